@@ -2,6 +2,97 @@
 
 import streamlit as st
 from data.template_generator import TemplateGenerator
+from data.readers.workbook_cache import workbook_cache
+from utils.job_manager import job_manager, CANCELLED, ERROR
+from utils.result_cache import result_cache
+
+
+# Profiled stages of a single optimization run, and of each optimization in a multi run
+SINGLE_OPTIMIZATION_STAGES = ("pre_validation_filter", "validate", "clean", "process", "output")
+MULTI_OPTIMIZATION_STAGES = ("validate", "clean", "process")
+
+
+def run_single_optimization(job, optimization_name, template_bytes, bulk_bytes, bulk_filename):
+    """Background job: read, pre-filter, validate, clean, process and format one optimization."""
+    from business.bid_optimizations.multi_optimization import MULTI_OPTIMIZATIONS
+    from business.processors.output_formatter import OutputFormatter
+
+    factory, _ = MULTI_OPTIMIZATIONS[optimization_name]
+    optimization = factory()
+
+    # Every stage is timed (see Performance) and reported to the job
+    profiler = optimization.profiler
+    profiler.reset()
+    profiler.add_listener(job.stage_listener)
+
+    # Read template and bulk (parsed once per upload, see workbook_cache)
+    job.update("Reading files...")
+    template_df = workbook_cache.read_excel(template_bytes, sheet_name=None)
+    bulk_df = workbook_cache.read(
+        bulk_bytes, bulk_filename, sheet_name="Sponsored Products Campaigns"
+    )
+
+    # Pre-validation filtering (remove rows with State != "enabled")
+    with profiler.stage("pre_validation_filter", bulk_df) as stage:
+        bulk_df = optimization.cleaner.pre_validation_filter(bulk_df)
+        stage.set_output(bulk_df)
+
+    # Validate (now on pre-filtered data)
+    with profiler.stage("validate", bulk_df) as stage:
+        is_valid, validation_msg, _ = optimization.validate(template_df, bulk_df)
+        stage.set_output(bulk_df)
+
+    if not is_valid:
+        return {"validation_error": validation_msg}
+
+    # Clean (remaining filters, no duplicate state filtering)
+    with profiler.stage("clean", bulk_df) as stage:
+        cleaned_data, _ = optimization.clean(template_df, bulk_df)
+        stage.set_output(cleaned_data)
+
+    # Process
+    with profiler.stage("process", cleaned_data) as stage:
+        optimization_results = optimization.process(template_df, cleaned_data)
+        stage.set_output(optimization_results)
+
+    # Format output
+    with profiler.stage("output", optimization_results):
+        working_file, clean_file = OutputFormatter().create_output_files(
+            optimization_results, optimization_name
+        )
+
+    return {
+        "results": optimization_results,
+        "statistics": optimization.get_statistics(),
+        "performance": optimization.get_performance_report(),
+        "working_file": working_file,
+        "clean_file": clean_file,
+    }
+
+
+def run_multi_optimizations(job, selected, combined, template_bytes, bulk_files):
+    """Background job: run several optimizations on shared uploads and create their files."""
+    from business.bid_optimizations.multi_optimization import MultiOptimizationRunner
+
+    runner = MultiOptimizationRunner(stage_listener=job.stage_listener)
+
+    # Each upload is parsed once (see workbook_cache) and shared by all runs
+    job.update("Reading files...")
+    template_df = workbook_cache.read_excel(template_bytes, sheet_name=None)
+    bulk_data = {
+        key: workbook_cache.read(content, filename, sheet_name="Sponsored Products Campaigns")
+        for key, (content, filename) in bulk_files.items()
+    }
+
+    runs = runner.run(template_df, bulk_data, selected)
+    # Cancelled optimizations end as failed runs; stop before writing files
+    job.check_cancelled()
+
+    job.update("Creating output files...", stage="output")
+    outputs = runner.create_output_files(runs, combined=combined)
+    job.update(completed_stage=True)
+
+    return {"runs": runs, "outputs": outputs}
 
 
 class BidOptimizerPage:
@@ -37,7 +128,13 @@ class BidOptimizerPage:
             # Use radio buttons for single selection
             optimization = st.radio(
                 "Select optimization:",
-                ["Zero Sales", "Bids 30 Days", "Bids 60 Days", "Empty Portfolios"],
+                [
+                    "Zero Sales",
+                    "Bids 30 Days",
+                    "Bids 60 Days",
+                    "Empty Portfolios",
+                    "Multiple Optimizations",
+                ],
                 index=0,  # Default to Zero Sales
                 key="optimization_selection",
             )
@@ -48,6 +145,11 @@ class BidOptimizerPage:
             bids_60_days = optimization == "Bids 60 Days"
             empty_portfolios = optimization == "Empty Portfolios"
 
+            # Zero Sales / Bids 30 / Bids 60 together on one parsed bulk
+            if optimization == "Multiple Optimizations":
+                self._render_multi_optimization()
+                return
+
             st.markdown(
                 """
                 <div style='height: 150px;'></div>
@@ -171,14 +273,12 @@ class BidOptimizerPage:
                         from business.bid_optimizations.empty_portfolios.orchestrator import (
                             EmptyPortfoliosOrchestrator,
                         )
-                        import io
                         
                         try:
                             # Read all sheets for Empty Portfolios
-                            bulk_data = pd.read_excel(
-                                io.BytesIO(bulk_file.read()), sheet_name=None
+                            bulk_data = workbook_cache.read_excel(
+                                bulk_file, sheet_name=None
                             )
-                            bulk_file.seek(0)
                             
                             # Create and run Empty Portfolios optimization
                             optimization = EmptyPortfoliosOrchestrator()
@@ -245,189 +345,298 @@ class BidOptimizerPage:
                 st.success(f"Template and Bulk {bulk_type} files loaded")
                 st.info("Ready for processing!")
 
+                # Files of the selected optimization
+                if zero_sales:
+                    bulk_file = bulk_60_file
+                elif bids_30_days:
+                    bulk_file = bulk_30_file
+                else:
+                    bulk_file = bulk_60_file_for_60_days
+                optimization_name = optimization
+
+                # The run executes in the job manager; the handle survives reruns
+                job = st.session_state.get("bid_optimizer_job")
+                running = job is not None and not job.done
+
                 # Process button
                 if st.button(
-                    "Process Files", type="secondary", use_container_width=True
+                    "Process Files",
+                    type="secondary",
+                    use_container_width=True,
+                    disabled=running or not (template_file and bulk_file),
                 ):
-                    try:
-                        with st.spinner("Processing files..."):
-                            # Import required modules
-                            import pandas as pd
-                            from datetime import datetime
-                            from business.processors.output_formatter import (
-                                OutputFormatter,
-                            )
-
-                            # Determine which optimization to use
-                            if zero_sales:
-                                from business.bid_optimizations.zero_sales.orchestrator import (
-                                    ZeroSalesOptimization,
-                                )
-
-                                optimization = ZeroSalesOptimization()
-                                optimization_name = "Zero Sales"
-                            elif bids_30_days:
-                                from business.bid_optimizations.bids_30_days.orchestrator import (
-                                    Bids30DaysOptimization,
-                                )
-
-                                optimization = Bids30DaysOptimization()
-                                optimization_name = "Bids 30 Days"
-                            else:  # bids_60_days
-                                from business.bid_optimizations.bids_60_days.orchestrator import (
-                                    Bids60DaysOptimization,
-                                )
-
-                                optimization = Bids60DaysOptimization()
-                                optimization_name = "Bids 60 Days"
-
-                            # Read template
-                            import io
-
-                            template_df = pd.read_excel(
-                                io.BytesIO(template_file.read()), sheet_name=None
-                            )
-                            template_file.seek(0)
-
-                            # Read bulk based on type and optimization
-                            if bulk_type == "60" and zero_sales and bulk_60_file:
-                                # Zero Sales uses bulk_60_file
-                                if bulk_60_file.name.endswith(".csv"):
-                                    bulk_df = pd.read_csv(bulk_60_file)
-                                else:
-                                    bulk_df = pd.read_excel(
-                                        bulk_60_file,
-                                        sheet_name="Sponsored Products Campaigns",
-                                    )
-                            elif bulk_type == "60" and bids_60_days and bulk_60_file_for_60_days:
-                                # Bids 60 Days uses bulk_60_file_for_60_days
-                                if bulk_60_file_for_60_days.name.endswith(".csv"):
-                                    bulk_df = pd.read_csv(bulk_60_file_for_60_days)
-                                else:
-                                    bulk_df = pd.read_excel(
-                                        bulk_60_file_for_60_days,
-                                        sheet_name="Sponsored Products Campaigns",
-                                    )
-                            elif bulk_type == "30" and bulk_30_file:
-                                # Bids 30 Days uses bulk_30_file
-                                if bulk_30_file.name.endswith(".csv"):
-                                    bulk_df = pd.read_csv(bulk_30_file)
-                                else:
-                                    bulk_df = pd.read_excel(
-                                        bulk_30_file,
-                                        sheet_name="Sponsored Products Campaigns",
-                                    )
-
-                            # Process the optimization
-                            st.info(f"Processing {optimization_name} optimization...")
-
-                            # Pre-validation filtering (remove rows with State != "enabled")
-                            st.info("Pre-filtering data for validation...")
-                            bulk_df = optimization.cleaner.pre_validation_filter(bulk_df)
-
-                            # Validate (now on pre-filtered data)
-                            is_valid, validation_msg, validation_details = (
-                                optimization.validate(template_df, bulk_df)
-                            )
-
-                            if not is_valid:
-                                st.error(f"Validation failed: {validation_msg}")
-                                return
-
-                            # Clean (remaining filters, no duplicate state filtering)
-                            cleaned_data, cleaning_details = optimization.clean(
-                                template_df, bulk_df
-                            )
-
-                            # Process
-                            optimization_results = optimization.process(
-                                template_df, cleaned_data
-                            )
-
-                            # DEBUG: Check what process() returned
-                            print(f"[DEBUG UI] optimization.process() returned:")
-                            print(f"[DEBUG UI]   Type: {type(optimization_results)}")
-                            if isinstance(optimization_results, dict):
-                                print(f"[DEBUG UI]   Keys: {list(optimization_results.keys())}")
-                                for key, df in optimization_results.items():
-                                    if hasattr(df, 'shape'):
-                                        print(f"[DEBUG UI]   {key}: {df.shape} rows x cols")
-                                    else:
-                                        print(f"[DEBUG UI]   {key}: {type(df)}")
-                            else:
-                                print(f"[DEBUG UI]   Value: {optimization_results}")
+                    template_bytes = template_file.getvalue()
+                    bulk_bytes = bulk_file.getvalue()
+                    # Same files and optimization as an earlier run: served from result_cache
+                    cache_key = result_cache.make_key(
+                        optimization_name,
+                        {"template": template_bytes, "bulk": bulk_bytes},
+                        {"bulk_filename": bulk_file.name},
+                    )
+                    job = job_manager.submit_cached(
+                        optimization_name,
+                        cache_key,
+                        run_single_optimization,
+                        optimization_name,
+                        template_bytes,
+                        bulk_bytes,
+                        bulk_file.name,
+                        total_stages=len(SINGLE_OPTIMIZATION_STAGES),
+                    )
+                    st.session_state.bid_optimizer_job = job
+
+                if job is not None and job.name == optimization_name:
+                    self._render_single_job(job, show_harvesting=bids_30_days or bids_60_days)
+
+    def _render_single_job(self, job, show_harvesting: bool):
+        """Progress of the running optimization, or its results once finished."""
+        from datetime import datetime
+        from app.ui.components.progress_bar import render_running_job
+
+        if not job.done:
+            render_running_job(job, key="bid_optimizer_job")
+            return
+
+        if job.status == CANCELLED:
+            st.warning(f"{job.name} processing cancelled")
+            return
+        if job.status == ERROR:
+            st.error(f"Error processing files: {job.error}")
+            st.code(job.traceback)
+            return
+
+        result = job.result
+        if result.get("validation_error"):
+            st.error(f"Validation failed: {result['validation_error']}")
+            return
+
+        optimization_name = job.name
+
+        # Show results
+        st.markdown(
+            "<h3 style='text-align: center;'>4. Results</h3>",
+            unsafe_allow_html=True,
+        )
+
+        st.success(f"{optimization_name} optimization completed successfully!")
+        if job.from_cache:
+            st.info("Served from cache: same files as an earlier run")
+
+        # Get statistics
+        stats = result["statistics"]
+        if stats:
+            st.info(
+                f"Processed: {stats.get('rows_processed', 0)} rows | "
+                f"Modified: {stats.get('rows_modified', 0)} bids"
+            )
 
-                            # Format output
-                            formatter = OutputFormatter()
-                            working_file, clean_file = formatter.create_output_files(
-                                optimization_results, optimization_name
-                            )
+            # Show additional stats for Bids 30 Days and Bids 60 Days
+            if show_harvesting and stats.get("rows_to_harvesting", 0) > 0:
+                st.info(
+                    f"Moved to For Harvesting: {stats.get('rows_to_harvesting', 0)} rows"
+                )
 
-                            # DEBUG: Check what create_output_files() returned
-                            print(f"[DEBUG UI] OutputFormatter.create_output_files() returned:")
-                            print(f"[DEBUG UI]   working_file type: {type(working_file)}")
-                            print(f"[DEBUG UI]   working_file size: {len(working_file.getvalue()) if hasattr(working_file, 'getvalue') else 'N/A'} bytes")
-                            print(f"[DEBUG UI]   clean_file type: {type(clean_file)}")
-                            print(f"[DEBUG UI]   clean_file size: {len(clean_file.getvalue()) if hasattr(clean_file, 'getvalue') else 'N/A'} bytes")
-
-                            # Show results
-                            st.markdown(
-                                "<h3 style='text-align: center;'>4. Results</h3>",
-                                unsafe_allow_html=True,
-                            )
+        file_tag = optimization_name.replace(" ", "_").lower()
+        self._render_performance(result["performance"], key=file_tag)
 
-                            st.success(
-                                f"{optimization_name} optimization completed successfully!"
-                            )
+        # Download buttons
+        timestamp = datetime.fromtimestamp(job.finished_at).strftime("%Y%m%d_%H%M%S")
+        col1, col2 = st.columns(2)
 
-                            # Get statistics
-                            stats = optimization.get_statistics()
-                            if stats:
-                                st.info(
-                                    f"Processed: {stats.get('rows_processed', 0)} rows | "
-                                    f"Modified: {stats.get('rows_modified', 0)} bids"
-                                )
+        with col1:
+            st.download_button(
+                label="Download Working File",
+                data=result["working_file"],
+                file_name=f"working_file_{file_tag}_{timestamp}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+            )
 
-                                # Show additional stats for Bids 30 Days and Bids 60 Days
-                                if (
-                                    (bids_30_days or bids_60_days)
-                                    and stats.get("rows_to_harvesting", 0) > 0
-                                ):
-                                    st.info(
-                                        f"Moved to For Harvesting: {stats.get('rows_to_harvesting', 0)} rows"
-                                    )
+        with col2:
+            st.download_button(
+                label="Download Clean File",
+                data=result["clean_file"],
+                file_name=f"clean_file_{file_tag}_{timestamp}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+            )
 
-                            # Download buttons
-                            col1, col2 = st.columns(2)
+    def _render_multi_optimization(self):
+        """Render the multi-optimization mode (several optimizations, one upload each)."""
+        from datetime import datetime
+        from app.ui.components.progress_bar import render_running_job
+        from business.bid_optimizations.multi_optimization import (
+            MULTI_OPTIMIZATIONS,
+            MultiOptimizationRunner,
+            BULK_60,
+            BULK_30,
+        )
+
+        selected = st.multiselect(
+            "Optimizations to run:",
+            list(MULTI_OPTIMIZATIONS.keys()),
+            default=list(MULTI_OPTIMIZATIONS.keys()),
+            key="multi_optimization_selection",
+        )
+        combined = st.checkbox(
+            "One combined Working/Clean file", value=False, key="multi_combined_output"
+        )
+
+        st.markdown(
+            "<h3 style='text-align: left;'>2. Upload Files</h3>",
+            unsafe_allow_html=True,
+        )
+
+        template_bytes = TemplateGenerator().generate_template()
+        st.download_button(
+            label="Download Template",
+            data=template_bytes,
+            file_name="template.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            use_container_width=True,
+        )
+
+        runner = MultiOptimizationRunner()
+        required_bulks = runner.required_bulks(selected) if selected else []
+
+        template_file = st.file_uploader(
+            "Upload Template", type=["xlsx"], key="multi_template_uploader"
+        )
+        bulk_files = {}
+        if BULK_60 in required_bulks:
+            bulk_files[BULK_60] = st.file_uploader(
+                "Bulk 60 Days", type=["xlsx", "csv"], key="multi_bulk_60_uploader"
+            )
+        if BULK_30 in required_bulks:
+            bulk_files[BULK_30] = st.file_uploader(
+                "Bulk 30 Days", type=["xlsx", "csv"], key="multi_bulk_30_uploader"
+            )
 
-                            # DEBUG: Final check before download button
-                            print(f"[DEBUG UI] Before download button:")
-                            print(f"[DEBUG UI]   working_file variable type: {type(working_file)}")
-                            print(f"[DEBUG UI]   working_file size: {len(working_file.getvalue()) if hasattr(working_file, 'getvalue') else 'N/A'} bytes")
+        if not selected or not template_file or not all(bulk_files.values()):
+            return
+
+        st.markdown(
+            "<h3 style='text-align: center;'>3. Data Validation</h3>",
+            unsafe_allow_html=True,
+        )
+        st.success("Template and bulk files loaded")
+
+        job = st.session_state.get("bid_multi_job")
+        running = job is not None and not job.done
+
+        if st.button(
+            "Process Files", type="secondary", use_container_width=True, disabled=running
+        ):
+            template_bytes = template_file.getvalue()
+            bulk_contents = {
+                key: (bulk_file.getvalue(), bulk_file.name) for key, bulk_file in bulk_files.items()
+            }
+            cache_key = result_cache.make_key(
+                "Multiple Optimizations",
+                {
+                    "template": template_bytes,
+                    **{f"bulk_{key}": content for key, (content, _) in bulk_contents.items()},
+                },
+                {
+                    "selected": list(selected),
+                    "combined": combined,
+                    "bulk_filenames": {key: name for key, (_, name) in bulk_contents.items()},
+                },
+            )
+            job = job_manager.submit_cached(
+                ", ".join(selected),
+                cache_key,
+                run_multi_optimizations,
+                list(selected),
+                combined,
+                template_bytes,
+                bulk_contents,
+                total_stages=len(selected) * len(MULTI_OPTIMIZATION_STAGES) + 1,
+            )
+            st.session_state.bid_multi_job = job
+
+        if job is None:
+            return
+        if not job.done:
+            render_running_job(job, key="bid_multi_job")
+            return
+        if job.status == CANCELLED:
+            st.warning(f"Processing of {job.name} cancelled")
+            return
+        if job.status == ERROR:
+            st.error(f"Error processing files: {job.error}")
+            st.code(job.traceback)
+            return
+
+        runs = job.result["runs"]
+        outputs = job.result["outputs"]
+
+        st.markdown(
+            "<h3 style='text-align: center;'>4. Results</h3>",
+            unsafe_allow_html=True,
+        )
+        if job.from_cache:
+            st.info("Served from cache: same files and options as an earlier run")
+
+        for name, run in runs.items():
+            if not run.success:
+                st.error(f"{name}: {run.message}")
+                continue
+
+            st.success(run.message)
+            stats = run.statistics
+            st.info(
+                f"Processed: {stats.get('rows_processed', 0)} rows | "
+                f"Modified: {stats.get('rows_modified', 0)} bids"
+            )
 
-                            with col1:
-                                st.download_button(
-                                    label="Download Working File",
-                                    data=working_file,
-                                    file_name=f"working_file_{optimization_name.replace(' ', '_').lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                    use_container_width=True,
-                                )
+        for name, run in runs.items():
+            if run.performance:
+                self._render_performance(
+                    run.performance, key=f"multi_{name.replace(' ', '_').lower()}"
+                )
 
-                            with col2:
-                                st.download_button(
-                                    label="Download Clean File",
-                                    data=clean_file,
-                                    file_name=f"clean_file_{optimization_name.replace(' ', '_').lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                    use_container_width=True,
-                                )
+        timestamp = datetime.fromtimestamp(job.finished_at).strftime("%Y%m%d_%H%M%S")
+        for name, (working_file, clean_file) in outputs.items():
+            file_tag = name.replace(" ", "_").lower()
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button(
+                    label=f"Download Working File ({name})",
+                    data=working_file,
+                    file_name=f"working_file_{file_tag}_{timestamp}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    use_container_width=True,
+                    key=f"multi_working_{file_tag}",
+                )
+            with col2:
+                st.download_button(
+                    label=f"Download Clean File ({name})",
+                    data=clean_file,
+                    file_name=f"clean_file_{file_tag}_{timestamp}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    use_container_width=True,
+                    key=f"multi_clean_{file_tag}",
+                )
 
-                    except Exception as e:
-                        st.error(f"Error processing files: {str(e)}")
-                        import traceback
+    def _render_performance(self, report, key: str):
+        """Render the per-stage timing/memory report in a collapsed expander."""
+        import json
+        import pandas as pd
 
-                        st.code(traceback.format_exc())
+        with st.expander(f"Performance ({report['optimization']})", expanded=False):
+            st.caption(
+                f"Total: {report['total_wall_seconds']:.2f}s wall, "
+                f"{report['total_cpu_seconds']:.2f}s CPU"
+            )
+            st.dataframe(pd.DataFrame(report["stages"]), use_container_width=True)
+            st.download_button(
+                label="Download Performance Report (JSON)",
+                data=json.dumps(report, indent=2),
+                file_name=f"performance_{key}.json",
+                mime="application/json",
+                key=f"performance_{key}",
+            )
 
 
 # Required for page registration
@@ -8,11 +8,15 @@ from datetime import datetime
 from io import BytesIO
 
 # Business logic imports
-from business.portfolio_optimizations.factory import get_portfolio_optimization_factory
+from business.portfolio_optimizations.factory import (
+    PortfolioOptimizationFactory,
+    get_portfolio_optimization_factory,
+)
 from business.portfolio_optimizations.orchestrator import (
     PortfolioOptimizationOrchestrator,
 )
 from business.portfolio_optimizations.service import PortfolioOptimizationService
+from business.portfolio_optimizations.constants import INPUT_SHEETS, REQUIRED_INPUT_SHEETS
 
 # State management imports
 from app.state.portfolio_state import PortfolioState
@@ -21,6 +25,9 @@ from app.state.portfolio_state import PortfolioState
 from data.validators.bulk_validator import BulkValidator
 from data.template_generator import TemplateGenerator
 from data.readers.excel_reader import ExcelReader
+from data.readers.workbook_cache import workbook_cache
+from utils.job_manager import job_manager, CANCELLED, ERROR
+from utils.result_cache import result_cache
 
 # UI component imports - FIXED: Creating wrapper functions for alerts
 from app.ui.components.alerts import show_validation_alert
@@ -49,6 +56,7 @@ def show_info(message: str):
 
 from app.ui.components.download_buttons import create_download_button
 from app.ui.components.file_cards import render_file_card
+from app.ui.components.progress_bar import render_running_job
 
 
 # Create wrapper function for display_file_card
@@ -76,6 +84,35 @@ def display_file_card(filename: str, size_or_sheets: Any, details: Any = None):
         )
 
 
+def run_portfolio_optimizations(job, sheets, selected, template_data):
+    """
+    Background job: run the selected optimizations and create the output file.
+
+    Uses its own strategy instances so concurrent sessions do not share
+    strategy state (e.g. the Top ASINs template).
+    """
+    orchestrator = PortfolioOptimizationOrchestrator(factory=PortfolioOptimizationFactory())
+    orchestrator.profiler.add_listener(job.stage_listener)
+
+    # Set template data on the strategy before running
+    if template_data is not None and "organize_top_campaigns" in selected:
+        strategy = orchestrator.factory.create_strategy("organize_top_campaigns")
+        if strategy and hasattr(strategy, "set_template_data"):
+            strategy.set_template_data(template_data)
+
+    merged_data, run_report = orchestrator.run_optimizations(sheets, selected)
+    # A cancelled run ends as a failed report; stop before writing the file
+    job.check_cancelled()
+
+    # updated_indices comes from results_manager when available
+    updated_indices = getattr(run_report, "updated_indices", {})
+    if not updated_indices:
+        updated_indices = {sheet: [] for sheet in merged_data.keys()}
+
+    output_bytes = orchestrator.create_output_file(merged_data, updated_indices)
+    return merged_data, run_report, updated_indices, output_bytes
+
+
 # Set up logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -222,13 +259,12 @@ class PortfolioOptimizerPage:
     def _process_uploaded_file(self, uploaded_file):
         """Process the uploaded file."""
         try:
-            # Read Excel file - Portfolio Optimizer needs all sheets
-            # Using pandas directly as ExcelReader doesn't have read_all_sheets
-            sheets = pd.read_excel(uploaded_file, sheet_name=None)
+            # Read Excel file - only the sheets the Portfolio Optimizer uses
+            # Parsed once per upload content through the shared workbook cache
+            sheets = workbook_cache.read_sheets(uploaded_file, INPUT_SHEETS)
 
             # Validate file structure
-            required_sheets = ["Sponsored Products Campaigns", "Portfolios"]
-            missing_sheets = [s for s in required_sheets if s not in sheets]
+            missing_sheets = [s for s in REQUIRED_INPUT_SHEETS if s not in sheets]
 
             if missing_sheets:
                 show_error(f"Missing required sheets: {', '.join(missing_sheets)}")
@@ -341,6 +377,8 @@ class PortfolioOptimizerPage:
             ):
                 self._process_optimizations()
 
+        self._render_job()
+
         # Show status messages
         if not selected_optimizations:
             show_info("Please select at least one optimization")
@@ -350,97 +388,94 @@ class PortfolioOptimizerPage:
             show_info("Please upload a template file for Organize Top Campaigns")
 
     def _process_optimizations(self):
-        """Process selected optimizations."""
-        try:
-            # Update status
-            st.session_state.portfolio_status = "processing"
-            st.session_state.portfolio_current_step = "starting"
-
-            # Show progress
-            progress_bar = st.progress(0, text="Starting optimization...")
-
-            # Get selected optimizations
-            selected = st.session_state.get("portfolio_selected_optimizations", [])
-            self.logger.info(f"Processing {len(selected)} optimizations: {selected}")
-
-            # Update progress
-            progress_bar.progress(20, text="Validating data...")
-            st.session_state.portfolio_current_step = "validating"
-
-            # Handle template data for Organize Top Campaigns
-            if "organize_top_campaigns" in selected:
-                from app.state.portfolio_state import get_portfolio_template_data
-                template_data = get_portfolio_template_data()
-                if template_data is not None:
-                    # Set template data on the strategy before running
-                    strategy = self.factory.create_strategy("organize_top_campaigns")
-                    if strategy and hasattr(strategy, 'set_template_data'):
-                        strategy.set_template_data(template_data)
-
-            # Run optimizations
-            progress_bar.progress(40, text="Running optimizations...")
-            st.session_state.portfolio_current_step = "optimizing"
-
-            merged_data, run_report = self.orchestrator.run_optimizations(
-                st.session_state.get("portfolio_sheets", {}), selected
-            )
+        """Start the selected optimizations as a background job."""
+        selected = st.session_state.get("portfolio_selected_optimizations", [])
+        self.logger.info(f"Processing {len(selected)} optimizations: {selected}")
+
+        # Template data for Organize Top Campaigns
+        template_data = None
+        template_bytes = None
+        if "organize_top_campaigns" in selected:
+            from app.state.portfolio_state import get_portfolio_template_data
+            template_data = get_portfolio_template_data()
+            template_file = st.session_state.get("portfolio_template_file")
+            template_bytes = template_file.getvalue() if template_file else None
+
+        # Same file, template and selection as an earlier run: served from result_cache
+        bulk_file = st.session_state.get("portfolio_original_file")
+        cache_key = result_cache.make_key(
+            "Portfolio Optimizer",
+            {"bulk": bulk_file.getvalue() if bulk_file else None, "template": template_bytes},
+            {"selected": list(selected)},
+        )
 
-            # Store results
-            st.session_state.portfolio_merged_data = merged_data
-            st.session_state.portfolio_run_report = run_report
-
-            # According to the architecture, updated_indices comes from results_manager
-            # and should be stored separately or accessed through merge_report
-            # For now, we'll create an empty dict if not available
-            updated_indices = getattr(run_report, "updated_indices", {})
-            if not updated_indices:
-                # Try to get from optimization_details if available
-                if hasattr(run_report, "optimization_details"):
-                    # Extract updated indices from optimization details if possible
-                    updated_indices = {}
-                    for sheet in merged_data.keys():
-                        updated_indices[sheet] = []
-
-            st.session_state.portfolio_updated_indices = updated_indices
-
-            # Create output file
-            progress_bar.progress(80, text="Creating output file...")
-            st.session_state.portfolio_current_step = "creating_file"
-
-            output_bytes = self.orchestrator.create_output_file(
-                merged_data, updated_indices
-            )
+        # clean + one stage per optimization + merge + output
+        job = job_manager.submit_cached(
+            "Portfolio optimizations",
+            cache_key,
+            run_portfolio_optimizations,
+            st.session_state.get("portfolio_sheets", {}),
+            selected,
+            template_data,
+            total_stages=len(selected) + 3,
+        )
+        st.session_state.portfolio_job = job
+        st.session_state.portfolio_status = "processing"
+        st.session_state.portfolio_current_step = "optimizing"
+
+    def _render_job(self):
+        """Progress of the running job; store its results once it finishes."""
+        job = st.session_state.get("portfolio_job")
+        if job is None:
+            return
+
+        if not job.done:
+            render_running_job(job, key="portfolio_job")
+            return
+
+        # Finished: consume the job so its results are stored once
+        del st.session_state["portfolio_job"]
+
+        if job.status == CANCELLED:
+            show_warning("Processing cancelled")
+            st.session_state.portfolio_status = "ready_to_process"
+            return
+        if job.status == ERROR:
+            self.logger.error(f"Error processing optimizations: {job.error}")
+            show_error(f"Processing failed: {job.error}")
+            st.session_state.portfolio_status = "processing_failed"
+            return
 
-            # Store output
-            st.session_state.portfolio_output_file = output_bytes
-            st.session_state.portfolio_output_filename = (
-                self.service.generate_filename()  # Using service's method
-            )
-            st.session_state.portfolio_output_created_at = datetime.now()
+        merged_data, run_report, updated_indices, output_bytes = job.result
 
-            # Update status
-            progress_bar.progress(100, text="Complete!")
-            st.session_state.portfolio_status = "ready_for_download"
+        # Store results
+        st.session_state.portfolio_merged_data = merged_data
+        st.session_state.portfolio_run_report = run_report
+        st.session_state.portfolio_updated_indices = updated_indices
 
-            # Show success message
-            show_success(
-                f"Successfully processed {run_report.successful_optimizations} optimizations. "
-                f"Updated {run_report.total_rows_updated} rows."
-            )
+        # Store output
+        st.session_state.portfolio_output_file = output_bytes
+        st.session_state.portfolio_output_filename = (
+            self.service.generate_filename()  # Using service's method
+        )
+        st.session_state.portfolio_output_created_at = datetime.now()
 
-            # Show any conflicts
-            if run_report.conflicts:
-                show_warning(
-                    f"Found {len(run_report.conflicts)} conflicts (last value was used)"
-                )
+        # Update status
+        st.session_state.portfolio_status = "ready_for_download"
 
-            # Rerun to update UI
-            st.rerun()
+        # Show success message
+        show_success(
+            f"Successfully processed {run_report.successful_optimizations} optimizations. "
+            f"Updated {run_report.total_rows_updated} rows."
+        )
+        if job.from_cache:
+            show_info("Served from cache: same file and optimizations as an earlier run")
 
-        except Exception as e:
-            self.logger.error(f"Error processing optimizations: {str(e)}")
-            show_error(f"Processing failed: {str(e)}")
-            st.session_state.portfolio_status = "processing_failed"
+        # Show any conflicts
+        if run_report.conflicts:
+            show_warning(
+                f"Found {len(run_report.conflicts)} conflicts (last value was used)"
+            )
 
     def _render_download_section(self):
         """Render download section."""
@@ -2,7 +2,7 @@
 
 import streamlit as st
 import time
-from typing import Optional
+from typing import Any, Dict, Optional
 
 def render(progress_value: Optional[float] = None) -> None:
     """
@@ -138,4 +138,43 @@ def _display_progress(value: float) -> None:
         value: Progress value between 0 and 1
     """
     percent = int(value * 100)
-    st.markdown(create_progress_html(percent), unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown(create_progress_html(percent), unsafe_allow_html=True)
+
+def render_job_progress(progress: Dict[str, Any]) -> None:
+    """
+    Display the progress of a background job.
+
+    Args:
+        progress: Job.snapshot() of the running job
+    """
+    _display_progress(progress["fraction"])
+
+    details = [progress["message"]]
+    if progress["total_stages"]:
+        details.append(f"stage {min(progress['completed_stages'] + 1, progress['total_stages'])}"
+                       f"/{progress['total_stages']}")
+    if progress["rows"] is not None:
+        details.append(f"{progress['rows']:,} rows")
+    st.caption(" | ".join(details))
+    st.caption(f"Time elapsed: {format_time(progress['elapsed'])}")
+
+
+def render_running_job(job, key: str, poll_seconds: float = 0.5) -> None:
+    """
+    Progress and Cancel button of an unfinished background job.
+
+    Reruns the script every poll_seconds until the job finishes; the job
+    itself keeps running in the job manager across reruns.
+
+    Args:
+        job: utils.job_manager.Job kept in session state
+        key: Unique widget key prefix
+        poll_seconds: Refresh interval
+    """
+    render_job_progress(job.snapshot())
+
+    if st.button("Cancel", key=f"cancel_{key}", disabled=job.cancel_requested):
+        job.cancel()
+
+    time.sleep(poll_seconds)
+    st.rerun()
@@ -6,6 +6,7 @@ import pandas as pd
 from typing import Optional, Dict, Any
 from data.template_generator import TemplateGenerator
 from data.readers.excel_reader import ExcelReader
+from data.readers.workbook_cache import workbook_cache
 from data.validators.template_validator import TemplateValidator
 from data.validators.bulk_validator import BulkValidator
 from app.state.bid_state import BidState
@@ -176,13 +177,10 @@ class UploadSection:
                 st.error(f"File exceeds {MAX_FILE_SIZE_MB}MB limit")
                 return
 
-            # Read file based on type
-            if uploaded_file.name.endswith(".csv"):
-                df = pd.read_csv(uploaded_file)
-            else:
-                df = pd.read_excel(
-                    uploaded_file, sheet_name="Sponsored Products Campaigns"
-                )
+            # Read file based on type (parsed once, shared with processing)
+            df = workbook_cache.read(
+                uploaded_file, uploaded_file.name, sheet_name="Sponsored Products Campaigns"
+            )
 
             # Validate bulk file
             is_valid, message = self.bulk_validator.validate(df)
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Headless batch runner: optimize a directory of account bulk files in parallel.
+
+Usage:
+    python -m batch.run_batch bid accounts/ out/ --optimizations "Zero Sales" "Bids 30 Days"
+    python -m batch.run_batch portfolio accounts/ out/ --optimizations empty_portfolios
+    python -m batch.run_batch budget accounts/ out/
+
+Input directory layout (.xlsx or .csv bulks):
+    <account>.xlsx           Bulk file of the account (Bulk 60 in bid mode)
+    <account>_30.xlsx        Bulk 30 of the account (bid mode only)
+    <account>_template.xlsx  Template of the account: the bid template in bid
+                             mode, the Top ASINs template in portfolio mode;
+                             --template gives a shared fallback
+
+Each account runs in its own process of a pool sized to the CPU count. The
+optimizations go through the same orchestrators, readers and writers as the
+pages, and the working/clean files are written to <output>/<account>/ under
+the names the pages offer for download. summary.json (with the stage
+timings of every optimization) and summary.csv list the status and time of
+every account and optimization.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from config.constants import BULK_SHEET_NAME
+
+
+logger = logging.getLogger(__name__)
+
+MODES = ("bid", "portfolio", "budget")
+
+BULK_EXTENSIONS = (".xlsx", ".csv")
+TEMPLATE_SUFFIX = "_template"
+BULK_30_SUFFIX = "_30"
+
+SUMMARY_JSON = "summary.json"
+SUMMARY_CSV = "summary.csv"
+SUMMARY_CSV_COLUMNS = [
+    "account", "optimization", "status", "message", "seconds", "account_seconds", "outputs",
+]
+
+
+@dataclass
+class BatchJob:
+    """One account: its bulk files, template and where its outputs go."""
+
+    account: str
+    mode: str
+    optimizations: List[str]
+    bulk_files: Dict[str, str]  # Bulk key ("60"/"30", or "60" outside bid mode) -> path
+    output_dir: str
+    template: Optional[str] = None
+    combined: bool = False
+
+
+@dataclass
+class OptimizationSummary:
+    """Status and timing of one optimization of one account."""
+
+    optimization: str
+    success: bool
+    message: str
+    seconds: float = 0.0
+    performance: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class AccountSummary:
+    """Status, timing and written files of one account."""
+
+    account: str
+    success: bool
+    message: str
+    seconds: float = 0.0
+    output_seconds: float = 0.0
+    outputs: List[str] = field(default_factory=list)
+    optimizations: List[OptimizationSummary] = field(default_factory=list)
+
+
+def discover_jobs(
+    input_dir: Path,
+    output_dir: Path,
+    mode: str,
+    optimizations: Sequence[str],
+    template: Optional[Path] = None,
+    combined: bool = False,
+) -> List[BatchJob]:
+    """
+    Pair every bulk file of input_dir with its template.
+
+    Args:
+        input_dir: Directory of bulk and template files (see module docstring)
+        output_dir: Root of the per-account output directories
+        mode: One of MODES
+        optimizations: Optimizations to run on every account
+        template: Template used by accounts without <account>_template.xlsx
+        combined: Bid mode: one working/clean pair per account instead of one per optimization
+
+    Returns:
+        One job per account, sorted by account name
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    bulks: Dict[str, Dict[str, str]] = {}
+    templates: Dict[str, str] = {}
+    for path in sorted(Path(input_dir).iterdir()):
+        if not path.is_file() or path.name.startswith("~$"):
+            continue
+        if path.suffix.lower() not in BULK_EXTENSIONS:
+            continue
+
+        stem = path.stem
+        if stem.endswith(TEMPLATE_SUFFIX):
+            templates[stem[: -len(TEMPLATE_SUFFIX)]] = str(path)
+        elif mode == "bid" and stem.endswith(BULK_30_SUFFIX):
+            bulks.setdefault(stem[: -len(BULK_30_SUFFIX)], {})["30"] = str(path)
+        else:
+            bulks.setdefault(stem, {})["60"] = str(path)
+
+    jobs = []
+    for account in sorted(bulks):
+        account_template = templates.get(account) or (str(template) if template else None)
+        jobs.append(
+            BatchJob(
+                account=account,
+                mode=mode,
+                optimizations=list(optimizations),
+                bulk_files=bulks[account],
+                output_dir=str(Path(output_dir) / account),
+                template=account_template,
+                combined=combined,
+            )
+        )
+    return jobs
+
+
+def run_job(job: BatchJob) -> AccountSummary:
+    """Run one account; never raises, failures are reported in the summary."""
+    start = time.perf_counter()
+    summary = AccountSummary(job.account, True, "")
+    try:
+        Path(job.output_dir).mkdir(parents=True, exist_ok=True)
+        RUNNERS[job.mode](job, summary)
+    except Exception as e:
+        logger.error(f"Account {job.account} failed: {str(e)}")
+        summary.success = False
+        summary.message = str(e)
+
+    if summary.success and summary.optimizations and not any(
+        item.success for item in summary.optimizations
+    ):
+        summary.success = False
+        summary.message = "All optimizations failed"
+    if summary.success and not summary.message:
+        summary.message = f"{sum(item.success for item in summary.optimizations)} optimizations completed"
+
+    summary.seconds = time.perf_counter() - start
+    return summary
+
+
+def run_bid_job(job: BatchJob, summary: AccountSummary) -> None:
+    """Bid optimizations through MultiOptimizationRunner, as the multi-optimization page does."""
+    from business.bid_optimizations.multi_optimization import MultiOptimizationRunner
+    from data.readers.workbook_cache import WorkbookCache
+
+    if not job.template:
+        raise ValueError("No template (add <account>_template.xlsx or pass --template)")
+
+    # Accounts already run in parallel processes
+    runner = MultiOptimizationRunner(max_workers=1)
+    reader = WorkbookCache()
+    template_df = reader.read_excel(_read_bytes(job.template), sheet_name=None)
+    bulk_data = {
+        key: reader.read(_read_bytes(path), path, sheet_name=BULK_SHEET_NAME)
+        for key, path in job.bulk_files.items()
+    }
+
+    runnable = [name for name in job.optimizations if runner.optimizations[name][1] in bulk_data]
+    runs = runner.run(template_df, bulk_data, runnable) if runnable else {}
+    for name in job.optimizations:
+        run = runs.get(name)
+        if run is None:
+            message = f"Missing Bulk {runner.optimizations[name][1]} file"
+            summary.optimizations.append(OptimizationSummary(name, False, message))
+        else:
+            summary.optimizations.append(
+                OptimizationSummary(name, run.success, run.message, run.seconds, run.performance)
+            )
+
+    output_start = time.perf_counter()
+    outputs = runner.create_output_files(runs, combined=job.combined)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for name, (working_file, clean_file) in outputs.items():
+        file_tag = name.replace(" ", "_").lower()
+        summary.outputs.append(
+            _write_output(job, f"working_file_{file_tag}_{timestamp}.xlsx", working_file)
+        )
+        summary.outputs.append(
+            _write_output(job, f"clean_file_{file_tag}_{timestamp}.xlsx", clean_file)
+        )
+    summary.output_seconds = time.perf_counter() - output_start
+
+
+def run_portfolio_job(job: BatchJob, summary: AccountSummary) -> None:
+    """Portfolio strategies through the orchestrator, as the Portfolio Optimizer page does."""
+    from business.portfolio_optimizations.constants import INPUT_SHEETS, REQUIRED_INPUT_SHEETS
+    from business.portfolio_optimizations.orchestrator import PortfolioOptimizationOrchestrator
+    from data.readers.excel_reader import ExcelReader
+    from data.readers.workbook_cache import WorkbookCache
+
+    orchestrator = PortfolioOptimizationOrchestrator()
+    if "organize_top_campaigns" in job.optimizations:
+        if not job.template:
+            raise ValueError(
+                "organize_top_campaigns needs a Top ASINs template "
+                "(add <account>_template.xlsx or pass --template)"
+            )
+        success, message, template_df = ExcelReader().read_top_asins_template(
+            _read_bytes(job.template), Path(job.template).name
+        )
+        if not success:
+            raise ValueError(f"Top ASINs template: {message}")
+        orchestrator.factory.create_strategy("organize_top_campaigns").set_template_data(template_df)
+
+    sheets = WorkbookCache().read_sheets(_read_bytes(job.bulk_files["60"]), INPUT_SHEETS)
+    missing_sheets = [sheet for sheet in REQUIRED_INPUT_SHEETS if sheet not in sheets]
+    if missing_sheets:
+        raise ValueError(f"Missing required sheets: {', '.join(missing_sheets)}")
+
+    merged_data, run_report = orchestrator.run_optimizations(sheets, list(job.optimizations))
+    stage_seconds = {stage.stage: stage.wall_seconds for stage in orchestrator.profiler.stages}
+    details = run_report.optimization_details
+    for name in job.optimizations:
+        failed = name in run_report.failed_optimizations
+        summary.optimizations.append(
+            OptimizationSummary(
+                name,
+                not failed,
+                str(details.get(name, {}).get("error")) if failed else f"{name} completed",
+                stage_seconds.get(name, 0.0),
+            )
+        )
+
+    if not run_report.successful_optimizations:
+        return
+
+    output_start = time.perf_counter()
+    updated_indices = getattr(run_report, "updated_indices", {}) or {
+        sheet: [] for sheet in merged_data
+    }
+    output_bytes = orchestrator.create_output_file(merged_data, updated_indices)
+    filename = orchestrator.service.generate_filename()
+    summary.outputs.append(_write_output(job, filename, output_bytes))
+    summary.output_seconds = time.perf_counter() - output_start
+
+    # One report for the whole run: strategies share the clean/merge/output stages
+    performance = orchestrator.profiler.report()
+    for item in summary.optimizations:
+        item.performance = performance
+
+
+def run_budget_job(job: BatchJob, summary: AccountSummary) -> None:
+    """Campaign Optimizer 1 (Bulk 7 budgets), as the Campaign Optimizer page does."""
+    from business.campaign_optimizer_1.orchestrator import CampaignOptimizer1Orchestrator
+    from data.readers.excel_reader import ExcelReader
+    from data.validators.campaign_optimizer_1_validators import CampaignOptimizer1Validator
+    from utils.filename_generator import generate_campaign_optimizer_1_filename
+
+    name = "campaign_optimizer_1"
+    start = time.perf_counter()
+    bulk_path = job.bulk_files["60"]
+    file_bytes = _read_bytes(bulk_path)
+
+    validation_result = CampaignOptimizer1Validator().validate_input_file(file_bytes)
+    if not validation_result.is_valid:
+        summary.optimizations.append(
+            OptimizationSummary(
+                name, False, f"Validation failed: {'; '.join(validation_result.errors)}",
+                time.perf_counter() - start,
+            )
+        )
+        return
+
+    success, message, input_df = ExcelReader().read_bulk_file(file_bytes, Path(bulk_path).name)
+    if not success:
+        raise ValueError(f"Failed to read input file: {message}")
+
+    orchestrator = CampaignOptimizer1Orchestrator()
+    output_bytes = orchestrator.process({BULK_SHEET_NAME: input_df})
+    summary.optimizations.append(
+        OptimizationSummary(
+            name, True, "Campaign optimization completed",
+            time.perf_counter() - start, orchestrator.profiler.report(),
+        )
+    )
+
+    output_start = time.perf_counter()
+    summary.outputs.append(
+        _write_output(job, generate_campaign_optimizer_1_filename(), output_bytes)
+    )
+    summary.output_seconds = time.perf_counter() - output_start
+
+
+# Mode -> runner(job, summary)
+RUNNERS = {
+    "bid": run_bid_job,
+    "portfolio": run_portfolio_job,
+    "budget": run_budget_job,
+}
+
+
+def run_batch(jobs: Sequence[BatchJob], max_workers: Optional[int] = None) -> List[AccountSummary]:
+    """
+    Run the jobs in a process pool.
+
+    Args:
+        jobs: Result of discover_jobs()
+        max_workers: Worker processes (default: CPU count); 1 runs in this process
+
+    Returns:
+        Account summaries, in job order
+    """
+    if not jobs:
+        return []
+
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if max_workers == 1:
+        return [run_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        summaries = list(pool.map(run_job, jobs))
+    return summaries
+
+
+def write_summary(summaries: Sequence[AccountSummary], output_dir: Path) -> Dict[str, Path]:
+    """Write summary.json (with stage timings) and summary.csv (one row per optimization)."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    json_path = output_dir / SUMMARY_JSON
+    json_path.write_text(
+        json.dumps(
+            {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "accounts": [asdict(summary) for summary in summaries],
+            },
+            indent=2,
+            default=str,
+        ),
+        encoding="utf-8",
+    )
+
+    csv_path = output_dir / SUMMARY_CSV
+    with open(csv_path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=SUMMARY_CSV_COLUMNS)
+        writer.writeheader()
+        for summary in summaries:
+            rows = summary.optimizations or [
+                OptimizationSummary("", summary.success, summary.message)
+            ]
+            for item in rows:
+                writer.writerow(
+                    {
+                        "account": summary.account,
+                        "optimization": item.optimization,
+                        "status": "success" if item.success and summary.success else "failed",
+                        "message": item.message if item.optimization else summary.message,
+                        "seconds": round(item.seconds, 3),
+                        "account_seconds": round(summary.seconds, 3),
+                        "outputs": ";".join(summary.outputs),
+                    }
+                )
+
+    return {"json": json_path, "csv": csv_path}
+
+
+def default_optimizations(mode: str) -> List[str]:
+    """Everything the mode can run."""
+    if mode == "bid":
+        from business.bid_optimizations.multi_optimization import MULTI_OPTIMIZATIONS
+        return list(MULTI_OPTIMIZATIONS)
+    if mode == "portfolio":
+        from business.portfolio_optimizations.factory import get_portfolio_optimization_factory
+        return get_portfolio_optimization_factory().get_available_strategies()
+    return ["campaign_optimizer_1"]
+
+
+def _read_bytes(path: str) -> bytes:
+    return Path(path).read_bytes()
+
+
+def _write_output(job: BatchJob, filename: str, data: Any) -> str:
+    """Write a BytesIO or bytes output into the account directory."""
+    content = data.getvalue() if hasattr(data, "getvalue") else data
+    path = Path(job.output_dir) / filename
+    path.write_bytes(content)
+    return str(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("mode", choices=MODES)
+    parser.add_argument("input_dir", help="Directory of bulk files and templates")
+    parser.add_argument("output_dir", help="Outputs go to <output_dir>/<account>/")
+    parser.add_argument("--optimizations", nargs="+",
+                        help="Optimizations to run (default: all of the mode)")
+    parser.add_argument("--template", help="Template for accounts without <account>_template.xlsx")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--combined", action="store_true",
+                        help="Bid mode: one working/clean pair per account")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logging.getLogger("optimization").setLevel(logging.WARNING)
+
+    optimizations = args.optimizations or default_optimizations(args.mode)
+    unknown = [name for name in optimizations if name not in default_optimizations(args.mode)]
+    if unknown:
+        parser.error(f"Unknown {args.mode} optimizations: {unknown}")
+
+    jobs = discover_jobs(
+        Path(args.input_dir), Path(args.output_dir), args.mode, optimizations,
+        template=Path(args.template) if args.template else None, combined=args.combined,
+    )
+    if not jobs:
+        print(f"No bulk files found in {args.input_dir}")
+        return 1
+
+    start = time.perf_counter()
+    summaries = run_batch(jobs, args.workers)
+    paths = write_summary(summaries, Path(args.output_dir))
+
+    for summary in summaries:
+        status = "OK" if summary.success else "FAILED"
+        print(f"{summary.account:<30} {status:<7} {summary.seconds:8.2f}s  {summary.message}")
+        for item in summary.optimizations:
+            print(f"    {item.optimization:<30} {'ok' if item.success else 'failed':<7} "
+                  f"{item.seconds:8.2f}s  {item.message}")
+    print(f"{len(summaries)} accounts in {time.perf_counter() - start:.2f}s; "
+          f"summary written to {paths['json']} and {paths['csv']}")
+
+    return 0 if all(summary.success for summary in summaries) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
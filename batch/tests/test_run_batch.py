@@ -0,0 +1,78 @@
+"""Tests for the headless batch runner."""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from benchmarks.synthetic_bulk import BulkSpec, generate_bulk_sheets, generate_template
+from batch.run_batch import discover_jobs, run_batch, write_summary
+
+
+def write_account(directory: Path, account: str, seed: int, bulk_30: bool = False):
+    sheets = generate_bulk_sheets(BulkSpec(n_rows=400, seed=seed))
+    with pd.ExcelWriter(directory / f"{account}.xlsx") as writer:
+        for sheet, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet, index=False)
+    if bulk_30:
+        with pd.ExcelWriter(directory / f"{account}_30.xlsx") as writer:
+            for sheet, df in sheets.items():
+                df.to_excel(writer, sheet_name=sheet, index=False)
+
+    template = generate_template(sheets["Sponsored Products Campaigns"], seed=seed)
+    with pd.ExcelWriter(directory / f"{account}_template.xlsx") as writer:
+        for sheet, df in template.items():
+            df.to_excel(writer, sheet_name=sheet, index=False)
+
+
+def test_discover_pairs_bulks_and_templates(tmp_path):
+    for name in ["acme.xlsx", "acme_30.xlsx", "acme_template.xlsx", "beta.csv", "~$acme.xlsx", "notes.txt"]:
+        (tmp_path / name).write_bytes(b"")
+
+    jobs = discover_jobs(tmp_path, tmp_path / "out", "bid", ["Zero Sales"], template=Path("shared.xlsx"))
+
+    assert [job.account for job in jobs] == ["acme", "beta"]
+    assert set(jobs[0].bulk_files) == {"60", "30"}
+    assert jobs[0].template.endswith("acme_template.xlsx")
+    assert jobs[1].template == "shared.xlsx"
+    assert jobs[1].output_dir == str(tmp_path / "out" / "beta")
+
+    # Only bid mode reads <account>_30 as a Bulk 30
+    portfolio_jobs = discover_jobs(tmp_path, tmp_path / "out", "portfolio", ["empty_portfolios"])
+    assert [job.account for job in portfolio_jobs] == ["acme", "acme_30", "beta"]
+
+
+def test_bid_batch_writes_outputs_and_summary(tmp_path):
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    write_account(input_dir, "acme", seed=1, bulk_30=True)
+    write_account(input_dir, "beta", seed=2)
+
+    jobs = discover_jobs(input_dir, tmp_path / "out", "bid", ["Zero Sales", "Bids 30 Days"])
+    summaries = run_batch(jobs, max_workers=2)
+    paths = write_summary(summaries, tmp_path / "out")
+
+    acme, beta = summaries
+    assert acme.success and all(item.success for item in acme.optimizations)
+    assert len(acme.outputs) == 4 and all(Path(path).exists() for path in acme.outputs)
+    assert Path(acme.outputs[0]).parent == tmp_path / "out" / "acme"
+    assert acme.optimizations[0].performance["stages"]
+
+    # beta has no Bulk 30: Zero Sales still runs
+    assert [(item.optimization, item.success) for item in beta.optimizations] == [
+        ("Zero Sales", True), ("Bids 30 Days", False)
+    ]
+    assert beta.success and len(beta.outputs) == 2
+
+    report = json.loads(paths["json"].read_text(encoding="utf-8"))
+    assert [entry["account"] for entry in report["accounts"]] == ["acme", "beta"]
+    with open(paths["csv"], newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert len(rows) == 4
+    assert {row["status"] for row in rows if row["account"] == "acme"} == {"success"}
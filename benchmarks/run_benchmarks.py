@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: every optimization on synthetic bulks of growing size.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 10k 100k --output benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --sizes 10k 100k --compare benchmarks/baseline.json
+
+Each suite records the stages of one optimization (see StageProfiler):
+validate/clean/process and the Excel writers for the bid optimizations,
+clean/strategy/merge/output for the portfolio strategies and
+clean/optimize/output for Campaign Optimizer 1. Results are written as
+JSON so a run can be compared against the baseline of another commit.
+"""
+
+import pandas as pd
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import logging
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from config.constants import BULK_SHEET_NAME
+from benchmarks.synthetic_bulk import BulkSpec, SIZE_PRESETS, generate_bulk_sheets, generate_template
+from business.bid_optimizations.multi_optimization import MULTI_OPTIMIZATIONS
+
+
+logger = logging.getLogger(__name__)
+
+# Stages faster than this are not reported as regressions (timer noise)
+MIN_COMPARED_SECONDS = 0.05
+
+
+def run_bid_optimization(name: str, data: Dict[str, Any], write_output: bool = True) -> Dict[str, Any]:
+    """Pre-filter, validate, clean, process and format one bid optimization, as the page does."""
+    from business.processors.output_formatter import OutputFormatter
+
+    factory, _ = MULTI_OPTIMIZATIONS[name]
+    optimization = factory()
+    profiler = optimization.profiler
+    template = {sheet: df.copy() for sheet, df in data["template"].items()}
+    bulk = data["sheets"][BULK_SHEET_NAME].copy()
+
+    with profiler.stage("pre_validation_filter", bulk) as stage:
+        bulk = optimization.cleaner.pre_validation_filter(bulk)
+        stage.set_output(bulk)
+
+    with profiler.stage("validate", bulk) as stage:
+        is_valid, message, _ = optimization.validate(template, bulk)
+        stage.set_output(bulk)
+    if not is_valid:
+        raise ValueError(f"Validation failed: {message}")
+
+    with profiler.stage("clean", bulk) as stage:
+        cleaned_data, _ = optimization.clean(template, bulk)
+        stage.set_output(cleaned_data)
+
+    with profiler.stage("process", cleaned_data) as stage:
+        results = optimization.process(template, cleaned_data)
+        stage.set_output(results)
+
+    if write_output:
+        with profiler.stage("output", results):
+            OutputFormatter().create_output_files(results, name)
+
+    return optimization.get_performance_report()
+
+
+def run_portfolio_optimizations(
+    selected: Sequence[str], data: Dict[str, Any], write_output: bool = True
+) -> Dict[str, Any]:
+    """Run portfolio strategies through the orchestrator, as the Portfolio Optimizer page does."""
+    from business.portfolio_optimizations.orchestrator import PortfolioOptimizationOrchestrator
+
+    orchestrator = PortfolioOptimizationOrchestrator()
+    if "organize_top_campaigns" in selected:
+        top_asins = pd.DataFrame({"Top ASINs": data["template"]["Top ASINs"]["ASIN"]})
+        orchestrator.factory.create_strategy("organize_top_campaigns").set_template_data(top_asins)
+
+    sheets = {sheet: df.copy() for sheet, df in data["sheets"].items()}
+    merged_data, run_report = orchestrator.run_optimizations(sheets, list(selected))
+    if run_report.failed_optimizations:
+        details = run_report.optimization_details
+        raise ValueError(
+            "; ".join(f"{name}: {details[name].get('error')}" for name in run_report.failed_optimizations)
+        )
+
+    if write_output:
+        orchestrator.create_output_file(merged_data, {sheet: [] for sheet in merged_data})
+
+    return orchestrator.profiler.report()
+
+
+def run_campaign_optimizer_1(data: Dict[str, Any], write_output: bool = True) -> Dict[str, Any]:
+    """Run Campaign Optimizer 1 (Bulk 7); the output stage always runs."""
+    from business.campaign_optimizer_1.orchestrator import CampaignOptimizer1Orchestrator
+
+    orchestrator = CampaignOptimizer1Orchestrator()
+    orchestrator.process({BULK_SHEET_NAME: data["sheets"][BULK_SHEET_NAME].copy()})
+    return orchestrator.profiler.report()
+
+
+# Suite name -> runner(data, write_output)
+SUITES: Dict[str, Callable[[Dict[str, Any], bool], Dict[str, Any]]] = {
+    "zero_sales": lambda data, out: run_bid_optimization("Zero Sales", data, out),
+    "bids_30_days": lambda data, out: run_bid_optimization("Bids 30 Days", data, out),
+    "bids_60_days": lambda data, out: run_bid_optimization("Bids 60 Days", data, out),
+    "empty_portfolios": lambda data, out: run_portfolio_optimizations(["empty_portfolios"], data, out),
+    "campaigns_without_portfolios": lambda data, out: run_portfolio_optimizations(
+        ["campaigns_without_portfolios"], data, out
+    ),
+    "organize_top_campaigns": lambda data, out: run_portfolio_optimizations(
+        ["organize_top_campaigns"], data, out
+    ),
+    "campaign_optimizer_1": run_campaign_optimizer_1,
+}
+
+
+def build_data(n_rows: int, seed: int = 0) -> Dict[str, Any]:
+    """Synthetic bulk workbook and filled template of n_rows bulk rows."""
+    spec = BulkSpec(n_rows=n_rows, seed=seed)
+    sheets = generate_bulk_sheets(spec)
+    return {"sheets": sheets, "template": generate_template(sheets[BULK_SHEET_NAME], seed=seed)}
+
+
+def run_suites(
+    sizes: Sequence[str],
+    suites: Optional[Sequence[str]] = None,
+    seed: int = 0,
+    write_output: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run the selected suites on each bulk size.
+
+    Args:
+        sizes: Keys of SIZE_PRESETS or row counts (e.g. "10k", "25000")
+        suites: Keys of SUITES (all when None)
+        seed: Generator seed, so runs on different commits see the same data
+        write_output: Include the Excel writer stages
+
+    Returns:
+        Report with one entry per (suite, size)
+    """
+    suites = list(suites or SUITES)
+    unknown = [name for name in suites if name not in SUITES]
+    if unknown:
+        raise ValueError(f"Unknown suites: {unknown}")
+
+    results = []
+    for size in sizes:
+        n_rows = parse_size(size)
+        start = time.perf_counter()
+        data = build_data(n_rows, seed)
+        generate_seconds = time.perf_counter() - start
+        logger.info(f"Generated {n_rows} rows in {generate_seconds:.2f}s")
+
+        for name in suites:
+            entry = {
+                "suite": name,
+                "size": size,
+                "rows": n_rows,
+                "seed": seed,
+                "generate_seconds": generate_seconds,
+                "success": True,
+                "error": None,
+            }
+            try:
+                report = SUITES[name](data, write_output)
+                entry["total_wall_seconds"] = report["total_wall_seconds"]
+                entry["stages"] = report["stages"]
+            except Exception as e:
+                logger.error(f"Suite {name} ({size}) failed: {str(e)}")
+                entry.update(success=False, error=str(e), total_wall_seconds=None, stages=[])
+            results.append(entry)
+            logger.info(f"{name} ({size}): {entry['total_wall_seconds']}s")
+
+    return {"environment": environment(), "results": results}
+
+
+def compare_reports(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 1.25
+) -> List[Dict[str, Any]]:
+    """
+    Stages that got slower than the baseline by more than threshold (ratio of wall times).
+
+    Stages missing from either report and stages under MIN_COMPARED_SECONDS
+    in both are skipped.
+    """
+    baseline_times = _stage_times(baseline)
+    regressions = []
+    for key, seconds in _stage_times(current).items():
+        before = baseline_times.get(key)
+        if before is None or max(before, seconds) < MIN_COMPARED_SECONDS:
+            continue
+        ratio = seconds / before if before > 0 else float("inf")
+        if ratio > threshold:
+            suite, size, stage = key
+            regressions.append(
+                {"suite": suite, "size": size, "stage": stage,
+                 "baseline_seconds": before, "current_seconds": seconds, "ratio": ratio}
+            )
+    return regressions
+
+
+def parse_size(size: str) -> int:
+    """Row count of a size preset or a plain number."""
+    if size.lower() in SIZE_PRESETS:
+        return SIZE_PRESETS[size.lower()]
+    return int(size)
+
+
+def environment() -> Dict[str, Any]:
+    """Commit and library versions the numbers were measured with."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def _stage_times(report: Dict[str, Any]) -> Dict[tuple, float]:
+    return {
+        (entry["suite"], entry["size"], stage["stage"]): stage["wall_seconds"]
+        for entry in report.get("results", [])
+        for stage in entry.get("stages", [])
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=list(SIZE_PRESETS),
+                        help=f"Bulk sizes: {', '.join(SIZE_PRESETS)} or row counts")
+    parser.add_argument("--suites", nargs="+", choices=list(SUITES), help="Suites to run (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-output", action="store_true", help="Skip the Excel writer stages")
+    parser.add_argument("--output", help="Write the report JSON here")
+    parser.add_argument("--compare", help="Baseline report JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio reported as a regression (default 1.25)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logging.getLogger("optimization").setLevel(logging.WARNING)
+
+    report = run_suites(args.sizes, args.suites, seed=args.seed, write_output=not args.no_output)
+
+    for entry in report["results"]:
+        status = f"{entry['total_wall_seconds']:.2f}s" if entry["success"] else f"FAILED: {entry['error']}"
+        print(f"{entry['suite']:<30} {entry['size']:>6}  {status}")
+        for stage in entry["stages"]:
+            print(f"    {stage['stage']:<28} {stage['wall_seconds']:8.3f}s  "
+                  f"rows {stage['rows_in']} -> {stage['rows_out']}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare_reports(baseline, report, args.threshold)
+        for item in regressions:
+            print(f"REGRESSION {item['suite']} ({item['size']}) {item['stage']}: "
+                  f"{item['baseline_seconds']:.3f}s -> {item['current_seconds']:.3f}s "
+                  f"(x{item['ratio']:.2f})")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare} (threshold x{args.threshold})")
+
+    return 0 if all(entry["success"] for entry in report["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
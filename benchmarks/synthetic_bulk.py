@@ -0,0 +1,295 @@
+"""Synthetic Amazon bulk files for benchmarking."""
+
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from config.constants import BULK_SHEET_NAME
+from business.common.excluded_portfolios import EXCLUDED_PORTFOLIOS
+
+
+# The 48 columns of the Sponsored Products Campaigns sheet, in file order
+BULK_COLUMNS = [
+    "Product", "Entity", "Operation", "Campaign ID", "Ad Group ID", "Portfolio ID",
+    "Ad ID", "Keyword ID", "Product Targeting ID", "Campaign Name", "Ad Group Name",
+    "Campaign Name (Informational only)", "Ad Group Name (Informational only)",
+    "Portfolio Name (Informational only)", "Start Date", "End Date", "Targeting Type",
+    "State", "Campaign State (Informational only)", "Ad Group State (Informational only)",
+    "Daily Budget", "SKU", "ASIN", "Eligibility Status (Informational only)",
+    "Reason for Ineligibility (Informational only)", "Ad Group Default Bid",
+    "Ad Group Default Bid (Informational only)", "Bid", "Keyword Text",
+    "Native Language Keyword", "Native Language Locale", "Match Type", "Bidding Strategy",
+    "Placement", "Percentage", "Product Targeting Expression",
+    "Resolved Product Targeting Expression (Informational only)", "Impressions", "Clicks",
+    "Click-through Rate", "Spend", "Sales", "Orders", "Units", "Conversion Rate", "ACOS",
+    "CPC", "ROAS",
+]
+
+PORTFOLIOS_COLUMNS = [
+    "Product", "Entity", "Operation", "Portfolio ID", "Portfolio Name", "Budget Amount",
+    "Budget Currency Code", "Budget Policy", "Budget Start Date", "Budget End Date",
+    "State (Informational only)", "In Budget (Informational only)",
+]
+
+# Share of rows per Entity (Campaign rows open one campaign each)
+DEFAULT_ENTITY_MIX = {
+    "Campaign": 0.04,
+    "Ad Group": 0.06,
+    "Product Ad": 0.20,
+    "Keyword": 0.42,
+    "Product Targeting": 0.16,
+    "Bidding Adjustment": 0.12,
+}
+
+PLACEMENTS = ["Placement Top", "Placement Product Page", "Placement Rest Of Search"]
+
+# Named sizes of the benchmark suite
+SIZE_PRESETS = {"10k": 10_000, "100k": 100_000, "500k": 500_000, "2m": 2_000_000}
+
+
+@dataclass
+class BulkSpec:
+    """
+    Shape of a synthetic bulk.
+
+    Rows are grouped by campaign as in a downloaded bulk: the Campaign row
+    first, then its Ad Groups, Product Ads, Keywords, Product Targets and
+    Bidding Adjustments.
+    """
+
+    n_rows: int = 10_000
+    entity_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_ENTITY_MIX))
+    n_portfolios: int = 60
+    empty_portfolio_share: float = 0.1  # Portfolios without campaigns
+    no_portfolio_share: float = 0.05  # Campaigns without a portfolio
+    excluded_portfolio_share: float = 0.05  # Campaigns in 'Flat' portfolios
+    up_and_share: float = 0.2  # Campaign names containing "up and"
+    paused_share: float = 0.08
+    zero_units_share: float = 0.45
+    n_asins: int = 500
+    seed: int = 0
+
+
+def generate_bulk(spec: Optional[BulkSpec] = None) -> pd.DataFrame:
+    """
+    Generate a Sponsored Products Campaigns sheet as read from Excel.
+
+    Dtypes follow pd.read_excel on a downloaded bulk: Campaign ID and the
+    count metrics are int64, other IDs and numbers float64 with NaN for
+    blank cells, text columns object with NaN for blank cells.
+
+    Args:
+        spec: Bulk shape (defaults to BulkSpec())
+
+    Returns:
+        DataFrame with the 48 bulk columns
+    """
+    spec = spec or BulkSpec()
+    rng = np.random.default_rng(spec.seed)
+    n = spec.n_rows
+
+    entities = np.array(list(spec.entity_mix))
+    shares = np.array(list(spec.entity_mix.values()), dtype=float)
+    entity = rng.choice(entities, n, p=shares / shares.sum())
+
+    # One campaign per Campaign row; other rows join a random campaign
+    is_campaign = entity == "Campaign"
+    if not is_campaign.any():
+        entity[0], is_campaign[0] = "Campaign", True
+    n_campaigns = int(is_campaign.sum())
+    campaign = np.empty(n, dtype=np.int64)
+    campaign[is_campaign] = np.arange(n_campaigns)
+    campaign[~is_campaign] = rng.integers(0, n_campaigns, n - n_campaigns)
+
+    # Campaign row first, then entities in bulk order
+    order = np.lexsort((_entity_rank(entity), campaign))
+    entity, campaign = entity[order], campaign[order]
+
+    is_campaign = entity == "Campaign"
+    is_ad_group_level = ~is_campaign & (entity != "Bidding Adjustment")
+    is_product_ad = entity == "Product Ad"
+    is_keyword = entity == "Keyword"
+    is_target = entity == "Product Targeting"
+    is_adjustment = entity == "Bidding Adjustment"
+    is_bid_row = is_keyword | is_target
+
+    # Campaign level attributes
+    portfolio_names = _portfolio_names(spec)
+    n_used = max(int(round(spec.n_portfolios * (1 - spec.empty_portfolio_share))), 1)
+    campaign_portfolio = rng.integers(0, n_used, n_campaigns)
+    flat = rng.random(n_campaigns) < spec.excluded_portfolio_share
+    campaign_portfolio[flat] = spec.n_portfolios + rng.integers(0, len(EXCLUDED_PORTFOLIOS), flat.sum())
+    no_portfolio = rng.random(n_campaigns) < spec.no_portfolio_share
+    campaign_portfolio[no_portfolio] = -1
+
+    portfolio_ids = 200_000_000_000_000 + np.arange(len(portfolio_names), dtype=np.int64) * 7919
+    campaign_ids = 300_000_000_000_000 + np.arange(n_campaigns, dtype=np.int64) * 104_729
+    up_and = rng.random(n_campaigns) < spec.up_and_share
+    campaign_names = np.where(
+        up_and,
+        np.char.add("Campaign up and ", np.arange(n_campaigns).astype(str)),
+        np.char.add("Campaign ", np.arange(n_campaigns).astype(str)),
+    ).astype(object)
+
+    # Ad groups: a few per campaign
+    ad_group = campaign * 4 + rng.integers(0, 4, n)
+    asins = np.char.add("B0", rng.integers(10_000_000, 99_999_999, spec.n_asins).astype(str))
+
+    df = pd.DataFrame(index=pd.RangeIndex(n))
+    df["Product"] = "Sponsored Products"
+    df["Entity"] = entity.astype(object)
+    df["Operation"] = np.nan
+    df["Campaign ID"] = campaign_ids[campaign]
+    df["Ad Group ID"] = _where(is_ad_group_level, 400_000_000_000_000 + ad_group * 13)
+    row_portfolio = campaign_portfolio[campaign]
+    df["Portfolio ID"] = _where(
+        is_campaign & (row_portfolio >= 0), portfolio_ids[np.maximum(row_portfolio, 0)]
+    )
+    df["Ad ID"] = _where(is_product_ad, 500_000_000_000_000 + np.arange(n))
+    df["Keyword ID"] = _where(is_keyword, 600_000_000_000_000 + np.arange(n))
+    df["Product Targeting ID"] = _where(is_target, 700_000_000_000_000 + np.arange(n))
+
+    df["Campaign Name"] = _text(is_campaign, campaign_names[campaign])
+    ad_group_names = np.char.add("Ad Group ", ad_group.astype(str)).astype(object)
+    df["Ad Group Name"] = _text(entity == "Ad Group", ad_group_names)
+    df["Campaign Name (Informational only)"] = campaign_names[campaign]
+    df["Ad Group Name (Informational only)"] = _text(is_ad_group_level, ad_group_names)
+    df["Portfolio Name (Informational only)"] = _text(
+        row_portfolio >= 0,
+        np.array(portfolio_names, dtype=object)[np.maximum(row_portfolio, 0)],
+    )
+    df["Start Date"] = _where(is_campaign, 20240101)
+    df["End Date"] = np.nan
+    df["Targeting Type"] = _text(is_campaign, rng.choice(["Manual", "Auto"], n).astype(object))
+
+    for col in ["State", "Campaign State (Informational only)", "Ad Group State (Informational only)"]:
+        df[col] = np.where(rng.random(n) < spec.paused_share, "paused", "enabled").astype(object)
+    df["Ad Group State (Informational only)"] = _text(
+        is_ad_group_level, df["Ad Group State (Informational only)"].to_numpy()
+    )
+
+    df["Daily Budget"] = _where(is_campaign, rng.uniform(1, 50, n).round(2))
+    df["SKU"] = np.nan
+    df["ASIN"] = _text(is_product_ad, rng.choice(asins, n).astype(object))
+    df["Eligibility Status (Informational only)"] = _text(is_product_ad, np.full(n, "Eligible", dtype=object))
+    df["Reason for Ineligibility (Informational only)"] = np.nan
+    default_bid = rng.uniform(0.2, 2, n).round(2)
+    df["Ad Group Default Bid"] = _where(entity == "Ad Group", default_bid)
+    df["Ad Group Default Bid (Informational only)"] = _where(is_bid_row, default_bid)
+    df["Bid"] = _where(is_bid_row, rng.uniform(0.05, 3, n).round(2))
+    df["Keyword Text"] = _text(is_keyword, np.char.add("keyword ", rng.integers(0, 10**5, n).astype(str)).astype(object))
+    df["Native Language Keyword"] = np.nan
+    df["Native Language Locale"] = np.nan
+    df["Match Type"] = _text(is_keyword, rng.choice(["Exact", "Phrase", "Broad"], n).astype(object))
+    df["Bidding Strategy"] = _text(is_campaign, np.full(n, "Dynamic bids - down only", dtype=object))
+    df["Placement"] = _text(is_adjustment, rng.choice(PLACEMENTS, n).astype(object))
+    df["Percentage"] = _where(is_adjustment, rng.integers(0, 900, n))
+    expressions = np.where(
+        rng.random(n) < 0.7,
+        np.char.add(np.char.add('asin="', rng.choice(asins, n)), '"'),
+        np.char.add(np.char.add('category="', rng.integers(1, 10**6, n).astype(str)), '"'),
+    ).astype(object)
+    df["Product Targeting Expression"] = _text(is_target, expressions)
+    df["Resolved Product Targeting Expression (Informational only)"] = _text(is_target, expressions)
+
+    # Performance metrics (all rows)
+    impressions = rng.poisson(800, n)
+    clicks = rng.binomial(impressions, 0.01)
+    cpc = rng.uniform(0.2, 2.5, n).round(2)
+    spend = (clicks * cpc).round(2)
+    units = np.where(rng.random(n) < spec.zero_units_share, 0, rng.poisson(3, n) + 1)
+    orders = np.minimum(units, rng.poisson(2, n) + (units > 0))
+    sales = (units * rng.uniform(10, 60, n)).round(2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["Impressions"] = impressions
+        df["Clicks"] = clicks
+        df["Click-through Rate"] = np.where(impressions > 0, clicks / impressions, 0.0)
+        df["Spend"] = spend
+        df["Sales"] = sales
+        df["Orders"] = orders
+        df["Units"] = units
+        df["Conversion Rate"] = np.where(clicks > 0, orders / clicks, 0.0)
+        df["ACOS"] = np.where(sales > 0, spend / sales, 0.0)
+        df["CPC"] = np.where(clicks > 0, cpc, 0.0)
+        df["ROAS"] = np.where(spend > 0, sales / spend, 0.0)
+
+    return df[BULK_COLUMNS]
+
+
+def generate_template(bulk: pd.DataFrame, seed: int = 0, top_asins: int = 50) -> Dict[str, pd.DataFrame]:
+    """
+    Generate a filled template (Port Values, Top ASINs, Delete for 60) for a bulk.
+
+    About one portfolio in ten gets no Target CPA and one in twenty is set
+    to Ignore.
+    """
+    rng = np.random.default_rng(seed)
+    names = pd.Series(bulk["Portfolio Name (Informational only)"].dropna().unique())
+    names = names[~names.isin(EXCLUDED_PORTFOLIOS)].reset_index(drop=True)
+
+    base_bid = pd.Series(rng.uniform(0.2, 1.5, len(names)).round(2), dtype=object)
+    base_bid[rng.random(len(names)) < 0.05] = "Ignore"
+    target_cpa = pd.Series(rng.uniform(3, 20, len(names)).round(2))
+    target_cpa[rng.random(len(names)) < 0.1] = np.nan
+
+    asins = bulk["ASIN"].dropna().unique()
+    return {
+        "Port Values": pd.DataFrame(
+            {"Portfolio Name": names, "Base Bid": base_bid, "Target CPA": target_cpa}
+        ),
+        "Top ASINs": pd.DataFrame({"ASIN": asins[:top_asins]}),
+        "Delete for 60": pd.DataFrame({"Keyword ID": [], "Product Targeting ID": []}),
+    }
+
+
+def generate_portfolios(bulk: pd.DataFrame, spec: Optional[BulkSpec] = None) -> pd.DataFrame:
+    """Generate the Portfolios sheet of a bulk (including the empty portfolios)."""
+    spec = spec or BulkSpec()
+    names = _portfolio_names(spec)
+    ids = 200_000_000_000_000 + np.arange(len(names), dtype=np.int64) * 7919
+
+    df = pd.DataFrame(index=pd.RangeIndex(len(names)))
+    df["Product"] = "Sponsored Products"
+    df["Entity"] = "Portfolio"
+    df["Operation"] = np.nan
+    df["Portfolio ID"] = ids
+    df["Portfolio Name"] = names
+    df["Budget Amount"] = np.nan
+    df["Budget Currency Code"] = "USD"
+    df["Budget Policy"] = "No Cap"
+    df["Budget Start Date"] = np.nan
+    df["Budget End Date"] = np.nan
+    df["State (Informational only)"] = "enabled"
+    df["In Budget (Informational only)"] = "TRUE"
+    return df[PORTFOLIOS_COLUMNS]
+
+
+def generate_bulk_sheets(spec: Optional[BulkSpec] = None) -> Dict[str, pd.DataFrame]:
+    """Bulk as a workbook: Sponsored Products Campaigns and Portfolios sheets."""
+    spec = spec or BulkSpec()
+    bulk = generate_bulk(spec)
+    return {BULK_SHEET_NAME: bulk, "Portfolios": generate_portfolios(bulk, spec)}
+
+
+def _portfolio_names(spec: BulkSpec) -> list:
+    """Regular portfolios first (the last ones stay empty), then the excluded names."""
+    return [f"Portfolio {i}" for i in range(spec.n_portfolios)] + list(EXCLUDED_PORTFOLIOS)
+
+
+def _entity_rank(entity: np.ndarray) -> np.ndarray:
+    """Position of each row's Entity in DEFAULT_ENTITY_MIX (unknown entities last)."""
+    order = list(DEFAULT_ENTITY_MIX)
+    codes, uniques = pd.factorize(entity)
+    ranks = np.array([order.index(name) if name in order else len(order) for name in uniques])
+    return ranks[codes]
+
+
+def _where(mask: np.ndarray, values) -> np.ndarray:
+    """Numeric cells present on masked rows, NaN elsewhere."""
+    return np.where(mask, values, np.nan).astype(float)
+
+
+def _text(mask: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Text cells present on masked rows, NaN elsewhere."""
+    return np.where(mask, values, np.nan).astype(object)
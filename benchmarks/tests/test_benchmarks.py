@@ -0,0 +1,56 @@
+"""Tests for the synthetic bulk generator and the benchmark runner."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from benchmarks.synthetic_bulk import BULK_COLUMNS, BulkSpec, generate_bulk, generate_template
+from benchmarks.run_benchmarks import compare_reports, run_suites
+
+
+def test_bulk_follows_spec():
+    spec = BulkSpec(n_rows=5000, entity_mix={"Campaign": 0.1, "Keyword": 0.6, "Product Ad": 0.3}, seed=1)
+    bulk = generate_bulk(spec)
+
+    assert list(bulk.columns) == BULK_COLUMNS and len(BULK_COLUMNS) == 48
+    assert len(bulk) == 5000
+    assert set(bulk["Entity"]) == {"Campaign", "Keyword", "Product Ad"}
+    assert abs((bulk["Entity"] == "Keyword").mean() - 0.6) < 0.03
+    assert bulk["Campaign ID"].dtype == np.int64
+
+    # Each campaign starts with its Campaign row
+    first_rows = bulk.drop_duplicates("Campaign ID")
+    assert (first_rows["Entity"] == "Campaign").all()
+    assert bulk["Bid"].notna().eq(bulk["Entity"] == "Keyword").all()
+
+    template = generate_template(bulk, seed=1)
+    assert set(template["Port Values"]["Portfolio Name"]) <= set(
+        bulk["Portfolio Name (Informational only)"].dropna()
+    )
+    pd.testing.assert_frame_equal(generate_bulk(spec), bulk)
+
+
+def test_run_and_compare():
+    report = run_suites(["2000"], ["zero_sales", "campaign_optimizer_1"], write_output=False)
+
+    entries = {entry["suite"]: entry for entry in report["results"]}
+    assert all(entry["success"] for entry in entries.values()), entries
+    assert [stage["stage"] for stage in entries["zero_sales"]["stages"]] == [
+        "pre_validation_filter", "validate", "clean", "process"
+    ]
+
+    slower = {
+        "results": [
+            dict(entry, stages=[dict(stage, wall_seconds=stage["wall_seconds"] * 3 + 1) for stage in entry["stages"]])
+            for entry in report["results"]
+        ]
+    }
+    assert compare_reports(report, report) == []
+    regressions = compare_reports(report, slower)
+    assert {item["stage"] for item in regressions} >= {"clean", "process", "optimize"}
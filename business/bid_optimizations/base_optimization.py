@@ -5,6 +5,9 @@ import pandas as pd
 from typing import Dict, Any, Tuple, Optional, List
 import logging
 
+from config.settings import settings
+from utils.stage_profiler import StageProfiler
+
 
 class BaseOptimization(ABC):
     """
@@ -26,6 +29,11 @@ class BaseOptimization(ABC):
             'errors': 0,
             'warnings': 0
         }
+        
+        # Per-stage timing and memory of the last run
+        self.profiler = StageProfiler(
+            name, trace_memory=settings.get_processing_config()["trace_stage_memory"]
+        )
     
     @abstractmethod
     def validate(self, template_data: Dict[str, pd.DataFrame], bulk_data: pd.DataFrame) -> Tuple[bool, str, Dict[str, Any]]:
@@ -84,25 +92,33 @@ class BaseOptimization(ABC):
         try:
             # Reset statistics
             self._reset_stats()
+            self.profiler.reset()
             
             self.logger.info(f"Starting {self.name} optimization")
             
             # Step 1: Validate
-            valid, msg, validation_details = self.validate(template_data, bulk_data)
+            with self.profiler.stage("validate", bulk_data) as stage:
+                valid, msg, validation_details = self.validate(template_data, bulk_data)
+                stage.set_output(bulk_data)
             if not valid:
                 return False, f"Validation failed: {msg}", None
             
             self.logger.info(f"Validation passed: {msg}")
             
             # Step 2: Clean
-            cleaned_data, cleaning_details = self.clean(template_data, bulk_data)
-            if cleaned_data is None or cleaned_data.empty:
+            # (a DataFrame, or a dict of sheet name -> DataFrame)
+            with self.profiler.stage("clean", bulk_data) as stage:
+                cleaned_data, cleaning_details = self.clean(template_data, bulk_data)
+                stage.set_output(cleaned_data)
+            if cleaned_data is None or not stage.rows_out:
                 return False, "No data available after cleaning", None
             
-            self.logger.info(f"Data cleaned: {len(cleaned_data)} rows remaining")
+            self.logger.info(f"Data cleaned: {stage.rows_out} rows remaining")
             
             # Step 3: Process
-            results = self.process(template_data, cleaned_data)
+            with self.profiler.stage("process", cleaned_data) as stage:
+                results = self.process(template_data, cleaned_data)
+                stage.set_output(results)
             if not results:
                 return False, "Processing returned no results", None
             
@@ -120,6 +136,26 @@ class BaseOptimization(ABC):
         """Get processing statistics."""
         return self.stats.copy()
     
+    def get_performance_report(self) -> Dict[str, Any]:
+        """Get the per-stage timing and memory report of the last run."""
+        return self.profiler.report()
+    
+    def export_performance_report(self, path: Optional[str] = None) -> str:
+        """
+        Export the performance report as JSON.
+        
+        Args:
+            path: File to write the JSON to (optional)
+            
+        Returns:
+            The JSON text
+        """
+        report_json = self.profiler.to_json()
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(report_json)
+        return report_json
+    
     def _reset_stats(self):
         """Reset processing statistics."""
         for key in self.stats:
@@ -1,10 +1,12 @@
 """Bids 30 Days optimization data cleaning."""
 
 import pandas as pd
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 import logging
 import numpy as np
 
+from data.readers.bulk_frame import numeric_values
+from business.bid_optimizations.filter_plan import FilterPlan
 from business.bid_optimizations.zero_sales.cleaner import ZeroSalesCleaner
 from .constants import (
     EXCLUDED_PORTFOLIOS,
@@ -80,26 +82,32 @@ class Bids30DaysCleaner(ZeroSalesCleaner):
         
         # STEP 2: Apply filters ONLY to Targeting sheet
         if "Targeting" in split_data and not split_data["Targeting"].empty:
-            targeting_df = split_data["Targeting"].copy()
+            targeting_df = split_data["Targeting"]
             
             # Ensure all original columns are preserved
             for col in original_columns:
                 if col not in targeting_df.columns:
                     targeting_df[col] = ""
             
-            # Filter units > 0 AND (units > 2 OR clicks > 30) - DIFFERENT FROM ZERO SALES
-            targeting_df = self._filter_bids_30_criteria(targeting_df, column_mapping)
-            cleaning_details["filtering"]["after_criteria_filter"] = len(targeting_df)
-            
-            # Remove excluded portfolios (same as Zero Sales)
-            targeting_df = self._remove_excluded_portfolios(targeting_df, column_mapping)
-            cleaning_details["filtering"]["after_excluded_filter"] = len(targeting_df)
-            
-            # Remove ignored portfolios (same as Zero Sales)
-            targeting_df = self._remove_ignored_portfolios(
-                targeting_df, template_data, column_mapping
+            # Filter units > 0 AND (units > 2 OR clicks > 30) - DIFFERENT FROM ZERO SALES,
+            # then remove excluded and ignored portfolios (same as Zero Sales).
+            # One combined mask, rows copied once.
+            plan = FilterPlan(targeting_df, self.logger)
+            plan.add("Bids 30 criteria", self._bids_30_criteria_mask(targeting_df, column_mapping))
+            plan.add(
+                "excluded portfolios",
+                self._excluded_portfolios_mask(targeting_df, column_mapping)
+            )
+            plan.add(
+                "ignored portfolios",
+                self._ignored_portfolios_mask(targeting_df, template_data, column_mapping)
             )
-            cleaning_details["filtering"]["after_ignored_filter"] = len(targeting_df)
+            targeting_df = plan.apply()
+            
+            cleaning_details["filtering"]["after_criteria_filter"] = plan.remaining["Bids 30 criteria"]
+            cleaning_details["filtering"]["after_excluded_filter"] = plan.remaining["excluded portfolios"]
+            cleaning_details["filtering"]["after_ignored_filter"] = plan.remaining["ignored portfolios"]
+            cleaning_details["filtering"]["rows_removed"] = plan.dropped.copy()
             
             # State filtering is now done in pre_validation_filter() - no duplicate filtering needed
             
@@ -136,24 +144,24 @@ class Bids30DaysCleaner(ZeroSalesCleaner):
         
         return split_data, cleaning_details
     
-    def _filter_bids_30_criteria(
+    def _bids_30_criteria_mask(
         self, 
         df: pd.DataFrame, 
         column_mapping: Dict[str, str]
-    ) -> pd.DataFrame:
+    ) -> Optional[pd.Series]:
         """
-        Filter by Bids 30 Days specific criteria.
+        Rows meeting the Bids 30 Days specific criteria.
         
         Criteria:
         - units > 0
         - units > 2 OR clicks > 30
         
         Args:
-            df: DataFrame to filter
+            df: DataFrame to filter (Units and Clicks are converted to numeric in place)
             column_mapping: Column name mapping
             
         Returns:
-            Filtered DataFrame
+            Mask of rows to keep, None if Units or Clicks is missing
         """
         
         units_col = column_mapping.get("units", "Units")
@@ -161,31 +169,17 @@ class Bids30DaysCleaner(ZeroSalesCleaner):
         
         if units_col not in df.columns or clicks_col not in df.columns:
             self.logger.error(f"Units or Clicks column not found")
-            return df
+            return None
         
         # Convert to numeric
-        df[units_col] = pd.to_numeric(df[units_col], errors='coerce')
-        df[clicks_col] = pd.to_numeric(df[clicks_col], errors='coerce')
-        
-        # Filter: units > 0
-        filtered_df = df[df[units_col] > 0].copy()
+        df[units_col] = numeric_values(df, units_col)
+        df[clicks_col] = numeric_values(df, clicks_col)
         
-        initial_count = len(filtered_df)
-        
-        # Additional filter: units > 2 OR clicks > 30
-        filtered_df = filtered_df[
-            (filtered_df[units_col] > UNITS_THRESHOLD) | 
-            (filtered_df[clicks_col] > CLICKS_THRESHOLD)
-        ]
-        
-        filtered_count = initial_count - len(filtered_df)
-        
-        self.logger.info(
-            f"Filtered {filtered_count} rows not meeting Bids 30 criteria "
-            f"(units > {UNITS_THRESHOLD} OR clicks > {CLICKS_THRESHOLD})"
+        # units > 0 AND (units > 2 OR clicks > 30)
+        return (df[units_col] > 0) & (
+            (df[units_col] > UNITS_THRESHOLD) | 
+            (df[clicks_col] > CLICKS_THRESHOLD)
         )
-        
-        return filtered_df
     
     def get_cleaning_summary(self, cleaning_details: Dict[str, Any]) -> str:
         """Generate a human-readable cleaning summary."""
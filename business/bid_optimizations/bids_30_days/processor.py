@@ -5,6 +5,8 @@ import numpy as np
 from typing import Dict, Any, Tuple, List, Optional
 import logging
 
+from business.bid_optimizations.portfolio_parameters import PortfolioParameters
+from business.bid_optimizations.string_predicates import column_predicate
 from .constants import (
     MIN_BID,
     MAX_BID,
@@ -15,7 +17,6 @@ from .constants import (
     MAX_BID_HIGH_UNITS,
     UP_AND_MULTIPLIER,
     OLD_BID_MULTIPLIER,
-    MATCH_TYPE_EXACT,
     ERROR_CALCULATION,
     ERROR_NULL,
     ERROR_MISSING_VALUE,
@@ -49,6 +50,7 @@ class Bids30DaysProcessor:
         port_values_df: pd.DataFrame,
         bidding_adjustment_df: pd.DataFrame,
         column_mapping: Dict[str, str],
+        parameters: Optional[PortfolioParameters] = None,
     ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]:
         """
         Process Bids 30 Days bid calculations using 8 defined steps.
@@ -58,6 +60,8 @@ class Bids30DaysProcessor:
             port_values_df: Port Values from template
             bidding_adjustment_df: Bidding Adjustment data for Max BA calculation
             column_mapping: Column name mapping
+            parameters: Compiled Port Values/Max BA lookups (built from the
+                        two frames above if not given)
 
         Returns:
             Tuple of (sheets_dict, processing_details)
@@ -83,7 +87,7 @@ class Bids30DaysProcessor:
 
         # STEP 1: Fill base columns
         processed_df = self._fill_base_columns(
-            processed_df, port_values_df, bidding_adjustment_df, column_mapping
+            processed_df, port_values_df, bidding_adjustment_df, column_mapping, parameters
         )
 
         # STEP 2: Separate NULL Target CPA to For Harvesting
@@ -101,8 +105,13 @@ class Bids30DaysProcessor:
         # Continue processing rows with Target CPA
         processed_df = targeting_with_cpa
 
+        # STEPS 3-8 run as one staged, column-wise pipeline. Rows that fail
+        # in step 3 are carried as a mask and marked in step 7.
+
         # STEP 3: Calculate calc1 and calc2
-        processed_df = self._calculate_calc_values(processed_df, column_mapping)
+        processed_df, error_mask = self._calculate_calc_values(
+            processed_df, column_mapping
+        )
 
         # STEP 4: Determine Temp Bid
         processed_df = self._determine_temp_bid(processed_df, column_mapping)
@@ -114,7 +123,9 @@ class Bids30DaysProcessor:
         processed_df = self._calculate_calc3(processed_df)
 
         # STEP 7: Calculate final Bid
-        processed_df = self._calculate_final_bid(processed_df, column_mapping)
+        processed_df = self._calculate_final_bid(
+            processed_df, column_mapping, error_mask
+        )
 
         # STEP 8: Mark rows for pink highlighting
         processed_df = self._mark_rows_for_coloring(processed_df, column_mapping)
@@ -161,6 +172,7 @@ class Bids30DaysProcessor:
         port_values_df: pd.DataFrame,
         ba_df: pd.DataFrame,
         column_mapping: Dict[str, str],
+        parameters: Optional[PortfolioParameters] = None,
     ) -> pd.DataFrame:
         """
         Step 1: Fill base columns.
@@ -183,91 +195,36 @@ class Bids30DaysProcessor:
         df["Target CPA"] = np.nan
         df["Base Bid"] = 0.5  # Default base bid
 
-        # Merge with template data if available
+        if parameters is None:
+            parameters = PortfolioParameters(port_values_df, ba_df, column_mapping)
+
+        # VLOOKUP from template data if available
         portfolio_col = column_mapping.get(
             "portfolio", "Portfolio Name (Informational only)"
         )
-        if (
-            portfolio_col in df.columns
-            and not port_values_df.empty
-            and "Portfolio Name" in port_values_df.columns
-        ):
-            # Prepare template data
-            template_cols_to_use = []
-            if "Portfolio Name" in port_values_df.columns:
-                template_cols_to_use.append("Portfolio Name")
-            if "Base Bid" in port_values_df.columns:
-                template_cols_to_use.append("Base Bid")
-            if "Target CPA" in port_values_df.columns:
-                template_cols_to_use.append("Target CPA")
-
-            if template_cols_to_use:
-                template_subset = port_values_df[template_cols_to_use].copy()
-
-                # Convert Base Bid and Target CPA to numeric if they exist
-                if "Base Bid" in template_subset.columns:
-                    template_subset["Base Bid_temp"] = pd.to_numeric(
-                        template_subset["Base Bid"], errors="coerce"
-                    )
-                if "Target CPA" in template_subset.columns:
-                    template_subset["Target CPA_temp"] = pd.to_numeric(
-                        template_subset["Target CPA"], errors="coerce"
-                    )
-
-                # Merge
-                df = pd.merge(
-                    df,
-                    template_subset,
-                    left_on=portfolio_col,
-                    right_on="Portfolio Name",
-                    how="left",
-                    suffixes=("", "_template"),
-                )
-
-                # Update Base Bid and Target CPA from merged data
-                if "Base Bid_temp" in df.columns:
-                    df["Base Bid"] = df["Base Bid_temp"].fillna(0.5)
-                    df.drop("Base Bid_temp", axis=1, inplace=True)
-                if "Target CPA_temp" in df.columns:
-                    df["Target CPA"] = df[
-                        "Target CPA_temp"
-                    ]  # Keep NaN values for NULL Target CPA
-                    df.drop("Target CPA_temp", axis=1, inplace=True)
-
-                # Clean up duplicate Portfolio Name column if it exists
-                if "Portfolio Name" in df.columns and portfolio_col != "Portfolio Name":
-                    df.drop("Portfolio Name", axis=1, inplace=True)
-
-        # Initialize Max BA column
-        df["Max BA"] = 0.0
-
-        # Calculate Max BA from Bidding Adjustment data
-        campaign_col = column_mapping.get("campaign_id", "Campaign ID")
-        percentage_col = column_mapping.get("percentage", "Percentage")
-
-        if (
-            not ba_df.empty
-            and campaign_col in ba_df.columns
-            and percentage_col in ba_df.columns
-        ):
-            ba_df[percentage_col] = pd.to_numeric(
-                ba_df[percentage_col], errors="coerce"
-            )
-            max_ba_map = ba_df.groupby(campaign_col)[percentage_col].max().to_dict()
+        if portfolio_col in df.columns and parameters.has_port_values:
+            # Same row order and RangeIndex as a left merge on the portfolio
+            df = df.reset_index(drop=True)
+
+            df["Base Bid"] = parameters.base_bid(df[portfolio_col]).fillna(0.5)
+            # Keep NaN values for NULL Target CPA
+            df["Target CPA"] = parameters.target_cpa(df[portfolio_col])
 
-            if campaign_col in df.columns:
-                df["Max BA"] = df[campaign_col].map(max_ba_map).fillna(0)
+        # Max BA from Bidding Adjustment data, 0 for campaigns without it
+        campaign_col = column_mapping.get("campaign_id", "Campaign ID")
+        if campaign_col in df.columns:
+            df["Max BA"] = parameters.max_ba(df[campaign_col]).fillna(0)
+        else:
+            df["Max BA"] = 0.0
 
         # Initialize Adj. CPA column
         df["Adj. CPA"] = np.nan
 
         # Calculate Adj. CPA only for rows with Target CPA
-        for idx in df.index:
-            target_cpa = df.at[idx, "Target CPA"]
-            max_ba = df.at[idx, "Max BA"]
-
-            if pd.notna(target_cpa) and max_ba >= 0:
-                df.at[idx, "Adj. CPA"] = target_cpa / (1 + max_ba / 100)
+        target_cpa = pd.to_numeric(df["Target CPA"], errors="coerce")
+        max_ba = pd.to_numeric(df["Max BA"], errors="coerce")
+        has_cpa = target_cpa.notna() & (max_ba >= 0)
+        df["Adj. CPA"] = (target_cpa / (1 + max_ba / 100)).where(has_cpa, np.nan)
 
         return df
 
@@ -290,9 +247,13 @@ class Bids30DaysProcessor:
 
     def _calculate_calc_values(
         self, df: pd.DataFrame, column_mapping: Dict[str, str]
-    ) -> pd.DataFrame:
+    ) -> Tuple[pd.DataFrame, pd.Series]:
         """
         Step 3: Calculate calc1 and calc2 based on campaign name.
+
+        Returns the DataFrame and a mask of rows whose Adj. CPA or Old Bid
+        is not numeric. Those rows get calc1 = calc2 = 0 and are marked with
+        ERROR_CALCULATION in step 7.
         """
 
         campaign_name_col = column_mapping.get(
@@ -301,48 +262,44 @@ class Bids30DaysProcessor:
         clicks_col = column_mapping.get("clicks", "Clicks")
         units_col = column_mapping.get("units", "Units")
 
-        for idx in df.index:
-            try:
-                row = df.loc[idx]
-
-                adj_cpa = row.get("Adj. CPA", 0)
-                old_bid = row.get("Old Bid", 0)
-                campaign_name = str(row.get(campaign_name_col, ""))
-                clicks = pd.to_numeric(row.get(clicks_col, 0), errors="coerce")
-                units = pd.to_numeric(row.get(units_col, 1), errors="coerce")
-
-                # Handle division by zero
-                if units == 0 or pd.isna(units):
-                    units = 1
+        adj_cpa, adj_cpa_invalid = self._numeric_column(df, "Adj. CPA", 0)
+        old_bid, old_bid_invalid = self._numeric_column(df, "Old Bid", 0)
+        clicks, _ = self._numeric_column(df, clicks_col, 0)
+        units, _ = self._numeric_column(df, units_col, 1)
 
-                # Check for "up and" in campaign name
-                has_up_and = "up and" in campaign_name.lower()
+        # Handle division by zero
+        units = units.mask((units == 0) | units.isna(), 1)
 
-                if has_up_and:
-                    calc1 = adj_cpa * UP_AND_MULTIPLIER / (clicks / units)
-                else:
-                    calc1 = adj_cpa / (clicks / units)
+        # Check for "up and" in campaign name (once per unique name)
+        has_up_and = column_predicate(df, campaign_name_col, "up_and")
 
-                calc2 = calc1 / old_bid if old_bid != 0 else 0
+        clicks_per_unit = clicks / units
+        calc1 = adj_cpa.where(~has_up_and, adj_cpa * UP_AND_MULTIPLIER) / clicks_per_unit
+        calc2 = (calc1 / old_bid).where(old_bid != 0, 0)
 
-                df.at[idx, "calc1"] = calc1
-                df.at[idx, "calc2"] = calc2
+        error_mask = adj_cpa_invalid | old_bid_invalid
+        df["calc1"] = calc1.where(~error_mask, 0).astype(float)
+        df["calc2"] = calc2.where(~error_mask, 0).astype(float)
 
-            except Exception as e:
-                self.logger.error(
-                    f"Error calculating calc values for row {idx}: {str(e)}"
-                )
-                df.at[idx, "calc1"] = 0
-                df.at[idx, "calc2"] = 0
-                self.stats["calculation_errors"] += 1
+        error_count = int(error_mask.sum())
+        if error_count:
+            self.logger.error(
+                f"Error calculating calc values for {error_count} rows: "
+                f"non-numeric Adj. CPA or Old Bid"
+            )
+            self.stats["calculation_errors"] += error_count
 
-        return df
+        return df, error_mask
 
     def _determine_temp_bid(
         self, df: pd.DataFrame, column_mapping: Dict[str, str]
     ) -> pd.DataFrame:
         """
         Step 4: Determine Temp Bid based on calc2 threshold and conditions.
+
+        - calc2 < 1.1: Bid = calc1 (FINAL)
+        - calc2 >= 1.1 and (Exact match or asin="B0 target): Temp Bid = calc1
+        - otherwise: Bid = Old Bid * 1.1 (FINAL)
         """
 
         bid_col = column_mapping.get("bid", "Bid")
@@ -351,39 +308,23 @@ class Bids30DaysProcessor:
             "product_targeting", "Product Targeting Expression"
         )
 
-        for idx in df.index:
-            try:
-                row = df.loc[idx]
-
-                calc1 = row.get("calc1", 0)
-                calc2 = row.get("calc2", 0)
-                old_bid = row.get("Old Bid", 0)
-                match_type = str(row.get(match_type_col, ""))
-                product_targeting = str(row.get(product_targeting_col, ""))
-
-                # Check calc2 threshold
-                if calc2 < CALC2_THRESHOLD:
-                    # Bid = calc1 (FINAL)
-                    df.at[idx, bid_col] = calc1
-                    df.at[idx, "Temp Bid"] = 0  # Not used
-                else:
-                    # calc2 >= 1.1
-                    is_exact = match_type.lower() == MATCH_TYPE_EXACT.lower()
-                    # FIXED: Use correct ASIN pattern with quote
-                    has_asin = 'asin="B0' in product_targeting
-
-                    if is_exact or has_asin:
-                        # Temp_Bid = calc1 (continue to step 5)
-                        df.at[idx, "Temp Bid"] = calc1
-                    else:
-                        # Bid = Old Bid * 1.1 (FINAL)
-                        df.at[idx, bid_col] = old_bid * OLD_BID_MULTIPLIER
-                        df.at[idx, "Temp Bid"] = 0  # Not used
-
-            except Exception as e:
-                self.logger.error(f"Error determining Temp Bid for row {idx}: {str(e)}")
-                df.at[idx, bid_col] = ERROR_CALCULATION
-                self.stats["calculation_errors"] += 1
+        calc1 = df["calc1"]
+        below_threshold = df["calc2"] < CALC2_THRESHOLD
+
+        is_exact = column_predicate(df, match_type_col, "exact_match")
+        # FIXED: Use correct ASIN pattern with quote
+        has_asin = column_predicate(df, product_targeting_col, "asin_target")
+
+        uses_temp_bid = ~below_threshold & (is_exact | has_asin)
+        uses_old_bid = ~below_threshold & ~(is_exact | has_asin)
+
+        bid = self._numeric_column(df, bid_col, np.nan)[0]
+        bid = bid.mask(below_threshold, calc1)
+        old_bid = self._numeric_column(df, "Old Bid", 0)[0]
+        bid = bid.mask(uses_old_bid, old_bid * OLD_BID_MULTIPLIER)
+        df[bid_col] = bid
+
+        df["Temp Bid"] = calc1.where(uses_temp_bid, 0).astype(float)
 
         return df
 
@@ -396,41 +337,18 @@ class Bids30DaysProcessor:
 
         units_col = column_mapping.get("units", "Units")
 
-        for idx in df.index:
-            try:
-                row = df.loc[idx]
-
-                temp_bid = row.get("Temp Bid", 0)
+        units = self._numeric_column(df, units_col, 0)[0].fillna(0)
+        max_ba = self._numeric_column(df, "Max BA", 0)[0].fillna(0)
 
-                # Only calculate if Temp Bid exists
-                if temp_bid > 0:
-                    units = pd.to_numeric(row.get(units_col, 0), errors="coerce")
-                    max_ba = pd.to_numeric(row.get("Max BA", 0), errors="coerce")
-
-                    # Handle NaN values
-                    if pd.isna(units):
-                        units = 0
-                    if pd.isna(max_ba):
-                        max_ba = 0
-
-                    # Determine Max_Bid based on units
-                    if units < UNITS_THRESHOLD_FOR_MAX_BID:
-                        max_bid_base = MAX_BID_LOW_UNITS
-                    else:
-                        max_bid_base = MAX_BID_HIGH_UNITS
-
-                    # Apply Max BA adjustment
-                    denominator = 1 + max_ba / 100
-                    max_bid = max_bid_base / denominator
-
-                    df.at[idx, "Max_Bid"] = max_bid
-                else:
-                    df.at[idx, "Max_Bid"] = 0
+        # Determine Max_Bid based on units
+        max_bid_base = pd.Series(
+            np.where(units < UNITS_THRESHOLD_FOR_MAX_BID, MAX_BID_LOW_UNITS, MAX_BID_HIGH_UNITS),
+            index=df.index,
+        )
 
-            except Exception as e:
-                self.logger.error(f"Error calculating Max Bid for row {idx}: {str(e)}")
-                df.at[idx, "Max_Bid"] = 0
-                self.stats["calculation_errors"] += 1
+        # Apply Max BA adjustment, only where Temp Bid exists
+        max_bid = max_bid_base / (1 + max_ba / 100)
+        df["Max_Bid"] = max_bid.where(df["Temp Bid"] > 0, 0).astype(float)
 
         return df
 
@@ -439,19 +357,19 @@ class Bids30DaysProcessor:
         Step 6: Calculate calc3 = Temp Bid - Max Bid.
         """
 
-        for idx in df.index:
-            temp_bid = df.at[idx, "Temp Bid"]
-            max_bid = df.at[idx, "Max_Bid"]
+        temp_bid = df["Temp Bid"]
+        max_bid = df["Max_Bid"]
 
-            if temp_bid > 0 and max_bid > 0:
-                df.at[idx, "calc3"] = temp_bid - max_bid
-            else:
-                df.at[idx, "calc3"] = 0
+        has_both = (temp_bid > 0) & (max_bid > 0)
+        df["calc3"] = (temp_bid - max_bid).where(has_both, 0).astype(float)
 
         return df
 
     def _calculate_final_bid(
-        self, df: pd.DataFrame, column_mapping: Dict[str, str]
+        self,
+        df: pd.DataFrame,
+        column_mapping: Dict[str, str],
+        error_mask: Optional[pd.Series] = None,
     ) -> pd.DataFrame:
         """
         Step 7: Calculate final Bid for rows with Max Bid.
@@ -461,41 +379,29 @@ class Bids30DaysProcessor:
             Bid = Temp_Bid
         ELSE (Temp_Bid >= Max_Bid):
             Bid = Max_Bid
+
+        Rows in error_mask are set to ERROR_CALCULATION.
         """
 
         bid_col = column_mapping.get("bid", "Bid")
 
-        for idx in df.index:
-            try:
-                row = df.loc[idx]
-
-                temp_bid = row.get("Temp Bid", 0)
-                max_bid = row.get("Max_Bid", 0)
-                calc3 = row.get("calc3", 0)
-
-                # Only process if we have Temp Bid and Max Bid
-                if temp_bid > 0 and max_bid > 0:
-                    # FIXED LOGIC - REVERSED
-                    if calc3 < 0:
-                        # calc3 < 0 means Temp_Bid < Max_Bid
-                        # Bid = Temp_Bid
-                        df.at[idx, bid_col] = temp_bid
-                    else:
-                        # calc3 >= 0 means Temp_Bid >= Max_Bid
-                        # Bid = Max_Bid
-                        df.at[idx, bid_col] = max_bid
-
-                # Round to 3 decimal places
-                current_bid = df.at[idx, bid_col]
-                if isinstance(current_bid, (int, float)):
-                    df.at[idx, bid_col] = round(current_bid, 3)
-
-            except Exception as e:
-                self.logger.error(
-                    f"Error calculating final Bid for row {idx}: {str(e)}"
-                )
-                df.at[idx, bid_col] = ERROR_CALCULATION
-                self.stats["calculation_errors"] += 1
+        temp_bid = df["Temp Bid"]
+        max_bid = df["Max_Bid"]
+
+        # Only process if we have Temp Bid and Max Bid
+        has_both = (temp_bid > 0) & (max_bid > 0)
+        capped = temp_bid.where(df["calc3"] < 0, max_bid)
+
+        bid = df[bid_col].mask(has_both, capped)
+
+        # Round to 3 decimal places
+        bid = pd.Series(np.round(bid.to_numpy(dtype=float), 3), index=df.index)
+
+        if error_mask is not None and error_mask.any():
+            bid = bid.astype(object)
+            bid[error_mask] = ERROR_CALCULATION
+
+        df[bid_col] = bid
 
         self.stats["rows_processed"] = len(df)
         self.stats["rows_modified"] = len(df[df["Old Bid"] != df[bid_col]])
@@ -518,34 +424,43 @@ class Bids30DaysProcessor:
         bid_col = column_mapping.get("bid", "Bid")
         cvr_col = column_mapping.get("conversion_rate", "Conversion Rate")
 
-        # Initialize marking column
-        df["_needs_highlight"] = False
+        needs_highlight = pd.Series(False, index=df.index)
 
-        for idx in df.index:
-            try:
-                row = df.loc[idx]
-                needs_highlight = False
+        # Check Conversion Rate
+        if cvr_col in df.columns:
+            cvr = pd.to_numeric(df[cvr_col], errors="coerce")
+            cvr_low = cvr.notna() & (cvr < CONVERSION_RATE_THRESHOLD)
+            needs_highlight |= cvr_low
+            self.stats["cvr_below_threshold"] += int(cvr_low.sum())
 
-                # Check Conversion Rate
-                if cvr_col in df.columns:
-                    cvr = pd.to_numeric(row.get(cvr_col, 0), errors="coerce")
-                    if pd.notna(cvr) and cvr < CONVERSION_RATE_THRESHOLD:
-                        needs_highlight = True
-                        self.stats["cvr_below_threshold"] += 1
+        # Check Bid range
+        bid = pd.to_numeric(df[bid_col], errors="coerce")
+        out_of_range = (bid < MIN_BID) | (bid > MAX_BID)
+        needs_highlight |= out_of_range
+        self.stats["bid_out_of_range"] += int(out_of_range.sum())
 
-                # Check Bid range
-                bid = row.get(bid_col)
-                if isinstance(bid, (int, float)):
-                    if bid < MIN_BID or bid > MAX_BID:
-                        needs_highlight = True
-                        self.stats["bid_out_of_range"] += 1
-                elif bid in [ERROR_CALCULATION, ERROR_NULL]:
-                    needs_highlight = True
+        # Check calculation errors
+        needs_highlight |= df[bid_col].isin([ERROR_CALCULATION, ERROR_NULL])
 
-                df.at[idx, "_needs_highlight"] = needs_highlight
-
-            except Exception as e:
-                self.logger.error(f"Error marking row {idx} for coloring: {str(e)}")
-                df.at[idx, "_needs_highlight"] = True
+        df["_needs_highlight"] = needs_highlight
 
         return df
+
+    def _numeric_column(
+        self, df: pd.DataFrame, column: str, default: float
+    ) -> Tuple[pd.Series, pd.Series]:
+        """
+        Get a column as numeric values plus a mask of values that are present
+        but not numeric. A missing column returns the default for every row.
+        """
+
+        if column not in df.columns:
+            return (
+                pd.Series(default, index=df.index, dtype=float),
+                pd.Series(False, index=df.index),
+            )
+
+        values = pd.to_numeric(df[column], errors="coerce")
+        invalid = values.isna() & df[column].notna()
+
+        return values.astype(float), invalid
@@ -4,6 +4,7 @@ import pandas as pd
 from typing import Tuple, Dict, Any
 import logging
 
+from data.readers.bulk_frame import numeric_values
 from business.bid_optimizations.zero_sales.validator import ZeroSalesValidator
 from .constants import (
     EXCLUDED_PORTFOLIOS,
@@ -198,8 +199,8 @@ class Bids30DaysValidator(ZeroSalesValidator):
             return False
         
         # Convert to numeric
-        bulk_data[units_col] = pd.to_numeric(bulk_data[units_col], errors='coerce')
-        bulk_data[clicks_col] = pd.to_numeric(bulk_data[clicks_col], errors='coerce')
+        bulk_data[units_col] = numeric_values(bulk_data, units_col)
+        bulk_data[clicks_col] = numeric_values(bulk_data, clicks_col)
         
         # Check main condition: units > 0
         units_positive = bulk_data[bulk_data[units_col] > 0]
@@ -279,8 +280,8 @@ class Bids30DaysValidator(ZeroSalesValidator):
             return 0
         
         # Convert to numeric
-        bulk_data[units_col] = pd.to_numeric(bulk_data[units_col], errors='coerce')
-        bulk_data[clicks_col] = pd.to_numeric(bulk_data[clicks_col], errors='coerce')
+        bulk_data[units_col] = numeric_values(bulk_data, units_col)
+        bulk_data[clicks_col] = numeric_values(bulk_data, clicks_col)
         
         # Filter: units > 0
         candidates = bulk_data[bulk_data[units_col] > 0].copy()
@@ -9,6 +9,8 @@ from .constants import (
     SEPARATE_ENTITIES,
     UNITS_THRESHOLD
 )
+from business.bid_optimizations.portfolio_parameters import PortfolioParameters
+from data.readers.bulk_frame import type_bulk_frame, numeric_values
 
 
 class Bids60DaysCleaner:
@@ -92,7 +94,7 @@ class Bids60DaysCleaner:
         initial_count = len(df)
         
         # Convert Units to numeric, handling any non-numeric values
-        df['Units'] = pd.to_numeric(df['Units'], errors='coerce').fillna(0)
+        df['Units'] = numeric_values(df, 'Units').fillna(0)
         
         # Filter units > 0
         filtered_df = df[df['Units'] > UNITS_THRESHOLD].copy()
@@ -159,9 +161,7 @@ class Bids60DaysCleaner:
         initial_count = len(df)
         
         # Get portfolios with Base Bid = 'Ignore'
-        ignored_portfolios = port_values[
-            port_values['Base Bid'].astype(str).str.lower() == 'ignore'
-        ]['Portfolio Name'].tolist()
+        ignored_portfolios = PortfolioParameters(port_values).ignored_portfolios
         
         if ignored_portfolios:
             # Get portfolio column name
@@ -317,7 +317,8 @@ class Bids60DaysCleaner:
             logger = logging.getLogger("optimization.bids_60_days.cleaner")
             logger.info(f"Pre-validation filter: removed {filtered_count} non-enabled rows")
             
-        return df
+        # Type numeric and ID columns once for validation, cleaning and processing
+        return type_bulk_frame(df)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cleaning statistics."""
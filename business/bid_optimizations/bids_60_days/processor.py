@@ -19,12 +19,18 @@ from .constants import (
     TARGET_ENTITIES,
     SEPARATE_ENTITIES
 )
+from business.bid_optimizations.portfolio_parameters import PortfolioParameters
+from business.bid_optimizations.string_predicates import column_predicate
 
 
 class Bids60DaysProcessor:
     """Handles bid calculation for Bids 60 Days optimization."""
     
-    def __init__(self):
+    def __init__(self, vectorized: bool = True):
+        # Batch mode switch: True = evaluate the 60-day rules for all rows
+        # together, False = original per-row loop (kept for comparison)
+        self.vectorized = vectorized
+
         self.stats = {
             'rows_processed': 0,
             'rows_modified': 0,
@@ -53,7 +59,11 @@ class Bids60DaysProcessor:
         
         # Process targeting data (main optimization)
         if not targeting_df.empty:
-            targeting_df = self._process_targeting(targeting_df, template_data)
+            # Port Values (last row of a portfolio wins) and Max BA from the targeting rows
+            parameters = PortfolioParameters.from_template(
+                template_data, targeting_df, keep='last'
+            )
+            targeting_df = self._process_targeting(targeting_df, template_data, parameters)
         
         # Prepare output DataFrames
         result = {
@@ -79,36 +89,41 @@ class Bids60DaysProcessor:
     
     def _process_targeting(self, 
                           df: pd.DataFrame,
-                          template_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+                          template_data: Dict[str, pd.DataFrame],
+                          parameters: Optional[PortfolioParameters] = None) -> pd.DataFrame:
         """Process targeting data with bid calculations."""
         # Step 0: Create helper columns
         df = self._create_helper_columns(df)
         
         # Step 1: Fill base columns from template
-        df = self._fill_base_columns(df, template_data)
+        df = self._fill_base_columns(df, template_data, parameters)
         
         # Step 2: Separate rows with NULL Target CPA
         df, self.for_harvesting_df = self._separate_null_target_cpa(df)
         
         # Process remaining rows
-        for idx in df.index:
-            try:
-                # Step 3: Calculate calc1 and calc2
-                df = self._calculate_calc_values(df, idx)
-                
-                # Step 4-7: Determine final bid based on conditions
-                df = self._calculate_final_bid(df, idx)
-                
-                # Step 8: Mark for coloring
-                df = self._mark_for_coloring(df, idx)
-                
-                self.stats['rows_processed'] += 1
-                
-            except Exception as e:
-                # Handle calculation errors
-                df.at[idx, 'Bid'] = ERROR_CALCULATION
-                df.at[idx, '_needs_highlight'] = True
-                self.stats['calculation_errors'] += 1
+        if self.vectorized:
+            # Steps 3-8 for all rows together
+            df = self._calculate_bids_batch(df)
+        else:
+            for idx in df.index:
+                try:
+                    # Step 3: Calculate calc1 and calc2
+                    df = self._calculate_calc_values(df, idx)
+                    
+                    # Step 4-7: Determine final bid based on conditions
+                    df = self._calculate_final_bid(df, idx)
+                    
+                    # Step 8: Mark for coloring
+                    df = self._mark_for_coloring(df, idx)
+                    
+                    self.stats['rows_processed'] += 1
+                    
+                except Exception as e:
+                    # Handle calculation errors
+                    df.at[idx, 'Bid'] = ERROR_CALCULATION
+                    df.at[idx, '_needs_highlight'] = True
+                    self.stats['calculation_errors'] += 1
         
         # Add Operation column for all rows
         df['Operation'] = 'Update'
@@ -133,13 +148,12 @@ class Bids60DaysProcessor:
     
     def _fill_base_columns(self, 
                            df: pd.DataFrame,
-                           template_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-        """Step 1: Fill Base Bid and Target CPA from template."""
+                           template_data: Dict[str, pd.DataFrame],
+                           parameters: Optional[PortfolioParameters] = None) -> pd.DataFrame:
+        """Step 1: Fill Base Bid, Target CPA and Max BA from template and targeting rows."""
         if 'Port Values' not in template_data:
             return df
         
-        port_values = template_data['Port Values']
-        
         # Get portfolio column name
         portfolio_col = None
         for col in ['Portfolio Name (Informational only)', 'Portfolio Name', 'Portfolio']:
@@ -150,21 +164,15 @@ class Bids60DaysProcessor:
         if not portfolio_col:
             return df
         
-        # Create mapping dictionaries
-        base_bid_map = dict(zip(port_values['Portfolio Name'], port_values['Base Bid']))
-        target_cpa_map = dict(zip(port_values['Portfolio Name'], port_values['Target CPA']))
-        
-        # Fill Base Bid and Target CPA
-        df['Base Bid'] = df[portfolio_col].map(base_bid_map)
-        df['Target CPA'] = df[portfolio_col].map(target_cpa_map)
+        if parameters is None:
+            parameters = PortfolioParameters.from_template(template_data, df, keep='last')
         
-        # Convert Base Bid to numeric (handle 'Ignore' values)
-        df['Base Bid'] = pd.to_numeric(df['Base Bid'], errors='coerce')
-        df['Target CPA'] = pd.to_numeric(df['Target CPA'], errors='coerce')
+        # Fill Base Bid and Target CPA (numeric, 'Ignore' becomes NaN)
+        df['Base Bid'] = parameters.base_bid(df[portfolio_col])
+        df['Target CPA'] = parameters.target_cpa(df[portfolio_col])
         
-        # Calculate Max BA (maximum Percentage for each Campaign ID)
-        df['Max BA'] = df.groupby('Campaign ID')['Percentage'].transform('max')
-        df['Max BA'] = pd.to_numeric(df['Max BA'], errors='coerce').fillna(0)
+        # Max BA (maximum Percentage for each Campaign ID of the targeting rows)
+        df['Max BA'] = parameters.max_ba(df['Campaign ID']).fillna(0)
         
         return df
     
@@ -212,6 +220,115 @@ class Bids60DaysProcessor:
         
         return remaining, for_harvesting
     
+    def _calculate_bids_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Steps 3-8 evaluated on whole columns.
+        
+        Same rules as the per-row path (_calculate_calc_values,
+        _calculate_final_bid and _mark_for_coloring). Rows whose Clicks or
+        Old Bid hold non-numeric values form the error mask: they get
+        Bid = ERROR_CALCULATION and _needs_highlight, and skip steps 4-7.
+        """
+        if df.empty:
+            return df
+        
+        clicks, clicks_invalid = self._numeric_column(df, 'Clicks')
+        units, units_invalid = self._numeric_column(df, 'Units')
+        old_bid, old_bid_invalid = self._numeric_column(df, 'Old Bid')
+        target_cpa = pd.to_numeric(df['Target CPA'], errors='coerce')
+        base_bid = pd.to_numeric(df['Base Bid'], errors='coerce')
+        max_ba = pd.to_numeric(df['Max BA'], errors='coerce')
+        
+        # Rows with NULL Target CPA / Base Bid skip step 3
+        null_mask = target_cpa.isna() | base_bid.isna()
+        error_mask = ~null_mask & (clicks_invalid | units_invalid | old_bid_invalid)
+        calc_mask = ~null_mask & ~error_mask
+        
+        # Step 3: Adj. CPA, calc1 and calc2
+        has_up_and = column_predicate(df, 'Campaign Name (Informational only)', 'up_and')
+        adj_cpa = target_cpa.where(~has_up_and, target_cpa * UP_AND_MULTIPLIER)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            calc1 = (adj_cpa / (clicks / units)).where(units != 0, 0)
+            calc2 = (calc1 / old_bid).where(old_bid != 0, 0)
+        
+        df['Adj. CPA'] = adj_cpa.where(calc_mask, df['Adj. CPA'])
+        df['calc1'] = calc1.where(calc_mask, df['calc1'])
+        df['calc2'] = calc2.where(calc_mask, df['calc2'])
+        
+        bid = df['Bid'].where(~null_mask, ERROR_NULL)
+        
+        # Steps 4-7: Temp Bid, Max_Bid, calc3 and final Bid. As in the
+        # per-row path these also run for NULL rows, whose calc2 is empty.
+        bid_mask = ~error_mask
+        calc1 = df['calc1']
+        below_threshold = df['calc2'] < CALC2_THRESHOLD
+        is_exact = column_predicate(df, 'Match Type', 'exact_match')
+        is_asin = column_predicate(df, 'Product Targeting Expression', 'asin_target_any_case')
+        
+        use_temp_bid = bid_mask & ~below_threshold & (is_exact | is_asin)
+        use_old_bid = bid_mask & ~below_threshold & ~(is_exact | is_asin)
+        
+        ba_factor = 1 + max_ba / 100
+        max_bid = pd.Series(
+            np.where(units < UNITS_FOR_MAX_BID, MAX_BID_LOW_UNITS, MAX_BID_HIGH_UNITS),
+            index=df.index
+        ) / ba_factor
+        calc3 = calc1 - max_bid
+        
+        df['Temp Bid'] = calc1.where(use_temp_bid, df['Temp Bid'])
+        df['Max_Bid'] = max_bid.where(use_temp_bid, df['Max_Bid'])
+        df['calc3'] = calc3.where(use_temp_bid, df['calc3'])
+        
+        bid = bid.mask(bid_mask & below_threshold, calc1)
+        bid = bid.mask(use_temp_bid, calc1.where(calc3 < 0, max_bid))
+        bid = bid.mask(use_old_bid, old_bid * OLD_BID_MULTIPLIER)
+        bid = bid.mask(error_mask, ERROR_CALCULATION)
+        
+        if bid.dtype == object and not (null_mask | error_mask).any():
+            bid = bid.astype(df['Bid'].dtype)
+        df['Bid'] = bid
+        
+        modified = bid_mask & (df['Bid'] != old_bid)
+        self.stats['rows_modified'] += int(modified.sum())
+        
+        # Step 8: Mark for coloring
+        if df['Bid'].dtype == object:
+            is_error = df['Bid'].astype(str).str.contains('Error', regex=False)
+        else:
+            is_error = pd.Series(False, index=df.index)
+        numeric_bid = pd.to_numeric(df['Bid'].where(~is_error), errors='coerce')
+        cvr = (
+            pd.to_numeric(df['Conversion Rate'], errors='coerce')
+            if 'Conversion Rate' in df.columns
+            else pd.Series(np.nan, index=df.index)
+        )
+        
+        low_cvr = ~is_error & (cvr < CONVERSION_RATE_THRESHOLD)
+        out_of_range = ~is_error & ((numeric_bid < MIN_BID) | (numeric_bid > MAX_BID))
+        
+        df['_needs_highlight'] = df['_needs_highlight'] | null_mask | is_error | low_cvr | out_of_range
+        
+        self.stats['rows_with_low_cvr'] += int(low_cvr.sum())
+        self.stats['rows_with_bid_errors'] += int((is_error | out_of_range).sum())
+        self.stats['calculation_errors'] += int(error_mask.sum())
+        self.stats['rows_processed'] += len(df)
+        
+        return df
+    
+    def _numeric_column(self, df: pd.DataFrame, column: str) -> Tuple[pd.Series, pd.Series]:
+        """Get a column as numbers plus a mask of present but non-numeric values."""
+        if column not in df.columns:
+            return (
+                pd.Series(np.nan, index=df.index, dtype=float),
+                pd.Series(True, index=df.index)
+            )
+        
+        values = pd.to_numeric(df[column], errors='coerce')
+        invalid = values.isna() & df[column].notna()
+        
+        return values.astype(float), invalid
+    
     def _calculate_calc_values(self, df: pd.DataFrame, idx: int) -> pd.DataFrame:
         """Step 3: Calculate calc1 and calc2."""
         try:
@@ -0,0 +1,55 @@
+"""Row filters combined into one mask and materialized once."""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional
+import logging
+
+
+class FilterPlan:
+    """
+    Sequence of row filters on one DataFrame.
+
+    Each rule contributes a boolean mask of rows to keep. The masks are
+    AND-ed as they are added and the DataFrame is copied only once, by
+    apply(), instead of once per filter. Row counts are still reported per
+    rule, in the order the rules were added:
+    - remaining[name]: rows left after the rule (and all rules before it)
+    - dropped[name]: rows removed by the rule that earlier rules kept
+    """
+
+    def __init__(self, df: pd.DataFrame, logger: Optional[logging.Logger] = None):
+        self.df = df
+        self.logger = logger or logging.getLogger(__name__)
+        self.keep = np.ones(len(df), dtype=bool)
+        self.remaining: Dict[str, int] = {}
+        self.dropped: Dict[str, int] = {}
+
+    def add(self, name: str, mask: Optional[pd.Series]) -> "FilterPlan":
+        """
+        Add a rule.
+
+        Args:
+            name: Rule name used in the row counts
+            mask: Rows to keep, aligned with the DataFrame; None if the rule
+                  does not apply (e.g. its column is missing)
+
+        Returns:
+            The plan, for chaining
+        """
+        before = int(self.keep.sum())
+        if mask is not None:
+            self.keep &= np.asarray(mask, dtype=bool)
+        after = int(self.keep.sum())
+
+        self.remaining[name] = after
+        self.dropped[name] = before - after
+        return self
+
+    def apply(self) -> pd.DataFrame:
+        """Rows kept by every rule, as one new DataFrame."""
+        for name, count in self.dropped.items():
+            if count > 0:
+                self.logger.info(f"Filtered {count} rows: {name}")
+
+        return self.df.take(np.flatnonzero(self.keep))
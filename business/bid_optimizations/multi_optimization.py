@@ -0,0 +1,256 @@
+"""Run several bid optimizations on one parsed and pre-filtered bulk."""
+
+import pandas as pd
+from io import BytesIO
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import logging
+import time
+
+from config.settings import settings
+from business.bid_optimizations.base_optimization import BaseOptimization
+from utils.stage_profiler import StageListener
+from business.bid_optimizations.zero_sales.cleaner import ZeroSalesCleaner
+
+
+# Bulk file each optimization runs on ("60" = Bulk 60 Days, "30" = Bulk 30 Days)
+BULK_60 = "60"
+BULK_30 = "30"
+
+# Name used for the single working/clean pair of a combined run
+COMBINED_OUTPUT = "Combined"
+
+
+def _zero_sales() -> BaseOptimization:
+    from business.bid_optimizations.zero_sales.orchestrator import ZeroSalesOptimization
+    return ZeroSalesOptimization()
+
+
+def _bids_30_days() -> BaseOptimization:
+    from business.bid_optimizations.bids_30_days.orchestrator import Bids30DaysOptimization
+    return Bids30DaysOptimization()
+
+
+def _bids_60_days() -> BaseOptimization:
+    from business.bid_optimizations.bids_60_days.orchestrator import Bids60DaysOptimization
+    return Bids60DaysOptimization()
+
+
+# Optimization name -> (factory, bulk file it runs on)
+MULTI_OPTIMIZATIONS: Dict[str, Tuple[Callable[[], BaseOptimization], str]] = {
+    "Zero Sales": (_zero_sales, BULK_60),
+    "Bids 30 Days": (_bids_30_days, BULK_30),
+    "Bids 60 Days": (_bids_60_days, BULK_60),
+}
+
+
+@dataclass
+class OptimizationRun:
+    """Outcome of one optimization in a multi-optimization run."""
+
+    name: str
+    success: bool
+    message: str
+    results: Optional[Dict[str, pd.DataFrame]] = None
+    statistics: Dict[str, Any] = field(default_factory=dict)
+    seconds: float = 0.0
+    performance: Dict[str, Any] = field(default_factory=dict)
+
+
+class MultiOptimizationRunner:
+    """
+    Runs Zero Sales, Bids 30 Days and Bids 60 Days together.
+
+    Each bulk file is pre-filtered (State = enabled) once and shared by all
+    optimizations that run on it; the optimizations then validate, clean
+    and process concurrently in a worker pool. Every optimization gets its
+    own copy of the template and bulk since cleaners modify their inputs.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        optimizations: Optional[Dict[str, Tuple[Callable[[], BaseOptimization], str]]] = None,
+        stage_listener: Optional[StageListener] = None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.optimizations = optimizations or MULTI_OPTIMIZATIONS
+        # Added to the profiler of every optimization (progress of background jobs)
+        self.stage_listener = stage_listener
+
+        if max_workers is None:
+            parallel = settings.get_processing_config()["parallel"]
+            max_workers = len(self.optimizations) if parallel else 1
+        self.max_workers = max(1, max_workers)
+
+        self.cleaner = ZeroSalesCleaner()
+        self.stats = {"pre_filter_seconds": 0.0, "run_seconds": 0.0, "output_seconds": 0.0}
+
+    def required_bulks(self, names: Sequence[str]) -> List[str]:
+        """Bulk files ("60"/"30") needed by the selected optimizations."""
+        return sorted({self.optimizations[name][1] for name in names}, reverse=True)
+
+    def run(
+        self,
+        template_data: Dict[str, pd.DataFrame],
+        bulk_data: Dict[str, pd.DataFrame],
+        names: Sequence[str],
+    ) -> Dict[str, OptimizationRun]:
+        """
+        Run the selected optimizations.
+
+        Args:
+            template_data: Parsed template sheets
+            bulk_data: Bulk file key ("60"/"30") -> raw Sponsored Products Campaigns sheet
+            names: Optimizations to run (keys of MULTI_OPTIMIZATIONS)
+
+        Returns:
+            Dictionary of optimization name -> OptimizationRun, in selection order
+        """
+        unknown = [name for name in names if name not in self.optimizations]
+        if unknown:
+            raise ValueError(f"Unknown optimizations: {unknown}")
+
+        missing = [key for key in self.required_bulks(names) if key not in bulk_data]
+        if missing:
+            raise ValueError(f"Missing bulk files: {', '.join(f'Bulk {key}' for key in missing)}")
+
+        # Pre-validation filter once per distinct bulk
+        start = time.time()
+        filtered: Dict[int, pd.DataFrame] = {}
+        for key in self.required_bulks(names):
+            bulk = bulk_data[key]
+            if id(bulk) not in filtered:
+                filtered[id(bulk)] = self.cleaner.pre_validation_filter(bulk)
+        self.stats["pre_filter_seconds"] = time.time() - start
+
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                name: pool.submit(
+                    self._run_one,
+                    name,
+                    template_data,
+                    filtered[id(bulk_data[self.optimizations[name][1]])],
+                )
+                for name in names
+            }
+            runs = {name: future.result() for name, future in futures.items()}
+        self.stats["run_seconds"] = time.time() - start
+
+        self.logger.info(
+            f"Multi-optimization run: {len(runs)} optimizations in "
+            f"{self.stats['run_seconds']:.2f}s ({self.max_workers} workers)"
+        )
+        return runs
+
+    def create_output_files(
+        self, runs: Dict[str, OptimizationRun], combined: bool = False
+    ) -> Dict[str, Tuple[BytesIO, BytesIO]]:
+        """
+        Create working/clean files for the successful optimizations.
+
+        Args:
+            runs: Result of run()
+            combined: One pair holding every optimization's sheets instead of one pair each
+
+        Returns:
+            Dictionary of optimization name (or COMBINED_OUTPUT) -> (working_file, clean_file)
+        """
+        successful = {name: run for name, run in runs.items() if run.success}
+        if not successful:
+            return {}
+
+        start = time.time()
+        if combined:
+            from data.writers.excel_writer import ExcelWriter
+
+            nested = {name: run.results for name, run in successful.items()}
+            excel_writer = ExcelWriter()
+            outputs = {
+                COMBINED_OUTPUT: (
+                    excel_writer.create_working_file(nested),
+                    excel_writer.create_clean_file(nested),
+                )
+            }
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    name: pool.submit(self._create_files, name, run.results)
+                    for name, run in successful.items()
+                }
+                outputs = {name: future.result() for name, future in futures.items()}
+        self.stats["output_seconds"] = time.time() - start
+
+        return outputs
+
+    def _run_one(
+        self, name: str, template_data: Dict[str, pd.DataFrame], bulk_df: pd.DataFrame
+    ) -> OptimizationRun:
+        """Validate, clean and process one optimization on its own copies of the inputs."""
+        start = time.time()
+        factory, _ = self.optimizations[name]
+
+        optimization = None
+        try:
+            optimization = factory()
+            profiler = optimization.profiler
+            if self.stage_listener:
+                profiler.add_listener(self.stage_listener)
+            template_copy = {sheet: df.copy() for sheet, df in template_data.items()}
+            bulk_copy = bulk_df.copy()
+
+            with profiler.stage("validate", bulk_copy) as stage:
+                is_valid, validation_msg, _ = optimization.validate(template_copy, bulk_copy)
+                stage.set_output(bulk_copy)
+            if not is_valid:
+                return OptimizationRun(
+                    name,
+                    False,
+                    f"Validation failed: {validation_msg}",
+                    seconds=time.time() - start,
+                    performance=optimization.get_performance_report(),
+                )
+
+            with profiler.stage("clean", bulk_copy) as stage:
+                cleaned_data, _ = optimization.clean(template_copy, bulk_copy)
+                stage.set_output(cleaned_data)
+            with profiler.stage("process", cleaned_data) as stage:
+                results = optimization.process(template_copy, cleaned_data)
+                stage.set_output(results)
+            if not results:
+                return OptimizationRun(
+                    name,
+                    False,
+                    "Processing returned no results",
+                    seconds=time.time() - start,
+                    performance=optimization.get_performance_report(),
+                )
+
+            return OptimizationRun(
+                name,
+                True,
+                f"{name} optimization completed successfully!",
+                results=results,
+                statistics=optimization.get_statistics(),
+                seconds=time.time() - start,
+                performance=optimization.get_performance_report(),
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error in {name} optimization: {str(e)}")
+            return OptimizationRun(
+                name,
+                False,
+                f"Optimization error: {str(e)}",
+                seconds=time.time() - start,
+                performance=optimization.get_performance_report() if optimization else {},
+            )
+
+    @staticmethod
+    def _create_files(name: str, results: Dict[str, pd.DataFrame]) -> Tuple[BytesIO, BytesIO]:
+        """Working/clean pair of one optimization, as in the single-optimization flow."""
+        from business.processors.output_formatter import OutputFormatter
+
+        return OutputFormatter().create_output_files(results, name)
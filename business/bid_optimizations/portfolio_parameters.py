@@ -0,0 +1,128 @@
+"""Compiled Port Values and Max BA lookups shared by the bid processors."""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+from data.readers.bulk_frame import numeric_values
+
+
+# Base Bid value marking a portfolio to be skipped (case insensitive)
+IGNORE_VALUE = "ignore"
+
+
+class PortfolioParameters:
+    """
+    Per-portfolio and per-campaign parameters of one optimization run.
+
+    Built once from the template Port Values and the Bidding Adjustment rows:
+    - Base Bid and Target CPA as numbers ('Ignore' and text become NaN)
+    - Ignore flag of every portfolio
+    - Max BA = MAX(Percentage) per Campaign ID
+
+    Lookups are positional (Index.get_indexer + take) instead of merges, so
+    the targeting rows are never duplicated. A portfolio listed twice in Port
+    Values uses the row picked by keep ("first" or "last"). Bids 60 Days
+    passes its targeting rows as the Max BA source and keep="last".
+    Inputs are not modified.
+    """
+
+    def __init__(
+        self,
+        port_values: Optional[pd.DataFrame] = None,
+        bidding_adjustment: Optional[pd.DataFrame] = None,
+        column_mapping: Optional[Dict[str, str]] = None,
+        keep: str = "first",
+    ):
+        column_mapping = column_mapping or {}
+        campaign_col = column_mapping.get("campaign_id", "Campaign ID")
+        percentage_col = column_mapping.get("percentage", "Percentage")
+
+        # Port Values: one row per portfolio
+        if (
+            port_values is not None
+            and not port_values.empty
+            and "Portfolio Name" in port_values.columns
+        ):
+            unique = port_values.drop_duplicates("Portfolio Name", keep=keep)
+            self.has_port_values = True
+        else:
+            unique = pd.DataFrame({"Portfolio Name": []})
+            self.has_port_values = False
+
+        self.portfolios = pd.Index(unique["Portfolio Name"])
+        self._base_bid = self._numeric(unique, "Base Bid")
+        self._target_cpa = self._numeric(unique, "Target CPA")
+        if "Base Bid" in unique.columns:
+            self._ignored = (
+                unique["Base Bid"].astype(str).str.lower() == IGNORE_VALUE
+            ).to_numpy()
+        else:
+            self._ignored = np.zeros(len(unique), dtype=bool)
+
+        # Max BA per Campaign ID from the Bidding Adjustment rows
+        if (
+            bidding_adjustment is not None
+            and not bidding_adjustment.empty
+            and campaign_col in bidding_adjustment.columns
+            and percentage_col in bidding_adjustment.columns
+        ):
+            percentage = numeric_values(bidding_adjustment, percentage_col)
+            max_ba = percentage.groupby(bidding_adjustment[campaign_col]).max()
+        else:
+            max_ba = pd.Series(dtype=float)
+
+        self.max_ba_by_campaign = max_ba
+        self.campaigns = pd.Index(max_ba.index)
+        self._max_ba = max_ba.to_numpy(dtype=float)
+
+    @classmethod
+    def from_template(
+        cls,
+        template_data: Dict[str, pd.DataFrame],
+        bidding_adjustment: Optional[pd.DataFrame] = None,
+        column_mapping: Optional[Dict[str, str]] = None,
+        keep: str = "first",
+    ) -> "PortfolioParameters":
+        """Build the parameters from the template sheets."""
+        return cls(
+            template_data.get("Port Values"), bidding_adjustment, column_mapping, keep
+        )
+
+    @property
+    def ignored_portfolios(self) -> List[str]:
+        """Portfolio names with Base Bid = 'Ignore'."""
+        return self.portfolios[self._ignored].tolist()
+
+    def base_bid(self, portfolios: pd.Series) -> pd.Series:
+        """Numeric Base Bid of each portfolio name, NaN if unknown or 'Ignore'."""
+        return self._lookup(self.portfolios, self._base_bid, portfolios, np.nan)
+
+    def target_cpa(self, portfolios: pd.Series) -> pd.Series:
+        """Numeric Target CPA of each portfolio name, NaN if unknown or empty."""
+        return self._lookup(self.portfolios, self._target_cpa, portfolios, np.nan)
+
+    def is_ignored(self, portfolios: pd.Series) -> pd.Series:
+        """Whether each portfolio name is marked 'Ignore'."""
+        return self._lookup(self.portfolios, self._ignored, portfolios, False)
+
+    def max_ba(self, campaign_ids: pd.Series) -> pd.Series:
+        """Max BA of each Campaign ID, NaN for campaigns without Bidding Adjustment."""
+        return self._lookup(self.campaigns, self._max_ba, campaign_ids, np.nan)
+
+    @staticmethod
+    def _numeric(df: pd.DataFrame, column: str) -> np.ndarray:
+        """Column as a float array, NaN where missing or not a number."""
+        if column not in df.columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+
+    @staticmethod
+    def _lookup(
+        keys: pd.Index, values: np.ndarray, lookup: pd.Series, default
+    ) -> pd.Series:
+        """Values of the lookup keys, default where the key is not found."""
+        positions = keys.get_indexer(lookup)
+        found = positions >= 0
+        result = np.full(len(lookup), default, dtype=values.dtype)
+        result[found] = values[positions[found]]
+        return pd.Series(result, index=lookup.index)
@@ -0,0 +1,64 @@
+"""Text rules evaluated once per unique value and broadcast to all rows."""
+
+import pandas as pd
+import numpy as np
+from typing import Callable, Dict
+
+
+# Rule name -> test on str(value) of a cell
+STRING_PREDICATES: Dict[str, Callable[[str], bool]] = {}
+
+
+def register_string_predicate(name: str, predicate: Callable[[str], bool]) -> None:
+    """
+    Register a text rule for use with predicate_mask().
+
+    Args:
+        name: Rule name
+        predicate: Test on str(value) of a cell (missing values give 'nan')
+    """
+    STRING_PREDICATES[name] = predicate
+
+
+# Campaign name contains "up and" (any case)
+register_string_predicate("up_and", lambda text: "up and" in text.lower())
+
+# Match Type is Exact (any case)
+register_string_predicate("exact_match", lambda text: text.lower() == "exact")
+
+# Product Targeting Expression targets an ASIN: asin="B0 (case sensitive, Bids 30 Days)
+register_string_predicate("asin_target", lambda text: 'asin="B0' in text)
+
+# Same in any case (Bids 60 Days)
+register_string_predicate("asin_target_any_case", lambda text: 'asin="b0' in text.lower())
+
+
+def predicate_mask(values: pd.Series, name: str) -> pd.Series:
+    """
+    Evaluate a registered rule on a column.
+
+    Values are factorized and the rule runs once per unique value, so
+    campaign names repeated over thousands of rows are tested once.
+
+    Args:
+        values: Column to test
+        name: Registered rule name (see STRING_PREDICATES)
+
+    Returns:
+        Boolean Series aligned with values
+    """
+    predicate = STRING_PREDICATES[name]
+
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    unique_results = np.fromiter(
+        (predicate(str(value)) for value in uniques), dtype=bool, count=len(uniques)
+    )
+
+    return pd.Series(unique_results[codes], index=values.index)
+
+
+def column_predicate(df: pd.DataFrame, column: str, name: str) -> pd.Series:
+    """Evaluate a registered rule on a DataFrame column; False for every row if it is missing."""
+    if column not in df.columns:
+        return pd.Series(False, index=df.index)
+    return predicate_mask(df[column], name)
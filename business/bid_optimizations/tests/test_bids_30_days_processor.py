@@ -0,0 +1,105 @@
+"""Tests for the column-wise Bids 30 Days bid pipeline."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from business.bid_optimizations.bids_30_days.processor import Bids30DaysProcessor
+from business.bid_optimizations.bids_30_days.constants import ERROR_CALCULATION
+
+
+COLUMN_MAPPING = {
+    "bid": "Bid",
+    "clicks": "Clicks",
+    "units": "Units",
+    "campaign_id": "Campaign ID",
+    "campaign_name": "Campaign Name (Informational only)",
+    "portfolio": "Portfolio Name (Informational only)",
+    "percentage": "Percentage",
+    "match_type": "Match Type",
+    "product_targeting": "Product Targeting Expression",
+    "conversion_rate": "Conversion Rate",
+}
+
+
+def build_targeting() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Entity": ["Keyword", "Keyword", "Product Targeting", "Keyword", "Keyword"],
+            "Campaign ID": ["C1", "C1", "C2", "C2", "C3"],
+            "Campaign Name (Informational only)": [
+                "Brand",
+                "Brand up and",
+                "Auto",
+                "Generic",
+                "Other",
+            ],
+            "Portfolio Name (Informational only)": ["P1", "P1", "P1", "P2", "P1"],
+            "Match Type": ["Broad", "Exact", np.nan, "Phrase", "Broad"],
+            "Product Targeting Expression": [np.nan, np.nan, 'asin="B0TEST"', np.nan, np.nan],
+            "Bid": [0.9, 0.3, 0.4, 0.6, 0.7],
+            "Clicks": [40.0, 10.0, 5.0, 35.0, 50.0],
+            "Units": [4.0, 3.0, 5.0, 1.0, 3.0],
+            "Conversion Rate": [0.1, 0.3, 0.05, 0.2, 0.2],
+        }
+    )
+
+
+def build_port_values() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Portfolio Name": ["P1", "P2"],
+            "Base Bid": [0.5, 0.8],
+            "Target CPA": [10.0, np.nan],
+        }
+    )
+
+
+def test_pipeline_values_and_harvesting_split():
+    bidding_adjustment = pd.DataFrame({"Campaign ID": ["C1"], "Percentage": [25]})
+
+    results, details = Bids30DaysProcessor().process(
+        build_targeting(), build_port_values(), bidding_adjustment, COLUMN_MAPPING
+    )
+
+    targeting = results["Targeting"].set_index("Campaign Name (Informational only)")
+    assert list(results["For Harvesting"]["Campaign ID"]) == ["C2"]
+
+    # calc2 < 1.1 -> Bid = calc1 = Adj. CPA / (clicks / units)
+    assert targeting.at["Brand", "Bid"] == round(8.0 / (40 / 4), 3)
+    # calc2 >= 1.1 + Exact -> capped at Max_Bid (1.25 / 1.25)
+    assert targeting.at["Brand up and", "Bid"] == 1.0
+    # calc2 >= 1.1 + ASIN target -> capped at 1.25 for units >= 3
+    assert targeting.at["Auto", "Bid"] == 1.25
+    # CVR below 8% is highlighted
+    assert bool(targeting.at["Auto", "_needs_highlight"])
+    assert details["statistics"]["moved_to_harvesting"] == 1
+
+
+def test_non_numeric_inputs_marked_as_calculation_error():
+    targeting = build_targeting()
+    processor = Bids30DaysProcessor()
+    processed = processor._create_helper_columns(targeting.copy())
+    processed = processor._fill_base_columns(
+        processed, build_port_values(), pd.DataFrame(), COLUMN_MAPPING
+    )
+    processed["Old Bid"] = processed["Old Bid"].astype(object)
+    processed.loc[0, "Old Bid"] = "bad"
+
+    processed, error_mask = processor._calculate_calc_values(processed, COLUMN_MAPPING)
+    processed = processor._determine_temp_bid(processed, COLUMN_MAPPING)
+    processed = processor._calculate_max_bid(processed, COLUMN_MAPPING)
+    processed = processor._calculate_calc3(processed)
+    processed = processor._calculate_final_bid(processed, COLUMN_MAPPING, error_mask)
+    processed = processor._mark_rows_for_coloring(processed, COLUMN_MAPPING)
+
+    assert processed.loc[0, "Bid"] == ERROR_CALCULATION
+    assert bool(processed.loc[0, "_needs_highlight"])
+    assert processor.stats["calculation_errors"] == 1
+    assert not processed.loc[1:, "Bid"].isin([ERROR_CALCULATION]).any()
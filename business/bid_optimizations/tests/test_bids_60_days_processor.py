@@ -0,0 +1,98 @@
+"""Tests for the Bids 60 Days batch mode."""
+
+import sys
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from business.bid_optimizations.bids_60_days.processor import Bids60DaysProcessor
+from business.bid_optimizations.bids_60_days.constants import ERROR_CALCULATION
+
+
+def build_inputs(n_rows: int = 1500, seed: int = 3):
+    """Build a random cleaned bulk and template for Bids 60 Days."""
+    rng = np.random.default_rng(seed)
+
+    portfolios = [f"Portfolio {i}" for i in range(12)]
+    bulk = pd.DataFrame(
+        {
+            "Entity": rng.choice(
+                ["Keyword", "Product Targeting", "Bidding Adjustment", "Product Ad"],
+                n_rows,
+                p=[0.5, 0.3, 0.1, 0.1],
+            ),
+            "Campaign ID": rng.choice([f"C{i}" for i in range(30)], n_rows),
+            "Campaign Name (Informational only)": rng.choice(
+                ["Brand up and", "Exact", "Generic"], n_rows
+            ),
+            "Portfolio Name (Informational only)": rng.choice(
+                portfolios + ["Unknown"], n_rows
+            ),
+            "Match Type": rng.choice(["Exact", "Broad", np.nan], n_rows),
+            "Product Targeting Expression": rng.choice(
+                ['asin="B0ABC"', 'category="1"', np.nan], n_rows
+            ),
+            "Bid": rng.uniform(0.02, 2, n_rows).round(2),
+            "Clicks": rng.integers(0, 60, n_rows).astype(float),
+            "Units": rng.integers(0, 8, n_rows).astype(float),
+            "Percentage": rng.choice([np.nan, 20, 150], n_rows),
+            "Conversion Rate": rng.choice([0.02, 0.1, 0.4, np.nan], n_rows),
+            "Operation": "",
+        }
+    )
+
+    port_values = pd.DataFrame(
+        {
+            "Portfolio Name": portfolios,
+            "Base Bid": rng.uniform(0.1, 2, len(portfolios)).round(3),
+            "Target CPA": rng.uniform(1, 30, len(portfolios)).round(2),
+        }
+    )
+    port_values.loc[::4, "Target CPA"] = np.nan
+    port_values.loc[1, "Base Bid"] = np.nan
+
+    return bulk, {"Port Values": port_values}
+
+
+def test_batch_mode_matches_row_loop():
+    bulk, template = build_inputs()
+
+    row_processor = Bids60DaysProcessor(vectorized=False)
+    batch_processor = Bids60DaysProcessor(vectorized=True)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        row_results = row_processor.process(template, bulk.copy())
+    batch_results = batch_processor.process(template, bulk.copy())
+
+    assert row_results.keys() == batch_results.keys()
+    for sheet_name in row_results:
+        pd.testing.assert_frame_equal(
+            row_results[sheet_name], batch_results[sheet_name], check_dtype=False
+        )
+    assert row_processor.get_statistics() == batch_processor.get_statistics()
+
+
+def test_error_mask_marks_only_failing_rows():
+    bulk, template = build_inputs(n_rows=200)
+    bulk["Clicks"] = bulk["Clicks"].astype(object)
+    targeting_rows = bulk.index[
+        bulk["Entity"].isin(["Keyword", "Product Targeting"])
+        & bulk["Portfolio Name (Informational only)"].isin(["Portfolio 2", "Portfolio 3"])
+    ]
+    failing_row = targeting_rows[0]
+    bulk.loc[failing_row, "Clicks"] = "n/a"
+
+    processor = Bids60DaysProcessor()
+    targeting = processor.process(template, bulk)["Targeting"]
+
+    assert targeting.loc[failing_row, "Bid"] == ERROR_CALCULATION
+    assert bool(targeting.loc[failing_row, "_needs_highlight"])
+    assert (targeting["Bid"] == ERROR_CALCULATION).sum() == 1
+    assert processor.get_statistics()["calculation_errors"] == 1
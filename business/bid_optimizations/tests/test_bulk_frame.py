@@ -0,0 +1,53 @@
+"""Tests for typing the bulk sheet once at load time."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from data.readers.bulk_frame import invalid_numeric_mask, numeric_values
+from business.bid_optimizations.zero_sales.cleaner import ZeroSalesCleaner
+from business.common.numeric_validator_py import NumericValidator
+
+
+def build_bulk():
+    return pd.DataFrame(
+        {
+            "State": ["enabled", "enabled", "paused", "enabled"],
+            "Campaign ID": [1.0, 2.0, 3.0, 4.0],
+            "Keyword ID": [10.0, np.nan, 30.0, 40.0],
+            "Units": pd.Series(["1", 2, 3, "4.5"], dtype=object),
+            "Clicks": pd.Series([1, "n/a", 3, 4], dtype=object),
+        }
+    )
+
+
+def test_pre_validation_filter_types_columns():
+    bulk = ZeroSalesCleaner().pre_validation_filter(build_bulk())
+
+    assert bulk["Units"].dtype == np.float64
+    assert bulk["Units"].tolist() == [1.0, 2.0, 4.5]
+    assert bulk["Campaign ID"].dtype == np.int64
+    assert bulk["Keyword ID"].dtype == np.float64
+
+    # Non-numeric values are kept for error marking and recorded at load time
+    assert bulk["Clicks"].dtype == object
+    assert invalid_numeric_mask(bulk, "Clicks").tolist() == [False, True, False]
+    assert numeric_values(bulk, "Clicks").isna().tolist() == [False, True, False]
+
+
+def test_numeric_validator_reads_load_time_masks():
+    bulk = ZeroSalesCleaner().pre_validation_filter(build_bulk())
+    targeting = bulk[bulk["Campaign ID"] > 1]
+
+    validated, details = NumericValidator().validate_numeric_columns(
+        targeting.copy(), ["Clicks", "Units"]
+    )
+
+    assert details["invalid_counts"] == {"Clicks": 1}
+    assert validated["_has_numeric_error"].tolist() == [True, False]
@@ -0,0 +1,43 @@
+"""Tests for combined-mask filtering in the cleaners."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from business.bid_optimizations.filter_plan import FilterPlan
+from business.bid_optimizations.zero_sales.cleaner import ZeroSalesCleaner
+
+
+def test_counts_follow_rule_order():
+    df = pd.DataFrame({"a": range(10)}, index=range(100, 110))
+
+    plan = FilterPlan(df)
+    plan.add("even", df["a"] % 2 == 0)
+    plan.add("missing column", None)
+    plan.add("small", df["a"] < 5)
+    result = plan.apply()
+
+    assert result.index.tolist() == [100, 102, 104]
+    assert plan.remaining == {"even": 5, "missing column": 5, "small": 3}
+    assert plan.dropped == {"even": 5, "missing column": 0, "small": 2}
+
+
+def test_pre_validation_filter_keeps_enabled_rows_only():
+    bulk = pd.DataFrame(
+        {
+            "State": ["enabled", "paused", "Enabled", "enabled"],
+            "Campaign State (Informational only)": ["enabled", "enabled", "enabled", np.nan],
+            "Ad Group State (Informational only)": "enabled",
+        }
+    )
+
+    filtered = ZeroSalesCleaner().pre_validation_filter(bulk)
+
+    assert filtered.index.tolist() == [0, 2]
+    assert len(bulk) == 4
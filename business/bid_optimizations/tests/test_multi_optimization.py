@@ -0,0 +1,118 @@
+"""Tests for running several bid optimizations on one pre-filtered bulk."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from business.bid_optimizations.multi_optimization import (
+    MultiOptimizationRunner,
+    COMBINED_OUTPUT,
+)
+from business.bid_optimizations.zero_sales.cleaner import ZeroSalesCleaner
+from business.bid_optimizations.zero_sales.orchestrator import ZeroSalesOptimization
+from business.bid_optimizations.bids_60_days.orchestrator import Bids60DaysOptimization
+
+
+BULK_COLUMNS = [
+    "Product", "Entity", "Operation", "Campaign ID", "Ad Group ID", "Portfolio ID",
+    "Ad ID", "Keyword ID", "Product Targeting ID", "Campaign Name", "Ad Group Name",
+    "Campaign Name (Informational only)", "Ad Group Name (Informational only)",
+    "Portfolio Name (Informational only)", "Start Date", "End Date", "Targeting Type",
+    "State", "Campaign State (Informational only)", "Ad Group State (Informational only)",
+    "Daily Budget", "SKU", "ASIN (Informational only)", "Eligibility Status (Informational only)",
+    "Reason for Ineligibility (Informational only)", "Ad Group Default Bid",
+    "Ad Group Default Bid (Informational only)", "Bid", "Keyword Text",
+    "Native Language Keyword", "Native Language Locale", "Match Type", "Bidding Strategy",
+    "Placement", "Percentage", "Product Targeting Expression",
+    "Resolved Product Targeting Expression (Informational only)", "Impressions", "Clicks",
+    "Click-through Rate", "Spend", "Sales", "Orders", "Units", "Conversion Rate", "ACOS",
+    "CPC", "ROAS",
+]
+
+
+def build_inputs(n_rows: int = 600, seed: int = 3):
+    """Build a random template and bulk sheet."""
+    rng = np.random.default_rng(seed)
+    portfolios = [f"Portfolio {i}" for i in range(8)]
+
+    bulk = pd.DataFrame({col: "" for col in BULK_COLUMNS}, index=range(n_rows))
+    bulk["Entity"] = rng.choice(
+        ["Keyword", "Product Targeting", "Bidding Adjustment", "Product Ad"],
+        n_rows, p=[0.5, 0.2, 0.2, 0.1],
+    )
+    bulk["Campaign ID"] = rng.integers(1, 40, n_rows).astype(float)
+    bulk["Portfolio Name (Informational only)"] = rng.choice(portfolios, n_rows)
+    bulk["Campaign Name (Informational only)"] = rng.choice(["up and away", "Exact"], n_rows)
+    for col in ["State", "Campaign State (Informational only)", "Ad Group State (Informational only)"]:
+        bulk[col] = rng.choice(["enabled", "paused"], n_rows, p=[0.9, 0.1])
+    bulk["Bid"] = rng.uniform(0.1, 2, n_rows).round(2)
+    bulk["Units"] = rng.choice([0, 0, 1, 3, 5], n_rows).astype(float)
+    bulk["Clicks"] = rng.integers(0, 60, n_rows).astype(float)
+    bulk["Percentage"] = rng.integers(0, 100, n_rows).astype(float)
+    bulk["Conversion Rate"] = rng.random(n_rows)
+
+    template = {
+        "Port Values": pd.DataFrame(
+            {
+                "Portfolio Name": portfolios,
+                "Base Bid": rng.uniform(0.2, 1, len(portfolios)).round(2),
+                "Target CPA": [np.nan, 5, 6, 7, 8, 9, 10, 11],
+            }
+        ),
+        "Top ASINs": pd.DataFrame({"ASIN": []}),
+    }
+    return template, bulk
+
+
+def run_single(optimization, template, bulk):
+    """Run one optimization the way the single-optimization page does."""
+    template = {name: df.copy() for name, df in template.items()}
+    bulk = ZeroSalesCleaner().pre_validation_filter(bulk)
+    optimization.validate(template, bulk)
+    cleaned_data, _ = optimization.clean(template, bulk)
+    return optimization.process(template, cleaned_data), optimization.get_statistics()
+
+
+def test_parallel_run_matches_single_runs():
+    template, bulk = build_inputs()
+
+    runner = MultiOptimizationRunner(max_workers=2)
+    runs = runner.run(template, {"60": bulk}, ["Zero Sales", "Bids 60 Days"])
+
+    for name, optimization in [
+        ("Zero Sales", ZeroSalesOptimization()),
+        ("Bids 60 Days", Bids60DaysOptimization()),
+    ]:
+        results, statistics = run_single(optimization, template, bulk)
+        assert runs[name].success, runs[name].message
+        assert runs[name].statistics == statistics
+        assert [stage["stage"] for stage in runs[name].performance["stages"]] == [
+            "validate", "clean", "process"
+        ]
+        assert list(runs[name].results) == list(results)
+        for sheet_name, df in results.items():
+            pd.testing.assert_frame_equal(runs[name].results[sheet_name], df)
+
+
+def test_failed_optimization_does_not_stop_others():
+    template, bulk = build_inputs()
+    bulk_without_bid = bulk.drop(columns=["Bid"])
+
+    runner = MultiOptimizationRunner()
+    runs = runner.run(
+        template, {"60": bulk, "30": bulk_without_bid}, ["Zero Sales", "Bids 30 Days"]
+    )
+
+    assert runs["Zero Sales"].success
+    assert not runs["Bids 30 Days"].success
+
+    outputs = runner.create_output_files(runs, combined=True)
+    assert list(outputs) == [COMBINED_OUTPUT]
+    working_file, clean_file = outputs[COMBINED_OUTPUT]
+    assert len(working_file.getvalue()) > 0 and len(clean_file.getvalue()) > 0
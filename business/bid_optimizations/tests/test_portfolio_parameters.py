@@ -0,0 +1,122 @@
+"""Tests for the compiled Port Values and Max BA lookups."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from business.bid_optimizations.portfolio_parameters import PortfolioParameters
+from business.bid_optimizations.zero_sales.processor import ZeroSalesProcessor
+from business.bid_optimizations.bids_30_days.processor import Bids30DaysProcessor
+from business.bid_optimizations.bids_60_days.processor import Bids60DaysProcessor
+
+
+COLUMN_MAPPING = {
+    "portfolio": "Portfolio Name (Informational only)",
+    "campaign_id": "Campaign ID",
+    "percentage": "Percentage",
+    "bid": "Bid",
+}
+
+
+def build_inputs():
+    """Port Values with a duplicate portfolio and an 'Ignore' row, plus BA rows."""
+    port_values = pd.DataFrame(
+        {
+            "Portfolio Name": ["A", "B", "A", "C"],
+            "Base Bid": [0.4, "Ignore", 0.9, "n/a"],
+            "Target CPA": [5, 6, 7, np.nan],
+        }
+    )
+    bidding_adjustment = pd.DataFrame(
+        {
+            "Entity": "Bidding Adjustment",
+            "Campaign ID": [1.0, 1.0, 2.0],
+            "Percentage": ["20", 150, np.nan],
+        }
+    )
+    return port_values, bidding_adjustment
+
+
+def test_lookups_and_inputs_untouched():
+    port_values, bidding_adjustment = build_inputs()
+    originals = port_values.copy(), bidding_adjustment.copy()
+
+    parameters = PortfolioParameters(port_values, bidding_adjustment, COLUMN_MAPPING)
+    portfolios = pd.Series(["A", "B", "C", "Unknown"], index=[7, 8, 9, 10])
+
+    base_bid = parameters.base_bid(portfolios)
+    assert list(base_bid.index) == [7, 8, 9, 10]
+    np.testing.assert_array_equal(base_bid, [0.4, np.nan, np.nan, np.nan])
+    np.testing.assert_array_equal(parameters.target_cpa(portfolios), [5, 6, np.nan, np.nan])
+    assert parameters.is_ignored(portfolios).tolist() == [False, True, False, False]
+    assert parameters.ignored_portfolios == ["B"]
+    np.testing.assert_array_equal(
+        parameters.max_ba(pd.Series([1.0, 2.0, 3.0])), [150, np.nan, np.nan]
+    )
+
+    pd.testing.assert_frame_equal(port_values, originals[0])
+    pd.testing.assert_frame_equal(bidding_adjustment, originals[1])
+
+
+def build_targeting():
+    return pd.DataFrame(
+        {
+            "Entity": "Keyword",
+            "Campaign ID": [1.0, 2.0, 3.0],
+            "Campaign Name (Informational only)": "Exact",
+            "Portfolio Name (Informational only)": ["A", "A", "C"],
+            "Match Type": "Exact",
+            "Bid": [0.5, 0.6, 0.7],
+            "Clicks": 10.0,
+            "Units": 0.0,
+            "Percentage": [30.0, np.nan, np.nan],
+            "Conversion Rate": 0.1,
+        },
+        index=[4, 5, 6],
+    )
+
+
+def test_processors_resolve_duplicate_portfolios():
+    port_values, bidding_adjustment = build_inputs()
+    targeting = build_targeting()
+
+    zero_sales = ZeroSalesProcessor()._merge_with_template(
+        targeting, port_values, COLUMN_MAPPING
+    )
+    bids_30 = Bids30DaysProcessor()._fill_base_columns(
+        targeting.copy(), port_values, bidding_adjustment, COLUMN_MAPPING
+    )
+    bids_60 = Bids60DaysProcessor()._fill_base_columns(
+        targeting.copy(), {"Port Values": port_values}
+    )
+
+    # Zero Sales and Bids 30 Days use the first Port Values row, Bids 60 Days the last
+    for df in (zero_sales, bids_30):
+        assert len(df) == len(targeting)
+        assert df["Target CPA"].tolist()[:2] == [5, 5]
+        assert df["Base Bid"].tolist()[:2] == [0.4, 0.4]
+    assert len(bids_60) == len(targeting)
+    assert bids_60["Target CPA"].tolist()[:2] == [7, 7]
+    assert bids_60["Base Bid"].tolist()[:2] == [0.9, 0.9]
+    assert bids_30["Max BA"].tolist() == [150, 0, 0]
+    assert not bids_30.columns.str.endswith("_template").any()
+
+
+def test_bids_60_max_ba_comes_from_targeting_percentage():
+    port_values, bidding_adjustment = build_inputs()
+    bulk = pd.concat([build_targeting(), bidding_adjustment], ignore_index=True)
+
+    result = Bids60DaysProcessor().process({"Port Values": port_values}, bulk)
+
+    # Campaign 1: targeting Percentage 30, Bidding Adjustment Percentage up to 150
+    targeting = pd.concat([result["Targeting"], result.get("For Harvesting")])
+    max_ba = dict(zip(targeting["Campaign ID"], targeting["Max BA"]))
+    assert max_ba[1.0] == 30
+    assert max_ba[2.0] == 0
+    assert len(result["Bidding Adjustment"]) == len(bidding_adjustment)
@@ -0,0 +1,52 @@
+"""Tests for the per-unique-value text rules."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from business.bid_optimizations.string_predicates import (
+    STRING_PREDICATES,
+    column_predicate,
+    predicate_mask,
+    register_string_predicate,
+)
+
+
+def test_rules_match_per_row_checks():
+    names = pd.Series(
+        ["Brand UP AND away", "Exact", np.nan, "Brand up and away", 3.0], index=[5, 6, 7, 8, 9]
+    )
+    expressions = pd.Series(['asin="B0ABC"', 'ASIN="b0abc"', 'category="1"', np.nan])
+
+    up_and = predicate_mask(names, "up_and")
+    assert up_and.index.equals(names.index)
+    assert up_and.tolist() == ["up and" in str(name).lower() for name in names]
+    assert predicate_mask(expressions, "asin_target").tolist() == [True, False, False, False]
+    assert predicate_mask(expressions, "asin_target_any_case").tolist() == [
+        True, True, False, False
+    ]
+
+
+def test_registered_rule_runs_once_per_unique_value():
+    calls = []
+
+    def is_brand(text):
+        calls.append(text)
+        return text.startswith("Brand")
+
+    register_string_predicate("test_brand", is_brand)
+    try:
+        df = pd.DataFrame({"Campaign": ["Brand A", "Other", "Brand A", "Other"] * 50})
+        mask = column_predicate(df, "Campaign", "test_brand")
+
+        assert mask.sum() == 100
+        assert sorted(calls) == ["Brand A", "Other"]
+        assert not column_predicate(df, "Missing", "test_brand").any()
+    finally:
+        del STRING_PREDICATES["test_brand"]
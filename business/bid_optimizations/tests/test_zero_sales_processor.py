@@ -0,0 +1,99 @@
+"""Equivalence tests for the Zero Sales row-by-row and column-wise bid engines."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from business.bid_optimizations.zero_sales.processor import ZeroSalesProcessor
+
+
+COLUMN_MAPPING = {
+    "bid": "Bid",
+    "clicks": "Clicks",
+    "campaign_id": "Campaign ID",
+    "campaign_name": "Campaign Name (Informational only)",
+    "portfolio": "Portfolio Name (Informational only)",
+    "percentage": "Percentage",
+}
+
+
+def build_inputs(n_rows: int = 2000, seed: int = 7):
+    """Build random Targeting, Port Values and Bidding Adjustment frames."""
+    rng = np.random.default_rng(seed)
+
+    portfolios = [f"Portfolio {i}" for i in range(20)]
+    campaigns = [f"C{i}" for i in range(50)]
+    names = ["Brand up and coming", "Exact Match", "UP AND Auto", "Generic"]
+
+    targeting = pd.DataFrame(
+        {
+            "Entity": rng.choice(["Keyword", "Product Targeting"], n_rows),
+            "Campaign ID": rng.choice(campaigns, n_rows),
+            "Campaign Name (Informational only)": rng.choice(names, n_rows),
+            "Portfolio Name (Informational only)": rng.choice(portfolios, n_rows),
+            "Bid": rng.uniform(0.02, 3, n_rows).round(2),
+            "Clicks": rng.integers(0, 40, n_rows).astype(float),
+            "Units": 0.0,
+        }
+    )
+    targeting.loc[::97, "Clicks"] = np.nan
+
+    port_values = pd.DataFrame(
+        {
+            "Portfolio Name": portfolios,
+            "Base Bid": rng.uniform(0.1, 2, len(portfolios)).round(3),
+            "Target CPA": rng.uniform(1, 30, len(portfolios)).round(2),
+        }
+    )
+    port_values["Base Bid"] = port_values["Base Bid"].astype(object)
+    port_values.loc[::4, "Target CPA"] = np.nan
+    port_values.loc[3, "Base Bid"] = "Ignore"
+
+    bidding_adjustment = pd.DataFrame(
+        {
+            "Campaign ID": rng.choice(campaigns, 200),
+            "Percentage": rng.integers(0, 300, 200),
+        }
+    )
+
+    return targeting, port_values, bidding_adjustment
+
+
+def test_engines_produce_identical_output():
+    targeting, port_values, bidding_adjustment = build_inputs()
+
+    rowwise_results, rowwise_details = ZeroSalesProcessor(vectorized=False).process(
+        targeting, port_values, bidding_adjustment.copy(), COLUMN_MAPPING
+    )
+    vector_results, vector_details = ZeroSalesProcessor(vectorized=True).process(
+        targeting, port_values, bidding_adjustment.copy(), COLUMN_MAPPING
+    )
+
+    pd.testing.assert_frame_equal(
+        rowwise_results["Targeting"], vector_results["Targeting"]
+    )
+    assert rowwise_details["case_statistics"] == vector_details["case_statistics"]
+
+
+def test_compare_engines_reports_match_and_counts_errors():
+    targeting, port_values, bidding_adjustment = build_inputs(n_rows=300)
+    targeting["Clicks"] = targeting["Clicks"].astype(object)
+    targeting.loc[5, "Clicks"] = "n/a"
+
+    processor = ZeroSalesProcessor()
+    merged = processor._merge_with_template(targeting, port_values, COLUMN_MAPPING)
+    merged["Max BA"] = merged["Campaign ID"].map(
+        processor._calculate_max_ba(bidding_adjustment, COLUMN_MAPPING)
+    ).fillna(0)
+    merged["Adj. CPA"] = merged["Target CPA"] / (1 + merged["Max BA"] / 100)
+
+    report = processor.compare_engines(merged, COLUMN_MAPPING)
+
+    assert report["match"], report
+    assert report["vectorized_stats"]["processing_errors"] == 1
@@ -1,10 +1,14 @@
 """Zero Sales optimization data cleaning - FIXED VERSION."""
 
 import pandas as pd
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 import logging
 import numpy as np
 
+from data.readers.bulk_frame import type_bulk_frame, numeric_values
+from business.bid_optimizations.filter_plan import FilterPlan
+from business.bid_optimizations.portfolio_parameters import PortfolioParameters
+
 
 class ZeroSalesCleaner:
     """
@@ -77,28 +81,35 @@ class ZeroSalesCleaner:
 
         # STEP 2: Apply filters ONLY to Targeting sheet
         if "Targeting" in split_data and not split_data["Targeting"].empty:
-            targeting_df = split_data["Targeting"].copy()
+            targeting_df = split_data["Targeting"]
 
             # Ensure all original columns are preserved
             for col in original_columns:
                 if col not in targeting_df.columns:
                     targeting_df[col] = ""
 
-            # Filter Units = 0
-            targeting_df = self._filter_zero_units(targeting_df, column_mapping)
-            cleaning_details["filtering"]["after_units_filter"] = len(targeting_df)
-
-            # Remove excluded portfolios
-            targeting_df = self._remove_excluded_portfolios(
-                targeting_df, column_mapping
+            # Filter Units = 0, remove excluded and ignored portfolios
+            # (one combined mask, rows copied once)
+            plan = FilterPlan(targeting_df, self.logger)
+            plan.add("Units != 0", self._zero_units_mask(targeting_df, column_mapping))
+            plan.add(
+                "excluded portfolios",
+                self._excluded_portfolios_mask(targeting_df, column_mapping),
             )
-            cleaning_details["filtering"]["after_excluded_filter"] = len(targeting_df)
-
-            # Remove ignored portfolios
-            targeting_df = self._remove_ignored_portfolios(
-                targeting_df, template_data, column_mapping
+            plan.add(
+                "ignored portfolios",
+                self._ignored_portfolios_mask(targeting_df, template_data, column_mapping),
             )
-            cleaning_details["filtering"]["after_ignored_filter"] = len(targeting_df)
+            targeting_df = plan.apply()
+
+            cleaning_details["filtering"]["after_units_filter"] = plan.remaining["Units != 0"]
+            cleaning_details["filtering"]["after_excluded_filter"] = plan.remaining[
+                "excluded portfolios"
+            ]
+            cleaning_details["filtering"]["after_ignored_filter"] = plan.remaining[
+                "ignored portfolios"
+            ]
+            cleaning_details["filtering"]["rows_removed"] = plan.dropped.copy()
 
             # State filtering is now done in pre_validation_filter() - no duplicate filtering needed
 
@@ -147,25 +158,27 @@ class ZeroSalesCleaner:
             bulk_data: Raw bulk data DataFrame
             
         Returns:
-            Filtered DataFrame with only enabled rows
+            Filtered DataFrame with only enabled rows, numeric and ID
+            columns typed once for all later steps (see type_bulk_frame)
         """
         if bulk_data.empty:
             return bulk_data
             
-        df = bulk_data.copy()
-        initial_count = len(df)
-        
-        # Filter by main State column
-        if 'State' in df.columns:
-            df = df[df['State'].astype(str).str.lower() == 'enabled'].copy()
-        
-        # Filter by Campaign State  
-        if 'Campaign State (Informational only)' in df.columns:
-            df = df[df['Campaign State (Informational only)'].astype(str).str.lower() == 'enabled'].copy()
-            
-        # Filter by Ad Group State
-        if 'Ad Group State (Informational only)' in df.columns:
-            df = df[df['Ad Group State (Informational only)'].astype(str).str.lower() == 'enabled'].copy()
+        initial_count = len(bulk_data)
+
+        # State, Campaign State and Ad Group State must all be enabled
+        plan = FilterPlan(bulk_data, self.logger)
+        for state_col in [
+            'State',
+            'Campaign State (Informational only)',
+            'Ad Group State (Informational only)',
+        ]:
+            if state_col in bulk_data.columns:
+                plan.add(
+                    state_col,
+                    bulk_data[state_col].astype(str).str.lower() == 'enabled',
+                )
+        df = type_bulk_frame(plan.apply())
         
         filtered_count = initial_count - len(df)
         if filtered_count > 0:
@@ -190,7 +203,7 @@ class ZeroSalesCleaner:
 
         if entity_col not in df.columns:
             self.logger.error(f"Entity column '{entity_col}' not found")
-            return {"Targeting": df}  # Fallback: treat all as Targeting
+            return {"Targeting": df.copy()}  # Fallback: treat all as Targeting
 
         result = {}
 
@@ -214,30 +227,25 @@ class ZeroSalesCleaner:
 
         return result
 
-    def _filter_zero_units(
+    def _zero_units_mask(
         self, df: pd.DataFrame, column_mapping: Dict[str, str]
-    ) -> pd.DataFrame:
-        """Filter to only rows with Units = 0."""
+    ) -> Optional[pd.Series]:
+        """Rows with Units = 0 (Units is converted to numeric in place)."""
 
         units_col = column_mapping.get("units", "Units")
 
         if units_col not in df.columns:
             self.logger.error(f"Units column '{units_col}' not found")
-            return df
+            return None
 
         # Convert to numeric and filter
-        df[units_col] = pd.to_numeric(df[units_col], errors="coerce")
-        zero_units_df = df[df[units_col] == 0].copy()
-
-        filtered_count = len(df) - len(zero_units_df)
-        self.logger.info(f"Filtered {filtered_count} rows with Units != 0")
+        df[units_col] = numeric_values(df, units_col)
+        return df[units_col] == 0
 
-        return zero_units_df
-
-    def _remove_excluded_portfolios(
+    def _excluded_portfolios_mask(
         self, df: pd.DataFrame, column_mapping: Dict[str, str]
-    ) -> pd.DataFrame:
-        """Remove rows from 10 excluded 'Flat' portfolios."""
+    ) -> Optional[pd.Series]:
+        """Rows not in the excluded 'Flat' portfolios."""
 
         portfolio_col = column_mapping.get(
             "portfolio", "Portfolio Name (Informational only)"
@@ -245,25 +253,18 @@ class ZeroSalesCleaner:
 
         if portfolio_col not in df.columns:
             self.logger.warning(f"Portfolio column '{portfolio_col}' not found")
-            return df
+            return None
 
-        # Filter out excluded portfolios (case sensitive)
-        excluded_mask = df[portfolio_col].isin(self.excluded_portfolios)
-        filtered_df = df[~excluded_mask].copy()
+        # Excluded portfolios are case sensitive
+        return ~df[portfolio_col].isin(self.excluded_portfolios)
 
-        excluded_count = excluded_mask.sum()
-        if excluded_count > 0:
-            self.logger.info(f"Removed {excluded_count} rows from excluded portfolios")
-
-        return filtered_df
-
-    def _remove_ignored_portfolios(
+    def _ignored_portfolios_mask(
         self,
         df: pd.DataFrame,
         template_data: Dict[str, pd.DataFrame],
         column_mapping: Dict[str, str],
-    ) -> pd.DataFrame:
-        """Remove rows from portfolios marked as 'Ignore' in template."""
+    ) -> Optional[pd.Series]:
+        """Rows not in portfolios marked as 'Ignore' in template."""
 
         portfolio_col = column_mapping.get(
             "portfolio", "Portfolio Name (Informational only)"
@@ -271,40 +272,26 @@ class ZeroSalesCleaner:
 
         if portfolio_col not in df.columns:
             self.logger.warning(f"Portfolio column '{portfolio_col}' not found")
-            return df
+            return None
 
         # Get Port Values sheet
         port_values = template_data.get("Port Values", pd.DataFrame())
 
         if port_values.empty:
             self.logger.warning("Port Values sheet is empty")
-            return df
+            return None
 
         # Find portfolios with Base Bid = 'Ignore'
         if "Base Bid" not in port_values.columns:
             self.logger.warning("Base Bid column not found in Port Values")
-            return df
-
-        # Convert Base Bid to string and check for 'Ignore' (case insensitive)
-        port_values["Base Bid"] = port_values["Base Bid"].astype(str)
-        ignored_mask = port_values["Base Bid"].str.lower() == "ignore"
-        ignored_portfolios = port_values[ignored_mask]["Portfolio Name"].tolist()
-
-        if ignored_portfolios:
-            # Filter out ignored portfolios
-            ignored_data_mask = df[portfolio_col].isin(ignored_portfolios)
-            filtered_df = df[~ignored_data_mask].copy()
-
-            ignored_count = ignored_data_mask.sum()
-            if ignored_count > 0:
-                self.logger.info(
-                    f"Removed {ignored_count} rows from {len(ignored_portfolios)} "
-                    f"ignored portfolios"
-                )
+            return None
 
-            return filtered_df
+        # Check Base Bid for 'Ignore' (case insensitive)
+        ignored_portfolios = PortfolioParameters(port_values).ignored_portfolios
+        if not ignored_portfolios:
+            return None
 
-        return df
+        return ~df[portfolio_col].isin(ignored_portfolios)
 
     def _filter_by_state(
         self, df: pd.DataFrame, column_mapping: Dict[str, str]
@@ -364,28 +351,28 @@ class ZeroSalesCleaner:
 
         # Validate Bid
         if bid_col in df.columns:
-            df[bid_col] = pd.to_numeric(df[bid_col], errors="coerce")
+            df[bid_col] = numeric_values(df, bid_col)
             invalid_bid = df[bid_col].isna()
             stats["invalid_bid"] = invalid_bid.sum()
             error_mask |= invalid_bid
 
         # Validate Clicks
         if clicks_col in df.columns:
-            df[clicks_col] = pd.to_numeric(df[clicks_col], errors="coerce")
+            df[clicks_col] = numeric_values(df, clicks_col)
             invalid_clicks = df[clicks_col].isna()
             stats["invalid_clicks"] = invalid_clicks.sum()
             error_mask |= invalid_clicks
 
-        # Validate Units (should already be numeric from _filter_zero_units)
+        # Validate Units (already numeric: typed by type_bulk_frame and filtered by _zero_units_mask)
         if units_col in df.columns:
-            df[units_col] = pd.to_numeric(df[units_col], errors="coerce")
+            df[units_col] = numeric_values(df, units_col)
             invalid_units = df[units_col].isna()
             stats["invalid_units"] = invalid_units.sum()
             error_mask |= invalid_units
 
         # Validate Percentage
         if percentage_col in df.columns:
-            df[percentage_col] = pd.to_numeric(df[percentage_col], errors="coerce")
+            df[percentage_col] = numeric_values(df, percentage_col)
             invalid_percentage = df[percentage_col].isna()
             stats["invalid_percentage"] = invalid_percentage.sum()
             error_mask |= invalid_percentage
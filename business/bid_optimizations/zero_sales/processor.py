@@ -2,17 +2,23 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 import logging
 from config.constants import MIN_BID, MAX_BID
+from business.bid_optimizations.portfolio_parameters import PortfolioParameters
+from business.bid_optimizations.string_predicates import column_predicate
 
 
 class ZeroSalesProcessor:
     """Processes Zero Sales optimization bid calculations."""
 
-    def __init__(self):
+    def __init__(self, vectorized: bool = True):
         self.logger = logging.getLogger("optimization.zero_sales.processor")
 
+        # Bid engine switch: True = column-wise case engine,
+        # False = original row-by-row loop (kept for side-by-side comparison)
+        self.vectorized = vectorized
+
         # Bid range constraints - FIXED: Changed from 4.00 to 1.25
         self.min_bid = MIN_BID  # 0.02
         self.max_bid = 4  # FIXED: Specification says 1.25, not 4.00
@@ -33,6 +39,7 @@ class ZeroSalesProcessor:
         port_values_df: pd.DataFrame,
         bidding_adjustment_df: pd.DataFrame,
         column_mapping: Dict[str, str],
+        parameters: Optional[PortfolioParameters] = None,
     ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]:
         """
         Process Zero Sales bid calculations using the 4 defined cases.
@@ -42,6 +49,8 @@ class ZeroSalesProcessor:
             port_values_df: Port Values from template
             bidding_adjustment_df: Bidding Adjustment data for Max BA calculation
             column_mapping: Column name mapping
+            parameters: Compiled Port Values/Max BA lookups (built from the
+                        two frames above if not given)
         """
 
         processing_details = {
@@ -66,27 +75,35 @@ class ZeroSalesProcessor:
             "processing_errors": 0,
         }
 
-        # STEP 1: Calculate Max BA for each Campaign ID
-        max_ba_map = self._calculate_max_ba(bidding_adjustment_df, column_mapping)
+        # STEP 1: Compile Port Values and Max BA for each Campaign ID
+        if parameters is None:
+            parameters = PortfolioParameters(
+                port_values_df, bidding_adjustment_df, column_mapping
+            )
 
-        # STEP 2: Merge template data with targeting data
+        # STEP 2: Look up template data for the targeting data
         processed_df = self._merge_with_template(
-            targeting_df, port_values_df, column_mapping
+            targeting_df, port_values_df, column_mapping, parameters
         )
 
         # STEP 3: Add Max BA column
         campaign_col = column_mapping.get("campaign_id", "Campaign ID")
         if campaign_col in processed_df.columns:
             processed_df["Max BA"] = (
-                processed_df[campaign_col].map(max_ba_map).fillna(0)
+                parameters.max_ba(processed_df[campaign_col]).fillna(0)
             )
         else:
             processed_df["Max BA"] = 0
 
         # STEP 4: Calculate Adj. CPA
-        processed_df["Adj. CPA"] = processed_df.apply(
-            lambda row: self._calculate_adj_cpa(row), axis=1
-        )
+        if self.vectorized and "Target CPA" in processed_df.columns:
+            processed_df["Adj. CPA"] = processed_df["Target CPA"] / (
+                1 + processed_df["Max BA"] / 100
+            )
+        else:
+            processed_df["Adj. CPA"] = processed_df.apply(
+                lambda row: self._calculate_adj_cpa(row), axis=1
+            )
 
         # STEP 5: Calculate new bids for all rows (Old Bid will be saved inside this function)
         processed_df = self._calculate_all_bids(processed_df, column_mapping)
@@ -123,11 +140,9 @@ class ZeroSalesProcessor:
             self.logger.warning("Campaign ID or Percentage column not found in BA data")
             return {}
 
-        # Convert Percentage to numeric
-        ba_df[percentage_col] = pd.to_numeric(ba_df[percentage_col], errors="coerce")
-
-        # Group by Campaign ID and get max Percentage
-        max_ba = ba_df.groupby(campaign_col)[percentage_col].max().to_dict()
+        max_ba = PortfolioParameters(
+            None, ba_df, column_mapping
+        ).max_ba_by_campaign.to_dict()
 
         self.logger.info(f"Calculated Max BA for {len(max_ba)} campaigns")
 
@@ -138,10 +153,12 @@ class ZeroSalesProcessor:
         df: pd.DataFrame,
         port_values_df: pd.DataFrame,
         column_mapping: Dict[str, str],
+        parameters: Optional[PortfolioParameters] = None,
     ) -> pd.DataFrame:
-        """Merge targeting data with template portfolio data."""
+        """Add Base Bid and Target CPA of each row's portfolio from the template."""
 
-        merged = df.copy()
+        # Same row order and RangeIndex as a left merge on the portfolio
+        merged = df.reset_index(drop=True)
 
         # Find portfolio column
         portfolio_col = column_mapping.get(
@@ -150,34 +167,15 @@ class ZeroSalesProcessor:
 
         if portfolio_col not in merged.columns:
             self.logger.error(f"Portfolio column '{portfolio_col}' not found")
-            return merged
-
-        # Merge with Port Values
-        if not port_values_df.empty and "Portfolio Name" in port_values_df.columns:
-            # Prepare template data for merge
-            template_cols = ["Portfolio Name", "Base Bid", "Target CPA"]
-            template_subset = port_values_df[template_cols].copy()
-
-            # Convert Base Bid to numeric (handle 'Ignore' values)
-            template_subset["Base Bid"] = pd.to_numeric(
-                template_subset["Base Bid"], errors="coerce"
-            )
-            template_subset["Target CPA"] = pd.to_numeric(
-                template_subset["Target CPA"], errors="coerce"
-            )
+            return df.copy()
 
-            # Merge
-            merged = pd.merge(
-                merged,
-                template_subset,
-                left_on=portfolio_col,
-                right_on="Portfolio Name",
-                how="left",
-            )
+        if parameters is None:
+            parameters = PortfolioParameters(port_values_df)
 
-            # Clean up duplicate column
-            if "Portfolio Name" in merged.columns and portfolio_col != "Portfolio Name":
-                merged.drop("Portfolio Name", axis=1, inplace=True)
+        # Base Bid and Target CPA are numeric ('Ignore' becomes NaN)
+        if parameters.has_port_values:
+            merged["Base Bid"] = parameters.base_bid(merged[portfolio_col])
+            merged["Target CPA"] = parameters.target_cpa(merged[portfolio_col])
 
         return merged
 
@@ -206,6 +204,20 @@ class ZeroSalesProcessor:
             self.logger.warning("Column 'Bid' not found, Old Bid will be empty")
             processed["Old Bid"] = 0.0
 
+        # Initialize calculation columns
+        processed["calc1"] = 0.0
+        processed["calc2"] = 0.0
+
+        if self.vectorized:
+            return self._calculate_bids_vectorized(processed, column_mapping)
+
+        return self._calculate_bids_rowwise(processed, column_mapping)
+
+    def _calculate_bids_rowwise(
+        self, processed: pd.DataFrame, column_mapping: Dict[str, str]
+    ) -> pd.DataFrame:
+        """Original row-by-row case engine (reference implementation)."""
+
         # Find relevant columns for calculations
         bid_col = column_mapping.get("bid", "Bid")
         campaign_name_col = column_mapping.get(
@@ -213,10 +225,6 @@ class ZeroSalesProcessor:
         )
         clicks_col = column_mapping.get("clicks", "Clicks")
 
-        # Initialize calculation columns
-        processed["calc1"] = 0.0
-        processed["calc2"] = 0.0
-
         # Process each row
         for idx in processed.index:
             try:
@@ -301,6 +309,198 @@ class ZeroSalesProcessor:
 
         return processed
 
+    def _calculate_bids_vectorized(
+        self, processed: pd.DataFrame, column_mapping: Dict[str, str]
+    ) -> pd.DataFrame:
+        """
+        Column-wise case engine.
+
+        Picks Case A/B/C/D from boolean masks and computes calc1, calc2 and
+        the new Bid on whole arrays. Produces the same values as the
+        row-by-row engine, rounding included. Rows
+        whose Clicks or Base Bid cannot be converted to float are counted as
+        processing errors and left untouched, as the row loop does.
+        """
+
+        bid_col = column_mapping.get("bid", "Bid")
+        campaign_name_col = column_mapping.get(
+            "campaign_name", "Campaign Name (Informational only)"
+        )
+        clicks_col = column_mapping.get("clicks", "Clicks")
+
+        n_rows = len(processed)
+
+        # Get values (same defaults as the row loop)
+        base_bid, base_bid_invalid = self._numeric_array(processed, "Base Bid", 0.5)
+        clicks, clicks_invalid = self._numeric_array(processed, clicks_col, 0.0)
+        target_cpa, _ = self._numeric_array(processed, "Target CPA", np.nan, fill=False)
+        adj_cpa, _ = self._numeric_array(processed, "Adj. CPA", np.nan, fill=False)
+        max_ba, _ = self._numeric_array(processed, "Max BA", 0.0, fill=False)
+
+        # Check if campaign name contains "up and" (once per unique name)
+        has_up_and = column_predicate(processed, campaign_name_col, "up_and").to_numpy(
+            dtype=bool
+        )
+
+        # Rows the row loop would reject with an exception
+        error_mask = base_bid_invalid | clicks_invalid
+        valid = ~error_mask
+
+        # Case masks
+        no_cpa = np.isnan(target_cpa)
+        case_a = valid & no_cpa & has_up_and
+        case_b = valid & no_cpa & ~has_up_and
+        case_c = valid & ~no_cpa & has_up_and
+        case_d = valid & ~no_cpa & ~has_up_and
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            half_base = base_bid * 0.5
+            adjusted_base = base_bid / (1 + max_ba / 100)
+
+            # Cases C/D: calc1 and calc2
+            calc1 = np.where(has_up_and, adj_cpa * 0.5, adj_cpa) / (clicks + 1)
+            calc2 = calc1 - np.where(has_up_and, half_base, adjusted_base)
+
+        has_calc = case_c | case_d
+        calc1 = np.where(has_calc, calc1, 0.0)
+        calc2 = np.where(has_calc, calc2, 0.0)
+
+        # Determine new bid per case
+        new_bid = np.select(
+            [case_a, case_b, case_c, case_d],
+            [
+                half_base,
+                adjusted_base,
+                np.where(calc2 <= 0, calc1, half_base),
+                np.where(calc2 <= 0, calc1, adjusted_base),
+            ],
+            default=np.nan,
+        )
+
+        # Round to 3 decimal places. The row loop rounds numpy scalars with
+        # np.round, except the Base Bid × 0.5 results which are Python floats
+        # and go through Python's round() - keep both behaviours.
+        python_rounded = case_a | (case_c & ~(calc2 <= 0))
+        rounded_bid = np.round(new_bid, 3)
+        rounded_bid[python_rounded] = self._round_like_python(
+            new_bid[python_rounded], 3
+        )
+        new_bid = rounded_bid
+
+        # Update rows
+        processed["calc1"] = calc1
+        processed["calc2"] = calc2
+        if valid.any():
+            processed.loc[valid, bid_col] = new_bid[valid]
+
+        # Statistics
+        out_of_range = valid & ((new_bid < self.min_bid) | (new_bid > self.max_bid))
+        self.stats["out_of_range_count"] += int(out_of_range.sum())
+        self.stats["case_a_count"] += int(case_a.sum())
+        self.stats["case_b_count"] += int(case_b.sum())
+        self.stats["case_c_count"] += int(case_c.sum())
+        self.stats["case_d_count"] += int(case_d.sum())
+
+        error_count = int(error_mask.sum())
+        if error_count:
+            self.logger.error(f"Error processing {error_count} rows: non-numeric values")
+            self.stats["processing_errors"] += error_count
+
+        return processed
+
+    def compare_engines(
+        self, df: pd.DataFrame, column_mapping: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Run the row-by-row and column-wise engines on the same input and
+        report any difference in output values or case statistics.
+
+        Args:
+            df: Targeting data merged with template values, with Max BA and
+                Adj. CPA already added (the input of _calculate_all_bids)
+            column_mapping: Column name mapping
+
+        Returns:
+            Dictionary with match flag, mismatched columns and statistics
+        """
+
+        original_vectorized = self.vectorized
+        original_stats = self.stats.copy()
+        results = {}
+
+        try:
+            for engine, vectorized in (("rowwise", False), ("vectorized", True)):
+                self.vectorized = vectorized
+                self.stats = {key: 0 for key in original_stats}
+                output = self._calculate_all_bids(df, column_mapping)
+                results[engine] = (output, self.stats.copy())
+        finally:
+            self.vectorized = original_vectorized
+            self.stats = original_stats
+
+        rowwise_df, rowwise_stats = results["rowwise"]
+        vectorized_df, vectorized_stats = results["vectorized"]
+
+        bid_col = column_mapping.get("bid", "Bid")
+        mismatched_columns = {}
+        for col in ["calc1", "calc2", bid_col]:
+            if col not in rowwise_df.columns:
+                continue
+            left = pd.to_numeric(rowwise_df[col], errors="coerce").to_numpy(dtype=float)
+            right = pd.to_numeric(vectorized_df[col], errors="coerce").to_numpy(dtype=float)
+            differs = ~((left == right) | (np.isnan(left) & np.isnan(right)))
+            if differs.any():
+                mismatched_columns[col] = int(differs.sum())
+
+        return {
+            "match": not mismatched_columns and rowwise_stats == vectorized_stats,
+            "rows_compared": len(df),
+            "mismatched_columns": mismatched_columns,
+            "rowwise_stats": rowwise_stats,
+            "vectorized_stats": vectorized_stats,
+        }
+
+    def _numeric_array(
+        self, df: pd.DataFrame, column: str, default: float, fill: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a column as a float array plus a mask of values that are present
+        but not numeric. Missing columns return the default for every row;
+        with fill=True, empty cells are replaced by the default as well.
+        """
+
+        n_rows = len(df)
+        if column not in df.columns:
+            return np.full(n_rows, default, dtype=float), np.zeros(n_rows, dtype=bool)
+
+        raw = df[column]
+        values = pd.to_numeric(raw, errors="coerce")
+        invalid = (values.isna() & raw.notna()).to_numpy(dtype=bool)
+        values = values.to_numpy(dtype=float, na_value=np.nan)
+
+        if fill:
+            values = np.where(np.isnan(values), default, values)
+
+        return values, invalid
+
+    @staticmethod
+    def _round_like_python(values: np.ndarray, decimals: int) -> np.ndarray:
+        """
+        Round an array exactly like Python's round(value, decimals).
+
+        np.round scales by 10**decimals before rounding, which can disagree
+        with Python's correctly-rounded result when the scaled value sits on
+        a .5 boundary. Those few values are re-rounded with Python's round.
+        """
+
+        rounded = np.round(values, decimals)
+        scaled = values * 10**decimals
+        near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+        for pos in np.flatnonzero(near_tie):
+            rounded[pos] = round(float(values[pos]), decimals)
+
+        return rounded
+
     def _add_helper_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Ensure all 7 helper columns are present in the correct order.
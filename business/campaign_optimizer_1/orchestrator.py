@@ -1,6 +1,7 @@
 from .cleaning import CampaignOptimizer1Cleaner
 from .factory import CampaignOptimizer1Factory
 from .service import CampaignOptimizer1Service
+from utils.stage_profiler import StageProfiler
 
 class CampaignOptimizer1Orchestrator:
     """
@@ -12,6 +13,9 @@ class CampaignOptimizer1Orchestrator:
         self.cleaner = CampaignOptimizer1Cleaner()
         self.factory = CampaignOptimizer1Factory()
         self.service = CampaignOptimizer1Service()
+        
+        # Per-stage timing and memory of the last run
+        self.profiler = StageProfiler("campaign_optimizer_1")
     
     def process(self, raw_data: dict) -> bytes:
         """
@@ -23,18 +27,25 @@ class CampaignOptimizer1Orchestrator:
         Returns:
             bytes: Excel file content ready for download
         """
+        self.profiler.reset()
+        
         # Step 1: Clean the data (3-step cleaning process)
-        cleaned_data = self.cleaner.clean(raw_data)
+        with self.profiler.stage("clean", raw_data) as stage:
+            cleaned_data = self.cleaner.clean(raw_data)
+            stage.set_output(cleaned_data)
         
         # Step 2: Apply optimization strategy
         strategy = self.factory.create_seven_days_budget_strategy()
         
         if "Campaign" in cleaned_data:
-            optimized_campaigns = strategy.optimize(cleaned_data["Campaign"])
+            with self.profiler.stage("optimize", cleaned_data["Campaign"]) as stage:
+                optimized_campaigns = strategy.optimize(cleaned_data["Campaign"])
+                stage.set_output(optimized_campaigns)
             cleaned_data["Campaign"] = optimized_campaigns
         
         # Step 3: Generate Excel output
-        output_bytes = self.service.generate_excel_output(cleaned_data)
+        with self.profiler.stage("output", cleaned_data):
+            output_bytes = self.service.generate_excel_output(cleaned_data)
         
         return output_bytes
     
@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any, Tuple, List, Optional
 import logging
+from data.readers.bulk_frame import numeric_values, invalid_numeric_mask
 
 
 class NumericValidator:
@@ -73,13 +74,12 @@ class NumericValidator:
 
             details["columns_validated"].append(col_name)
 
-            # Convert to numeric
-            original_values = df[col_name].copy()
-            df[col_name] = pd.to_numeric(df[col_name], errors="coerce")
-
-            # Check for non-numeric values
-            invalid_mask = df[col_name].isna() & original_values.notna()
+            # Check for non-numeric values (recorded at load time for typed bulks)
+            invalid_mask = invalid_numeric_mask(df, col_name)
             invalid_count = invalid_mask.sum()
+
+            # Convert to numeric
+            df[col_name] = numeric_values(df, col_name)
             
             if invalid_count > 0:
                 details["invalid_counts"][col_name] = invalid_count
@@ -1,13 +1,86 @@
 """Data structure cleaning for Portfolio Optimizations."""
 
 import pandas as pd
-from typing import Dict, Tuple
+import numpy as np
+from typing import Dict, Iterable, Optional, Tuple
 import logging
 from .constants import COL_ENTITY, SHEET_PORTFOLIOS
+from .sheet_store import take_rows
 
 logger = logging.getLogger(__name__)
 
 
+def clean_data_content(
+    all_sheets: Dict[str, pd.DataFrame],
+    columns: Optional[Dict[str, Iterable[str]]] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Clean text content (spaces, 'nan', '.0' suffixes) without changing structure.
+    
+    Args:
+        all_sheets: Dictionary of sheet name to DataFrame
+        columns: Input sheet name -> columns to clean; None cleans every text
+            column of every sheet, sheets missing from the mapping are kept as is
+        
+    Returns:
+        Dictionary with the cleaned sheets (input DataFrames are not modified)
+    """
+    cleaned = {}
+    for sheet_name, df in all_sheets.items():
+        if columns is None:
+            selected = df.columns
+        else:
+            wanted = set(columns.get(sheet_name, ()))
+            selected = [col for col in df.columns if col in wanted]
+        
+        selected = [col for col in selected if df[col].dtype == 'object']
+        if not selected:
+            cleaned[sheet_name] = df
+            continue
+        
+        # Shallow copy: cleaned columns are replaced, never modified in place
+        cleaned_df = df.copy(deep=False)
+        for col in selected:
+            cleaned_df[col] = normalize_text_column(cleaned_df[col])
+        cleaned[sheet_name] = cleaned_df
+        logger.debug(f"Cleaned {len(selected)} columns of {sheet_name}")
+    
+    return cleaned
+
+
+def normalize_text_column(values: pd.Series) -> pd.Series:
+    """
+    Normalize a text column as astype(str), strip, 'nan' -> '' and '1.0' -> '1' do.
+    
+    The string operations run once per distinct value (factorize, normalize
+    the uniques, take back by code) instead of once per row.
+    """
+    if pd.api.types.infer_dtype(values, skipna=True) == 'string':
+        # Missing cells factorize to -1; their text ('nan', 'None') is normalized separately
+        codes, uniques = pd.factorize(values.to_numpy())
+    else:
+        # Mixed types: factorize on the text so that e.g. True and 1 stay distinct
+        codes, uniques = pd.factorize(values.astype(str).to_numpy())
+    
+    normalized = _normalize_text(pd.Series(uniques, dtype=object).astype(str)).to_numpy()
+    result = normalized.take(codes) if len(normalized) else np.full(len(values), '', dtype=object)
+    
+    missing = codes == -1
+    if missing.any():
+        result[missing] = normalize_text_column(values[missing].astype(str)).to_numpy()
+    
+    return pd.Series(result, index=values.index, name=values.name, dtype=object)
+
+
+def _normalize_text(text: pd.Series) -> pd.Series:
+    """Strip text, blank out 'nan' and drop the '.0' of numeric strings."""
+    text = text.str.strip().replace('nan', '')
+    
+    # Numeric strings like "1.0" -> "1", "20250830.0" -> "20250830"
+    mask = text.str.endswith('.0') & text.str.replace('.0', '').str.replace('-', '').str.isdigit()
+    return text.mask(mask, text.str.replace('.0', ''))
+
+
 def clean_data_structure(all_sheets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
     """
     Clean and restructure the data according to preprocessing logic.
@@ -33,7 +106,7 @@ def clean_data_structure(all_sheets: Dict[str, pd.DataFrame]) -> Dict[str, pd.Da
         logger.warning(f"Source sheet '{source_sheet_name}' not found - skipping cleaning")
         return all_sheets
     
-    source_df = all_sheets[source_sheet_name].copy()
+    source_df = all_sheets[source_sheet_name]
     
     if source_df.empty:
         logger.info(f"Source sheet '{source_sheet_name}' is empty - skipping cleaning")
@@ -69,11 +142,11 @@ def _split_campaigns_sheet(source_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Da
     
     # Extract campaigns (Entity = "Campaign")
     campaigns_mask = source_df[COL_ENTITY] == "Campaign"
-    campaigns_df = source_df[campaigns_mask].copy()
+    campaigns_df = take_rows(source_df, campaigns_mask)
     
     # Extract product ads (Entity = "Product Ad")  
     product_ads_mask = source_df[COL_ENTITY] == "Product Ad"
-    product_ads_df = source_df[product_ads_mask].copy()
+    product_ads_df = take_rows(source_df, product_ads_mask)
     
     # Log statistics
     total_rows = len(source_df)
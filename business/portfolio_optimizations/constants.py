@@ -5,11 +5,20 @@ SHEET_CAMPAIGNS = "Sponsored Products Campaigns"
 SHEET_PORTFOLIOS = "Portfolios"
 SHEET_BRANDS = "Sponsored Brands Campaigns"
 
+SHEET_METADATA = "Sheet3"
+
+# Sheets read from the bulk file (None keeps every column, output rows are
+# written back in full); all other sheets are skipped at parse time.
+# Sheet3 is optional and passed through to the output when present.
+REQUIRED_INPUT_SHEETS = [SHEET_CAMPAIGNS, SHEET_PORTFOLIOS]
+INPUT_SHEETS = {SHEET_CAMPAIGNS: None, SHEET_PORTFOLIOS: None, SHEET_METADATA: None}
+
 # Sheet names (after cleaning)
 SHEET_CAMPAIGNS_CLEANED = "Campaign"
 SHEET_PRODUCT_AD = "Product Ad"
 SHEET_TOP = "Top"
 SHEET_TERMINAL = "Terminal"
+SHEET_TOP_CAMPAIGNS = "Top Campaigns"
 
 # Column names
 COL_ENTITY = "Entity"
@@ -32,6 +41,17 @@ COL_ASIN_PA = "ASIN PA"
 COL_TOP = "Top"
 COL_TOP_ASINS = "Top ASINs"
 
+# Columns content-cleaned on every run: the Entity split and the merge keys.
+# Strategies add the columns they read via get_required_columns()
+CONTENT_KEY_COLUMNS = [COL_ENTITY, COL_CAMPAIGN_ID, COL_PORTFOLIO_ID]
+
+# Input sheet each cleaned sheet is built from
+CLEANED_SHEET_SOURCES = {
+    SHEET_CAMPAIGNS_CLEANED: SHEET_CAMPAIGNS,
+    SHEET_PRODUCT_AD: SHEET_CAMPAIGNS,
+    SHEET_PORTFOLIOS: SHEET_PORTFOLIOS,
+}
+
 # Protected columns that cannot be updated
 PROTECTED_COLUMNS = [
     COL_ENTITY,
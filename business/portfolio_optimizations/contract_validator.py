@@ -128,7 +128,7 @@ def _validate_output(result: OptimizationResult, strategy_name: str, all_sheets:
         )
     
     # Validate cell updates limits
-    total_cell_updates = sum(len(update.cell_changes) for update in result.patch.updates)
+    total_cell_updates = result.patch.cell_count
     if total_cell_updates > MAX_CELL_UPDATES:
         raise ValidationError(
             f"[{strategy_name}] Too many cell updates: {total_cell_updates} > {MAX_CELL_UPDATES}"
@@ -144,12 +144,24 @@ def _validate_output(result: OptimizationResult, strategy_name: str, all_sheets:
     # Validate that all updates have valid keys
     existing_keys = set(target_sheet[key_column].astype(str))
     
-    for update in result.patch.updates:
-        if str(update.key_value) not in existing_keys:
+    for key_value in result.patch.key_values:
+        if str(key_value) not in existing_keys:
             raise ValidationError(
-                f"[{strategy_name}] Update references non-existent key: {update.key_value}"
+                f"[{strategy_name}] Update references non-existent key: {key_value}"
             )
     
+    # Validate that row moves reference existing rows
+    for move in result.moves:
+        if move.source_sheet not in all_sheets:
+            raise ValidationError(f"[{strategy_name}] Row move from missing sheet: {move.source_sheet}")
+        
+        source_keys = set(all_sheets[move.source_sheet][move.key_column].astype(str))
+        for key_value in move.keys:
+            if str(key_value) not in source_keys:
+                raise ValidationError(
+                    f"[{strategy_name}] Row move references non-existent key: {key_value}"
+                )
+    
     # Validate metrics
     if not isinstance(result.metrics, dict):
         raise ValidationError(f"[{strategy_name}] metrics must be a dictionary")
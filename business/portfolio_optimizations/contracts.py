@@ -1,8 +1,9 @@
 """Contracts for Portfolio Optimizations module."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Literal
+from typing import Dict, List, Any, Optional, Literal, Sequence, Union
 import pandas as pd
+import numpy as np
 
 
 @dataclass
@@ -20,15 +21,138 @@ class PatchData:
     sheet_name: str
     updates: List[CellUpdate]
 
+    @property
+    def key_values(self) -> List[str]:
+        """Key value of each updated row."""
+        return [update.key_value for update in self.updates]
+
+    @property
+    def update_count(self) -> int:
+        """Number of updated rows."""
+        return len(self.updates)
+
+    @property
+    def cell_count(self) -> int:
+        """Number of updated cells."""
+        return sum(len(update.cell_changes) for update in self.updates)
+
+
+@dataclass
+class ColumnarPatch:
+    """
+    Represents updates for a single sheet as aligned columns.
+
+    Entry i of keys, row_indices and every value array describes the same
+    row, so a patch of N rows is a handful of arrays instead of N CellUpdate
+    objects. A column's optional mask limits which rows it changes.
+    """
+    sheet_name: str
+    key_column: str
+    keys: Sequence[Any]
+    columns: Dict[str, Sequence[Any]]
+    row_indices: Optional[Sequence[Optional[int]]] = None
+    masks: Dict[str, Sequence[bool]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Convert arrays to positional numpy arrays and check they are aligned with keys."""
+        self.keys = pd.Series(self.keys, dtype=object).to_numpy()
+        self.columns = {
+            name: pd.Series(values, dtype=object).to_numpy() for name, values in self.columns.items()
+        }
+        self.masks = {name: np.asarray(mask, dtype=bool) for name, mask in self.masks.items()}
+        if self.row_indices is not None:
+            self.row_indices = pd.Series(self.row_indices, dtype=object).to_numpy()
+
+        row_count = len(self.keys)
+        arrays = {"row_indices": self.row_indices} if self.row_indices is not None else {}
+        arrays.update({f"column '{name}'": values for name, values in self.columns.items()})
+        arrays.update({f"mask '{name}'": mask for name, mask in self.masks.items()})
+
+        for name, values in arrays.items():
+            if len(values) != row_count:
+                raise ValueError(
+                    f"ColumnarPatch {name} has {len(values)} values, expected {row_count}"
+                )
+
+        unknown_masks = set(self.masks) - set(self.columns)
+        if unknown_masks:
+            raise ValueError(f"ColumnarPatch masks for unknown columns: {sorted(unknown_masks)}")
+
+    @property
+    def key_values(self) -> List[str]:
+        """Key value of each updated row."""
+        return list(self.keys)
+
+    @property
+    def update_count(self) -> int:
+        """Number of updated rows."""
+        return len(self.keys)
+
+    @property
+    def cell_count(self) -> int:
+        """Number of updated cells."""
+        return sum(
+            int(self.masks[name].sum()) if name in self.masks else len(self.keys)
+            for name in self.columns
+        )
+
+    @property
+    def updates(self) -> List[CellUpdate]:
+        """Equivalent per-row CellUpdate list (built on every access)."""
+        updates = []
+        for i, key in enumerate(self.keys):
+            cell_changes = {
+                name: values[i]
+                for name, values in self.columns.items()
+                if name not in self.masks or self.masks[name][i]
+            }
+            if not cell_changes:
+                continue
+            updates.append(CellUpdate(
+                row_index=self.row_indices[i] if self.row_indices is not None else None,
+                key_column=self.key_column,
+                key_value=key,
+                cell_changes=cell_changes
+            ))
+        return updates
+
+
+@dataclass
+class RowMove:
+    """
+    Moves the rows of a sheet whose key is in keys to another sheet.
+
+    The source sheet is partitioned with one mask: the matching rows, with
+    the assignments written to all of them, become the target sheet and the
+    rest stay in the source sheet. The target sheet is created (empty if no
+    row matches) or replaced.
+    """
+    source_sheet: str
+    target_sheet: str
+    key_column: str
+    keys: Sequence[Any]
+    assignments: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def row_count(self) -> int:
+        """Number of moved rows."""
+        return len(self.keys)
+
+    @property
+    def cell_count(self) -> int:
+        """Number of assigned cells."""
+        return len(self.keys) * len(self.assignments)
+
 
 @dataclass
 class OptimizationResult:
     """Result from a single optimization strategy."""
     result_type: Literal["campaigns", "portfolios"]
     merge_keys: List[str]
-    patch: PatchData
+    patch: Union[PatchData, ColumnarPatch]
     metrics: Dict[str, int] = field(default_factory=dict)
     messages: List[str] = field(default_factory=list)
+    moves: List[RowMove] = field(default_factory=list)
     
     def __post_init__(self):
         """Initialize default values."""
@@ -92,6 +216,26 @@ class OptimizationStrategy:
     def get_required_sheets(self) -> List[str]:
         """Get list of required sheet names."""
         raise NotImplementedError("Each strategy must implement get_required_sheets()")
+    
+    def get_required_columns(self) -> Optional[Dict[str, List[str]]]:
+        """
+        Get the columns this optimization reads, per cleaned sheet name.
+        
+        Only these columns (and the key columns) are content-cleaned before
+        the run. None, the default, cleans every text column of every sheet.
+        """
+        return None
+    
+    def get_output_sheets(self) -> Optional[List[str]]:
+        """
+        Get the sheets this optimization replaces or creates while running.
+        
+        Sheets it only patches do not count: patches are applied at merge
+        time. Strategies that do not write each other's input sheets run
+        concurrently. None, the default, means unknown: the strategy runs
+        on its own.
+        """
+        return None
 
 
 class ValidationError(Exception):
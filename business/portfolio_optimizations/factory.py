@@ -1,7 +1,7 @@
 """Factory for creating optimization strategies."""
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Set, Any
 from .contracts import OptimizationStrategy
 from .strategies import EmptyPortfoliosStrategy, CampaignsWithoutPortfoliosStrategy, OrganizeTopCampaignsStrategy
 from .constants import OPTIMIZATION_ORDER
@@ -113,6 +113,46 @@ class PortfolioOptimizationFactory:
                 ordered.append(strategy)
         
         return ordered
+    
+    def get_execution_batches(self, selected_strategies: List[str]) -> List[List[str]]:
+        """
+        Group the ordered strategies into batches that can run concurrently.
+        
+        A strategy depends on an earlier one that replaces or creates a sheet
+        it reads or writes; it then starts a new batch. Inside a batch each
+        strategy runs on its own snapshot of the sheets, so a strategy may
+        write a sheet another strategy of the batch reads (the reader sees
+        the earlier version, as it would when running first). Strategies
+        that do not declare their outputs run alone.
+        
+        Args:
+            selected_strategies: List of selected strategy names
+        
+        Returns:
+            Batches in execution order; concatenated they give get_ordered_strategies()
+        """
+        batches: List[List[str]] = []
+        batch_outputs: Optional[Set[str]] = None  # None: the batch must not be joined
+        
+        for name in self.get_ordered_strategies(selected_strategies):
+            strategy = self._strategies.get(name)
+            reads = set(strategy.get_required_sheets()) if strategy else set()
+            outputs = strategy.get_output_sheets() if strategy else None
+        
+            independent = (
+                batches
+                and outputs is not None
+                and batch_outputs is not None
+                and not batch_outputs & (reads | set(outputs))
+            )
+            if independent:
+                batches[-1].append(name)
+                batch_outputs |= set(outputs)
+            else:
+                batches.append([name])
+                batch_outputs = set(outputs) if outputs is not None else None
+        
+        return batches
 
 
 # Singleton instance
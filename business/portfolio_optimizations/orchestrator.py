@@ -2,29 +2,47 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Set, Tuple, Optional, Any
 import logging
 import time
-from .factory import get_portfolio_optimization_factory
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import settings
+from .factory import PortfolioOptimizationFactory, get_portfolio_optimization_factory
 from .results_manager import ResultsManager
 from .service import PortfolioOptimizationService
 from .contracts import OptimizationResult, RunReport, ValidationError, OptimizationError
 from .constants import (
     SHEET_CAMPAIGNS, SHEET_PORTFOLIOS, SHEET_CAMPAIGNS_CLEANED,
     COL_ENTITY, COL_CAMPAIGN_ID, COL_PORTFOLIO_ID,
+    CONTENT_KEY_COLUMNS, CLEANED_SHEET_SOURCES, OPTIMIZATION_ORDER,
     SUCCESS_MESSAGES, ERROR_MESSAGES, REQUIRED_SHEETS_AFTER_CLEANING
 )
-from .cleaning import clean_data_structure, validate_cleaned_structure
+from .cleaning import clean_data_content, clean_data_structure, validate_cleaned_structure
+from utils.stage_profiler import StageProfiler
 
 
 class PortfolioOptimizationOrchestrator:
     """Orchestrates the portfolio optimization process."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        factory: Optional[PortfolioOptimizationFactory] = None,
+        max_workers: Optional[int] = None
+    ):
         self.logger = logging.getLogger(__name__)
-        self.factory = get_portfolio_optimization_factory()
+        # Shared singleton unless the caller needs its own strategy instances
+        self.factory = factory or get_portfolio_optimization_factory()
+        
+        # Strategies of one execution batch running at once
+        if max_workers is None:
+            parallel = settings.get_processing_config()["parallel"]
+            max_workers = len(OPTIMIZATION_ORDER) if parallel else 1
+        self.max_workers = max(1, max_workers)
         self.results_manager = ResultsManager()
         self.service = PortfolioOptimizationService()
+        
+        # Per-stage timing and memory of the last run
+        self.profiler = StageProfiler("portfolio_optimizations")
     
     def run_optimizations(
         self,
@@ -43,57 +61,77 @@ class PortfolioOptimizationOrchestrator:
         """
         start_time = time.time()
         self.logger.info(f"Starting optimizations: {selected_optimizations}")
+        self.profiler.reset()
         
         try:
-            # Step 1: Validate and clean data
-            cleaned_sheets = self._validate_and_clean(all_sheets)
-            
-            # Step 2: Get ordered strategies
+            # Step 1: Get ordered strategies
             ordered_strategies = self.factory.get_ordered_strategies(selected_optimizations)
             
-            # Step 3: Run each strategy
+            # Step 2: Validate and clean data (only the columns the strategies read)
+            with self.profiler.stage("clean", all_sheets) as stage:
+                cleaned_sheets = self._validate_and_clean(
+                    all_sheets, self._get_content_columns(ordered_strategies)
+                )
+                stage.set_output(cleaned_sheets)
+            
+            # Step 3: Run the strategies, independent ones concurrently
             optimization_results = []
             failed_optimizations = []
             optimization_details = {}
             additional_sheets = {}  # Track additional sheets created by strategies
             
-            for strategy_name in ordered_strategies:
-                try:
-                    result, strategy = self._run_single_optimization(strategy_name, cleaned_sheets)
-                    if result:
-                        optimization_results.append(result)
+            for batch in self.factory.get_execution_batches(ordered_strategies):
+                batch_sheets = dict(cleaned_sheets)
+                outcomes = self._run_batch(batch, batch_sheets)
+                
+                # Apply the outcomes in execution order, as a sequential run would
+                for strategy_name, (result, strategy, strategy_sheets, error) in zip(batch, outcomes):
+                    # Sheets the strategy replaced or created in its snapshot (kept even if it failed later)
+                    for sheet_name, sheet_df in strategy_sheets.items():
+                        if batch_sheets.get(sheet_name) is not sheet_df:
+                            cleaned_sheets[sheet_name] = sheet_df
+                    
+                    if error is not None:
+                        self.logger.error(f"Optimization {strategy_name} failed: {str(error)}")
+                        failed_optimizations.append(strategy_name)
                         optimization_details[strategy_name] = {
-                            "status": "success",
-                            "metrics": result.metrics,
-                            "messages": result.messages
+                            "status": "failed",
+                            "error": str(error)
                         }
-                        
-                        # Check if strategy created additional sheets or modified existing ones
-                        if hasattr(strategy, 'get_updated_sheets'):
-                            updated_sheets = strategy.get_updated_sheets()
-                            for sheet_name, sheet_df in updated_sheets.items():
-                                if sheet_name not in cleaned_sheets:
-                                    # New sheet created by strategy
-                                    additional_sheets[sheet_name] = sheet_df
-                                    self.logger.info(f"Strategy {strategy_name} created additional sheet: {sheet_name}")
-                                else:
-                                    # Existing sheet modified by strategy - replace it
-                                    cleaned_sheets[sheet_name] = sheet_df
-                                    self.logger.info(f"Strategy {strategy_name} modified existing sheet: {sheet_name}")
-                                    
-                except Exception as e:
-                    self.logger.error(f"Optimization {strategy_name} failed: {str(e)}")
-                    failed_optimizations.append(strategy_name)
+                        continue
+                    
+                    # Rows the strategy moves between sheets, visible to later batches
+                    if result.moves:
+                        self.results_manager.apply_row_moves(cleaned_sheets, result.moves)
+                    
+                    optimization_results.append(result)
                     optimization_details[strategy_name] = {
-                        "status": "failed",
-                        "error": str(e)
+                        "status": "success",
+                        "metrics": result.metrics,
+                        "messages": result.messages
                     }
+                    
+                    # Check if strategy created additional sheets or modified existing ones
+                    if hasattr(strategy, 'get_updated_sheets'):
+                        output_sheets = strategy.get_output_sheets()
+                        updated_sheets = strategy.get_updated_sheets()
+                        for sheet_name, sheet_df in updated_sheets.items():
+                            if sheet_name not in cleaned_sheets:
+                                # New sheet created by strategy
+                                additional_sheets[sheet_name] = sheet_df
+                                self.logger.info(f"Strategy {strategy_name} created additional sheet: {sheet_name}")
+                            elif output_sheets is None or sheet_name in output_sheets:
+                                # Existing sheet modified by strategy - replace it
+                                cleaned_sheets[sheet_name] = sheet_df
+                                self.logger.info(f"Strategy {strategy_name} modified existing sheet: {sheet_name}")
             
             # Step 4: Merge results
-            merged_data, merge_report = self.results_manager.merge_all(
-                cleaned_sheets,
-                optimization_results
-            )
+            with self.profiler.stage("merge", cleaned_sheets) as stage:
+                merged_data, merge_report = self.results_manager.merge_all(
+                    cleaned_sheets,
+                    optimization_results
+                )
+                stage.set_output(merged_data)
             
             # Step 4b: Add any additional sheets created by strategies
             merged_data.update(additional_sheets)
@@ -115,6 +153,7 @@ class PortfolioOptimizationOrchestrator:
             
             # Add conflict summary for UI display
             run_report.conflict_summary = conflict_summary
+            run_report.merge_timings = merge_report["timings"]
             
             self.logger.info(f"Optimizations complete in {execution_time:.2f} seconds")
             return merged_data, run_report
@@ -123,12 +162,17 @@ class PortfolioOptimizationOrchestrator:
             self.logger.error(f"Orchestration failed: {str(e)}")
             raise OptimizationError(f"Orchestration failed: {str(e)}")
     
-    def _validate_and_clean(self, all_sheets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    def _validate_and_clean(
+        self,
+        all_sheets: Dict[str, pd.DataFrame],
+        content_columns: Optional[Dict[str, Set[str]]] = None
+    ) -> Dict[str, pd.DataFrame]:
         """
         Validate and clean the input data.
         
         Args:
             all_sheets: Raw input data
+            content_columns: Input sheet name -> columns to content-clean (None cleans all)
             
         Returns:
             Cleaned and restructured data
@@ -142,7 +186,7 @@ class PortfolioOptimizationOrchestrator:
                 raise ValidationError(ERROR_MESSAGES["missing_sheet"].format(sheet))
         
         # Step 2: Clean data content (remove extra spaces, convert types)
-        content_cleaned = self._clean_data_content(all_sheets)
+        content_cleaned = self._clean_data_content(all_sheets, content_columns)
         
         # Step 3: Restructure data according to preprocessing logic
         structure_cleaned = clean_data_structure(content_cleaned)
@@ -153,35 +197,98 @@ class PortfolioOptimizationOrchestrator:
         self.logger.info(SUCCESS_MESSAGES["structure_cleaning_complete"])
         return structure_cleaned
     
-    def _clean_data_content(self, all_sheets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    def _get_content_columns(self, strategy_names: List[str]) -> Optional[Dict[str, Set[str]]]:
+        """
+        Columns to content-clean per input sheet for the given strategies.
+        
+        Args:
+            strategy_names: Strategies that will run
+            
+        Returns:
+            Input sheet name -> columns (the key columns plus every declared column),
+            or None if a strategy does not declare its columns
+        """
+        content_columns = {
+            sheet: set(CONTENT_KEY_COLUMNS) for sheet in set(CLEANED_SHEET_SOURCES.values())
+        }
+        for strategy_name in strategy_names:
+            strategy = self.factory.create_strategy(strategy_name)
+            required_columns = strategy.get_required_columns() if strategy else None
+            if required_columns is None:
+                return None
+            
+            for sheet_name, columns in required_columns.items():
+                source_sheet = CLEANED_SHEET_SOURCES.get(sheet_name, sheet_name)
+                content_columns.setdefault(source_sheet, set()).update(columns)
+        
+        return content_columns
+    
+    def _clean_data_content(
+        self,
+        all_sheets: Dict[str, pd.DataFrame],
+        content_columns: Optional[Dict[str, Set[str]]] = None
+    ) -> Dict[str, pd.DataFrame]:
         """
         Clean data content (spaces, types) without changing structure.
         
         Args:
             all_sheets: Input data
+            content_columns: Input sheet name -> columns to clean (None cleans all)
             
         Returns:
             Content-cleaned data
         """
-        cleaned = {}
-        for sheet_name, df in all_sheets.items():
-            cleaned_df = df.copy()
-            
-            # Clean string columns and remove .0 suffixes from numeric strings
-            for col in cleaned_df.columns:
-                if cleaned_df[col].dtype == 'object':
-                    cleaned_df[col] = cleaned_df[col].astype(str).str.strip()
-                    cleaned_df[col] = cleaned_df[col].replace('nan', '')
-                    
-                    # Remove .0 suffix from numeric strings (like "1.0" -> "1", "20250830.0" -> "20250830")
-                    mask = cleaned_df[col].str.endswith('.0') & cleaned_df[col].str.replace('.0', '').str.replace('-', '').str.isdigit()
-                    cleaned_df.loc[mask, col] = cleaned_df.loc[mask, col].str.replace('.0', '')
-            
-            cleaned[sheet_name] = cleaned_df
+        cleaned = clean_data_content(all_sheets, content_columns)
         
         self.logger.info(SUCCESS_MESSAGES["cleaning_complete"])
         return cleaned
     
+    def _run_batch(
+        self,
+        batch: List[str],
+        batch_sheets: Dict[str, pd.DataFrame]
+    ) -> List[Tuple[Optional[OptimizationResult], Any, Dict[str, pd.DataFrame], Optional[Exception]]]:
+        """
+        Run a batch of independent strategies, concurrently if allowed.
+        
+        Each strategy keeps its own profiler stage for timing. Memory is only
+        measured process wide, so stages of strategies that ran at the same
+        time are recorded with memory_overlapped=True and no memory figures
+        (see StageProfiler); run with max_workers=1 to profile their memory.
+        
+        Args:
+            batch: Strategy names (see factory.get_execution_batches)
+            batch_sheets: Sheets at the start of the batch; not modified
+            
+        Returns:
+            (result, strategy, sheets after the run, error) per strategy, in batch order
+        """
+        workers = min(self.max_workers, len(batch))
+        if workers <= 1:
+            return [self._run_isolated(strategy_name, batch_sheets) for strategy_name in batch]
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self._run_isolated, strategy_name, batch_sheets)
+                for strategy_name in batch
+            ]
+            return [future.result() for future in futures]
+    
+    def _run_isolated(
+        self,
+        strategy_name: str,
+        batch_sheets: Dict[str, pd.DataFrame]
+    ) -> Tuple[Optional[OptimizationResult], Any, Dict[str, pd.DataFrame], Optional[Exception]]:
+        """Run one strategy on its own snapshot of the sheet dictionary; never raises."""
+        # Strategies copy the DataFrames they modify, so a shallow snapshot is enough
+        sheets = dict(batch_sheets)
+        try:
+            with self.profiler.stage(strategy_name, batch_sheets):
+                result, strategy = self._run_single_optimization(strategy_name, sheets)
+            return result, strategy, sheets, None
+        except Exception as e:
+            return None, None, sheets, e
+    
     def _run_single_optimization(
         self,
         strategy_name: str,
@@ -225,4 +332,5 @@ class PortfolioOptimizationOrchestrator:
         Returns:
             Bytes of the Excel file
         """
-        return self.service.create_output_file(merged_data, updated_indices)
\ No newline at end of file
+        with self.profiler.stage("output", merged_data):
+            return self.service.create_output_file(merged_data, updated_indices)
\ No newline at end of file
@@ -3,9 +3,11 @@
 from .ads_count_processor import AdsCountProcessor
 from .asin_matcher import AsinMatcher
 from .top_campaigns_processor import TopCampaignsProcessor
+from .lookup_index import LookupIndex
 
 __all__ = [
     'AdsCountProcessor',
     'AsinMatcher', 
-    'TopCampaignsProcessor'
+    'TopCampaignsProcessor',
+    'LookupIndex'
 ]
\ No newline at end of file
@@ -2,13 +2,15 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Optional
 import logging
 from ..constants import (
     SHEET_CAMPAIGNS_CLEANED, SHEET_PRODUCT_AD,
     COL_ENTITY, COL_CAMPAIGN_ID, COL_PORTFOLIO_NAME_INFO, COL_OPERATION,
     ENTITY_CAMPAIGN, ENTITY_PRODUCT_AD
 )
+from .lookup_index import LookupIndex
+from ..sheet_store import SheetStore, take_rows
 
 COL_ADS_COUNT = "Ads Count"
 
@@ -25,7 +27,11 @@ class AdsCountProcessor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
-    def process(self, all_sheets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    def process(
+        self,
+        all_sheets: Dict[str, pd.DataFrame],
+        product_ad_index: Optional[LookupIndex] = None
+    ) -> Dict[str, pd.DataFrame]:
         """
         Process Ads Count column and apply filtering logic.
         
@@ -35,16 +41,16 @@ class AdsCountProcessor:
         
         Args:
             all_sheets: Dictionary of sheet name to DataFrame
+            product_ad_index: Campaign ID index over the Product Ad sheet,
+                built here when not supplied
             
         Returns:
             Updated sheets with Ads Count column and filtered rows
         """
         self.logger.info("Starting Ads Count processing")
         
-        # Work on copies
-        updated_sheets = {}
-        for sheet_name, df in all_sheets.items():
-            updated_sheets[sheet_name] = df.copy()
+        # Work on views; only whole columns are added to the Campaign sheet
+        updated_sheets = SheetStore(all_sheets).views()
         
         campaigns_df = updated_sheets[SHEET_CAMPAIGNS_CLEANED]
         product_ad_df = updated_sheets.get(SHEET_PRODUCT_AD)
@@ -52,8 +58,11 @@ class AdsCountProcessor:
         if product_ad_df is None:
             raise ValueError(f"Required sheet {SHEET_PRODUCT_AD} not found")
         
+        if product_ad_index is None:
+            product_ad_index = LookupIndex.for_product_ads(product_ad_df)
+        
         # Step 3: Add Ads Count column and populate with COUNTIFS logic
-        self._add_ads_count_column(campaigns_df, product_ad_df)
+        self._add_ads_count_column(campaigns_df, product_ad_index)
         
         # Filter rows based on Ads Count and ignore rules
         campaigns_df_filtered = self._filter_by_ads_count(campaigns_df)
@@ -70,7 +79,7 @@ class AdsCountProcessor:
         self.logger.info(f"Ads Count processing complete: {len(campaigns_df)} -> {len(campaigns_df_final)} rows")
         return updated_sheets
     
-    def _add_ads_count_column(self, campaigns_df: pd.DataFrame, product_ad_df: pd.DataFrame) -> None:
+    def _add_ads_count_column(self, campaigns_df: pd.DataFrame, product_ad_index: LookupIndex) -> None:
         """Add Ads Count column to the right of Campaign ID column."""
         self.logger.info("Adding Ads Count column with COUNTIFS logic")
         
@@ -81,21 +90,10 @@ class AdsCountProcessor:
         # Insert Ads Count column to the right of Campaign ID
         campaigns_df.insert(campaign_id_col_idx + 1, COL_ADS_COUNT, 0)
         
-        # Filter Product Ad sheet to only Product Ad entities
-        product_ads = product_ad_df[product_ad_df[COL_ENTITY] == ENTITY_PRODUCT_AD].copy()
-        
-        # Calculate COUNTIFS for each campaign row
-        for idx, row in campaigns_df.iterrows():
-            if row[COL_ENTITY] == ENTITY_CAMPAIGN:
-                campaign_id = str(row[COL_CAMPAIGN_ID])
-                
-                # Count occurrences in Product Ad sheet with same Campaign ID
-                matching_ads = product_ads[
-                    product_ads[COL_CAMPAIGN_ID].astype(str) == campaign_id
-                ]
-                count = len(matching_ads)
-                
-                campaigns_df.at[idx, COL_ADS_COUNT] = count
+        # COUNTIFS for campaign rows: Product Ads with the same Campaign ID
+        is_campaign = campaigns_df[COL_ENTITY] == ENTITY_CAMPAIGN
+        counts = product_ad_index.count(campaigns_df[COL_CAMPAIGN_ID])
+        campaigns_df[COL_ADS_COUNT] = counts.where(is_campaign, 0)
     
     def _filter_by_ads_count(self, campaigns_df: pd.DataFrame) -> pd.DataFrame:
         """Filter rows based on Ads Count and ignore rules."""
@@ -108,7 +106,7 @@ class AdsCountProcessor:
         delete_mask = (campaigns_df[COL_ADS_COUNT] > 1) & (~ignore_mask)
         
         # Keep rows that are not marked for deletion
-        filtered_df = campaigns_df[~delete_mask].copy()
+        filtered_df = take_rows(campaigns_df, ~delete_mask)
         
         self.logger.info(f"Filtered {delete_mask.sum()} rows with Ads Count > 1 (ignored {ignore_mask.sum()} rows)")
         return filtered_df
@@ -129,4 +127,4 @@ class AdsCountProcessor:
         self.logger.info(f"Step 4 complete: {pattern_ignore_count} rows with patterns {DELETE_PATTERNS} will be ignored (kept but excluded from transformations)")
         
         # Return all campaigns - no deletion in Step 4 anymore
-        return campaigns_df.copy()
\ No newline at end of file
+        return campaigns_df
\ No newline at end of file
@@ -2,13 +2,15 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
 from ..constants import (
     SHEET_CAMPAIGNS_CLEANED, SHEET_PRODUCT_AD,
     COL_ENTITY, COL_CAMPAIGN_ID, COL_OPERATION,
     ENTITY_CAMPAIGN, ENTITY_PRODUCT_AD
 )
+from .lookup_index import LookupIndex
+from ..sheet_store import SheetStore
 
 COL_ASIN_PA = "ASIN PA"
 COL_ASIN = "ASIN"
@@ -20,7 +22,11 @@ class AsinMatcher:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
-    def process(self, all_sheets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    def process(
+        self,
+        all_sheets: Dict[str, pd.DataFrame],
+        product_ad_index: Optional[LookupIndex] = None
+    ) -> Dict[str, pd.DataFrame]:
         """
         Add ASIN PA column to Campaign sheet with VLOOKUP logic.
         
@@ -29,16 +35,16 @@ class AsinMatcher:
         
         Args:
             all_sheets: Dictionary of sheet name to DataFrame
+            product_ad_index: Campaign ID index over the Product Ad sheet,
+                built here when not supplied
             
         Returns:
             Updated sheets with ASIN PA column added
         """
         self.logger.info("Starting ASIN matching process")
         
-        # Work on copies
-        updated_sheets = {}
-        for sheet_name, df in all_sheets.items():
-            updated_sheets[sheet_name] = df.copy()
+        # Work on views; only whole columns are added to the Campaign sheet
+        updated_sheets = SheetStore(all_sheets).views()
         
         campaigns_df = updated_sheets[SHEET_CAMPAIGNS_CLEANED]
         product_ad_df = updated_sheets.get(SHEET_PRODUCT_AD)
@@ -46,13 +52,16 @@ class AsinMatcher:
         if product_ad_df is None:
             raise ValueError(f"Required sheet {SHEET_PRODUCT_AD} not found")
         
+        if product_ad_index is None:
+            product_ad_index = LookupIndex.for_product_ads(product_ad_df)
+        
         # Add ASIN PA column
-        self._add_asin_pa_column(campaigns_df, product_ad_df)
+        self._add_asin_pa_column(campaigns_df, product_ad_index)
         
         self.logger.info("ASIN matching process complete")
         return updated_sheets
     
-    def _add_asin_pa_column(self, campaigns_df: pd.DataFrame, product_ad_df: pd.DataFrame) -> None:
+    def _add_asin_pa_column(self, campaigns_df: pd.DataFrame, product_ad_index: LookupIndex) -> None:
         """Add ASIN PA column to match expected column order."""
         self.logger.info("Adding ASIN PA column with VLOOKUP logic")
         
@@ -71,31 +80,13 @@ class AsinMatcher:
         
         campaigns_df.insert(asin_pa_position, COL_ASIN_PA, "")
         
-        # Create lookup dictionary from Product Ad sheet for faster matching
-        product_ads = product_ad_df[product_ad_df[COL_ENTITY] == ENTITY_PRODUCT_AD].copy()
-        
-        # Create Campaign ID -> ASIN mapping
-        asin_lookup = {}
-        for idx, row in product_ads.iterrows():
-            campaign_id = str(row[COL_CAMPAIGN_ID])
-            asin = str(row[COL_ASIN]) if pd.notna(row[COL_ASIN]) else ""
-            
-            # If multiple ASINs for same campaign, take the first one (VLOOKUP behavior)
-            if campaign_id not in asin_lookup:
-                asin_lookup[campaign_id] = asin
+        # VLOOKUP: first Product Ad ASIN for each campaign's Campaign ID
+        is_campaign = campaigns_df[COL_ENTITY] == ENTITY_CAMPAIGN
+        asins = product_ad_index.first(campaigns_df[COL_CAMPAIGN_ID], COL_ASIN)
+        asins = asins.astype(str).where(asins.notna(), "")
+        campaigns_df[COL_ASIN_PA] = asins.where(is_campaign, "")
         
-        # Apply VLOOKUP logic to each campaign row
-        matches_found = 0
-        for idx, row in campaigns_df.iterrows():
-            if row[COL_ENTITY] == ENTITY_CAMPAIGN:
-                campaign_id = str(row[COL_CAMPAIGN_ID])
-                
-                # Look up ASIN for this Campaign ID
-                asin = asin_lookup.get(campaign_id, "")
-                campaigns_df.at[idx, COL_ASIN_PA] = asin
-                
-                if asin:
-                    matches_found += 1
+        matches_found = int((is_campaign & (asins != "")).sum())
         
         self.logger.info(f"ASIN PA column added: {matches_found} ASIN matches found")
         
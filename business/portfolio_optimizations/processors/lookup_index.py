@@ -0,0 +1,107 @@
+"""Keyed lookup index for COUNTIFS / VLOOKUP steps in portfolio optimizations."""
+
+import pandas as pd
+import numpy as np
+from typing import Callable, Dict, Optional
+import logging
+from ..constants import (
+    COL_ENTITY, COL_CAMPAIGN_ID, COL_PORTFOLIO_ID, ENTITY_CAMPAIGN, ENTITY_PRODUCT_AD
+)
+
+
+_INT64_LIMIT = 2.0 ** 63
+
+
+def normalize_text_key(values: pd.Series) -> pd.Series:
+    """Normalize keys the way str(value) does (Campaign ID lookups)."""
+    return values.astype(str)
+
+
+def normalize_id_key(values: pd.Series) -> pd.Series:
+    """
+    Normalize numeric IDs the way str(int(float(value))) does.
+
+    Empty cells become '' and values that are not numeric are kept as
+    stripped strings (Portfolio ID lookups).
+    """
+    text = values.astype(str).str.strip()
+    empty = values.isna() | (text == '')
+
+    numbers = pd.to_numeric(text.where(~empty), errors='coerce')
+    is_number = numbers.notna() & np.isfinite(numbers)
+
+    normalized = text.where(~empty, '')
+    if is_number.any():
+        normalized = normalized.copy()
+        # Parse with float() semantics (to_numeric rounds some long decimals differently)
+        whole = np.trunc(text[is_number].astype(float).to_numpy())
+        strings = np.empty(len(whole), dtype=object)
+        small = np.abs(whole) < _INT64_LIMIT
+        strings[small] = whole[small].astype('int64').astype(str)
+        # int64 would wrap around; Python int is exact
+        strings[~small] = [str(int(value)) for value in whole[~small]]
+        normalized[is_number] = strings
+
+    return normalized
+
+
+class LookupIndex:
+    """
+    One-pass index from a normalized key column to its rows.
+
+    The source sheet is grouped once; COUNTIFS and VLOOKUP style lookups for
+    any number of keys are then answered with a hash join instead of a scan
+    of the source sheet per key.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        key_column: str,
+        entity: Optional[str] = None,
+        normalizer: Callable[[pd.Series], pd.Series] = normalize_text_key
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.key_column = key_column
+        self.normalizer = normalizer
+
+        # Restrict to one Entity type when requested
+        source = df if entity is None else df[df[COL_ENTITY] == entity]
+        self._source = source
+        self._keys = normalizer(source[key_column])
+
+        # COUNTIFS: key -> number of rows
+        self._counts = self._keys.value_counts()
+
+        # VLOOKUP: value column -> (key -> first value), built on demand
+        self._first_values: Dict[str, pd.Series] = {}
+
+        self.logger.info(
+            f"Lookup index built on '{key_column}': {len(source)} rows, {len(self._counts)} keys"
+        )
+
+    @classmethod
+    def for_product_ads(cls, product_ad_df: pd.DataFrame) -> "LookupIndex":
+        """Index Product Ad rows by Campaign ID."""
+        return cls(product_ad_df, COL_CAMPAIGN_ID, entity=ENTITY_PRODUCT_AD)
+
+    @classmethod
+    def for_campaign_portfolios(cls, campaigns_df: pd.DataFrame) -> "LookupIndex":
+        """Index Campaign rows by Portfolio ID."""
+        return cls(campaigns_df, COL_PORTFOLIO_ID, entity=ENTITY_CAMPAIGN, normalizer=normalize_id_key)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def count(self, keys: pd.Series) -> pd.Series:
+        """COUNTIFS: number of indexed rows for each key (0 when absent)."""
+        counts = self.normalizer(keys).map(self._counts)
+        return counts.fillna(0).astype('int64')
+
+    def first(self, keys: pd.Series, value_column: str) -> pd.Series:
+        """VLOOKUP: value of the first indexed row for each key (NaN when absent)."""
+        if value_column not in self._first_values:
+            values = pd.Series(self._source[value_column].to_numpy(), index=self._keys.to_numpy())
+            self._first_values[value_column] = values[~values.index.duplicated(keep='first')]
+
+        return self.normalizer(keys).map(self._first_values[value_column])
@@ -7,8 +7,9 @@ import logging
 from ..constants import (
     SHEET_CAMPAIGNS_CLEANED, COL_ENTITY, COL_OPERATION, ENTITY_CAMPAIGN,
     COL_PORTFOLIO_ID, COL_PORTFOLIO_NAME_INFO, OPERATION_UPDATE,
-    ORGANIZE_TOP_CAMPAIGNS_PORTFOLIO_ID
+    ORGANIZE_TOP_CAMPAIGNS_PORTFOLIO_ID, SHEET_TOP_CAMPAIGNS
 )
+from ..sheet_store import SheetStore, take_rows
 
 COL_ASIN_PA = "ASIN PA"
 COL_TOP = "Top"
@@ -49,10 +50,10 @@ class TopCampaignsProcessor:
         if self.template_data is None:
             raise ValueError("Template data not set. Call set_template_data() first.")
         
-        # Work on copies
-        updated_sheets = {}
-        for sheet_name, df in all_sheets.items():
-            updated_sheets[sheet_name] = df.copy()
+        # Work on views; Step 6 updates Portfolio ID and Operation in place
+        updated_sheets = SheetStore(all_sheets).views(
+            {SHEET_CAMPAIGNS_CLEANED: [COL_PORTFOLIO_ID, COL_OPERATION]}
+        )
         
         campaigns_df = updated_sheets[SHEET_CAMPAIGNS_CLEANED]
         
@@ -226,11 +227,11 @@ class TopCampaignsProcessor:
             (campaigns_df[COL_OPERATION] == OPERATION_UPDATE)
         )
         
-        edited_campaigns = campaigns_df[edited_campaigns_mask].copy()
-        remaining_campaigns = campaigns_df[~edited_campaigns_mask].copy()
+        edited_campaigns = take_rows(campaigns_df, edited_campaigns_mask)
+        remaining_campaigns = take_rows(campaigns_df, ~edited_campaigns_mask)
         
         # Create Top Campaigns sheet with edited campaigns
-        all_sheets["Top Campaigns"] = edited_campaigns
+        all_sheets[SHEET_TOP_CAMPAIGNS] = edited_campaigns
         
         # Update Campaign sheet to remove edited campaigns
         all_sheets[SHEET_CAMPAIGNS_CLEANED] = remaining_campaigns
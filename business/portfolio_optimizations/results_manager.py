@@ -5,7 +5,8 @@ import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
 import logging
 import time
-from .contracts import OptimizationResult, MergeConflict, MergeError
+from .contracts import OptimizationResult, MergeConflict, MergeError, PatchData, ColumnarPatch, RowMove
+from .sheet_store import SheetStore, take_rows
 from .constants import (
     PROTECTED_COLUMNS,
     CONDITIONALLY_PROTECTED_COLUMNS,
@@ -23,6 +24,11 @@ class ResultsManager:
         self.logger = logging.getLogger(__name__)
         self.conflicts = []
         self.updated_indices = {}
+        # (sheet, key column) -> (row index the lookup was built for, key -> row labels)
+        self.row_indexes = {}
+        # (sheet, key column) -> (row index the lookup was built for, key column as string Index)
+        self.key_indexes = {}
+        self.index_build_seconds = 0.0
 
     def merge_all(
         self,
@@ -45,9 +51,13 @@ class ResultsManager:
         # Reset tracking
         self.conflicts = []
         self.updated_indices = {sheet: set() for sheet in original_data.keys()}
+        self.row_indexes = {}
+        self.key_indexes = {}
+        self.index_build_seconds = 0.0
+        patch_timings = []
 
-        # Create working copy
-        merged_data = {sheet: df.copy() for sheet, df in original_data.items()}
+        # Views of the original sheets with private copies of the patched columns
+        merged_data = SheetStore(original_data).views(self._patched_columns(optimization_results))
 
         # Track statistics
         total_cells_updated = 0
@@ -59,20 +69,31 @@ class ResultsManager:
                 f"Applying result {i + 1}/{len(optimization_results)}: {result.result_type}"
             )
 
+            patch_start = time.time()
+            index_seconds_before = self.index_build_seconds
+
             cells_updated = self._apply_patch(
                 merged_data, result.patch, result.merge_keys, optimization_index=i, result_type=result.result_type
             )
 
             total_cells_updated += cells_updated
 
+            # Split patch time into row index building and applying updates
+            index_seconds = self.index_build_seconds - index_seconds_before
+            patch_timings.append({
+                "result_type": result.result_type,
+                "sheet_name": result.patch.sheet_name,
+                "updates": result.patch.update_count,
+                "index_build_seconds": index_seconds,
+                "patch_seconds": time.time() - patch_start - index_seconds,
+            })
+
         # Count total unique rows updated
         for sheet, indices in self.updated_indices.items():
             total_rows_updated += len(indices)
 
-        # Create Terminal sheet if campaigns were modified
-        print("TERMINAL DEBUG: About to call _create_terminal_sheet_if_needed")
-        self._create_terminal_sheet_if_needed(merged_data, optimization_results)
-        print("TERMINAL DEBUG: Finished calling _create_terminal_sheet_if_needed")
+        self.row_indexes = {}
+        self.key_indexes = {}
 
         # Check time limit
         elapsed_time = time.time() - start_time
@@ -88,6 +109,11 @@ class ResultsManager:
                 sheet: list(indices) for sheet, indices in self.updated_indices.items()
             },
             "merge_time_seconds": elapsed_time,
+            "timings": {
+                "index_build_seconds": self.index_build_seconds,
+                "patch_seconds": sum(t["patch_seconds"] for t in patch_timings),
+                "patches": patch_timings,
+            },
         }
 
         # Fix column order for Portfolios sheet to match expected file format
@@ -98,10 +124,24 @@ class ResultsManager:
         )
         return merged_data, merge_report
 
+    @staticmethod
+    def _patched_columns(optimization_results: List[OptimizationResult]) -> Dict[str, set]:
+        """Sheet name -> columns the results' patches write."""
+        patched: Dict[str, set] = {}
+        for result in optimization_results:
+            patch = result.patch
+            columns = patched.setdefault(patch.sheet_name, set())
+            if isinstance(patch, ColumnarPatch):
+                columns.update(patch.columns)
+            else:
+                for update in patch.updates:
+                    columns.update(update.cell_changes)
+        return patched
+
     def _apply_patch(
         self,
         data: Dict[str, pd.DataFrame],
-        patch: Any,  # PatchData
+        patch: Any,  # PatchData or ColumnarPatch
         merge_keys: List[str],
         optimization_index: int,
         result_type: str = None,
@@ -127,10 +167,13 @@ class ResultsManager:
 
         df = data[sheet_name]
 
+        if isinstance(patch, ColumnarPatch):
+            return self._apply_columnar_patch(df, patch, result_type)
+
         for update in patch.updates:
             # Find the row to update
             row_idx = self._find_row(
-                df, update.key_column, update.key_value, update.row_index
+                df, update.key_column, update.key_value, update.row_index, sheet_name=sheet_name
             )
 
             if row_idx is None:
@@ -141,19 +184,9 @@ class ResultsManager:
 
             # Apply cell changes
             for column, new_value in update.cell_changes.items():
-                # Check if column is protected
-                if column in PROTECTED_COLUMNS:
-                    self.logger.warning(f"Skipping protected column: {column}")
+                # Skip protected and conditionally protected columns
+                if not self._is_column_writable(column, result_type):
                     continue
-                
-                # Check if column is conditionally protected
-                if column in CONDITIONALLY_PROTECTED_COLUMNS:
-                    # Allow Portfolio ID updates for campaigns_without_portfolios optimization
-                    if column == COL_PORTFOLIO_ID and result_type == "campaigns":
-                        self.logger.info(f"Allowing Portfolio ID update for campaigns optimization")
-                    else:
-                        self.logger.warning(f"Skipping conditionally protected column: {column} for result_type: {result_type}")
-                        continue
 
                 if column not in df.columns:
                     # Add new column if it doesn't exist
@@ -176,28 +209,11 @@ class ResultsManager:
                             resolution="last_wins",
                         )
                         self.conflicts.append(conflict)
-                        
-                        # Enhanced conflict logging with user-friendly messages
-                        if column == "Portfolio Name":
-                            self.logger.info(
-                                f"⚠️  Portfolio naming conflict: Row {row_idx+1} portfolio name changed "
-                                f"from '{old_value}' to '{new_value}' (last optimization wins)"
-                            )
-                        elif column == "Portfolio ID":
-                            self.logger.info(
-                                f"⚠️  Portfolio assignment conflict: Row {row_idx+1} campaign moved "
-                                f"from portfolio '{old_value}' to '{new_value}' (last optimization wins)"
-                            )
-                        elif column == "Operation":
-                            self.logger.info(
-                                f"⚠️  Operation conflict: Row {row_idx+1} operation changed "
-                                f"from '{old_value}' to '{new_value}' (last optimization wins)"
-                            )
-                        else:
-                            self.logger.info(
-                                f"⚠️  Data conflict: Row {row_idx+1} {column} changed "
-                                f"from '{old_value}' to '{new_value}' (last optimization wins)"
-                            )
+                        self._log_conflict(conflict)
+
+                # Rewriting a key column makes its row index stale
+                self.row_indexes.pop((sheet_name, column), None)
+                self.key_indexes.pop((sheet_name, column), None)
 
                 # Apply update with proper dtype handling to eliminate pandas warnings
                 try:
@@ -205,18 +221,7 @@ class ResultsManager:
                     if df[column].dtype != 'object':
                         df[column] = df[column].astype('object')
                     
-                    # Apply update with special formatting for numeric fields
-                    if new_value is None or new_value == "":
-                        df.at[row_idx, column] = ""
-                    else:
-                        # Convert to string and handle numeric formatting
-                        str_value = str(new_value)
-                        
-                        # Remove .0 suffix from numeric values
-                        if str_value.endswith('.0') and str_value.replace('.0', '').replace('-', '').isdigit():
-                            str_value = str_value.replace('.0', '')
-                        
-                        df.at[row_idx, column] = str_value
+                    df.at[row_idx, column] = self._format_cell_value(new_value)
                         
                 except Exception as e:
                     # Fallback: force string conversion with .0 removal
@@ -232,12 +237,184 @@ class ResultsManager:
 
         return cells_updated
 
+    def _apply_columnar_patch(
+        self,
+        df: pd.DataFrame,
+        patch: ColumnarPatch,
+        result_type: str = None,
+    ) -> int:
+        """
+        Apply a columnar patch with one aligned assignment per column.
+
+        Produces the same cells, conflicts and updated_indices as applying the
+        equivalent CellUpdate list row by row.
+
+        Args:
+            df: Sheet to update (modified in place)
+            patch: Columnar patch to apply
+            result_type: Result type of the optimization (for protected columns)
+
+        Returns:
+            Number of cells updated
+        """
+        sheet_name = patch.sheet_name
+
+        # Resolve all target rows with one lookup on the key column index
+        key_index = self._get_key_index(sheet_name, df, patch.key_column)
+        if key_index is not None and key_index.is_unique:
+            keys = pd.Series(patch.keys, dtype=object).astype(str)
+            positions = key_index.get_indexer(keys)
+            found = positions >= 0
+            labels = df.index[positions[found]]
+        else:
+            # Missing or duplicated keys in the sheet: per-key lookup (expected row, else first match)
+            row_indices = patch.row_indices if patch.row_indices is not None else [None] * len(patch.keys)
+            targets = [
+                self._find_row(df, patch.key_column, key, expected, sheet_name=sheet_name)
+                for key, expected in zip(patch.keys, row_indices)
+            ]
+            found = np.array([target is not None for target in targets], dtype=bool)
+            labels = pd.Index([target for target in targets if target is not None])
+
+        if not found.all():
+            self.logger.warning(
+                f"Rows not found for {int((~found).sum())} {patch.key_column} keys in {sheet_name}"
+            )
+
+        if labels.has_duplicates:
+            # Several keys resolve to one row: keep the sequential last-wins semantics
+            return self._apply_patch(
+                {sheet_name: df},
+                PatchData(sheet_name=sheet_name, updates=patch.updates),
+                [patch.key_column],
+                optimization_index=-1,
+                result_type=result_type,
+            )
+
+        updated = self.updated_indices[sheet_name]
+        # Rows already updated by an earlier patch or an earlier column of this one
+        touched = labels.isin(updated)
+        cells_updated = 0
+
+        for column, values in patch.columns.items():
+            if not self._is_column_writable(column, result_type):
+                continue
+
+            mask = found.copy()
+            if column in patch.masks:
+                mask &= patch.masks[column]
+            row_mask = mask[found]
+            if not row_mask.any():
+                continue
+
+            column_labels = labels[row_mask]
+            new_values = values[mask]
+
+            if column not in df.columns:
+                # Add new column if it doesn't exist
+                self.logger.info(f"Adding new column {column} to sheet {sheet_name}")
+                df[column] = ""
+
+            # Conflict detection as a masked comparison against current values
+            old_values = df.loc[column_labels, column].to_numpy(dtype=object)
+            changed = pd.notna(old_values) & (old_values != new_values) & (old_values != "")
+            for i in np.flatnonzero(changed & touched[row_mask]):
+                conflict = MergeConflict(
+                    sheet_name=sheet_name,
+                    row_index=column_labels[i],
+                    column_name=column,
+                    first_value=old_values[i],
+                    second_value=new_values[i],
+                    resolution="last_wins",
+                )
+                self.conflicts.append(conflict)
+                self._log_conflict(conflict)
+
+            # Rewriting a key column makes its row index stale
+            self.row_indexes.pop((sheet_name, column), None)
+            self.key_indexes.pop((sheet_name, column), None)
+
+            if df[column].dtype != 'object':
+                df[column] = df[column].astype('object')
+            formatted = np.empty(len(new_values), dtype=object)
+            formatted[:] = [self._format_cell_value(value) for value in new_values]
+            df.loc[column_labels, column] = formatted
+
+            cells_updated += len(column_labels)
+            touched |= row_mask
+            updated.update(column_labels.tolist())
+
+        return cells_updated
+
+    def _is_column_writable(self, column: str, result_type: str = None) -> bool:
+        """Check protected and conditionally protected columns for a result type."""
+        # Check if column is protected
+        if column in PROTECTED_COLUMNS:
+            self.logger.warning(f"Skipping protected column: {column}")
+            return False
+
+        # Check if column is conditionally protected
+        if column in CONDITIONALLY_PROTECTED_COLUMNS:
+            # Allow Portfolio ID updates for campaigns_without_portfolios optimization
+            if column == COL_PORTFOLIO_ID and result_type == "campaigns":
+                self.logger.info(f"Allowing Portfolio ID update for campaigns optimization")
+            else:
+                self.logger.warning(f"Skipping conditionally protected column: {column} for result_type: {result_type}")
+                return False
+
+        return True
+
+    @staticmethod
+    def _format_cell_value(new_value: Any) -> str:
+        """Convert a patch value to the string written to the sheet."""
+        if new_value is None or new_value == "":
+            return ""
+
+        # Convert to string and handle numeric formatting
+        str_value = str(new_value)
+
+        # Remove .0 suffix from numeric values
+        if str_value.endswith('.0') and str_value.replace('.0', '').replace('-', '').isdigit():
+            str_value = str_value.replace('.0', '')
+
+        return str_value
+
+    def _log_conflict(self, conflict: MergeConflict) -> None:
+        """Log a merge conflict with a user-friendly message."""
+        row_idx = conflict.row_index
+        column = conflict.column_name
+        old_value = conflict.first_value
+        new_value = conflict.second_value
+
+        # Enhanced conflict logging with user-friendly messages
+        if column == "Portfolio Name":
+            self.logger.info(
+                f"⚠️  Portfolio naming conflict: Row {row_idx+1} portfolio name changed "
+                f"from '{old_value}' to '{new_value}' (last optimization wins)"
+            )
+        elif column == "Portfolio ID":
+            self.logger.info(
+                f"⚠️  Portfolio assignment conflict: Row {row_idx+1} campaign moved "
+                f"from portfolio '{old_value}' to '{new_value}' (last optimization wins)"
+            )
+        elif column == "Operation":
+            self.logger.info(
+                f"⚠️  Operation conflict: Row {row_idx+1} operation changed "
+                f"from '{old_value}' to '{new_value}' (last optimization wins)"
+            )
+        else:
+            self.logger.info(
+                f"⚠️  Data conflict: Row {row_idx+1} {column} changed "
+                f"from '{old_value}' to '{new_value}' (last optimization wins)"
+            )
+
     def _find_row(
         self,
         df: pd.DataFrame,
         key_column: str,
         key_value: str,
         expected_index: int = None,
+        sheet_name: str = None,
     ) -> Optional[int]:
         """
         Find a row in the dataframe by key.
@@ -247,6 +424,7 @@ class ResultsManager:
             key_column: Column to search in
             key_value: Value to search for
             expected_index: Expected row index (for validation)
+            sheet_name: Sheet the dataframe belongs to; enables the keyed row index
 
         Returns:
             Row index or None if not found
@@ -258,8 +436,12 @@ class ResultsManager:
         key_value_str = str(key_value)
 
         # Find matching rows
-        mask = df[key_column].astype(str) == key_value_str
-        matching_indices = df[mask].index.tolist()
+        if sheet_name is None:
+            mask = df[key_column].astype(str) == key_value_str
+            matching_indices = df[mask].index.tolist()
+        else:
+            row_index = self._get_row_index(sheet_name, df, key_column)
+            matching_indices = row_index.get(key_value_str, [])
 
         if not matching_indices:
             return None
@@ -271,6 +453,55 @@ class ResultsManager:
         # Return first match
         return matching_indices[0]
 
+    def _get_row_index(
+        self, sheet_name: str, df: pd.DataFrame, key_column: str
+    ) -> Dict[str, List[int]]:
+        """
+        Get the key -> row labels lookup for a sheet's key column.
+
+        Built lazily on first use and rebuilt when rows were added or removed
+        (the DataFrame's row index changed) since it was built.
+        """
+        cached = self.row_indexes.get((sheet_name, key_column))
+        if cached is not None and cached[0] is df.index:
+            return cached[1]
+
+        build_start = time.time()
+        keys = df[key_column].astype(str)
+        labels = df.index
+        row_index = {
+            key: labels[positions].tolist()
+            for key, positions in keys.groupby(keys, sort=False).indices.items()
+        }
+        self.row_indexes[(sheet_name, key_column)] = (df.index, row_index)
+        self.index_build_seconds += time.time() - build_start
+
+        self.logger.info(
+            f"Built row index for {sheet_name}.{key_column}: {len(row_index)} keys, {len(df)} rows"
+        )
+        return row_index
+
+    def _get_key_index(
+        self, sheet_name: str, df: pd.DataFrame, key_column: str
+    ) -> Optional[pd.Index]:
+        """
+        Get a sheet's key column as a string Index, for vectorized key lookups.
+
+        Cached like the row index; None if the column is missing.
+        """
+        if key_column not in df.columns:
+            return None
+
+        cached = self.key_indexes.get((sheet_name, key_column))
+        if cached is not None and cached[0] is df.index:
+            return cached[1]
+
+        build_start = time.time()
+        key_index = pd.Index(df[key_column].astype(str))
+        self.key_indexes[(sheet_name, key_column)] = (df.index, key_index)
+        self.index_build_seconds += time.time() - build_start
+        return key_index
+
     def get_updated_indices(self) -> Dict[str, List[int]]:
         """Get dictionary of updated row indices by sheet."""
         return {sheet: list(indices) for sheet, indices in self.updated_indices.items()}
@@ -331,115 +562,43 @@ class ResultsManager:
             "severity": severity
         }
     
-    def _create_terminal_sheet_if_needed(self, merged_data: Dict[str, pd.DataFrame], optimization_results: List[Any]):
+    def apply_row_moves(self, data: Dict[str, pd.DataFrame], moves: List[RowMove]) -> int:
         """
-        Create Terminal sheet and move modified campaigns there if campaigns_without_portfolios was run.
-        
+        Move rows between sheets, one mask partition per move.
+
         Args:
-            merged_data: The merged data to modify
-            optimization_results: List of optimization results to check
+            data: Sheets to update (sheets are replaced, never modified in place)
+            moves: Row moves to apply, in order
+
+        Returns:
+            Number of rows moved
         """
-        print("TERMINAL DEBUG: _create_terminal_sheet_if_needed method called!")
-        self.logger.info("DEBUG: _create_terminal_sheet_if_needed called")
-        from .constants import SHEET_CAMPAIGNS_CLEANED, SHEET_TERMINAL, COL_CAMPAIGN_ID
-        
-        # Check if campaigns_without_portfolios optimization was run specifically
-        campaigns_result = None
-        self.logger.info(f"DEBUG: Checking {len(optimization_results)} optimization results")
-        for result in optimization_results:
-            self.logger.info(f"DEBUG: Result type: {getattr(result, 'result_type', 'NO_TYPE')}")
-            # Only create Terminal sheet for campaigns_without_portfolios, not organize_top_campaigns
-            if (hasattr(result, 'result_type') and result.result_type == "campaigns" and
-                hasattr(result, 'patch') and hasattr(result.patch, 'sheet_name') and 
-                result.patch.sheet_name == "Campaign"):
-                # Additional check to ensure this is campaigns_without_portfolios
-                # by checking if the strategy name or messages contain the right indication
-                is_campaigns_without_portfolios = any(
-                    'without portfolios' in str(msg).lower() or 'campaigns_without_portfolios' in str(msg).lower()
-                    for msg in getattr(result, 'messages', [])
-                )
-                if is_campaigns_without_portfolios:
-                    campaigns_result = result
-                    break
-        
-        if campaigns_result is None:
-            self.logger.info("Campaigns without portfolios optimization not run, skipping Terminal sheet creation")
-            return
-        
-        # Check if Campaign sheet exists
-        if SHEET_CAMPAIGNS_CLEANED not in merged_data:
-            self.logger.warning(f"Sheet {SHEET_CAMPAIGNS_CLEANED} not found, cannot create Terminal sheet")
-            return
-        
-        campaigns_df = merged_data[SHEET_CAMPAIGNS_CLEANED].copy()
-        
-        # Extract Campaign IDs from the optimization result instead of using row indices
-        # This ensures we get exactly the campaigns that were targeted by the optimization
-        updated_campaign_ids = []
-        for update in campaigns_result.patch.updates:
-            updated_campaign_ids.append(str(update.key_value))
-        
-        self.logger.info(f"DEBUG: Campaign IDs from optimization result: {updated_campaign_ids}")
-        
-        if not updated_campaign_ids:
-            self.logger.info("No campaign IDs found in optimization result, skipping Terminal sheet creation")
-            return
-        
-        # Find campaigns by Campaign ID (not by row index)
-        campaign_id_mask = campaigns_df[COL_CAMPAIGN_ID].astype(str).isin(updated_campaign_ids)
-        terminal_campaigns = campaigns_df[campaign_id_mask]
-        
-        if len(terminal_campaigns) == 0:
-            self.logger.warning("No campaigns found matching the updated Campaign IDs")
-            return
-        
-        self.logger.info(f"Creating Terminal sheet with {len(terminal_campaigns)} campaigns using Campaign ID matching")
-        self.logger.info(f"Terminal Campaign IDs: {terminal_campaigns[COL_CAMPAIGN_ID].astype(str).tolist()}")
-        
-        # Create Terminal sheet with campaigns found by Campaign ID
-        terminal_df = terminal_campaigns.copy()
-        
-        # Ensure all Terminal sheet campaigns have Operation = "update"
-        # This is critical for bulk upload - all campaigns in Terminal sheet must have Operation = "update"
-        from .constants import COL_OPERATION, OPERATION_UPDATE
-        
-        # Force set Operation = "update" using multiple approaches to ensure it works
-        try:
-            # Method 1: Direct assignment
-            terminal_df[COL_OPERATION] = OPERATION_UPDATE
-            
-            # Method 2: Explicit row-by-row assignment as backup
-            for idx in range(len(terminal_df)):
-                terminal_df.iloc[idx, terminal_df.columns.get_loc(COL_OPERATION)] = OPERATION_UPDATE
-            
-            # Method 3: Reset index and assign (in case of index issues)
-            terminal_df = terminal_df.reset_index(drop=True)
-            terminal_df[COL_OPERATION] = OPERATION_UPDATE
-            
-            self.logger.info(f"Successfully set Operation = '{OPERATION_UPDATE}' for all {len(terminal_df)} Terminal campaigns using multiple methods")
-            
-            # Verify the fix worked
-            operation_values = terminal_df[COL_OPERATION].tolist()
-            non_update_count = sum(1 for val in operation_values if pd.isna(val) or str(val) != OPERATION_UPDATE)
-            if non_update_count > 0:
-                self.logger.error(f"FAILED: {non_update_count} rows still don't have Operation='{OPERATION_UPDATE}': {operation_values}")
-            else:
-                self.logger.info(f"SUCCESS: All {len(terminal_df)} rows have Operation='{OPERATION_UPDATE}'")
-                
-        except Exception as e:
-            self.logger.error(f"Error setting Operation column: {e}")
-            # Fallback: create new DataFrame with explicit Operation column
-            terminal_df[COL_OPERATION] = OPERATION_UPDATE
-        
-        # Remove modified campaigns from original Campaign sheet using Campaign ID matching
-        campaigns_df_filtered = campaigns_df[~campaign_id_mask].copy()
-        
-        # Update the merged data
-        merged_data[SHEET_CAMPAIGNS_CLEANED] = campaigns_df_filtered
-        merged_data[SHEET_TERMINAL] = terminal_df
-        
-        self.logger.info(f"Terminal sheet created: {len(terminal_df)} rows moved, {len(campaigns_df_filtered)} rows remain in Campaign sheet")
-    
+        rows_moved = 0
+
+        for move in moves:
+            if move.source_sheet not in data:
+                self.logger.warning(f"Sheet {move.source_sheet} not found, skipping row move")
+                continue
+
+            source_df = data[move.source_sheet]
+            keys = pd.Index(move.keys).astype(str)
+            moved_mask = source_df[move.key_column].astype(str).isin(keys)
+
+            moved_rows = take_rows(source_df, moved_mask)
+            for column, value in move.assignments.items():
+                moved_rows[column] = value
+
+            data[move.target_sheet] = moved_rows
+            data[move.source_sheet] = take_rows(source_df, ~moved_mask)
+            rows_moved += len(moved_rows)
+
+            self.logger.info(
+                f"Moved {len(moved_rows)} rows from {move.source_sheet} to {move.target_sheet}, "
+                f"{len(data[move.source_sheet])} rows remain"
+            )
+
+        return rows_moved
+
     def _fix_portfolios_column_order(self, merged_data: Dict[str, pd.DataFrame]) -> None:
         """
         Fix the column order in Portfolios sheet to match expected file format.
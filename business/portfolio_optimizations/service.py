@@ -7,6 +7,7 @@ import logging
 from datetime import datetime
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
+from data.writers.format_plan import get_format_plan, integer_text, number_text
 from .constants import HIGHLIGHT_COLOR
 
 
@@ -78,103 +79,37 @@ class PortfolioOptimizationService:
         """
         df_clean = df.copy()
         
-        if was_modified:
-            # Only apply string conversion and .0 removal to modified sheets (like Portfolios)
-            for col in df_clean.columns:
-                # Use comprehensive ID detection for consistent formatting
-                is_id_column = any(id_keyword in col for id_keyword in [
-                    'Product Targeting ID', 'Campaign ID', 'Ad Group ID', 'Keyword ID', 
-                    'Portfolio ID', 'ASIN', 'Target ID', 'Ad ID', 'ID'
-                ])
-                
-                if df_clean[col].dtype in ['float64', 'int64']:
-                    if is_id_column:
-                        # ID columns: clean integer conversion to prevent scientific notation
-                        df_clean[col] = df_clean[col].apply(
-                            lambda x: str(int(x)) if pd.notna(x) and not pd.isna(x) else ''
-                        )
-                    else:
-                        # Non-ID numeric columns: check if they should be integers (like dates and budgets)
-                        is_integer_column = col in ['Budget Amount', 'Budget Start Date', 'Daily Budget', 'Start Date', 'End Date'] or 'Date' in col or 'Budget' in col
-                        
-                        if is_integer_column:
-                            # Convert to integer first, then to string to remove .0
-                            def clean_integer(x):
-                                if pd.isna(x) or pd.isnull(x):
-                                    return ''
-                                try:
-                                    return str(int(float(x)))
-                                except (ValueError, TypeError):
-                                    return ''
-                            df_clean[col] = df_clean[col].apply(clean_integer)
-                        else:
-                            # Other numeric columns: convert to string and remove .0 suffix for simple integers
-                            df_clean[col] = df_clean[col].apply(
-                                lambda x: str(int(x)) if pd.notna(x) and not pd.isna(x) and str(x) != '' and float(x).is_integer() else (str(x) if pd.notna(x) else '')
-                            )
-                elif df_clean[col].dtype == 'object':
+        # Column classification (IDs, dates and budgets) comes from the shared format plan
+        plan = get_format_plan(df_clean.columns, sheet_name)
+        
+        # Modified sheets (like Portfolios) also clean integer columns;
+        # unmodified sheets (Campaigns, Product Ad) keep their integer types
+        numeric_dtypes = ['float64', 'int64'] if was_modified else ['float64']
+        
+        for position, column_format in enumerate(plan):
+            values = df_clean.iloc[:, position]
+            dtype = values.dtype
+            
+            if dtype in numeric_dtypes:
+                if column_format.is_id or column_format.is_whole_number:
+                    # IDs, dates and budgets: clean integer text to prevent scientific notation
+                    df_clean.isetitem(position, integer_text(values))
+                else:
+                    # Other numeric columns: remove .0 suffix for simple integers
+                    df_clean.isetitem(position, number_text(values))
+            elif dtype == 'object':
+                if was_modified:
                     # Clean string columns and remove .0 suffix from numeric strings
-                    df_clean[col] = df_clean[col].fillna('').astype(str)
-                    if is_id_column:
-                        # Extra ID column cleaning for consistent text format
-                        mask = df_clean[col].str.endswith('.0') & df_clean[col].str.replace('.0', '').str.replace('-', '').str.isdigit()
-                        df_clean.loc[mask, col] = df_clean.loc[mask, col].str.replace('.0', '')
-                    else:
-                        # Remove .0 suffix from numeric strings in non-ID columns
-                        mask = df_clean[col].str.endswith('.0') & df_clean[col].str.replace('.0', '').str.replace('-', '').str.isdigit()
-                        df_clean.loc[mask, col] = df_clean.loc[mask, col].str.replace('.0', '')
-        else:
-            # For unmodified sheets (Campaigns, Product Ad), preserve original data types
-            # Only clean string columns minimally and handle floating point precision
-            for col in df_clean.columns:
-                if df_clean[col].dtype == 'float64':
-                    # Handle ID columns vs numeric columns differently with comprehensive ID detection
-                    is_id_column = any(id_keyword in col for id_keyword in [
-                        'Product Targeting ID', 'Campaign ID', 'Ad Group ID', 'Keyword ID', 
-                        'Portfolio ID', 'ASIN', 'Target ID', 'Ad ID', 'ID'
-                    ])
-                    
-                    if is_id_column:
-                        # ID columns should be converted to clean text format to prevent scientific notation
-                        # Keep NaN as empty string, convert valid numbers to clean text
-                        df_clean[col] = df_clean[col].apply(
-                            lambda x: str(int(x)) if pd.notna(x) and not pd.isna(x) else ''
-                        )
-                    else:
-                        # Non-ID numeric columns: handle integer columns vs precision columns differently
-                        is_integer_column = col in ['Budget Amount', 'Budget Start Date', 'Daily Budget', 'Start Date', 'End Date'] or 'Date' in col or 'Budget' in col
-                        
-                        if is_integer_column:
-                            # Convert integer columns to clean integer strings
-                            def clean_integer(x):
-                                if pd.isna(x) or pd.isnull(x):
-                                    return ''
-                                try:
-                                    return str(int(float(x)))
-                                except (ValueError, TypeError):
-                                    return ''
-                            df_clean[col] = df_clean[col].apply(clean_integer)
-                        else:
-                            # For precision columns, convert integers to clean format but preserve precision artifacts for floats
-                            df_clean[col] = df_clean[col].apply(
-                                lambda x: str(int(x)) if pd.notna(x) and not pd.isna(x) and str(x) != '' and float(x).is_integer() else (str(x) if pd.notna(x) else '')
-                            )
-                elif df_clean[col].dtype == 'object':
+                    text = values.fillna('').astype(str)
+                    df_clean.isetitem(position, self._strip_integer_suffix(text, text))
+                else:
                     # Only handle NaN values, don't change formatting
-                    df_clean[col] = df_clean[col].fillna('')
-                    # Use comprehensive ID detection and clean formatting to prevent scientific notation
-                    is_id_column = any(id_keyword in col for id_keyword in [
-                        'Product Targeting ID', 'Campaign ID', 'Ad Group ID', 'Keyword ID', 
-                        'Portfolio ID', 'ASIN', 'Target ID', 'Ad ID', 'ID'
-                    ])
-                    
-                    if is_id_column:
-                        # Clean ID columns: remove .0 suffix and ensure text format
-                        mask = (df_clean[col].astype(str).str.endswith('.0') & 
-                               df_clean[col].astype(str).str.replace('.0', '').str.replace('-', '').str.isdigit())
-                        df_clean.loc[mask, col] = df_clean[col].astype(str).str.replace('.0', '')
-                        # Force all ID values to be clean strings to prevent scientific notation
-                        df_clean[col] = df_clean[col].astype(str)
+                    values = values.fillna('')
+                    if column_format.is_id:
+                        # Clean ID columns and force clean strings to prevent scientific notation
+                        text = values.astype(str)
+                        values = self._strip_integer_suffix(values, text).astype(str)
+                    df_clean.isetitem(position, values)
         
         # Remove any columns that start with underscore (internal columns)
         cols_to_remove = [col for col in df_clean.columns if col.startswith('_')]
@@ -183,6 +118,16 @@ class PortfolioOptimizationService:
         
         return df_clean
     
+    @staticmethod
+    def _strip_integer_suffix(values: pd.Series, text: pd.Series) -> pd.Series:
+        """Replace numeric strings ending in '.0' (as seen in text) with their integer text."""
+        mask = (text.str.endswith('.0') & text.str.replace('.0', '').str.replace('-', '').str.isdigit()).to_numpy()
+        if not mask.any():
+            return values
+        values = values.copy()
+        values[mask] = text[mask].str.replace('.0', '').to_numpy()
+        return values
+    
     def _mark_rows_for_highlighting(self, df: pd.DataFrame, updated_indices: List[int]) -> pd.DataFrame:
         """
         Mark rows that need yellow highlighting for excel_writer.
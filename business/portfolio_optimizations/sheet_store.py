@@ -0,0 +1,75 @@
+"""Copy-on-write views of the workbook sheets for portfolio optimizations."""
+
+import pandas as pd
+from typing import Dict, Iterable, Optional
+import logging
+
+
+class SheetStore:
+    """
+    Hands out views of a set of sheets that share their column data.
+
+    A view is a shallow copy: adding, inserting, replacing or dropping whole
+    columns and filtering rows never touch the shared arrays, so strategies
+    and processors that only do that need no copy of the sheet at all.
+    Columns modified in place (.loc / .at / .iloc writes) must be named as
+    writable columns when the view is taken; only those get private copies.
+    """
+
+    def __init__(self, sheets: Dict[str, pd.DataFrame]):
+        self.logger = logging.getLogger(__name__)
+        self.sheets = sheets
+        self.stats = {"views": 0, "materialized_columns": 0, "materialized_bytes": 0}
+
+    def view(self, sheet_name: str, writable_columns: Iterable[str] = ()) -> pd.DataFrame:
+        """
+        View of one sheet.
+
+        Args:
+            sheet_name: Sheet to view
+            writable_columns: Columns the caller modifies in place (missing ones are ignored)
+
+        Returns:
+            Shallow copy of the sheet with private copies of the writable columns
+        """
+        df = self.sheets[sheet_name].copy(deep=False)
+        self.stats["views"] += 1
+
+        for column in writable_columns:
+            if column in df.columns:
+                df[column] = df[column].copy()
+                self.stats["materialized_columns"] += 1
+                self.stats["materialized_bytes"] += int(df[column].memory_usage(index=False))
+
+        return df
+
+    def views(
+        self,
+        writable_columns: Optional[Dict[str, Iterable[str]]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Views of every sheet.
+
+        Args:
+            writable_columns: Sheet name -> columns the caller modifies in place
+
+        Returns:
+            Dictionary of sheet name to view
+        """
+        writable_columns = writable_columns or {}
+        return {
+            sheet_name: self.view(sheet_name, writable_columns.get(sheet_name, ()))
+            for sheet_name in self.sheets
+        }
+
+
+def take_rows(df: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
+    """
+    Rows of df where mask is True, as an independent DataFrame.
+
+    Boolean indexing already copies the selected rows; the shallow copy
+    only drops pandas' link to df so that writes to the result do not
+    raise SettingWithCopyWarning (which a second .copy() would also do,
+    at the cost of copying the rows again).
+    """
+    return df[mask].copy(deep=False)
@@ -4,8 +4,10 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Any
 import logging
-from ..contracts import OptimizationStrategy, OptimizationResult, PatchData, CellUpdate
+from ..contracts import OptimizationStrategy, OptimizationResult, ColumnarPatch
 from ..contract_validator import contract_validator
+from ..processors.lookup_index import LookupIndex
+from ..sheet_store import SheetStore
 from ..constants import (
     SHEET_CAMPAIGNS_CLEANED, SHEET_PORTFOLIOS,
     COL_ENTITY, COL_CAMPAIGN_ID, COL_PORTFOLIO_ID, COL_PORTFOLIO_NAME,
@@ -31,14 +33,26 @@ class EmptyPortfoliosStrategy(OptimizationStrategy):
     def get_required_sheets(self) -> List[str]:
         return [SHEET_CAMPAIGNS_CLEANED, SHEET_PORTFOLIOS]
     
+    def get_required_columns(self) -> Dict[str, List[str]]:
+        return {
+            SHEET_CAMPAIGNS_CLEANED: [COL_ENTITY, COL_PORTFOLIO_ID],
+            SHEET_PORTFOLIOS: [
+                COL_ENTITY, COL_PORTFOLIO_ID, COL_PORTFOLIO_NAME,
+                COL_BUDGET_AMOUNT, COL_BUDGET_START_DATE
+            ]
+        }
+    
+    def get_output_sheets(self) -> List[str]:
+        return []
+    
     @contract_validator
     def run(self, all_sheets: Dict[str, pd.DataFrame]) -> OptimizationResult:
         """Run the empty portfolios optimization using exact 6-step PRD logic."""
         self.logger.info("Starting Empty Portfolios optimization with PRD-compliant 6-step logic")
         
-        # Get required sheets
-        campaigns_df = all_sheets[SHEET_CAMPAIGNS_CLEANED].copy()
-        portfolios_df = all_sheets[SHEET_PORTFOLIOS].copy()
+        # Get required sheets (Campaign is only read; Camp Count may be rewritten in place)
+        campaigns_df = all_sheets[SHEET_CAMPAIGNS_CLEANED]
+        portfolios_df = SheetStore(all_sheets).view(SHEET_PORTFOLIOS, [COL_CAMP_COUNT])
         
         # Step 1: Create Old Portfolio Name column first  
         self.logger.info("PRD Step 1: Creating Old Portfolio Name column and backing up names for all rows")
@@ -64,119 +78,90 @@ class EmptyPortfoliosStrategy(OptimizationStrategy):
             self.logger.info("No empty portfolios found that need renaming")
             return self._create_empty_result()
         
-        # Generate new numeric names
-        empty_portfolio_indices = portfolios_df[empty_portfolios_mask].index.tolist()
-        new_names = self._generate_new_numeric_names(portfolios_df, len(empty_portfolio_indices))
-        
-        self.logger.info(f"PRD Step 4: Found {len(empty_portfolio_indices)} empty portfolios to rename")
-        
-        # Create updates for ALL portfolios to populate new columns, plus special handling for empty portfolios
-        updates = []
-        
-        # First: Create updates for ALL portfolio rows to populate Camp Count and Old Portfolio Name
-        for idx, row in portfolios_df.iterrows():
-            if row[COL_ENTITY] == ENTITY_PORTFOLIO:
-                cell_changes = {
-                    COL_CAMP_COUNT: str(int(row[COL_CAMP_COUNT])),
-                    COL_OLD_PORTFOLIO_NAME: str(row[COL_OLD_PORTFOLIO_NAME])
-                }
-                
-                # Check if this is an empty portfolio that needs renaming
-                if idx in empty_portfolio_indices:
-                    # This is an empty portfolio - rename it and apply special settings
-                    empty_idx_in_list = empty_portfolio_indices.index(idx)
-                    original_name = str(row[COL_PORTFOLIO_NAME])
-                    new_name = new_names[empty_idx_in_list]
-                    
-                    self.logger.info(f"PRD Steps 5-6: Renaming empty portfolio '{original_name}' to '{new_name}' at index {idx}")
-                    
-                    # Add empty portfolio specific changes
-                    cell_changes.update({
-                        COL_PORTFOLIO_NAME: new_name,
-                        COL_OPERATION: OPERATION_UPDATE,
-                        COL_BUDGET_POLICY: BUDGET_POLICY_NO_CAP,
-                        COL_OLD_PORTFOLIO_NAME: original_name  # Store original name before change
-                    })
-                    
-                    # PRD Step 6: Clear budget fields if they have values
-                    if pd.notna(row[COL_BUDGET_AMOUNT]) and str(row[COL_BUDGET_AMOUNT]).strip() and str(row[COL_BUDGET_AMOUNT]).strip() != 'nan':
-                        cell_changes[COL_BUDGET_AMOUNT] = ""
-                    
-                    if pd.notna(row[COL_BUDGET_START_DATE]) and str(row[COL_BUDGET_START_DATE]).strip() and str(row[COL_BUDGET_START_DATE]).strip() != 'nan':
-                        cell_changes[COL_BUDGET_START_DATE] = ""
-                
-                update = CellUpdate(
-                    row_index=idx,
-                    key_column=COL_PORTFOLIO_ID,
-                    key_value=str(row[COL_PORTFOLIO_ID]),
-                    cell_changes=cell_changes
-                )
-                updates.append(update)
-        
-        # Create patch - ONLY for empty portfolios
-        patch = PatchData(
+        # Work on Portfolio entity rows only, as aligned arrays
+        is_portfolio = portfolios_df[COL_ENTITY] == ENTITY_PORTFOLIO
+        portfolio_rows = portfolios_df[is_portfolio]
+        is_empty = empty_portfolios_mask[is_portfolio].to_numpy()
+        empty_count = int(is_empty.sum())
+        
+        # Generate new numeric names, aligned with the portfolio rows
+        new_names = np.full(len(portfolio_rows), "", dtype=object)
+        new_names[is_empty] = self._generate_new_numeric_names(portfolios_df, empty_count)
+        
+        self.logger.info(f"PRD Step 4: Found {empty_count} empty portfolios to rename")
+        
+        # ALL portfolio rows get Camp Count and Old Portfolio Name; empty ones keep their original name there
+        original_names = portfolio_rows[COL_PORTFOLIO_NAME].astype(str).to_numpy()
+        old_names = np.where(is_empty, original_names, portfolio_rows[COL_OLD_PORTFOLIO_NAME].astype(str).to_numpy())
+        
+        # PRD Step 6: Clear budget fields of empty portfolios if they have values
+        clear_budget_amount = is_empty & self._has_value(portfolio_rows[COL_BUDGET_AMOUNT])
+        clear_budget_start_date = is_empty & self._has_value(portfolio_rows[COL_BUDGET_START_DATE])
+        
+        # One columnar patch: rename and special settings are masked to the empty portfolios
+        patch = ColumnarPatch(
             sheet_name=SHEET_PORTFOLIOS,
-            updates=updates
+            key_column=COL_PORTFOLIO_ID,
+            keys=portfolio_rows[COL_PORTFOLIO_ID].astype(str).to_numpy(),
+            row_indices=portfolio_rows.index,
+            columns={
+                COL_CAMP_COUNT: portfolio_rows[COL_CAMP_COUNT].astype('int64').astype(str).to_numpy(),
+                COL_OLD_PORTFOLIO_NAME: old_names,
+                COL_PORTFOLIO_NAME: new_names,
+                COL_OPERATION: np.full(len(portfolio_rows), OPERATION_UPDATE, dtype=object),
+                COL_BUDGET_POLICY: np.full(len(portfolio_rows), BUDGET_POLICY_NO_CAP, dtype=object),
+                COL_BUDGET_AMOUNT: np.full(len(portfolio_rows), "", dtype=object),
+                COL_BUDGET_START_DATE: np.full(len(portfolio_rows), "", dtype=object)
+            },
+            masks={
+                COL_PORTFOLIO_NAME: is_empty,
+                COL_OPERATION: is_empty,
+                COL_BUDGET_POLICY: is_empty,
+                COL_BUDGET_AMOUNT: clear_budget_amount,
+                COL_BUDGET_START_DATE: clear_budget_start_date
+            }
         )
         
         # Create result
-        total_portfolios = len(portfolios_df[portfolios_df[COL_ENTITY] == ENTITY_PORTFOLIO])
+        total_portfolios = len(portfolio_rows)
         result = OptimizationResult(
             result_type="portfolios",
             merge_keys=[COL_PORTFOLIO_ID],
             patch=patch,
             metrics={
                 "rows_checked": total_portfolios,
-                "rows_updated": len(updates),  # All portfolios get updated with new columns
-                "cells_updated": sum(len(update.cell_changes) for update in updates),
-                "empty_portfolios_found": len(empty_portfolio_indices),
-                "portfolios_renamed": len(empty_portfolio_indices)
+                "rows_updated": patch.update_count,  # All portfolios get updated with new columns
+                "cells_updated": patch.cell_count,
+                "empty_portfolios_found": empty_count,
+                "portfolios_renamed": empty_count
             },
             messages=[
                 f"PRD Compliance: Analyzed {total_portfolios} portfolio rows",
                 f"PRD Compliance: Added Camp Count and Old Portfolio Name columns to all {total_portfolios} portfolios",
-                f"PRD Compliance: Found {len(empty_portfolio_indices)} empty portfolios (Camp Count = 0)",
-                f"PRD Compliance: Renamed {len(empty_portfolio_indices)} empty portfolios only",
-                f"PRD Compliance: Updated Budget Policy to 'No Cap' for {len(empty_portfolio_indices)} empty portfolios only",
+                f"PRD Compliance: Found {empty_count} empty portfolios (Camp Count = 0)",
+                f"PRD Compliance: Renamed {empty_count} empty portfolios only",
+                f"PRD Compliance: Updated Budget Policy to 'No Cap' for {empty_count} empty portfolios only",
                 f"PRD Compliance: Cleared budget fields where necessary for empty portfolios only"
             ]
         )
         
-        self.logger.info(f"PRD-compliant Empty Portfolios optimization complete: {len(updates)} portfolios updated (all with new columns, {len(empty_portfolio_indices)} renamed)")
+        self.logger.info(f"PRD-compliant Empty Portfolios optimization complete: {patch.update_count} portfolios updated (all with new columns, {empty_count} renamed)")
         return result
     
     def _calculate_campaign_counts_countifs(self, portfolios_df: pd.DataFrame, campaigns_df: pd.DataFrame) -> None:
         """Calculate campaign counts using COUNTIFS logic (Step 2)."""
-        # Filter to Campaign entities only
-        campaign_entities = campaigns_df[campaigns_df[COL_ENTITY] == ENTITY_CAMPAIGN]
-        
-        # For each portfolio, count campaigns with matching Portfolio ID
-        for idx, row in portfolios_df.iterrows():
-            if row[COL_ENTITY] == ENTITY_PORTFOLIO:
-                # Handle empty Portfolio ID safely
-                raw_portfolio_id = row[COL_PORTFOLIO_ID]
-                if pd.notna(raw_portfolio_id) and str(raw_portfolio_id).strip() and str(raw_portfolio_id).strip() != '':
-                    try:
-                        portfolio_id = str(int(float(raw_portfolio_id)))
-                    except (ValueError, TypeError):
-                        portfolio_id = str(raw_portfolio_id).strip()
-                else:
-                    portfolio_id = ''
-                
-                # COUNTIFS equivalent: count campaigns where Portfolio ID matches
-                # Handle float Portfolio IDs in campaigns by converting to int then string
-                matching_campaigns = campaign_entities[
-                    campaign_entities[COL_PORTFOLIO_ID].apply(
-                        lambda x: str(int(float(x))) if pd.notna(x) and str(x).strip() and str(x).strip() != '' else ''
-                    ) == portfolio_id
-                ]
-                count = len(matching_campaigns)
-                
-                portfolios_df.at[idx, COL_CAMP_COUNT] = count
-                
-                # Log for debugging
-                if row[COL_PORTFOLIO_NAME] == 'Test':
-                    self.logger.info(f"Test portfolio ID {portfolio_id}: found {count} campaigns")
+        # Index Campaign entities by normalized Portfolio ID once
+        campaign_index = LookupIndex.for_campaign_portfolios(campaigns_df)
+        
+        # COUNTIFS equivalent: count campaigns where Portfolio ID matches
+        is_portfolio = portfolios_df[COL_ENTITY] == ENTITY_PORTFOLIO
+        counts = campaign_index.count(portfolios_df.loc[is_portfolio, COL_PORTFOLIO_ID])
+        portfolios_df.loc[is_portfolio, COL_CAMP_COUNT] = counts
+        
+        # Log for debugging
+        test_portfolios = is_portfolio & (portfolios_df[COL_PORTFOLIO_NAME] == 'Test')
+        for idx in portfolios_df.index[test_portfolios]:
+            self.logger.info(f"Test portfolio ID {portfolios_df.at[idx, COL_PORTFOLIO_ID]}: found {counts[idx]} campaigns")
     
     def _find_empty_portfolios(self, portfolios_df: pd.DataFrame) -> pd.Series:
         """Find portfolios that meet empty criteria (Step 4)."""
@@ -196,33 +181,34 @@ class EmptyPortfoliosStrategy(OptimizationStrategy):
     def _generate_new_numeric_names(self, portfolios_df: pd.DataFrame, count_needed: int) -> List[str]:
         """Generate new numeric names that don't exist yet (Step 4)."""
         # Find all existing numeric portfolio names
-        existing_numeric = set()
-        for name in portfolios_df[COL_PORTFOLIO_NAME]:
-            name_str = str(name).strip()
-            if name_str.isdigit():
-                existing_numeric.add(int(name_str))
-        
-        # Generate new numeric names starting from 1
-        new_names = []
-        next_number = 1
-        
-        for _ in range(count_needed):
-            # Find next available number
-            while next_number in existing_numeric:
-                next_number += 1
-            
-            new_names.append(str(next_number))
-            existing_numeric.add(next_number)
-            next_number += 1
-        
-        return new_names
+        names = portfolios_df[COL_PORTFOLIO_NAME].astype(str).str.strip()
+        numeric_names = names[names.str.isdigit()]
+        
+        # The first count_needed free numbers starting from 1 lie within 1..count_needed + len(existing);
+        # longer names can never collide (and may not fit in int64), so they are skipped before converting
+        limit = count_needed + len(numeric_names)
+        significant_digits = numeric_names.str.lstrip('0').str.len()
+        existing_numeric = np.unique(
+            numeric_names[significant_digits <= len(str(limit))].map(int).to_numpy(dtype='int64')
+        )
+        
+        candidates = np.arange(1, limit + 1)
+        free_numbers = candidates[~np.isin(candidates, existing_numeric)][:count_needed]
+        
+        return free_numbers.astype(str).tolist()
+    
+    @staticmethod
+    def _has_value(values: pd.Series) -> np.ndarray:
+        """Cells that are not empty, blank or 'nan' (budget fields to clear)."""
+        text = values.astype(str).str.strip()
+        return (values.notna() & (text != '') & (text != 'nan')).to_numpy()
     
     def _create_empty_result(self) -> OptimizationResult:
         """Create empty result when no changes are needed."""
         return OptimizationResult(
             result_type="portfolios",
             merge_keys=[COL_PORTFOLIO_ID],
-            patch=PatchData(sheet_name=SHEET_PORTFOLIOS, updates=[]),
+            patch=ColumnarPatch(sheet_name=SHEET_PORTFOLIOS, key_column=COL_PORTFOLIO_ID, keys=[], columns={}),
             metrics={
                 "rows_checked": 0,
                 "rows_updated": 0,
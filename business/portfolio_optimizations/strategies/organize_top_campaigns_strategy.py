@@ -7,10 +7,11 @@ import logging
 from ..contracts import OptimizationStrategy, OptimizationResult, PatchData, CellUpdate
 from ..contract_validator import contract_validator
 from ..constants import (
-    SHEET_CAMPAIGNS_CLEANED, SHEET_PORTFOLIOS, SHEET_PRODUCT_AD,
-    COL_ENTITY, COL_CAMPAIGN_ID, ENTITY_CAMPAIGN
+    SHEET_CAMPAIGNS_CLEANED, SHEET_PORTFOLIOS, SHEET_PRODUCT_AD, SHEET_TOP, SHEET_TOP_CAMPAIGNS,
+    COL_ENTITY, COL_CAMPAIGN_ID, COL_PORTFOLIO_ID, COL_PORTFOLIO_NAME_INFO,
+    COL_OPERATION, COL_ASIN, ENTITY_CAMPAIGN
 )
-from ..processors import AdsCountProcessor, AsinMatcher, TopCampaignsProcessor
+from ..processors import AdsCountProcessor, AsinMatcher, TopCampaignsProcessor, LookupIndex
 
 
 class OrganizeTopCampaignsStrategy(OptimizationStrategy):
@@ -29,6 +30,18 @@ class OrganizeTopCampaignsStrategy(OptimizationStrategy):
     def get_required_sheets(self) -> List[str]:
         return [SHEET_CAMPAIGNS_CLEANED, SHEET_PORTFOLIOS, SHEET_PRODUCT_AD]
     
+    def get_required_columns(self) -> Dict[str, List[str]]:
+        return {
+            SHEET_CAMPAIGNS_CLEANED: [
+                COL_ENTITY, COL_CAMPAIGN_ID, COL_PORTFOLIO_ID,
+                COL_PORTFOLIO_NAME_INFO, COL_OPERATION
+            ],
+            SHEET_PRODUCT_AD: [COL_ENTITY, COL_CAMPAIGN_ID, COL_ASIN]
+        }
+    
+    def get_output_sheets(self) -> List[str]:
+        return [SHEET_CAMPAIGNS_CLEANED, SHEET_TOP, SHEET_TOP_CAMPAIGNS]
+    
     def set_template_data(self, template_data: pd.DataFrame) -> None:
         """Set the template data for ASIN matching."""
         self.template_data = template_data
@@ -48,19 +61,22 @@ class OrganizeTopCampaignsStrategy(OptimizationStrategy):
                 raise ValueError(f"Required sheet '{sheet}' not found")
         
         # Track original row count
-        original_campaigns = all_sheets[SHEET_CAMPAIGNS_CLEANED].copy()
+        original_campaigns = all_sheets[SHEET_CAMPAIGNS_CLEANED]
         original_campaign_rows = len(original_campaigns[original_campaigns[COL_ENTITY] == ENTITY_CAMPAIGN])
         
         # Process through the pipeline
         updated_sheets = all_sheets.copy()
         
+        # Index Product Ads by Campaign ID once for the COUNTIFS and VLOOKUP steps
+        product_ad_index = LookupIndex.for_product_ads(all_sheets[SHEET_PRODUCT_AD])
+        
         # Step 3 & 4: Process Ads Count and filter rows
         ads_processor = AdsCountProcessor()
-        updated_sheets = ads_processor.process(updated_sheets)
+        updated_sheets = ads_processor.process(updated_sheets, product_ad_index)
         
         # Step 5a: Add ASIN PA column with VLOOKUP
         asin_matcher = AsinMatcher()
-        updated_sheets = asin_matcher.process(updated_sheets)
+        updated_sheets = asin_matcher.process(updated_sheets, product_ad_index)
         
         # Step 5b-5d: Add Top column and create Top sheet
         top_processor = TopCampaignsProcessor()
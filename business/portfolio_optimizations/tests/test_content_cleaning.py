@@ -0,0 +1,53 @@
+"""Tests for schema-aware content cleaning."""
+
+import numpy as np
+import pandas as pd
+
+from ..cleaning import clean_data_content, normalize_text_column
+from ..orchestrator import PortfolioOptimizationOrchestrator
+from ..factory import PortfolioOptimizationFactory
+
+
+def row_by_row(values: pd.Series) -> pd.Series:
+    """Reference: the per-row string cleaning the normalizer replaces."""
+    text = values.astype(str).str.strip().replace('nan', '')
+    mask = text.str.endswith('.0') & text.str.replace('.0', '').str.replace('-', '').str.isdigit()
+    text.loc[mask] = text.loc[mask].str.replace('.0', '')
+    return text
+
+
+def test_normalizer_matches_row_by_row_cleaning():
+    columns = [
+        pd.Series([" Campaign ", "Campaign", np.nan, None, "Product Ad", "nan", " 12.0", "-3.0", "1.05"]),
+        pd.Series([123456789012.0, "123456789012", np.nan, 7, True, 1, "x ", pd.NA, 1.0]),
+        pd.Series([np.nan, None, np.nan], index=[5, 3, 9]),
+        pd.Series([], dtype=object),
+    ]
+    for values in columns:
+        pd.testing.assert_series_equal(normalize_text_column(values), row_by_row(values))
+
+
+def test_only_declared_and_key_columns_are_cleaned():
+    campaigns = pd.DataFrame({
+        "Entity": [" Campaign", "Product Ad ", "Keyword"],
+        "Campaign ID": ["11.0", "11.0", "11.0"],
+        "Portfolio ID": [np.nan, np.nan, np.nan],
+        "ASIN": [np.nan, " B001 ", np.nan],
+        "Campaign Name": [" raw ", np.nan, np.nan],
+    })
+    sheets = {"Sponsored Products Campaigns": campaigns, "Sheet3": pd.DataFrame({"a": [" x "]})}
+
+    orchestrator = PortfolioOptimizationOrchestrator(PortfolioOptimizationFactory())
+    content_columns = orchestrator._get_content_columns(["organize_top_campaigns"])
+    cleaned = clean_data_content(sheets, content_columns)["Sponsored Products Campaigns"]
+
+    assert cleaned["Entity"].tolist() == ["Campaign", "Product Ad", "Keyword"]
+    assert cleaned["Campaign ID"].tolist() == ["11", "11", "11"]
+    assert cleaned["ASIN"].tolist() == ["", "B001", ""]
+    assert cleaned["Campaign Name"].iloc[0] == " raw "
+    assert campaigns["Entity"].iloc[0] == " Campaign"  # input untouched
+
+    # Without declarations every text column is cleaned
+    everything = clean_data_content(sheets)
+    assert everything["Sponsored Products Campaigns"]["Campaign Name"].iloc[0] == "raw"
+    assert everything["Sheet3"]["a"].iloc[0] == "x"
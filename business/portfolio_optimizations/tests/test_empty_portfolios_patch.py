@@ -0,0 +1,64 @@
+"""Tests for the columnar Empty Portfolios patch."""
+
+import pandas as pd
+
+from ..constants import COL_OLD_PORTFOLIO_NAME
+from ..contracts import ColumnarPatch
+from ..strategies import EmptyPortfoliosStrategy
+
+
+def _sheets():
+    campaigns = pd.DataFrame({
+        "Entity": ["Campaign", "Campaign", "Campaign", "Ad Group"],
+        "Campaign ID": ["c1", "c2", "c3", "c3"],
+        "Portfolio ID": ["101", "101.0", "", "102"],
+    })
+    portfolios = pd.DataFrame({
+        "Entity": ["Portfolio"] * 5,
+        "Operation": [""] * 5,
+        "Portfolio ID": ["101", "102", "103", "104", "105"],
+        "Portfolio Name": ["Main", "Old Brand", "1", "Paused", "Spare"],
+        "Budget Amount": ["", "50", "", "", " "],
+        "Budget Policy": [""] * 5,
+        "Budget Start Date": ["", "20240101", "", "", "nan"],
+    })
+    return {"Campaign": campaigns, "Portfolios": portfolios}
+
+
+def test_empty_portfolios_come_out_as_one_columnar_patch():
+    result = EmptyPortfoliosStrategy().run(_sheets())
+    patch = result.patch
+
+    assert isinstance(patch, ColumnarPatch)
+    assert list(patch.keys) == ["101", "102", "103", "104", "105"]
+    assert list(patch.columns["Camp Count"]) == ["2", "0", "0", "0", "0"]
+
+    # Numeric names skip the existing "1"; "Paused" and numeric names are never renamed
+    updates = {update.key_value: update.cell_changes for update in patch.updates}
+    assert updates["102"]["Portfolio Name"] == "2"
+    assert updates["105"]["Portfolio Name"] == "3"
+    assert "Portfolio Name" not in updates["103"] and "Portfolio Name" not in updates["104"]
+    assert updates["102"][COL_OLD_PORTFOLIO_NAME] == "Old Brand"
+
+    # Only budget fields that hold a value are cleared
+    assert updates["102"]["Budget Amount"] == "" and updates["102"]["Budget Start Date"] == ""
+    assert "Budget Amount" not in updates["105"] and "Budget Start Date" not in updates["105"]
+
+    assert result.metrics["rows_updated"] == 5
+    assert result.metrics["portfolios_renamed"] == 2
+    assert result.metrics["cells_updated"] == patch.cell_count == 18
+
+
+def test_numeric_names_beyond_int64_do_not_break_renaming():
+    sheets = _sheets()
+    sheets["Portfolios"].loc[2, "Portfolio Name"] = "99999999999999999999"
+    sheets["Portfolios"].loc[3, "Portfolio Name"] = "0002"
+
+    updates = {
+        update.key_value: update.cell_changes
+        for update in EmptyPortfoliosStrategy().run(sheets).patch.updates
+    }
+
+    # "0002" takes 2; the 20-digit name can never collide
+    assert updates["102"]["Portfolio Name"] == "1"
+    assert updates["105"]["Portfolio Name"] == "3"
@@ -0,0 +1,47 @@
+"""Tests for dependency-aware concurrent execution of portfolio strategies."""
+
+import pandas as pd
+
+from benchmarks.synthetic_bulk import BulkSpec, generate_bulk_sheets, generate_template
+from ..factory import PortfolioOptimizationFactory
+from ..orchestrator import PortfolioOptimizationOrchestrator
+
+ALL_STRATEGIES = ["organize_top_campaigns", "campaigns_without_portfolios", "empty_portfolios"]
+
+
+def test_batches_follow_sheet_dependencies():
+    factory = PortfolioOptimizationFactory()
+
+    # Campaigns w/o Portfolios rewrites the Campaign sheet Organize Top Campaigns reads
+    assert factory.get_execution_batches(ALL_STRATEGIES) == [
+        ["empty_portfolios", "campaigns_without_portfolios"],
+        ["organize_top_campaigns"],
+    ]
+    assert factory.get_execution_batches(["organize_top_campaigns", "empty_portfolios"]) == [
+        ["empty_portfolios", "organize_top_campaigns"]
+    ]
+
+    # Strategies without declared outputs run alone
+    factory.create_strategy("empty_portfolios").get_output_sheets = lambda: None
+    assert factory.get_execution_batches(ALL_STRATEGIES) == [
+        ["empty_portfolios"], ["campaigns_without_portfolios"], ["organize_top_campaigns"]
+    ]
+
+
+def test_concurrent_run_matches_sequential_run():
+    sheets = generate_bulk_sheets(BulkSpec(n_rows=3000, seed=4))
+    template = generate_template(sheets["Sponsored Products Campaigns"], seed=4)
+    top_asins = pd.DataFrame({"Top ASINs": template["Top ASINs"]["ASIN"]})
+
+    outputs = []
+    for max_workers in (1, 3):
+        orchestrator = PortfolioOptimizationOrchestrator(PortfolioOptimizationFactory(), max_workers)
+        orchestrator.factory.create_strategy("organize_top_campaigns").set_template_data(top_asins)
+        input_sheets = {name: df.copy() for name, df in sheets.items()}
+        outputs.append(orchestrator.run_optimizations(input_sheets, ALL_STRATEGIES))
+
+    (sequential, sequential_report), (concurrent, concurrent_report) = outputs
+    assert list(concurrent) == list(sequential)
+    for sheet_name, df in sequential.items():
+        pd.testing.assert_frame_equal(concurrent[sheet_name], df)
+    assert concurrent_report.optimization_details == sequential_report.optimization_details
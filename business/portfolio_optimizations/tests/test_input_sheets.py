@@ -0,0 +1,34 @@
+"""Tests for the sheets read from an uploaded bulk file."""
+
+import io
+
+import pandas as pd
+
+from benchmarks.synthetic_bulk import BulkSpec, generate_bulk_sheets
+from data.readers.workbook_cache import WorkbookCache
+from ..constants import INPUT_SHEETS
+from ..factory import PortfolioOptimizationFactory
+from ..orchestrator import PortfolioOptimizationOrchestrator
+
+
+def test_sheet3_passes_through_to_the_output_workbook():
+    sheets = generate_bulk_sheets(BulkSpec(n_rows=500, seed=8))
+    sheet3 = pd.DataFrame({"Report": ["Bulk export"], "Version": ["v2"]})
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+        sheet3.to_excel(writer, sheet_name="Sheet3", index=False)
+        pd.DataFrame({"Entity": ["Campaign"]}).to_excel(
+            writer, sheet_name="Sponsored Brands Campaigns", index=False
+        )
+
+    input_sheets = WorkbookCache().read_sheets(buffer.getvalue(), INPUT_SHEETS)
+    assert "Sheet3" in input_sheets and "Sponsored Brands Campaigns" not in input_sheets
+
+    orchestrator = PortfolioOptimizationOrchestrator(PortfolioOptimizationFactory())
+    merged_data, _ = orchestrator.run_optimizations(input_sheets, ["empty_portfolios"])
+    output = orchestrator.create_output_file(merged_data, {})
+
+    output_sheets = pd.read_excel(io.BytesIO(output), sheet_name=None)
+    pd.testing.assert_frame_equal(output_sheets["Sheet3"], sheet3)
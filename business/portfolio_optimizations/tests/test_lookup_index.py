@@ -0,0 +1,73 @@
+"""Tests for the Campaign ID / Portfolio ID lookup index."""
+
+import numpy as np
+import pandas as pd
+
+from ..processors import AdsCountProcessor, AsinMatcher, LookupIndex
+from ..processors.lookup_index import normalize_id_key
+
+
+def build_sheets():
+    """Small Campaign / Product Ad pair with repeated and missing campaign IDs."""
+    campaigns = pd.DataFrame({
+        "Operation": ["", "", "", ""],
+        "Entity": ["Campaign", "Campaign", "Ad Group", "Campaign"],
+        "Campaign ID": [101, 102, 101, 103],
+        "Portfolio Name (Informational only)": ["A", "A", "A", "A"],
+        "Campaign State (Informational only)": ["enabled"] * 4,
+        "State": ["enabled"] * 4,
+    })
+    product_ads = pd.DataFrame({
+        "Entity": ["Product Ad", "Product Ad", "Ad Group", "Product Ad"],
+        "Campaign ID": [101, 101, 102, 102],
+        "ASIN": [np.nan, "B0002", "B0003", "B0004"],
+    })
+    return {"Campaign": campaigns, "Product Ad": product_ads}
+
+
+def test_count_and_first_match_countifs_and_vlookup():
+    sheets = build_sheets()
+    index = LookupIndex.for_product_ads(sheets["Product Ad"])
+
+    keys = pd.Series([101, 102, 103])
+    assert index.count(keys).tolist() == [2, 1, 0]
+
+    first = index.first(keys, "ASIN")
+    assert pd.isna(first[0]) and first[1] == "B0004" and pd.isna(first[2])
+
+
+def test_portfolio_ids_are_normalized_before_counting():
+    campaigns = pd.DataFrame({
+        "Entity": ["Campaign", "Campaign", "Campaign", "Ad Group"],
+        "Portfolio ID": [12.0, "12", np.nan, 12],
+    })
+    index = LookupIndex.for_campaign_portfolios(campaigns)
+
+    assert index.count(pd.Series(["12", 12.0, "", "13"])).tolist() == [2, 2, 1, 0]
+
+
+def test_processors_share_one_index():
+    sheets = build_sheets()
+    index = LookupIndex.for_product_ads(sheets["Product Ad"])
+
+    counted = AdsCountProcessor().process(sheets, index)
+    matched = AsinMatcher().process(counted, index)
+
+    # Campaign 101 has two Product Ads and is removed by the Ads Count filter
+    campaigns = matched["Campaign"]
+    assert campaigns["Campaign ID"].tolist() == [102, 101, 103]
+    assert campaigns["Ads Count"].tolist() == [1, 0, 0]
+    assert campaigns["ASIN PA"].tolist() == ["B0004", "", ""]
+
+
+def test_id_normalization_matches_str_int_float_beyond_int64():
+    values = pd.Series([
+        "99999999999999999999", "9223372036854775808", "-9223372036854775809",
+        "7800654720179028.0", "84453417629173", " 12.9 ", "abc", "", np.nan,
+    ], dtype=object)
+
+    # str(int(float(value))) for numbers, without int64 wrap-around
+    assert normalize_id_key(values).tolist() == [
+        "100000000000000000000", "9223372036854775808", "-9223372036854775808",
+        "7800654720179028", "84453417629173", "12", "abc", "", "",
+    ]
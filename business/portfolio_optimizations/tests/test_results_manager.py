@@ -0,0 +1,136 @@
+"""Tests for ResultsManager patch application through the keyed row index."""
+
+import pandas as pd
+
+from ..contracts import OptimizationResult, PatchData, CellUpdate, ColumnarPatch
+from ..results_manager import ResultsManager
+
+
+def build_portfolios():
+    return {
+        "Portfolios": pd.DataFrame({
+            "Entity": ["Portfolio"] * 4,
+            "Portfolio ID": [11, 12, 12, 13],
+            "Portfolio Name": ["A", "B", "C", "D"],
+        })
+    }
+
+
+def portfolio_result(changes):
+    updates = [
+        CellUpdate(row_index=row, key_column="Portfolio ID", key_value=key, cell_changes=cells)
+        for row, key, cells in changes
+    ]
+    return OptimizationResult(
+        result_type="portfolios",
+        merge_keys=["Portfolio ID"],
+        patch=PatchData(sheet_name="Portfolios", updates=updates),
+    )
+
+
+def test_indexed_lookup_matches_column_scan():
+    df = build_portfolios()["Portfolios"]
+    manager = ResultsManager()
+
+    for key, expected in [("12", None), ("12", 2), ("13", 99), ("14", None)]:
+        scanned = manager._find_row(df, "Portfolio ID", key, expected)
+        indexed = manager._find_row(df, "Portfolio ID", key, expected, sheet_name="Portfolios")
+        assert scanned == indexed
+
+
+def test_merge_tracks_conflicts_and_reports_timings():
+    manager = ResultsManager()
+    results = [
+        portfolio_result([(1, "12", {"Portfolio Name": "X"}), (3, "13", {"Portfolio Name": "Y"})]),
+        portfolio_result([(1, "12", {"Portfolio Name": "Z"})]),
+    ]
+
+    merged, report = manager.merge_all(build_portfolios(), results)
+
+    assert merged["Portfolios"]["Portfolio Name"].tolist() == ["A", "Z", "C", "Y"]
+    assert sorted(report["updated_indices"]["Portfolios"]) == [1, 3]
+    assert len(report["conflicts"]) == 1
+    assert len(report["timings"]["patches"]) == 2
+
+
+def test_row_index_is_rebuilt_after_rows_change():
+    data = build_portfolios()
+    df = data["Portfolios"]
+    manager = ResultsManager()
+
+    assert manager._find_row(df, "Portfolio ID", "13", sheet_name="Portfolios") == 3
+
+    data["Portfolios"] = df = df.drop(index=0).reset_index(drop=True)
+    assert manager._find_row(df, "Portfolio ID", "13", sheet_name="Portfolios") == 2
+
+
+def test_columnar_patch_matches_cell_updates():
+    first = portfolio_result([(1, "12", {"Portfolio Name": "X"})])
+    columnar = ColumnarPatch(
+        sheet_name="Portfolios",
+        key_column="Portfolio ID",
+        keys=["11", "12", "13", "99"],
+        row_indices=[0, 1, 3, None],
+        columns={"Portfolio Name": ["P", "Q", 7.0, "R"], "Camp Count": [0, 1, 2, 3]},
+        masks={"Portfolio Name": [True, True, False, True]},
+    )
+    as_rows = OptimizationResult(
+        result_type="portfolios",
+        merge_keys=["Portfolio ID"],
+        patch=PatchData(sheet_name="Portfolios", updates=columnar.updates),
+    )
+    as_columns = OptimizationResult(
+        result_type="portfolios", merge_keys=["Portfolio ID"], patch=columnar
+    )
+
+    row_manager, column_manager = ResultsManager(), ResultsManager()
+    row_merged, row_report = row_manager.merge_all(build_portfolios(), [first, as_rows])
+    column_merged, column_report = column_manager.merge_all(build_portfolios(), [first, as_columns])
+
+    pd.testing.assert_frame_equal(row_merged["Portfolios"], column_merged["Portfolios"])
+    assert row_report["total_cells_updated"] == column_report["total_cells_updated"] == 6
+    assert sorted(row_report["updated_indices"]["Portfolios"]) == sorted(column_report["updated_indices"]["Portfolios"])
+    assert sorted((c.row_index, c.column_name) for c in row_report["conflicts"]) == \
+        sorted((c.row_index, c.column_name) for c in column_report["conflicts"])
+
+
+
+def test_columnar_patch_resolves_unique_keys_without_per_key_lookups(monkeypatch):
+    def sheets():
+        data = build_portfolios()
+        data["Portfolios"]["Portfolio ID"] = [11, 12, 14, 13]
+        return data
+
+    patches = [
+        ColumnarPatch(
+            sheet_name="Portfolios", key_column="Portfolio ID", keys=["12"],
+            columns={"Portfolio Name": ["X"]},
+        ),
+        ColumnarPatch(
+            sheet_name="Portfolios", key_column="Portfolio ID", keys=["13", "12", "99", "11"],
+            columns={"Portfolio Name": ["P", "Q", "R", "S"]},
+            masks={"Portfolio Name": [True, True, True, False]},
+        ),
+    ]
+
+    def results(as_rows):
+        return [
+            OptimizationResult(
+                result_type="portfolios",
+                merge_keys=["Portfolio ID"],
+                patch=PatchData(sheet_name="Portfolios", updates=patch.updates) if as_rows else patch,
+            )
+            for patch in patches
+        ]
+
+    row_merged, row_report = ResultsManager().merge_all(sheets(), results(as_rows=True))
+
+    column_manager = ResultsManager()
+    monkeypatch.setattr(column_manager, "_find_row", None)  # must not be called
+    column_merged, column_report = column_manager.merge_all(sheets(), results(as_rows=False))
+
+    pd.testing.assert_frame_equal(row_merged["Portfolios"], column_merged["Portfolios"])
+    assert column_merged["Portfolios"]["Portfolio Name"].tolist() == ["A", "Q", "C", "P"]
+    assert row_report["total_cells_updated"] == column_report["total_cells_updated"] == 3
+    assert [(c.row_index, c.second_value) for c in column_report["conflicts"]] == [(1, "Q")]
+    assert [(c.row_index, c.second_value) for c in row_report["conflicts"]] == [(1, "Q")]
@@ -0,0 +1,55 @@
+"""Tests for moving Campaigns w/o Portfolios rows to the Terminal sheet."""
+
+import pandas as pd
+
+from benchmarks.synthetic_bulk import BulkSpec, generate_bulk_sheets
+from ..constants import DEFAULT_PORTFOLIO_ID
+from ..contracts import RowMove
+from ..factory import PortfolioOptimizationFactory
+from ..orchestrator import PortfolioOptimizationOrchestrator
+from ..results_manager import ResultsManager
+
+
+def test_row_move_partitions_the_source_sheet():
+    campaigns = pd.DataFrame({
+        "Entity": ["Campaign"] * 4,
+        "Operation": [""] * 4,
+        "Campaign ID": [11, 12, 13, 14],
+        "Portfolio ID": ["7", "", "8", ""],
+    })
+    original = campaigns.copy()
+    data = {"Campaign": campaigns}
+
+    moved = ResultsManager().apply_row_moves(data, [RowMove(
+        source_sheet="Campaign",
+        target_sheet="Terminal",
+        key_column="Campaign ID",
+        keys=["12", "14"],
+        assignments={"Portfolio ID": DEFAULT_PORTFOLIO_ID, "Operation": "update"},
+    )])
+
+    assert moved == 2
+    assert data["Terminal"]["Campaign ID"].tolist() == [12, 14]
+    assert data["Terminal"]["Portfolio ID"].tolist() == [DEFAULT_PORTFOLIO_ID] * 2
+    assert data["Terminal"]["Operation"].tolist() == ["update"] * 2
+    assert data["Campaign"]["Campaign ID"].tolist() == [11, 13]
+    pd.testing.assert_frame_equal(campaigns, original)
+
+    # Nothing to move still creates the target sheet, with the source's columns
+    ResultsManager().apply_row_moves(data, [RowMove("Campaign", "Terminal", "Campaign ID", [])])
+    assert data["Terminal"].empty and list(data["Terminal"].columns) == list(campaigns.columns)
+    assert len(data["Campaign"]) == 2
+
+
+def test_campaigns_without_portfolios_moves_rows_to_terminal():
+    sheets = generate_bulk_sheets(BulkSpec(n_rows=3000, seed=6))
+    orchestrator = PortfolioOptimizationOrchestrator(PortfolioOptimizationFactory())
+    merged_data, run_report = orchestrator.run_optimizations(sheets, ["campaigns_without_portfolios"])
+
+    terminal = merged_data["Terminal"]
+    metrics = run_report.optimization_details["campaigns_without_portfolios"]["metrics"]
+    assert run_report.failed_optimizations == []
+    assert len(terminal) == metrics["rows_updated"] > 0
+    assert (terminal["Portfolio ID"] == DEFAULT_PORTFOLIO_ID).all()
+    assert (terminal["Operation"] == "update").all()
+    assert not merged_data["Campaign"]["Campaign ID"].isin(terminal["Campaign ID"]).any()
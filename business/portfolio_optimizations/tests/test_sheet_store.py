@@ -0,0 +1,56 @@
+"""Tests for copy-on-write sheet views."""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_bulk import BulkSpec, generate_bulk_sheets, generate_template
+from ..factory import PortfolioOptimizationFactory
+from ..orchestrator import PortfolioOptimizationOrchestrator
+from ..sheet_store import SheetStore, take_rows
+
+
+def test_views_share_data_and_materialize_writable_columns():
+    base = pd.DataFrame({
+        "Portfolio ID": [1.0, 2.0, 3.0],
+        "Operation": ["", "", ""],
+        "Campaign ID": [11, 12, 13],
+    })
+    original = base.copy()
+    store = SheetStore({"Campaign": base})
+
+    view = store.view("Campaign", ["Portfolio ID", "Operation", "Missing"])
+    assert np.shares_memory(view["Campaign ID"].to_numpy(), base["Campaign ID"].to_numpy())
+    assert not np.shares_memory(view["Portfolio ID"].to_numpy(), base["Portfolio ID"].to_numpy())
+
+    view.loc[view["Campaign ID"] > 11, "Portfolio ID"] = 9.0
+    view.at[0, "Operation"] = "update"
+    view.insert(1, "Ads Count", 0)
+    view["Campaign ID"] = view["Campaign ID"] * 10
+    pd.testing.assert_frame_equal(base, original)
+    assert store.stats["materialized_columns"] == 2
+
+    rows = take_rows(base, base["Campaign ID"] > 11)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        rows.at[1, "Operation"] = "update"
+    pd.testing.assert_frame_equal(base, original)
+
+
+def test_optimizations_leave_input_sheets_untouched():
+    sheets = generate_bulk_sheets(BulkSpec(n_rows=3000, seed=5))
+    template = generate_template(sheets["Sponsored Products Campaigns"], seed=5)
+    original = {name: df.copy() for name, df in sheets.items()}
+
+    orchestrator = PortfolioOptimizationOrchestrator(PortfolioOptimizationFactory())
+    orchestrator.factory.create_strategy("organize_top_campaigns").set_template_data(
+        pd.DataFrame({"Top ASINs": template["Top ASINs"]["ASIN"]})
+    )
+    merged_data, run_report = orchestrator.run_optimizations(
+        sheets, ["empty_portfolios", "campaigns_without_portfolios", "organize_top_campaigns"]
+    )
+
+    assert "Top Campaigns" in merged_data and run_report.successful_optimizations >= 2
+    for name, df in original.items():
+        pd.testing.assert_frame_equal(sheets[name], df)
@@ -11,6 +11,7 @@ from io import BytesIO
 import logging
 from openpyxl.styles import PatternFill, Font, Alignment
 from openpyxl.utils import get_column_letter
+from data.writers.format_plan import NUMBER_FORMATS, get_format_plan, text_values
 
 
 class ExcelBaseFormatter:
@@ -63,40 +64,8 @@ class ExcelBaseFormatter:
     # Standard colors
     COLORS = {"pink_error": "FFE4E1", "blue_header": "87CEEB", "gray_header": "E0E0E0"}
 
-    # Standard number formats
-    NUMBER_FORMATS = {
-        # IDs - Text format
-        "Campaign ID": "@",
-        "Ad Group ID": "@",
-        "Keyword ID": "@",
-        "Product Targeting ID": "@",
-        # Money
-        "Bid": "0.000",
-        "Old Bid": "0.000",
-        "Temp Bid": "0.000",
-        "Max_Bid": "0.000",
-        "Base Bid": "0.000",
-        "Target CPA": "0.00",
-        "Adj. CPA": "0.00",
-        "Max BA": "0.00",
-        "Spend": "$#,##0.00",
-        "Sales": "$#,##0.00",
-        "CPC": "$0.000",
-        # Percentages
-        "Conversion Rate": "0.00%",
-        "ACOS": "0.00%",
-        "Percentage": "0.00",
-        # Integers
-        "Clicks": "#,##0",
-        "Units": "#,##0",
-        "Impressions": "#,##0",
-        "Orders": "#,##0",
-        # Decimals
-        "ROAS": "0.00",
-        "calc1": "0.000",
-        "calc2": "0.000",
-        "calc3": "0.000",
-    }
+    # Standard number formats (shared with the other writers' format plans)
+    NUMBER_FORMATS = NUMBER_FORMATS
 
     def __init__(self):
         """Initialize base formatter."""
@@ -121,17 +90,10 @@ class ExcelBaseFormatter:
         """
         df_copy = df.copy()
 
-        for col in df_copy.columns:
-            if self._should_format_as_text(col):
+        for position, column_format in enumerate(get_format_plan(df_copy.columns)):
+            if column_format.is_text:
                 # Convert to string, preserving all digits
-                mask = df_copy[col].notna()
-                df_copy.loc[mask, col] = df_copy.loc[mask, col].apply(
-                    lambda x: str(int(x))
-                    if isinstance(x, (int, float)) and x == int(x)
-                    else str(x)
-                    if pd.notna(x)
-                    else ""
-                )
+                df_copy.isetitem(position, text_values(df_copy.iloc[:, position]))
 
         return df_copy
 
@@ -315,16 +277,14 @@ class ExcelBaseFormatter:
         if worksheet.max_row > 1000:
             return  # Skip formatting for large files
 
-        for col_idx, col_name in enumerate(columns, 1):
-            if col_name in self.NUMBER_FORMATS:
-                format_str = self.NUMBER_FORMATS[col_name]
-                col_letter = get_column_letter(col_idx)
-
+        last_row = min(worksheet.max_row, 999)  # Limit to 1000 rows
+        for col_idx, column_format in enumerate(get_format_plan(columns), 1):
+            format_str = column_format.bulk_number_format
+            if format_str:
                 # Apply to all rows except header
-                for row in range(
-                    2, min(worksheet.max_row + 1, 1000)
-                ):  # Limit to 1000 rows
-                    cell = worksheet[f"{col_letter}{row}"]
+                for (cell,) in worksheet.iter_rows(
+                    min_row=2, max_row=last_row, min_col=col_idx, max_col=col_idx
+                ):
                     cell.number_format = format_str
 
     # =========================================================================
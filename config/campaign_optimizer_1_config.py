@@ -16,6 +16,9 @@ REQUIRED_COLUMNS = [
     "Ad Group State (Informational only)"
 ]
 
+# Sheets and columns read from the bulk file for validation (others are skipped)
+INPUT_SHEET_COLUMNS = {sheet: REQUIRED_COLUMNS for sheet in REQUIRED_SHEETS}
+
 # Output settings
 OUTPUT_SHEETS = ["Campaign", "Sheet3"]
 OUTPUT_FILE_PREFIX = "campaign-optimizer-1"
@@ -534,36 +534,14 @@ def apply_text_format_before_write(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with ID columns converted to strings
     """
+    from data.writers.format_plan import get_format_plan, text_values
+
     df_copy = df.copy()
 
-    for col in df_copy.columns:
-        if should_format_as_text(col):
-            # Convert to string and preserve all digits
-            if col in df_copy.columns:
-                # Handle NaN values
-                mask = df_copy[col].notna()
-
-                # Convert to string, removing decimal points for integers
-                def safe_convert_to_string(x):
-                    try:
-                        if pd.isna(x):
-                            return ""
-                        elif hasattr(x, '__iter__') and not isinstance(x, str):
-                            # Handle array/list data - convert to string representation
-                            return str(x)
-                        elif isinstance(x, (int, float)) and not isinstance(x, bool):
-                            if x == int(x):
-                                return str(int(x))
-                            else:
-                                return str(x)
-                        else:
-                            return str(x)
-                    except (ValueError, TypeError, OverflowError):
-                        return str(x)
-                
-                # Use .loc with proper boolean indexing to avoid the warning
-                if mask.any():
-                    df_copy.loc[mask, col] = df_copy.loc[mask, col].apply(safe_convert_to_string)
+    for position, column_format in enumerate(get_format_plan(df_copy.columns)):
+        if column_format.is_text:
+            # Convert to string, removing decimal points for integers
+            df_copy.isetitem(position, text_values(df_copy.iloc[:, position]))
 
     return df_copy
 
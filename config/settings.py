@@ -23,6 +23,12 @@ class Settings:
         self.parallel_processing = True
         self.chunk_size = 1000
         self.memory_limit_gb = 4
+        self.workbook_cache_entries = 8  # Parsed uploads kept in memory
+        self.workbook_cache_mb = 512  # Shared by all sessions; callers get copies on top
+        self.trace_stage_memory = False  # tracemalloc per optimization stage (slow)
+        self.background_job_workers = 4  # Optimization runs executing at once (all sessions)
+        self.result_cache_entries = 16  # Finished runs kept for identical inputs
+        self.result_cache_mb = 1024
         
     def get_ui_config(self) -> Dict[str, Any]:
         """Get UI-specific configuration."""
@@ -39,7 +45,13 @@ class Settings:
         return {
             "parallel": self.parallel_processing,
             "chunk_size": self.chunk_size,
-            "memory_limit": self.memory_limit_gb * 1024 * 1024 * 1024  # Convert to bytes
+            "memory_limit": self.memory_limit_gb * 1024 * 1024 * 1024,  # Convert to bytes
+            "workbook_cache_entries": self.workbook_cache_entries,
+            "workbook_cache_limit": self.workbook_cache_mb * 1024 * 1024,  # Convert to bytes
+            "trace_stage_memory": self.trace_stage_memory,
+            "background_job_workers": self.background_job_workers,
+            "result_cache_entries": self.result_cache_entries,
+            "result_cache_limit": self.result_cache_mb * 1024 * 1024  # Convert to bytes
         }
 
 # Global settings instance
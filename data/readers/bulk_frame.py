@@ -0,0 +1,131 @@
+"""Bulk sheet columns typed once at load time."""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Hashable, Optional
+import logging
+
+
+# Numeric columns of the Sponsored Products Campaigns sheet
+BULK_NUMERIC_COLUMNS = [
+    "Bid", "Clicks", "Units", "Percentage", "Impressions", "Spend", "Sales",
+    "Orders", "Conversion Rate", "ACOS", "CPC", "ROAS", "Click-through Rate",
+    "Daily Budget", "Ad Group Default Bid",
+]
+
+# ID columns, stored as int64 when every value is a whole number
+BULK_ID_COLUMNS = [
+    "Campaign ID", "Ad Group ID", "Portfolio ID", "Ad ID", "Keyword ID",
+    "Product Targeting ID",
+]
+
+# DataFrame.attrs key of the invalid value labels (see type_bulk_frame)
+INVALID_NUMERIC_ATTR = "invalid_numeric"
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidNumericLabels:
+    """
+    Row labels of present but non-numeric values, per column.
+
+    Immutable, so DataFrame.attrs propagation (a deepcopy on every pandas
+    operation) shares the instance instead of copying the labels.
+    """
+
+    __slots__ = ("_labels",)
+
+    def __init__(self, labels: Dict[Hashable, np.ndarray]):
+        self._labels = labels
+
+    def __deepcopy__(self, memo) -> "InvalidNumericLabels":
+        return self
+
+    def get(self, column: Hashable) -> Optional[np.ndarray]:
+        """Labels recorded for a column, None if the column had no invalid values."""
+        return self._labels.get(column)
+
+    def counts(self) -> Dict[Hashable, int]:
+        """Number of invalid values per column."""
+        return {column: len(labels) for column, labels in self._labels.items()}
+
+
+def type_bulk_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Type the numeric and ID columns of a bulk sheet in place.
+
+    - Numeric columns become float64, so later pd.to_numeric calls in the
+      validators, cleaners and processors return at once.
+    - A column with present but non-numeric values (e.g. 'n/a') is left as
+      read, so the processors can still mark those rows as errors. The
+      labels of those rows are kept in df.attrs[INVALID_NUMERIC_ATTR]
+      (only when there are any) for invalid_numeric_mask().
+    - ID columns holding only whole numbers become int64.
+
+    Args:
+        df: Bulk DataFrame owned by the caller (e.g. a fresh copy)
+
+    Returns:
+        The same DataFrame
+    """
+    invalid: Dict[Hashable, np.ndarray] = {}
+
+    for column in BULK_NUMERIC_COLUMNS:
+        if column not in df.columns or _is_numeric(df[column]):
+            continue
+
+        values = pd.to_numeric(df[column], errors="coerce")
+        invalid_mask = values.isna() & df[column].notna()
+        if invalid_mask.any():
+            invalid[column] = df.index[invalid_mask.to_numpy()].to_numpy()
+        else:
+            df[column] = values.astype(float)
+
+    for column in BULK_ID_COLUMNS:
+        if column in df.columns and df[column].dtype == np.float64:
+            values = df[column].to_numpy()
+            if len(values) and np.isfinite(values).all() and (values == np.trunc(values)).all():
+                if (np.abs(values) < 2.0 ** 63).all():
+                    df[column] = values.astype(np.int64)
+
+    if invalid:
+        labels = InvalidNumericLabels(invalid)
+        df.attrs[INVALID_NUMERIC_ATTR] = labels
+        logger.info(f"Non-numeric values in bulk: {labels.counts()}")
+    else:
+        df.attrs.pop(INVALID_NUMERIC_ATTR, None)
+
+    return df
+
+
+def numeric_values(df: pd.DataFrame, column: Hashable) -> pd.Series:
+    """Column as numbers (non-numeric values become NaN); typed columns are returned as is."""
+    values = df[column]
+    if _is_numeric(values):
+        return values
+    return pd.to_numeric(values, errors="coerce")
+
+
+def invalid_numeric_mask(df: pd.DataFrame, column: Hashable) -> pd.Series:
+    """
+    Rows whose value in column is present but not numeric.
+
+    Read from the labels recorded by type_bulk_frame() when available
+    (valid while the frame keeps the row labels of the loaded bulk),
+    otherwise computed from the column.
+    """
+    values = df[column]
+    if _is_numeric(values):
+        return pd.Series(False, index=df.index)
+
+    invalid = df.attrs.get(INVALID_NUMERIC_ATTR)
+    labels = invalid.get(column) if invalid is not None else None
+    if labels is not None:
+        return pd.Series(df.index.isin(labels), index=df.index)
+
+    return pd.to_numeric(values, errors="coerce").isna() & values.notna()
+
+
+def _is_numeric(values: pd.Series) -> bool:
+    """Whether a column already holds plain numbers."""
+    return values.dtype.kind in "fiu"
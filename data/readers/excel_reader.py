@@ -5,6 +5,7 @@ import io
 from typing import Dict, Tuple, Optional
 from config.constants import TEMPLATE_REQUIRED_SHEETS, BULK_SHEET_NAME
 from .template_reader import TemplateReader
+from .workbook_cache import workbook_cache
 
 
 class ExcelReader:
@@ -24,7 +25,7 @@ class ExcelReader:
         """
         try:
             # Read all sheets
-            excel_data = pd.read_excel(io.BytesIO(file_data), sheet_name=None)
+            excel_data = workbook_cache.read_excel(file_data, sheet_name=None)
 
             # Only require Port Values sheet (Top ASINs and Delete for 60 are optional)
             if "Port Values" not in excel_data:
@@ -81,19 +82,19 @@ class ExcelReader:
                     df = pd.read_csv(io.BytesIO(file_data), encoding="latin-1")
             else:
                 # Handle Excel files - try to find the correct sheet
-                excel_data = pd.read_excel(io.BytesIO(file_data), sheet_name=None)
+                # and decode only that one
+                available_sheets = workbook_cache.sheet_names(file_data)
 
-                if BULK_SHEET_NAME in excel_data:
-                    df = excel_data[BULK_SHEET_NAME]
+                if BULK_SHEET_NAME in available_sheets:
+                    df = workbook_cache.read_sheets(file_data, {BULK_SHEET_NAME: None})[BULK_SHEET_NAME]
                 else:
                     # Look for similar sheet names
-                    available_sheets = list(excel_data.keys())
                     possible_sheets = [
                         s for s in available_sheets if "campaign" in s.lower()
                     ]
 
                     if possible_sheets:
-                        df = excel_data[possible_sheets[0]]
+                        df = workbook_cache.read_sheets(file_data, {possible_sheets[0]: None})[possible_sheets[0]]
                         sheet_msg = f"Using sheet '{possible_sheets[0]}' (expected '{BULK_SHEET_NAME}')"
                     else:
                         return (
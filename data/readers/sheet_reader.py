@@ -0,0 +1,163 @@
+"""Sheet-selective, column-pruned Excel reading."""
+
+import pandas as pd
+import numpy as np
+import io
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
+
+try:
+    import python_calamine  # noqa: F401
+
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+
+# Sheet name -> columns to keep (None keeps every column)
+SheetSpec = Dict[str, Optional[Sequence[str]]]
+
+
+class SheetReader:
+    """
+    Reads only the sheets and columns an optimization declares.
+
+    Other sheets are never decoded and cells of other columns are never
+    converted. Uses the calamine engine when python-calamine is installed,
+    otherwise streams rows with openpyxl in read-only mode. Results match
+    pd.read_excel for the selected sheets and columns.
+    """
+
+    def __init__(self, engine: Optional[str] = None):
+        self.engine = engine or ("calamine" if CALAMINE_AVAILABLE else "openpyxl")
+        self.logger = logging.getLogger(__name__)
+
+    def sheet_names(self, content: bytes) -> List[str]:
+        """List the sheet names without decoding any sheet."""
+        workbook = load_workbook(io.BytesIO(content), read_only=True, keep_links=False)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+
+    def read(self, content: bytes, sheets: SheetSpec) -> Dict[str, pd.DataFrame]:
+        """
+        Read the requested sheets of a workbook.
+
+        Args:
+            content: Raw workbook bytes
+            sheets: Sheet name -> columns to keep (None keeps every column)
+
+        Returns:
+            Dictionary of sheet name to DataFrame for the sheets that exist
+        """
+        if self.engine == "calamine":
+            return self._read_calamine(content, sheets)
+        return self._read_openpyxl(content, sheets)
+
+    def _read_calamine(self, content: bytes, sheets: SheetSpec) -> Dict[str, pd.DataFrame]:
+        """Read with pandas' calamine engine, pruning columns while parsing."""
+        available = set(self.sheet_names(content))
+        result = {}
+        for sheet_name, columns in sheets.items():
+            if sheet_name not in available:
+                continue
+            usecols = None if columns is None else self._column_filter(columns)
+            result[sheet_name] = pd.read_excel(
+                io.BytesIO(content), sheet_name=sheet_name, usecols=usecols, engine="calamine"
+            )
+        return result
+
+    def _read_openpyxl(self, content: bytes, sheets: SheetSpec) -> Dict[str, pd.DataFrame]:
+        """Stream the requested sheets with openpyxl read-only mode."""
+        workbook = load_workbook(
+            io.BytesIO(content), read_only=True, data_only=True, keep_links=False
+        )
+        try:
+            result = {}
+            for sheet_name, columns in sheets.items():
+                if sheet_name not in workbook.sheetnames:
+                    continue
+                result[sheet_name] = self._read_worksheet(workbook[sheet_name], columns)
+            return result
+        finally:
+            workbook.close()
+
+    def _read_worksheet(self, worksheet: Any, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+        """Convert one worksheet, keeping only the requested columns."""
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows()
+        header_cells = next(rows, None)
+        if header_cells is None:
+            return pd.DataFrame()
+
+        if columns is None:
+            data = [self._convert_row(header_cells)]
+            data.extend(self._convert_row(cells) for cells in rows)
+
+            # Trim trailing empty rows like pd.read_excel
+            while data and not data[-1]:
+                data.pop()
+        else:
+            wanted = set(columns)
+            keep = [
+                i for i, cell in enumerate(header_cells)
+                if str(self._convert_cell(cell)) in wanted
+            ]
+            if not keep:
+                return pd.DataFrame()
+
+            data = [[self._convert_cell(header_cells[i]) for i in keep]]
+            last_row_with_data = 0
+            for cells in rows:
+                row_length = len(cells)
+                row = [self._convert_cell(cells[i]) if i < row_length else "" for i in keep]
+                while row and row[-1] == "":
+                    row.pop()
+                data.append(row)
+
+                # Trailing empty rows are trimmed on the whole row, as pd.read_excel does
+                # before applying usecols: a row with data only in pruned columns is kept
+                if row or any(cell.value is not None and cell.value != "" for cell in cells):
+                    last_row_with_data = len(data) - 1
+
+            del data[last_row_with_data + 1:]
+
+        if not data:
+            return pd.DataFrame()
+
+        width = max(len(row) for row in data)
+        data = [row + [""] * (width - len(row)) for row in data]
+
+        return TextParser(data, header=0, skip_blank_lines=False).read()
+
+    def _convert_row(self, cells: Sequence[Any]) -> List[Any]:
+        """Convert all cells of a row, trimming trailing empty cells."""
+        row = [self._convert_cell(cell) for cell in cells]
+        while row and row[-1] == "":
+            row.pop()
+        return row
+
+    @staticmethod
+    def _convert_cell(cell: Any) -> Any:
+        """Convert a cell value the way pandas' openpyxl reader does."""
+        value = cell.value
+        if value is None:
+            return ""
+        if cell.data_type == TYPE_ERROR:
+            return np.nan
+        if cell.data_type == TYPE_NUMERIC:
+            integer = int(value)
+            if integer == value:
+                return integer
+            return float(value)
+        return value
+
+    @staticmethod
+    def _column_filter(columns: Sequence[str]):
+        """usecols callable keeping the requested column names."""
+        wanted = set(columns)
+        return lambda name: str(name) in wanted
@@ -0,0 +1,232 @@
+"""Content-hash keyed cache of parsed workbooks."""
+
+import pandas as pd
+import hashlib
+import io
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from config.settings import settings
+from .sheet_reader import SheetReader, SheetSpec
+
+
+class WorkbookCache:
+    """
+    Parse-once cache for uploaded Excel and CSV files.
+
+    Entries are keyed by the SHA-256 of the file content plus the read
+    arguments, so the same upload is decoded once no matter how many times
+    upload, validation and processing ask for it. Least recently used
+    entries are evicted once the cached DataFrames exceed the memory cap or
+    the entry limit. Callers always receive copies and may modify them.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None):
+        processing_config = settings.get_processing_config()
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else processing_config["workbook_cache_limit"]
+        )
+        self.max_entries = (
+            max_entries if max_entries is not None else processing_config["workbook_cache_entries"]
+        )
+        self.logger = logging.getLogger(__name__)
+
+        # key -> (parsed data, size in bytes), oldest first
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.sheet_reader = SheetReader()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+    def read_excel(
+        self, file_data: Any, sheet_name: Union[str, int, None] = 0, **kwargs
+    ) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """
+        Cached equivalent of pd.read_excel(file_data, sheet_name=...).
+
+        A single sheet is served from an already parsed full workbook
+        (sheet_name=None) when one is cached.
+        """
+        content = self._get_bytes(file_data)
+        digest = self.content_hash(content)
+        options = self._options_key(kwargs)
+
+        if sheet_name is not None:
+            workbook = self._get((digest, "excel", None, options), count_miss=False)
+            if workbook is not None and isinstance(sheet_name, str) and sheet_name in workbook:
+                return workbook[sheet_name].copy()
+
+        key = (digest, "excel", sheet_name, options)
+        data = self._get(key)
+        if data is None:
+            data = pd.read_excel(io.BytesIO(content), sheet_name=sheet_name, **kwargs)
+            self._put(key, data)
+
+        return self._copy(data)
+
+    def read_sheets(self, file_data: Any, sheets: SheetSpec) -> Dict[str, pd.DataFrame]:
+        """
+        Read only the declared sheets and columns (see SheetReader).
+
+        Sheets missing from the workbook are left out of the result. Served
+        from an already parsed full workbook when one is cached, and sheets
+        already parsed by read_excel(sheet_name=<sheet>) are reused; only
+        the remaining sheets are decoded.
+        """
+        content = self._get_bytes(file_data)
+        digest = self.content_hash(content)
+
+        workbook = self._get((digest, "excel", None, ()), count_miss=False)
+        if workbook is not None:
+            return {
+                sheet_name: self._select_columns(workbook[sheet_name], columns)
+                for sheet_name, columns in sheets.items()
+                if sheet_name in workbook
+            }
+
+        result = {}
+        remaining = {}
+        for sheet_name, columns in sheets.items():
+            parsed = self._get((digest, "excel", sheet_name, ()), count_miss=False)
+            if parsed is not None:
+                result[sheet_name] = self._select_columns(parsed, columns)
+            else:
+                remaining[sheet_name] = columns
+        if not remaining:
+            return result
+
+        spec = tuple(
+            (sheet_name, None if columns is None else tuple(columns))
+            for sheet_name, columns in remaining.items()
+        )
+        key = (digest, "sheets", spec, ())
+        data = self._get(key)
+        if data is None:
+            data = self.sheet_reader.read(content, remaining)
+            self._put(key, data)
+
+        result.update(self._copy(data))
+        return {sheet_name: result[sheet_name] for sheet_name in sheets if sheet_name in result}
+
+    def sheet_names(self, file_data: Any) -> List[str]:
+        """Sheet names of a workbook, without decoding its sheets."""
+        return self.sheet_reader.sheet_names(self._get_bytes(file_data))
+
+    def read_csv(self, file_data: Any, **kwargs) -> pd.DataFrame:
+        """Cached equivalent of pd.read_csv(file_data)."""
+        content = self._get_bytes(file_data)
+        key = (self.content_hash(content), "csv", None, self._options_key(kwargs))
+
+        data = self._get(key)
+        if data is None:
+            data = pd.read_csv(io.BytesIO(content), **kwargs)
+            self._put(key, data)
+
+        return self._copy(data)
+
+    def read(
+        self, file_data: Any, filename: str = "", sheet_name: Union[str, int, None] = 0
+    ) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """Read a CSV or Excel upload depending on its file name."""
+        if filename.lower().endswith(".csv"):
+            return self.read_csv(file_data)
+        return self.read_excel(file_data, sheet_name=sheet_name)
+
+    def clear(self) -> None:
+        """Drop all cached workbooks."""
+        with self._lock:
+            self._entries.clear()
+            self.stats["bytes"] = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """Hash of the file content used as cache key."""
+        return hashlib.sha256(content).hexdigest()
+
+    def _get(self, key: Tuple, count_miss: bool = True) -> Any:
+        """Return cached data and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if count_miss:
+                    self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[0]
+
+    def _put(self, key: Tuple, data: Any) -> None:
+        """Store parsed data and evict least recently used entries over the limits."""
+        size = self._memory_size(data)
+        if size > self.max_bytes:
+            self.logger.info(f"Workbook of {size:,} bytes exceeds cache limit, not cached")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.stats["bytes"] -= self._entries.pop(key)[1]
+
+            self._entries[key] = (data, size)
+            self.stats["bytes"] += size
+
+            while self._entries and (
+                self.stats["bytes"] > self.max_bytes or len(self._entries) > self.max_entries
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.stats["bytes"] -= evicted_size
+                self.stats["evictions"] += 1
+
+    @staticmethod
+    def _get_bytes(file_data: Any) -> bytes:
+        """Get the raw content of bytes, a path, BytesIO or an uploaded file."""
+        if isinstance(file_data, (bytes, bytearray)):
+            return bytes(file_data)
+
+        if isinstance(file_data, (str, os.PathLike)):
+            with open(file_data, "rb") as f:
+                return f.read()
+
+        if hasattr(file_data, "getvalue"):
+            return file_data.getvalue()
+
+        position = file_data.tell()
+        file_data.seek(0)
+        content = file_data.read()
+        file_data.seek(position)
+        return content
+
+    @staticmethod
+    def _options_key(kwargs: Dict[str, Any]) -> Tuple:
+        """Hashable form of the pandas read arguments."""
+        return tuple(sorted((name, repr(value)) for name, value in kwargs.items()))
+
+    @staticmethod
+    def _memory_size(data: Any) -> int:
+        """Memory used by a DataFrame or a dict of DataFrames."""
+        if isinstance(data, dict):
+            return sum(int(df.memory_usage(deep=True).sum()) for df in data.values())
+        return int(data.memory_usage(deep=True).sum())
+
+    @staticmethod
+    def _select_columns(df: pd.DataFrame, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+        """Copy of a sheet restricted to the requested columns."""
+        if columns is None:
+            return df.copy()
+        wanted = set(columns)
+        return df[[column for column in df.columns if str(column) in wanted]].copy()
+
+    @staticmethod
+    def _copy(data: Any) -> Any:
+        """Copy cached data so callers cannot modify the cache."""
+        if isinstance(data, dict):
+            return {name: df.copy() for name, df in data.items()}
+        return data.copy()
+
+
+# Global workbook cache instance
+workbook_cache = WorkbookCache()
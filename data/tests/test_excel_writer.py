@@ -0,0 +1,110 @@
+"""Round-trip tests for the streaming Excel writer and its format plan."""
+
+import sys
+import io
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from data.writers.excel_writer import ExcelWriter
+from data.writers.format_plan import get_format_plan
+
+YELLOW = "00FFFF00"
+
+
+def write_and_load(sheets):
+    output = ExcelWriter().write_excel(sheets)
+    return load_workbook(io.BytesIO(output.getvalue()))
+
+
+def column_cells(ws, name):
+    header = [cell.value for cell in ws[1]]
+    return [row[header.index(name)] for row in ws.iter_rows(min_row=2)]
+
+
+def test_id_columns_are_written_as_text():
+    large = float(2 ** 60)
+    df = pd.DataFrame({
+        "Campaign ID": [123.0, large, np.nan],
+        "Ad Group ID": [1, 2, 3],
+        "Keyword ID": [456.0, "789.0", "abc"],
+        "Portfolio ID": pd.Series([101, None, 9007199254740993], dtype=object),
+    })
+
+    ws = write_and_load({"Sheet": df})["Sheet"]
+
+    assert [cell.value for cell in column_cells(ws, "Campaign ID")] == ["123", str(2 ** 60), None]
+    assert [cell.value for cell in column_cells(ws, "Ad Group ID")] == ["1", "2", "3"]
+    assert [cell.value for cell in column_cells(ws, "Keyword ID")] == ["456", "789", "abc"]
+    assert [cell.value for cell in column_cells(ws, "Portfolio ID")] == ["101", None, "9007199254740993"]
+    for name in df.columns:
+        assert all(cell.number_format == "@" for cell in column_cells(ws, name) if cell.value is not None)
+
+
+def test_campaign_dates_and_budgets_are_whole_numbers():
+    df = pd.DataFrame({
+        "Start Date": [20240101.0, np.nan],
+        "Daily Budget": [25.0, 12.5],
+        "End Date": pd.Series([20241231.0, "20250101"], dtype=object),
+    })
+
+    values = {
+        column_format.name: column_format.cell_values(df[column_format.name])[0]
+        for column_format in get_format_plan(df.columns, "Campaign")
+    }
+    assert values["Start Date"] == [20240101, ""] and type(values["Start Date"][0]) is int
+    assert values["Daily Budget"] == [25, 12.5] and type(values["Daily Budget"][0]) is int
+    assert values["End Date"] == [20241231, "20250101"] and type(values["End Date"][0]) is int
+
+    # Other sheets keep the float values
+    other = get_format_plan(df.columns, "Other")["Start Date"].cell_values(df["Start Date"])[0]
+    assert type(other[0]) is float
+
+    campaign = write_and_load({"Campaign": df})["Campaign"]
+    assert [cell.value for cell in column_cells(campaign, "Start Date")] == [20240101, None]
+    assert [cell.value for cell in column_cells(campaign, "Daily Budget")] == [25, 12.5]
+    assert [cell.value for cell in column_cells(campaign, "End Date")] == [20241231, "20250101"]
+
+
+def test_bid_columns_share_three_decimal_format_on_empty_cells():
+    df = pd.DataFrame({"Old Bid": [0.5, np.nan], "Bid": [np.nan, 0.75], "Clicks": [1.0, np.nan]})
+
+    ws = write_and_load({"Sheet": df})["Sheet"]
+
+    for name in ["Old Bid", "Bid"]:
+        assert [cell.number_format for cell in column_cells(ws, name)] == ["0.000", "0.000"]
+    assert column_cells(ws, "Old Bid")[1].value is None
+    assert column_cells(ws, "Clicks")[1].number_format == "General"
+
+
+def test_highlighted_rows_follow_row_positions():
+    df = pd.DataFrame(
+        {"Campaign ID": ["1", "2", "3"], "_needs_highlight": [False, True, False]},
+        index=[10, 0, 5],
+    )
+
+    ws = write_and_load({"Sheet": df})["Sheet"]
+
+    assert [cell.value for cell in ws[1]] == ["Campaign ID"]
+    fills = [row[0].fill.start_color.rgb for row in ws.iter_rows(min_row=2)]
+    assert [fill == YELLOW for fill in fills] == [False, True, False]
+
+
+def test_top_sheet_is_written_through_the_template_writer():
+    sheets = {
+        "Campaign": pd.DataFrame({"Campaign ID": ["1"]}),
+        "Top": pd.DataFrame({"Top ASINs": ["B000000001", "B000000002"]}),
+    }
+
+    workbook = write_and_load(sheets)
+
+    assert workbook.sheetnames == ["Campaign", "Top"]
+    values = [row[0].value for row in workbook["Top"].iter_rows()]
+    assert values == ["Top ASINs", "B000000001", "B000000002"]
+    assert workbook["Top"]["A1"].font.bold
@@ -0,0 +1,84 @@
+"""Tests for sheet-selective, column-pruned Excel reading."""
+
+import sys
+import io
+import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from data.readers.sheet_reader import SheetReader
+
+
+def build_workbook() -> bytes:
+    """Workbook with error cells, whole-number floats, dates and trailing rows."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Bulk"
+    rows = [
+        ["Campaign ID", "Bid", "State", "Budget", "Start"],
+        [101, 1.5, "enabled", 10.0, datetime.datetime(2024, 1, 2)],
+        [102, "#N/A", "paused", 12.5, None],
+        [None, 2.0, None, None, None],
+        [None, None, None, None, None],
+        [103, None, True, 20.0, None],
+        # Data only in columns that are pruned below
+        [None, None, None, None, datetime.datetime(2024, 3, 4)],
+        [None, 5.0, None, None, None],
+    ]
+    for row in rows:
+        sheet.append(row)
+    workbook.create_sheet("Portfolios").append(["Portfolio ID", "Portfolio Name"])
+    workbook["Portfolios"].append([7, "Main"])
+
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def expected_frame(content: bytes, sheet_name: str, columns):
+    usecols = None if columns is None else (lambda name: str(name) in columns)
+    return pd.read_excel(io.BytesIO(content), sheet_name=sheet_name, usecols=usecols)
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "calamine"])
+@pytest.mark.parametrize("columns", [
+    None,
+    ["Campaign ID"],
+    ["Campaign ID", "State"],
+    ["Bid", "Budget"],
+    ["Start", "Campaign ID"],
+])
+def test_read_matches_pandas(engine, columns):
+    if engine == "calamine":
+        pytest.importorskip("python_calamine")
+    content = build_workbook()
+
+    sheets = SheetReader(engine).read(content, {"Bulk": columns, "Missing": None})
+
+    assert list(sheets) == ["Bulk"]
+    pd.testing.assert_frame_equal(sheets["Bulk"], expected_frame(content, "Bulk", columns))
+
+
+def test_trailing_rows_with_data_in_pruned_columns_are_kept():
+    workbook = Workbook()
+    for row in [["A", "B"], [1, 2], [None, 5], [None, 6]]:
+        workbook.active.append(row)
+    workbook.active.title = "S"
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    df = SheetReader("openpyxl").read(buffer.getvalue(), {"S": ["A"]})["S"]
+
+    assert len(df) == 3 and df["A"].dtype == float
+    pd.testing.assert_frame_equal(df, expected_frame(buffer.getvalue(), "S", ["A"]))
+
+
+def test_sheet_names_without_decoding():
+    assert SheetReader("openpyxl").sheet_names(build_workbook()) == ["Bulk", "Portfolios"]
@@ -0,0 +1,116 @@
+"""Tests for the parse-once workbook cache."""
+
+import sys
+import io
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from data.readers.workbook_cache import WorkbookCache
+
+
+def build_workbook(rows: int = 3, seed: int = 0) -> bytes:
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        pd.DataFrame({
+            "Campaign ID": range(seed, seed + rows),
+            "Bid": [1.0 + i for i in range(rows)],
+            "State": ["enabled"] * rows,
+        }).to_excel(writer, sheet_name="Sponsored Products Campaigns", index=False)
+        pd.DataFrame({"Portfolio ID": [7], "Portfolio Name": ["Main"]}).to_excel(
+            writer, sheet_name="Portfolios", index=False
+        )
+    return buffer.getvalue()
+
+
+def forbid_decoding(cache, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("workbook decoded again")
+
+    monkeypatch.setattr(cache.sheet_reader, "read", fail)
+    monkeypatch.setattr(pd, "read_excel", fail)
+
+
+def test_hits_return_copies():
+    cache = WorkbookCache(max_bytes=10**8, max_entries=8)
+    content = build_workbook()
+
+    first = cache.read_excel(content, sheet_name=None)
+    first["Portfolios"].loc[0, "Portfolio Name"] = "Changed"
+    second = cache.read_excel(io.BytesIO(content), sheet_name=None)
+    assert second["Portfolios"].loc[0, "Portfolio Name"] == "Main"
+
+    sheets = cache.read_sheets(content, {"Portfolios": ["Portfolio Name"]})
+    sheets["Portfolios"]["Portfolio Name"] = "Changed"
+    assert cache.read_sheets(content, {"Portfolios": None})["Portfolios"].loc[0, "Portfolio Name"] == "Main"
+    assert cache.stats["hits"] >= 2
+
+
+def test_eviction_by_entries_and_bytes():
+    contents = [build_workbook(seed=seed) for seed in range(3)]
+
+    cache = WorkbookCache(max_bytes=10**8, max_entries=2)
+    for content in contents:
+        cache.read_excel(content, sheet_name="Portfolios")
+    assert len(cache) == 2 and cache.stats["evictions"] == 1
+
+    # The least recently used workbook was evicted
+    cache.read_excel(contents[0], sheet_name="Portfolios")
+    assert cache.stats["misses"] == 4
+
+    size = cache._memory_size(pd.read_excel(io.BytesIO(contents[0]), sheet_name="Portfolios"))
+    cache = WorkbookCache(max_bytes=2 * size, max_entries=8)
+    for content in contents:
+        cache.read_excel(content, sheet_name="Portfolios")
+    assert len(cache) == 2 and cache.stats["bytes"] <= 2 * size
+
+    # An entry larger than the cap is returned but not cached
+    cache = WorkbookCache(max_bytes=size - 1, max_entries=8)
+    assert len(cache.read_excel(contents[0], sheet_name="Portfolios")) == 1
+    assert len(cache) == 0
+
+
+def test_read_sheets_reuses_parsed_workbooks(monkeypatch):
+    content = build_workbook()
+    spec = {
+        "Sponsored Products Campaigns": ["Campaign ID", "Bid"],
+        "Portfolios": None,
+        "Missing": None,
+    }
+    fresh = WorkbookCache(max_bytes=10**8, max_entries=8).read_sheets(content, spec)
+    assert list(fresh) == ["Sponsored Products Campaigns", "Portfolios"]
+    for sheet_name, columns in spec.items():
+        if sheet_name in fresh:
+            usecols = None if columns is None else (lambda name: name in columns)
+            pd.testing.assert_frame_equal(
+                fresh[sheet_name],
+                pd.read_excel(io.BytesIO(content), sheet_name=sheet_name, usecols=usecols),
+            )
+
+    # Served from a full workbook parsed by read_excel(sheet_name=None)
+    cache = WorkbookCache(max_bytes=10**8, max_entries=8)
+    cache.read_excel(content, sheet_name=None)
+    with monkeypatch.context() as patch:
+        forbid_decoding(cache, patch)
+        from_workbook = cache.read_sheets(content, spec)
+
+    # Served from the single sheet the upload page parsed
+    cache = WorkbookCache(max_bytes=10**8, max_entries=8)
+    cache.read_excel(content, sheet_name="Sponsored Products Campaigns")
+    with monkeypatch.context() as patch:
+        forbid_decoding(cache, patch)
+        bulk_only = cache.read_sheets(content, {"Sponsored Products Campaigns": None})
+    mixed = cache.read_sheets(content, spec)
+
+    for result in (from_workbook, mixed):
+        assert list(result) == list(fresh)
+        for sheet_name, df in fresh.items():
+            pd.testing.assert_frame_equal(result[sheet_name], df)
+    pd.testing.assert_frame_equal(
+        bulk_only["Sponsored Products Campaigns"],
+        pd.read_excel(io.BytesIO(content), sheet_name="Sponsored Products Campaigns"),
+    )
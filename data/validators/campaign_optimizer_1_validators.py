@@ -6,8 +6,9 @@ from typing import List, NamedTuple
 import logging
 
 from config.campaign_optimizer_1_config import (
-    REQUIRED_SHEETS, REQUIRED_COLUMNS, MAX_FILE_SIZE_MB, ERROR_MESSAGES
+    REQUIRED_SHEETS, REQUIRED_COLUMNS, INPUT_SHEET_COLUMNS, MAX_FILE_SIZE_MB, ERROR_MESSAGES
 )
+from data.readers.workbook_cache import workbook_cache
 
 logger = logging.getLogger(__name__)
 
@@ -42,9 +43,9 @@ class CampaignOptimizer1Validator:
                 errors.append(ERROR_MESSAGES["file_too_large"])
                 return ValidationResult(False, errors, warnings)
             
-            # Try to read as Excel
+            # Try to read as Excel (only the sheets and columns validated below)
             try:
-                excel_data = pd.read_excel(BytesIO(file_bytes), sheet_name=None)
+                excel_data = workbook_cache.read_sheets(file_bytes, INPUT_SHEET_COLUMNS)
             except Exception as e:
                 errors.append(f"{ERROR_MESSAGES['invalid_format']}: {str(e)}")
                 return ValidationResult(False, errors, warnings)
@@ -2,6 +2,7 @@
 
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
+from data.readers.workbook_cache import workbook_cache
 
 
 class TemplateValidator:
@@ -30,11 +31,11 @@ class TemplateValidator:
         self.errors = []
 
         try:
-            # Read Excel file
-            excel_data = pd.ExcelFile(excel_file)
+            # Read Excel file (all sheets parsed once and cached)
+            excel_data = workbook_cache.read_excel(excel_file, sheet_name=None)
 
             # Check required sheets exist
-            sheet_names = excel_data.sheet_names
+            sheet_names = list(excel_data.keys())
             missing_sheets = [s for s in self.required_sheets if s not in sheet_names]
 
             if missing_sheets:
@@ -48,7 +49,7 @@ class TemplateValidator:
             dataframes = {}
 
             # Validate Port Values sheet (required)
-            port_values_df = pd.read_excel(excel_file, sheet_name="Port Values")
+            port_values_df = excel_data["Port Values"]
             valid, error = self._validate_port_values_columns(port_values_df)
             if not valid:
                 return False, f"Port Values sheet error: {error}", None
@@ -56,7 +57,7 @@ class TemplateValidator:
 
             # Check and validate Top ASINs sheet if exists (optional)
             if "Top ASINs" in sheet_names:
-                top_asins_df = pd.read_excel(excel_file, sheet_name="Top ASINs")
+                top_asins_df = excel_data["Top ASINs"]
                 valid, error = self._validate_top_asins_columns(top_asins_df)
                 if not valid:
                     return False, f"Top ASINs sheet error: {error}", None
@@ -67,7 +68,7 @@ class TemplateValidator:
 
             # Check and validate Delete for 60 sheet if exists (optional)
             if "Delete for 60" in sheet_names:
-                delete_for_60_df = pd.read_excel(excel_file, sheet_name="Delete for 60")
+                delete_for_60_df = excel_data["Delete for 60"]
                 valid, error = self._validate_delete_for_60_columns(delete_for_60_df)
                 if not valid:
                     return False, f"Delete for 60 sheet error: {error}", None
@@ -1,14 +1,23 @@
 """Excel writer for output files - UPDATED for proper formatting."""
 
 import pandas as pd
+import numpy as np
 from io import BytesIO
-from typing import Dict, Optional, List, Any
+from copy import copy
+from typing import Dict, Optional, List, Any, Set, Tuple
 import logging
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 from datetime import datetime
 from ..writers.template_writer import TemplateWriter
+from .format_plan import get_format_plan
+
+
+# Rows converted and streamed to the worksheet at a time
+WRITE_CHUNK_ROWS = 10000
 
 
 class ExcelWriter:
@@ -17,7 +26,8 @@ class ExcelWriter:
 
     Features:
     - Creates multi-sheet Excel files
-    - Applies pink highlighting to error rows
+    - Streams rows with an openpyxl write-only workbook (constant memory)
+    - Applies yellow highlighting to updated rows
     - Formats numbers as text for long IDs
     - Centers all cell values
     - No borders on cells
@@ -49,6 +59,9 @@ class ExcelWriter:
 
         # No borders
         self.no_border = Border()
+
+        # Cell style arrays by (kind, number format, highlighted), see _style_for
+        self._styles: Dict[Tuple[str, str, bool], Any] = {}
         
         # Template writer for Top sheet handling
         self.template_writer = TemplateWriter()
@@ -69,23 +82,18 @@ class ExcelWriter:
 
         output = BytesIO()
 
-        # DEBUG: Log what ExcelWriter received
-        print(f"[DEBUG ExcelWriter] write_excel() called:")
-        print(f"[DEBUG ExcelWriter]   sheets_dict type: {type(sheets_dict)}")
-        print(f"[DEBUG ExcelWriter]   number of sheets: {len(sheets_dict)}")
-        for sheet_name, df in sheets_dict.items():
-            if hasattr(df, 'shape'):
-                print(f"[DEBUG ExcelWriter]   {sheet_name}: {df.shape} (DataFrame)")
-            else:
-                print(f"[DEBUG ExcelWriter]   {sheet_name}: {type(df)}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"write_excel() called with {len(sheets_dict)} sheets")
+            for sheet_name, df in sheets_dict.items():
+                if hasattr(df, 'shape'):
+                    self.logger.debug(f"  {sheet_name}: {df.shape} (DataFrame)")
+                else:
+                    self.logger.debug(f"  {sheet_name}: {type(df)}")
 
         try:
-            # Create workbook
-            wb = Workbook()
-
-            # Remove default sheet
-            if "Sheet" in wb.sheetnames:
-                wb.remove(wb["Sheet"])
+            # Create write-only workbook: rows are streamed, not kept in memory
+            wb = Workbook(write_only=True)
+            self._styles = {}
 
             # Define expected sheet order for Portfolio Optimizer - Updated to match expected output
             expected_order = ['Portfolios', 'Campaign', 'Top', 'Top Camps', 'Product Ad', 'Sheet3']
@@ -120,34 +128,27 @@ class ExcelWriter:
                 ws = wb.create_sheet(title=self._clean_sheet_name(sheet_name))
 
                 # Remove internal columns before writing  
-                df_to_write = df.copy()
                 internal_columns = ["_needs_highlight", "_needs_pink_highlight", "_error_type"]
-                for col in internal_columns:
-                    if col in df_to_write.columns:
-                        df_to_write = df_to_write.drop(columns=[col])
-                
-                
-                # Write dataframe to worksheet
-                self._write_dataframe_to_sheet(ws, df_to_write)
-
-                # Apply formatting
-                self._format_worksheet(ws, df_to_write)
-
-                # Highlight updated rows if present
+                df_to_write = df.drop(columns=[col for col in internal_columns if col in df.columns])
+
+                # Rows that were updated are highlighted in yellow
+                highlight_rows = set()
                 if "_needs_highlight" in df.columns:
                     # Handle _needs_highlight column from optimization processors
-                    updated_rows = df[df["_needs_highlight"] == True].index.tolist()
-                    self._highlight_updated_rows(ws, updated_rows)
+                    # (row positions, so filtered or re-indexed frames highlight the right rows)
+                    highlight_rows = set(np.flatnonzero((df["_needs_highlight"] == True).to_numpy()))
+
+                # Stream dataframe to worksheet with formatting
+                self._write_dataframe_to_sheet(ws, df_to_write, highlight_rows)
 
             # Save workbook to BytesIO
             wb.save(output)
             output.seek(0)
 
-            # DEBUG: Log final output details
-            output_size = len(output.getvalue())
-            print(f"[DEBUG ExcelWriter] Final Excel file created:")
-            print(f"[DEBUG ExcelWriter]   File size: {output_size} bytes")
-            print(f"[DEBUG ExcelWriter]   Sheets processed: {len(sheets_dict)}")
+            self.logger.debug(
+                f"Excel file created: {output.getbuffer().nbytes} bytes, "
+                f"{len(sheets_dict)} sheets processed"
+            )
 
             self.logger.info(
                 f"Successfully created Excel file with {len(sheets_dict)} sheets"
@@ -179,165 +180,79 @@ class ExcelWriter:
 
         return name
 
-    def _write_dataframe_to_sheet(self, ws, df: pd.DataFrame):
+    def _write_dataframe_to_sheet(self, ws, df: pd.DataFrame, highlight_rows: Set[int] = None):
         """
-        Write a DataFrame to an Excel worksheet.
-        """
-
-        # Write headers
-        for col_idx, col_name in enumerate(df.columns, 1):
-            cell = ws.cell(row=1, column=col_idx, value=str(col_name))
-            
-            # Special formatting for ASIN PA column header (blue background)
-            if col_name == "ASIN PA":
-                cell.font = self.blue_header_font
-                cell.fill = self.blue_fill
-            else:
-                cell.font = self.header_font
-                
-            cell.alignment = self.center_alignment
-            cell.border = self.no_border
+        Stream a DataFrame to a write-only worksheet.
 
-        # Write data
-        for row_idx, row in enumerate(df.itertuples(index=False), 2):
-            for col_idx, value in enumerate(row, 1):
-                cell = ws.cell(row=row_idx, column=col_idx)
-
-                # Convert value to appropriate type
-                col_name = df.columns[col_idx - 1]
-                
-                # DEBUG: Check what type of data we're getting for ID columns and problematic columns
-                is_id_col_debug = any(id_keyword in col_name for id_keyword in [
-                    'Product Targeting ID', 'Campaign ID', 'Ad Group ID', 'Keyword ID', 
-                    'Portfolio ID', 'ASIN', 'Target ID', 'Ad ID', 'ID'
-                ])
-                if (is_id_col_debug or col_name in ['Budget Amount', 'Budget Start Date', 'Daily Budget', 'Start Date']) and row_idx <= 3:
-                    print(f'[DEBUG excel_writer] {ws.title}.{col_name}[{row_idx-2}]: {repr(value)} (type: {type(value)}) ID_COLUMN: {is_id_col_debug}')
-                
-                if pd.isna(value):
-                    cell.value = ""
-                elif isinstance(value, (int, float)):
-                    # Check if this is an ID column that should be formatted as text
-                    is_id_column = any(id_keyword in col_name for id_keyword in [
-                        'Product Targeting ID', 'Campaign ID', 'Ad Group ID', 'Keyword ID', 
-                        'Portfolio ID', 'ASIN', 'Target ID', 'Ad ID', 'ID'
-                    ])
-                    
-                    # Check if this is a column that should be converted to integer in the Campaign sheet
-                    is_integer_column = col_name in ['Start Date', 'Daily Budget', 'End Date'] and ws.title == 'Campaign'
-                    
-                    # Check if this is an ID column in Product Ad sheet that should be integer
-                    is_product_ad_id = (ws.title == 'Product Ad' and 
-                                      col_name in ['Ad Group ID', 'Ad ID'] and
-                                      isinstance(value, float) and value.is_integer())
-                    
-                    # Format ID columns as text to prevent scientific notation and decimal display  
-                    if is_id_column:
-                        # Convert to integer first to remove decimals, then to string
-                        if isinstance(value, float) and value.is_integer():
-                            cell.value = str(int(value))
-                        else:
-                            cell.value = str(value)
-                        cell.number_format = "@"  # Text format
-                    
-                    # Convert certain Campaign columns to integers
-                    elif is_integer_column:
-                        if isinstance(value, float) and value.is_integer():
-                            cell.value = int(value)
-                        else:
-                            cell.value = value
-                    
-                    # Convert Product Ad ID columns to integers  
-                    elif is_product_ad_id:
-                        cell.value = int(value)
-                    
-                    else:
-                        cell.value = value
-                        # Regular number format with 3 decimal places for bid values
-                        if "bid" in col_name.lower() or col_name in [
-                            "calc1",
-                            "calc2",
-                            "Target CPA",
-                            "Base Bid",
-                            "Adj. CPA",
-                            "Max BA",
-                            "Temp Bid",
-                            "Max_Bid",
-                            "calc3",
-                        ]:
-                            cell.number_format = "0.000"
-                        # For financial columns, preserve exact values including precision artifacts
-                        elif col_name in ["Spend", "Sales", "Cost", "Revenue"]:
-                            # Don't apply number formatting - let the original string values be preserved
-                            cell.number_format = "General"
-                        else:
-                            cell.number_format = "General"
-                elif isinstance(value, str):
-                    # Handle string values - force text format for ID columns
-                    is_id_column = any(id_keyword in col_name for id_keyword in [
-                        'Product Targeting ID', 'Campaign ID', 'Ad Group ID', 'Keyword ID', 
-                        'Portfolio ID', 'ASIN', 'Target ID', 'Ad ID', 'ID'
-                    ])
-                    
-                    if is_id_column:
-                        # Remove .0 suffix from string ID values
-                        if value.endswith('.0'):
-                            clean_value = value[:-2]  # Remove '.0'
-                            cell.value = clean_value
-                        else:
-                            cell.value = str(value)
-                        cell.number_format = "@"  # Text format
-                    else:
-                        cell.value = str(value)
-                else:
-                    cell.value = str(value)
-
-                # Apply center alignment and no border
-                cell.alignment = self.center_alignment
-                cell.border = self.no_border
+        Value conversion and number format come from the shared format plan
+        of the sheet schema; columns are converted and rows appended in chunks.
 
-    def _format_worksheet(self, ws, df: pd.DataFrame):
-        """
-        Apply formatting to the worksheet.
+        Args:
+            ws: Write-only worksheet
+            df: DataFrame to write
+            highlight_rows: Positions of the DataFrame rows to highlight in yellow
         """
+        highlight_rows = highlight_rows or set()
 
         # Set consistent column width for ALL columns (15 characters)
+        # (write-only sheets need column widths before the first row)
         for col_idx in range(1, len(df.columns) + 1):
-            column_letter = ws.cell(row=1, column=col_idx).column_letter
-            ws.column_dimensions[column_letter].width = 15
+            ws.column_dimensions[get_column_letter(col_idx)].width = 15
+
+        # Write headers
+        header = []
+        for col_name in df.columns:
+            # Special formatting for ASIN PA column header (blue background)
+            kind = "asin_pa_header" if col_name == "ASIN PA" else "header"
+            header.append(self._make_cell(ws, str(col_name), kind, "General", False))
+        ws.append(header)
 
-        # Ensure Old Bid column is properly positioned and formatted
-        if "Old Bid" in df.columns and "Bid" in df.columns:
-            old_bid_idx = df.columns.get_loc("Old Bid") + 1
-            bid_idx = df.columns.get_loc("Bid") + 1
+        # Conversion and number format of every column, shared with the other writers
+        plan = get_format_plan(df.columns, ws.title)
 
-            # The processor should have already arranged columns correctly
-            # Just ensure formatting is applied
-            for row in range(2, ws.max_row + 1):
-                old_bid_cell = ws.cell(row=row, column=old_bid_idx)
-                bid_cell = ws.cell(row=row, column=bid_idx)
+        # Write data
+        for start in range(0, len(df), WRITE_CHUNK_ROWS):
+            chunk = df.iloc[start:start + WRITE_CHUNK_ROWS]
+            columns = [
+                column_format.cell_values(chunk.iloc[:, col_idx])
+                for col_idx, column_format in enumerate(plan)
+            ]
+
+            for offset in range(len(chunk)):
+                highlighted = (start + offset) in highlight_rows
+                ws.append([
+                    self._make_cell(ws, values[offset], "data", formats[offset], highlighted)
+                    for values, formats in columns
+                ])
 
-                # Both should have same number format
-                old_bid_cell.number_format = "0.000"
-                bid_cell.number_format = "0.000"
+    def _make_cell(self, ws, value: Any, kind: str, number_format: str, highlighted: bool):
+        """Create a write-only cell with a shared, pre-built style."""
+        cell = WriteOnlyCell(ws, value=value)
+        cell._style = copy(self._style_for(ws, kind, number_format, highlighted))
+        return cell
 
-    def _highlight_updated_rows(self, ws, updated_indices: List[int]):
+    def _style_for(self, ws, kind: str, number_format: str, highlighted: bool):
         """
-        Highlight rows that were updated in yellow.
+        Style array for a cell kind ("header", "asin_pa_header" or "data").
 
-        Args:
-            ws: Worksheet object
-            updated_indices: List of row indices to highlight (0-based from DataFrame)
+        Built once per combination so fonts, fills and formats are not
+        re-registered with the workbook for every cell.
         """
-
-        for idx in updated_indices:
-            # Convert DataFrame index to Excel row (add 2: +1 for 0-based to 1-based, +1 for header)
-            excel_row = idx + 2
-
-            # Apply yellow fill to entire row
-            for col in range(1, ws.max_column + 1):
-                cell = ws.cell(row=excel_row, column=col)
-                cell.fill = self.yellow_fill
+        key = (kind, number_format, highlighted)
+        if key not in self._styles:
+            prototype = WriteOnlyCell(ws)
+            if kind == "asin_pa_header":
+                prototype.font = self.blue_header_font
+                prototype.fill = self.blue_fill
+            elif kind == "header":
+                prototype.font = self.header_font
+            if highlighted:
+                prototype.fill = self.yellow_fill
+            prototype.alignment = self.center_alignment
+            prototype.border = self.no_border
+            prototype.number_format = number_format
+            self._styles[key] = prototype._style
+        return self._styles[key]
 
     def create_working_file(
         self, optimization_results: Dict[str, Dict[str, pd.DataFrame]]
@@ -0,0 +1,304 @@
+"""Cached per-schema column format plans shared by the Excel writers."""
+
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+from config.optimization_config import should_format_as_text
+
+
+# Columns containing any of these keywords are written as text
+ID_KEYWORDS = [
+    'Product Targeting ID', 'Campaign ID', 'Ad Group ID', 'Keyword ID',
+    'Portfolio ID', 'ASIN', 'Target ID', 'Ad ID', 'ID'
+]
+
+# Numeric columns shown with 3 decimal places (besides any column containing "bid")
+DECIMAL_COLUMNS = [
+    "calc1", "calc2", "Target CPA", "Base Bid", "Adj. CPA",
+    "Max BA", "Temp Bid", "Max_Bid", "calc3",
+]
+
+# Campaign sheet columns written as whole numbers
+CAMPAIGN_INTEGER_COLUMNS = ['Start Date', 'Daily Budget', 'End Date']
+
+# Columns holding dates and budgets, written as whole numbers in portfolio output
+WHOLE_NUMBER_COLUMNS = ['Budget Amount', 'Budget Start Date', 'Daily Budget', 'Start Date', 'End Date']
+
+# Number formats of the bid optimization output files
+NUMBER_FORMATS = {
+    # IDs - Text format
+    "Campaign ID": "@",
+    "Ad Group ID": "@",
+    "Keyword ID": "@",
+    "Product Targeting ID": "@",
+    # Money
+    "Bid": "0.000",
+    "Old Bid": "0.000",
+    "Temp Bid": "0.000",
+    "Max_Bid": "0.000",
+    "Base Bid": "0.000",
+    "Target CPA": "0.00",
+    "Adj. CPA": "0.00",
+    "Max BA": "0.00",
+    "Spend": "$#,##0.00",
+    "Sales": "$#,##0.00",
+    "CPC": "$0.000",
+    # Percentages
+    "Conversion Rate": "0.00%",
+    "ACOS": "0.00%",
+    "Percentage": "0.00",
+    # Integers
+    "Clicks": "#,##0",
+    "Units": "#,##0",
+    "Impressions": "#,##0",
+    "Orders": "#,##0",
+    # Decimals
+    "ROAS": "0.00",
+    "calc1": "0.000",
+    "calc2": "0.000",
+    "calc3": "0.000",
+}
+
+# Largest magnitude converted to int64 in bulk; larger values go through int()
+_INT64_LIMIT = 2.0 ** 63
+
+
+@dataclass(frozen=True)
+class ColumnFormat:
+    """How one column of a sheet is converted and formatted."""
+
+    name: Hashable
+    is_id: bool               # Matches ID_KEYWORDS, written as text
+    is_text: bool             # Bulk ID/code column, stringified before writing
+    is_integer: bool          # Campaign sheet date/budget written as int
+    is_whole_number: bool     # Date/budget column of portfolio output
+    number_format: str        # Number format of numeric values
+    default_format: str       # Number format of empty cells and other values
+    bulk_number_format: Optional[str]  # Format of the bid optimization files
+
+    def convert(self, value: Any) -> Tuple[Any, str]:
+        """Map a single value to (cell value, number format)."""
+        if isinstance(value, (int, float)):
+            # Format ID columns as text to prevent scientific notation and decimal display
+            if self.is_id:
+                if isinstance(value, float) and value.is_integer():
+                    return str(int(value)), "@"
+                return str(value), "@"
+
+            if self.is_integer:
+                if isinstance(value, float) and value.is_integer():
+                    return int(value), self.default_format
+                return value, self.default_format
+
+            return value, self.number_format
+
+        if isinstance(value, str):
+            # Remove .0 suffix from string ID values and force text format
+            if self.is_id:
+                return (value[:-2] if value.endswith('.0') else value), "@"
+            return value, self.default_format
+
+        return str(value), self.default_format
+
+    def cell_values(self, values: pd.Series) -> Tuple[List[Any], List[str]]:
+        """
+        Convert a whole column to cell values and number formats.
+
+        Float and integer columns are converted in bulk; other columns fall
+        back to convert() per value. Missing values become empty cells.
+        """
+        missing = values.isna().to_numpy()
+        kind = values.dtype.kind
+
+        if not _is_plain_numeric(values):
+            cells = [
+                ("", self.default_format) if is_missing else self.convert(value)
+                for value, is_missing in zip(values.tolist(), missing)
+            ]
+            return [value for value, _ in cells], [number_format for _, number_format in cells]
+
+        array = values.to_numpy()
+        if self.is_id:
+            converted = _number_strings(array).astype(object)
+            value_format = "@"
+        elif self.is_integer and kind == "f":
+            converted = array.astype(object)
+            integral = _integral(array)
+            converted[integral] = _whole_values(array[integral])
+            value_format = self.default_format
+        else:
+            converted = array.astype(object)
+            value_format = self.default_format if self.is_integer else self.number_format
+
+        converted[missing] = ""
+        formats = np.where(missing, self.default_format, value_format)
+        return converted.tolist(), formats.tolist()
+
+
+class FormatPlan:
+    """
+    Column formats of one sheet schema (sheet name + column tuple).
+
+    Plans are built once per schema by get_format_plan() and shared by all
+    writers, so column classification is not repeated per cell or per write.
+    """
+
+    def __init__(self, sheet_name: Optional[str], columns: Tuple[Hashable, ...]):
+        self.sheet_name = sheet_name
+        self.columns = columns
+        self.formats = tuple(self._column_format(name) for name in columns)
+        self._by_name: Dict[Hashable, ColumnFormat] = {}
+        for column_format in self.formats:
+            self._by_name.setdefault(column_format.name, column_format)
+
+    def __iter__(self) -> Iterator[ColumnFormat]:
+        return iter(self.formats)
+
+    def __len__(self) -> int:
+        return len(self.formats)
+
+    def __getitem__(self, name: Hashable) -> ColumnFormat:
+        return self._by_name[name]
+
+    @property
+    def text_columns(self) -> List[Hashable]:
+        """Columns stringified before writing in the bid optimization files."""
+        return [column_format.name for column_format in self.formats if column_format.is_text]
+
+    def _column_format(self, name: Hashable) -> ColumnFormat:
+        label = str(name)
+        is_campaign_sheet = self.sheet_name == 'Campaign'
+
+        # Old Bid and Bid share the 3-decimal format on every row when both exist
+        if name in ("Old Bid", "Bid") and "Old Bid" in self.columns and "Bid" in self.columns:
+            number_format = default_format = "0.000"
+        else:
+            # Regular number format with 3 decimal places for bid values
+            if "bid" in label.lower() or label in DECIMAL_COLUMNS:
+                number_format = "0.000"
+            else:
+                number_format = "General"
+            default_format = "General"
+
+        return ColumnFormat(
+            name=name,
+            is_id=any(id_keyword in label for id_keyword in ID_KEYWORDS),
+            is_text=should_format_as_text(label),
+            is_integer=is_campaign_sheet and label in CAMPAIGN_INTEGER_COLUMNS,
+            is_whole_number=label in WHOLE_NUMBER_COLUMNS or 'Date' in label or 'Budget' in label,
+            number_format=number_format,
+            default_format=default_format,
+            bulk_number_format=NUMBER_FORMATS.get(label),
+        )
+
+
+@lru_cache(maxsize=256)
+def _cached_plan(sheet_name: Optional[str], columns: Tuple[Hashable, ...]) -> FormatPlan:
+    return FormatPlan(sheet_name, columns)
+
+
+def get_format_plan(columns: Sequence[Hashable], sheet_name: Optional[str] = None) -> FormatPlan:
+    """
+    Get the shared format plan for a sheet schema.
+
+    Args:
+        columns: Column labels in output order
+        sheet_name: Sheet name for sheet-specific rules (Campaign integers)
+
+    Returns:
+        Cached FormatPlan for (sheet_name, columns)
+    """
+    return _cached_plan(sheet_name, tuple(columns))
+
+
+def integer_text(values: pd.Series) -> pd.Series:
+    """Numeric column as str(int(value)) strings, '' for missing values."""
+    array = values.to_numpy()
+    if values.dtype.kind in "iu":
+        return pd.Series(array.astype(str).astype(object), index=values.index)
+
+    missing = np.isnan(array)
+    result = np.full(len(array), "", dtype=object)
+    result[~missing] = _whole_strings(np.trunc(array[~missing]))
+    return pd.Series(result, index=values.index)
+
+
+def number_text(values: pd.Series) -> pd.Series:
+    """Numeric column as text without '.0' on whole numbers, '' for missing values."""
+    array = values.to_numpy()
+    if values.dtype.kind in "iu":
+        return pd.Series(array.astype(str).astype(object), index=values.index)
+
+    result = _number_strings(array).astype(object)
+    result[np.isnan(array)] = ""
+    return pd.Series(result, index=values.index)
+
+
+def text_values(values: pd.Series) -> pd.Series:
+    """
+    ID column as text so Excel keeps every digit.
+
+    Whole numbers lose their '.0', other values become str(value) and
+    missing values are left as they are.
+    """
+    present = values.notna()
+    if not present.any():
+        return values
+
+    result = values.astype(object)
+    if _is_plain_numeric(values):
+        result[present] = _number_strings(values.to_numpy()[present.to_numpy()])
+    else:
+        result[present] = [_value_text(value) for value in values[present]]
+    return result
+
+
+def _is_plain_numeric(values: pd.Series) -> bool:
+    """Whether a column is float64 or integer, i.e. convertible in bulk."""
+    return values.dtype == np.float64 or values.dtype.kind in "iu"
+
+
+def _value_text(value: Any) -> str:
+    """Text of a single value of a mixed column."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            if value == int(value):
+                return str(int(value))
+        except (ValueError, OverflowError):
+            pass
+    return str(value)
+
+
+def _integral(array: np.ndarray) -> np.ndarray:
+    """Mask of finite whole numbers of a float array."""
+    with np.errstate(invalid="ignore"):
+        return np.isfinite(array) & (array == np.trunc(array))
+
+
+def _number_strings(array: np.ndarray) -> np.ndarray:
+    """Text of numbers: whole numbers without '.0', others as str(value)."""
+    if array.dtype.kind in "iu":
+        return array.astype(str)
+
+    result = array.astype(str).astype(object)
+    integral = _integral(array)
+    result[integral] = _whole_strings(array[integral])
+    return result
+
+
+def _whole_values(array: np.ndarray) -> np.ndarray:
+    """Python ints of a float array holding whole numbers."""
+    result = np.empty(len(array), dtype=object)
+    small = np.abs(array) < _INT64_LIMIT
+    result[small] = array[small].astype(np.int64).astype(object)
+    result[~small] = [int(value) for value in array[~small]]
+    return result
+
+
+def _whole_strings(array: np.ndarray) -> np.ndarray:
+    """str(int(value)) of a float array holding whole numbers."""
+    if (np.abs(array) < _INT64_LIMIT).all():
+        return array.astype(np.int64).astype(str).astype(object)
+    return np.array([str(value) for value in _whole_values(array)], dtype=object)
@@ -6,6 +6,7 @@ from typing import Dict, Optional
 import logging
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.cell import WriteOnlyCell
 
 
 class TemplateWriter:
@@ -120,26 +121,21 @@ class TemplateWriter:
         """
         self.logger.info("Adding Top sheet to workbook")
         
-        # Create Top sheet
+        # Create Top sheet (written row by row so write-only workbooks work too)
         top_sheet = workbook.create_sheet(title="Top")
         
+        # Set column width
+        top_sheet.column_dimensions['A'].width = 15
+        
         # Write header
-        top_sheet['A1'] = 'Top ASINs'
+        header = WriteOnlyCell(top_sheet, value='Top ASINs')
         
         # Style header
-        header_font = Font(bold=True, size=12)
-        header_fill = PatternFill(start_color='FFE6CC', end_color='FFE6CC', fill_type='solid')
-        header_alignment = Alignment(horizontal='center', vertical='center')
-        
-        top_sheet['A1'].font = header_font
-        top_sheet['A1'].fill = header_fill
-        top_sheet['A1'].alignment = header_alignment
+        header.font = Font(bold=True, size=12)
+        header.fill = PatternFill(start_color='FFE6CC', end_color='FFE6CC', fill_type='solid')
+        header.alignment = Alignment(horizontal='center', vertical='center')
+        top_sheet.append([header])
         
         # Write ASIN data
-        for i, asin in enumerate(top_asins_df['Top ASINs'], start=2):
-            top_sheet[f'A{i}'] = asin
-        
-        # Set column width
-        top_sheet.column_dimensions['A'].width = 15
-        
-        self.logger.info(f"Top sheet added with {len(top_asins_df)} ASINs")
\ No newline at end of file
+        for asin in top_asins_df['Top ASINs']:
+            top_sheet.append([asin])
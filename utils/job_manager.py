@@ -0,0 +1,289 @@
+"""Background execution of optimization runs for the Streamlit pages."""
+
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from config.settings import settings
+from utils.result_cache import result_cache
+
+
+# Job statuses
+PENDING = "pending"
+RUNNING = "running"
+COMPLETE = "complete"
+ERROR = "error"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (COMPLETE, ERROR, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once the user has asked to cancel it."""
+
+
+class Job:
+    """
+    One optimization run submitted to the JobManager.
+
+    The work function receives the job and reports progress through
+    update(), or through stage_listener() attached to the StageProfiler of
+    each optimization it runs. Cancelling is cooperative: the run stops at
+    the next stage start or check_cancelled() call.
+    """
+
+    def __init__(self, name: str, total_stages: int = 0):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = PENDING
+        self.total_stages = total_stages
+        self.completed_stages = 0
+        self.stage: Optional[str] = None
+        self.rows: Optional[int] = None
+        self.message = "Waiting for a worker..."
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.traceback: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+        self.cache_key: Optional[str] = None  # Result stored in result_cache on completion
+        self.from_cache = False
+
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the job started (or its total run time once finished)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def fraction(self) -> float:
+        """Share of the expected stages completed, 0 to 1."""
+        if self.status == COMPLETE:
+            return 1.0
+        if not self.total_stages:
+            return 0.0
+        return min(self.completed_stages / self.total_stages, 0.99)
+
+    def cancel(self):
+        """Ask the job to stop at its next stage."""
+        self._cancel_event.set()
+        with self._lock:
+            if not self.done:
+                self.message = "Cancelling..."
+
+    def check_cancelled(self):
+        """Raise JobCancelled if the user cancelled the job."""
+        if self._cancel_event.is_set():
+            raise JobCancelled(f"{self.name} cancelled")
+
+    def update(
+        self,
+        message: Optional[str] = None,
+        stage: Optional[str] = None,
+        rows: Optional[int] = None,
+        completed_stage: bool = False,
+    ):
+        """Report progress from the work function."""
+        with self._lock:
+            if stage is not None:
+                self.stage = stage
+            if rows is not None:
+                self.rows = rows
+            if message is not None:
+                self.message = message
+            if completed_stage:
+                self.completed_stages += 1
+
+    def stage_listener(self, profiler_name: str, profile, finished: bool):
+        """
+        StageProfiler listener: progress per stage, cancel point at each stage start.
+
+        Attach with profiler.add_listener(job.stage_listener).
+        """
+        if not finished:
+            self.check_cancelled()
+            self.update(
+                message=f"{profiler_name}: {profile.stage}...",
+                stage=profile.stage,
+                rows=profile.rows_in,
+            )
+        else:
+            rows = profile.rows_out if profile.rows_out is not None else profile.rows_in
+            self.update(stage=profile.stage, rows=rows, completed_stage=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Consistent copy of the progress fields, for rendering."""
+        with self._lock:
+            return {
+                "id": self.id,
+                "name": self.name,
+                "status": self.status,
+                "fraction": self.fraction,
+                "stage": self.stage,
+                "rows": self.rows,
+                "message": self.message,
+                "completed_stages": self.completed_stages,
+                "total_stages": self.total_stages,
+                "elapsed": self.elapsed,
+                "error": self.error,
+            }
+
+
+class JobManager:
+    """
+    Thread pool shared by every session of the server.
+
+    Pages submit their run and keep the returned Job in session state; the
+    script thread only polls it, so reruns caused by widget interactions do
+    not restart or block the run, and one user's run does not block another
+    user's page. At most max_workers jobs run at once, the others wait.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers or settings.get_processing_config()["background_job_workers"]
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="optimization-job"
+        )
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self, name: str, fn: Callable[..., Any], *args, total_stages: int = 0, **kwargs
+    ) -> Job:
+        """
+        Run fn(job, *args, **kwargs) in the pool.
+
+        Args:
+            name: Display name of the job
+            fn: Work function; its return value becomes job.result
+            total_stages: Expected number of profiled stages, for the progress fraction
+
+        Returns:
+            The Job handle
+        """
+        return self._submit(Job(name, total_stages), fn, args, kwargs)
+
+    def submit_cached(
+        self, name: str, cache_key: str, fn: Callable[..., Any], *args, total_stages: int = 0, **kwargs
+    ) -> Job:
+        """
+        Like submit(), but serve an identical earlier run from the result cache.
+
+        Args:
+            cache_key: ResultCache.make_key() of the inputs and options
+
+        Returns:
+            An already completed job (from_cache=True) on a cache hit, else the submitted job,
+            whose result is cached when it completes
+        """
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            job = Job(name)
+            job.result = cached
+            job.from_cache = True
+            self._finish(job, COMPLETE, message=f"{name} served from cache")
+            return job
+
+        job = Job(name, total_stages)
+        job.cache_key = cache_key
+        return self._submit(job, fn, args, kwargs)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job; False if it is unknown or already finished."""
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel()
+        return True
+
+    def active_jobs(self) -> List[Job]:
+        """Jobs waiting for or holding a worker."""
+        with self._lock:
+            return [job for job in self._jobs.values() if not job.done]
+
+    def _submit(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Job:
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        self.logger.info(f"Submitted job {job.name} ({job.id})")
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]):
+        if job.cancel_requested:
+            self._finish(job, CANCELLED, message=f"{job.name} cancelled")
+            return
+
+        with job._lock:
+            job.status = RUNNING
+            job.started_at = time.time()
+            job.message = "Starting..."
+
+        try:
+            result = fn(job, *args, **kwargs)
+            # A run may swallow the cancel inside its own error handling
+            job.check_cancelled()
+        except JobCancelled as e:
+            self._finish(job, CANCELLED, message=str(e))
+        except Exception as e:
+            if job.cancel_requested:
+                # Cancel surfaced through the run's own error wrapping
+                self._finish(job, CANCELLED, message=f"{job.name} cancelled")
+                return
+            self.logger.error(f"Job {job.name} failed: {str(e)}")
+            self._finish(job, ERROR, message=str(e), error=str(e), trace=traceback.format_exc())
+        else:
+            job.result = result
+            if job.cache_key:
+                result_cache.put(job.cache_key, result)
+            self._finish(job, COMPLETE, message=f"{job.name} completed")
+
+    def _finish(
+        self,
+        job: Job,
+        status: str,
+        message: str,
+        error: Optional[str] = None,
+        trace: Optional[str] = None,
+    ):
+        with job._lock:
+            job.status = status
+            job.message = message
+            job.error = error
+            job.traceback = trace
+            job.finished_at = time.time()
+            if job.started_at is None:
+                job.started_at = job.finished_at
+        self.logger.info(f"Job {job.name} ({job.id}) {status} after {job.elapsed:.2f}s")
+
+    def _prune(self):
+        """Forget finished jobs; sessions keep their own handle."""
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done]:
+            del self._jobs[job_id]
+
+
+# Global job manager instance (shared by all sessions)
+job_manager = JobManager()
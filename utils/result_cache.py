@@ -0,0 +1,164 @@
+"""Content-addressed cache of optimization results and generated workbooks."""
+
+import pandas as pd
+import copy
+import hashlib
+import io
+import json
+import threading
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from config.settings import settings
+
+
+# Packages whose source decides the results; any edit invalidates the cache
+CODE_PACKAGES = ("business", "data", "config", "utils")
+
+_code_version: Optional[str] = None
+_code_version_lock = threading.Lock()
+
+
+def code_version() -> str:
+    """Hash of the app version and the source of CODE_PACKAGES (computed once)."""
+    global _code_version
+    with _code_version_lock:
+        if _code_version is None:
+            root = Path(__file__).parent.parent
+            digest = hashlib.sha256(settings.version.encode())
+            for package in CODE_PACKAGES:
+                for path in sorted((root / package).rglob("*.py")):
+                    if "tests" in path.parts:
+                        continue
+                    digest.update(str(path.relative_to(root)).encode())
+                    digest.update(path.read_bytes())
+            _code_version = digest.hexdigest()[:16]
+        return _code_version
+
+
+class ResultCache:
+    """
+    LRU cache of finished optimization runs.
+
+    Entries are keyed by the SHA-256 of the input files, the optimization,
+    its options and the code version (see make_key), so processing the same
+    uploads again returns the stored result sheets and working/clean files
+    instead of recomputing them. Least recently used entries are evicted
+    once the cached results exceed the memory cap or the entry limit.
+    Callers always receive copies and may modify them.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None):
+        processing_config = settings.get_processing_config()
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else processing_config["result_cache_limit"]
+        )
+        self.max_entries = (
+            max_entries if max_entries is not None else processing_config["result_cache_entries"]
+        )
+        self.logger = logging.getLogger(__name__)
+
+        # key -> (result, size in bytes), oldest first
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+    @staticmethod
+    def make_key(
+        optimization: str,
+        inputs: Dict[str, Optional[bytes]],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Cache key of one run.
+
+        Args:
+            optimization: Optimization (or page flow) name
+            inputs: Input role ("template", "bulk_60"...) -> file content (None if absent)
+            options: Selected options (optimizations, output mode...); must be JSON serializable
+
+        Returns:
+            Hex digest of the file hashes, optimization, options and code version
+        """
+        description = {
+            "optimization": optimization,
+            "inputs": {
+                role: hashlib.sha256(content).hexdigest() if content is not None else None
+                for role, content in sorted(inputs.items())
+            },
+            "options": options or {},
+            "code_version": code_version(),
+        }
+        return hashlib.sha256(
+            json.dumps(description, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """Copy of the cached result, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            result = entry[0]
+
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Any) -> None:
+        """Store a copy of a result and evict least recently used entries over the limits."""
+        size = self._memory_size(result)
+        if size > self.max_bytes:
+            self.logger.info(f"Result of {size:,} bytes exceeds cache limit, not cached")
+            return
+
+        result = copy.deepcopy(result)
+        with self._lock:
+            if key in self._entries:
+                self.stats["bytes"] -= self._entries.pop(key)[1]
+
+            self._entries[key] = (result, size)
+            self.stats["bytes"] += size
+
+            while self._entries and (
+                self.stats["bytes"] > self.max_bytes or len(self._entries) > self.max_entries
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.stats["bytes"] -= evicted_size
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+            self.stats["bytes"] = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @classmethod
+    def _memory_size(cls, data: Any) -> int:
+        """Memory of the DataFrames and file contents in a result."""
+        if isinstance(data, pd.DataFrame):
+            return int(data.memory_usage(deep=True).sum())
+        if isinstance(data, io.BytesIO):
+            return data.getbuffer().nbytes
+        if isinstance(data, (bytes, bytearray)):
+            return len(data)
+        if isinstance(data, dict):
+            return sum(cls._memory_size(value) for value in data.values())
+        if isinstance(data, (list, tuple)):
+            return sum(cls._memory_size(value) for value in data)
+        if hasattr(data, "__dict__"):  # OptimizationRun, RunReport...
+            return cls._memory_size(vars(data))
+        return 0
+
+
+# Global result cache instance
+result_cache = ResultCache()
@@ -0,0 +1,235 @@
+"""Per-stage timing and memory profile of an optimization run."""
+
+import pandas as pd
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+MB = 1024 * 1024
+
+# tracemalloc is process wide: started by the first profiled stage that asks
+# for it and stopped by the last one (stages may run in worker threads)
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+# Stages running right now in any profiler (id -> (thread, profile)); memory
+# figures of stages that overlap a stage of another thread are not recorded
+_active_lock = threading.Lock()
+_active_stages: Dict[int, Tuple[int, "StageProfile"]] = {}
+
+
+@dataclass
+class StageProfile:
+    """Measurements of one stage (validate, clean, process, output...)."""
+
+    stage: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    rss_growth_mb: Optional[float] = None
+    traced_peak_mb: Optional[float] = None
+    traced_delta_mb: Optional[float] = None
+    rows_in: Optional[int] = None
+    cols_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    cols_out: Optional[int] = None
+    error: Optional[str] = None
+    memory_overlapped: bool = False
+
+    def set_output(self, data: Any) -> None:
+        """Record the rows/columns of the stage result (see frame_shape)."""
+        self.rows_out, self.cols_out = frame_shape(data)
+
+
+# listener(profiler name, stage, finished): called when a stage starts and
+# when it ends. A listener raising at the start aborts the stage (used to
+# cancel background jobs); it must not raise at the end.
+StageListener = Callable[[str, "StageProfile", bool], None]
+
+
+class StageProfiler:
+    """
+    Records wall time, CPU time, memory and data shape of each stage.
+
+    - cpu_seconds is the CPU time of the thread running the stage, so runs
+      in the multi-optimization worker pool do not count each other.
+    - peak_rss_mb is the process peak RSS at the end of the stage and
+      rss_growth_mb how much the stage raised it (None where the resource
+      module is unavailable).
+    - traced_peak_mb / traced_delta_mb are the tracemalloc peak above the
+      stage start and the memory still allocated at its end. tracemalloc
+      slows pandas down noticeably, so it only runs with trace_memory=True.
+    - Memory is only measured process wide, so a stage that overlaps a stage
+      running in another thread (of any profiler: strategies of one portfolio
+      batch, runs in the multi-optimization pool) cannot be attributed its
+      own memory. It gets memory_overlapped=True and rss_growth_mb,
+      traced_peak_mb and traced_delta_mb stay None; peak_rss_mb is still
+      the process peak.
+    """
+
+    def __init__(self, name: str, trace_memory: bool = False):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.logger = logging.getLogger(f"optimization.{name}")
+        self.stages: List[StageProfile] = []
+        self.listeners: List[StageListener] = []
+
+    def reset(self):
+        """Forget the stages of a previous run (listeners are kept)."""
+        self.stages = []
+
+    def add_listener(self, listener: StageListener):
+        """Call listener when each stage starts and ends (progress reporting)."""
+        self.listeners.append(listener)
+
+    @contextmanager
+    def stage(self, stage: str, data_in: Any = None) -> Iterator[StageProfile]:
+        """
+        Profile the body of a with block as one stage.
+
+        Args:
+            stage: Stage name
+            data_in: Stage input, for rows_in/cols_in (see frame_shape)
+
+        Yields:
+            The StageProfile; call set_output() with the stage result
+        """
+        profile = StageProfile(stage)
+        profile.rows_in, profile.cols_in = frame_shape(data_in)
+        for listener in self.listeners:
+            listener(self.name, profile, False)
+
+        _enter_stage(profile)
+        tracing = self.trace_memory and _start_tracemalloc()
+        if tracing:
+            traced_start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        rss_start = _peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+
+        try:
+            yield profile
+        except Exception as e:
+            profile.error = str(e)
+            raise
+        finally:
+            profile.wall_seconds = time.perf_counter() - wall_start
+            profile.cpu_seconds = time.thread_time() - cpu_start
+
+            profile.peak_rss_mb = _peak_rss_mb()
+            overlapped = _exit_stage(profile)
+            if rss_start is not None and not overlapped:
+                profile.rss_growth_mb = profile.peak_rss_mb - rss_start
+
+            if tracing:
+                if not overlapped:
+                    traced_end, traced_peak = tracemalloc.get_traced_memory()
+                    profile.traced_peak_mb = (traced_peak - traced_start) / MB
+                    profile.traced_delta_mb = (traced_end - traced_start) / MB
+                _stop_tracemalloc()
+
+            self.stages.append(profile)
+            self.logger.info(
+                f"Stage {stage}: {profile.wall_seconds:.3f}s wall, "
+                f"{profile.cpu_seconds:.3f}s CPU, rows {profile.rows_in} -> {profile.rows_out}"
+            )
+            for listener in self.listeners:
+                listener(self.name, profile, True)
+
+    def report(self) -> Dict[str, Any]:
+        """Structured report of the recorded stages."""
+        return {
+            "optimization": self.name,
+            "total_wall_seconds": sum(profile.wall_seconds for profile in self.stages),
+            "total_cpu_seconds": sum(profile.cpu_seconds for profile in self.stages),
+            "stages": [asdict(profile) for profile in self.stages],
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Report as JSON."""
+        return json.dumps(self.report(), indent=indent)
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per stage, for display."""
+        return pd.DataFrame([asdict(profile) for profile in self.stages])
+
+
+def frame_shape(data: Any) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Rows and columns of a stage input or output.
+
+    A DataFrame gives its shape; a dict of DataFrames (template sheets,
+    result sheets) gives the total rows and the widest sheet; anything
+    else gives (None, None).
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.shape
+
+    if isinstance(data, dict):
+        frames = [df for df in data.values() if isinstance(df, pd.DataFrame)]
+        if frames:
+            return sum(len(df) for df in frames), max(len(df.columns) for df in frames)
+
+    return None, None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the process so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / MB if sys.platform == "darwin" else peak / 1024
+
+
+def _enter_stage(profile: StageProfile):
+    """Register a starting stage; flag it and the stages of other threads it overlaps."""
+    thread = threading.get_ident()
+    with _active_lock:
+        for other_thread, other in _active_stages.values():
+            # Nested stages of one thread are not concurrent
+            if other_thread != thread:
+                profile.memory_overlapped = True
+                other.memory_overlapped = True
+        _active_stages[id(profile)] = (thread, profile)
+
+
+def _exit_stage(profile: StageProfile) -> bool:
+    """Unregister a finished stage; True if it overlapped another stage."""
+    with _active_lock:
+        _active_stages.pop(id(profile), None)
+        return profile.memory_overlapped
+
+
+def _start_tracemalloc() -> bool:
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+    return True
+
+
+def _stop_tracemalloc():
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        # Leave tracing on if someone else started it
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
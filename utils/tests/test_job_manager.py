@@ -0,0 +1,71 @@
+"""Tests for the background job manager."""
+
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from utils.stage_profiler import StageProfiler
+from utils.job_manager import CANCELLED, COMPLETE, ERROR, JobManager
+
+
+def test_job_reports_stage_progress():
+    manager = JobManager(max_workers=2)
+    seen = []
+
+    def work(job, df):
+        profiler = StageProfiler("test")
+        profiler.add_listener(job.stage_listener)
+        with profiler.stage("clean", df) as stage:
+            df = df[df["a"] > 1]
+            stage.set_output(df)
+        seen.append(job.snapshot())
+        with profiler.stage("process", df):
+            pass
+        return len(df)
+
+    job = manager.submit("Test", work, pd.DataFrame({"a": [1, 2, 3]}), total_stages=2)
+    job.future.result(timeout=10)
+
+    assert job.status == COMPLETE and job.result == 2
+    assert seen[0]["completed_stages"] == 1 and seen[0]["fraction"] == 0.5
+    assert seen[0]["rows"] == 2 and seen[0]["stage"] == "clean"
+    assert job.snapshot()["fraction"] == 1.0
+
+    failing = manager.submit("Failing", lambda job: 1 / 0)
+    failing.future.result(timeout=10)
+    assert failing.status == ERROR and "division by zero" in failing.error
+
+
+def test_cancel_stops_at_next_stage():
+    manager = JobManager(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+    stages = []
+
+    def work(job):
+        profiler = StageProfiler("test")
+        profiler.add_listener(job.stage_listener)
+        with profiler.stage("first"):
+            started.set()
+            release.wait(10)
+        with profiler.stage("second"):
+            stages.append("second")
+
+    job = manager.submit("Slow", work, total_stages=2)
+    waiting = manager.submit("Queued", work)
+    assert started.wait(10)
+
+    assert manager.cancel(job.id) and manager.cancel(waiting.id)
+    release.set()
+    job.future.result(timeout=10)
+    waiting.future.result(timeout=10)
+
+    assert job.status == CANCELLED and waiting.status == CANCELLED
+    assert stages == []
+    assert not manager.cancel(job.id)
@@ -0,0 +1,61 @@
+"""Tests for the optimization result cache."""
+
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from utils.job_manager import COMPLETE, JobManager
+from utils.result_cache import ResultCache, result_cache
+
+
+def test_keys_copies_and_eviction():
+    key = ResultCache.make_key("Zero Sales", {"template": b"t", "bulk": b"b"}, {"combined": False})
+    assert key == ResultCache.make_key("Zero Sales", {"bulk": b"b", "template": b"t"}, {"combined": False})
+    assert key != ResultCache.make_key("Zero Sales", {"template": b"t", "bulk": b"B"}, {"combined": False})
+    assert key != ResultCache.make_key("Zero Sales", {"template": b"t", "bulk": b"b"}, {"combined": True})
+    assert key != ResultCache.make_key("Bids 30 Days", {"template": b"t", "bulk": b"b"}, {"combined": False})
+
+    cache = ResultCache(max_bytes=10_000, max_entries=2)
+    sheets = {"Targeting": pd.DataFrame({"Bid": [1.0, 2.0]})}
+    cache.put("a", {"results": sheets, "working_file": BytesIO(b"xlsx")})
+
+    cached = cache.get("a")
+    cached["results"]["Targeting"].loc[0, "Bid"] = 9.0
+    assert cache.get("a")["results"]["Targeting"].loc[0, "Bid"] == 1.0
+    assert cache.get("a")["working_file"].getvalue() == b"xlsx"
+
+    cache.put("b", {"output": b"1"})
+    cache.put("c", {"output": b"2"})
+    assert "a" not in cache and len(cache) == 2
+    assert cache.get("missing") is None
+    assert cache.stats["evictions"] == 1
+
+    cache.put("huge", {"output": b"x" * 20_000})
+    assert "huge" not in cache
+
+
+def test_submit_cached_runs_once():
+    manager = JobManager(max_workers=1)
+    calls = []
+
+    def work(job, value):
+        calls.append(value)
+        return {"value": value}
+
+    key = ResultCache.make_key("test_submit_cached", {"bulk": b"same"})
+    try:
+        first = manager.submit_cached("Test", key, work, 1)
+        first.future.result(timeout=10)
+        second = manager.submit_cached("Test", key, work, 1)
+
+        assert first.status == COMPLETE and not first.from_cache
+        assert second.status == COMPLETE and second.from_cache
+        assert second.result == {"value": 1} and calls == [1]
+    finally:
+        result_cache.clear()
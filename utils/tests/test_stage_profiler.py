@@ -0,0 +1,111 @@
+"""Tests for the per-stage profile of optimization runs."""
+
+import sys
+import json
+import threading
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from utils.stage_profiler import StageProfiler
+from business.bid_optimizations.zero_sales.cleaner import ZeroSalesCleaner
+from business.bid_optimizations.zero_sales.orchestrator import ZeroSalesOptimization
+
+
+def build_inputs(n_rows: int = 200, seed: int = 5):
+    """Build a small template and pre-filtered Zero Sales bulk."""
+    rng = np.random.default_rng(seed)
+    portfolios = [f"Portfolio {i}" for i in range(4)]
+
+    bulk = pd.DataFrame(
+        {
+            "Entity": rng.choice(["Keyword", "Product Targeting", "Bidding Adjustment"], n_rows),
+            "Campaign ID": rng.integers(1, 10, n_rows).astype(float),
+            "Portfolio Name (Informational only)": rng.choice(portfolios, n_rows),
+            "Campaign Name (Informational only)": rng.choice(["up and away", "Exact"], n_rows),
+            "State": "enabled",
+            "Campaign State (Informational only)": "enabled",
+            "Ad Group State (Informational only)": "enabled",
+            "Bid": rng.uniform(0.1, 2, n_rows).round(2),
+            "Units": rng.choice([0, 0, 1], n_rows).astype(float),
+            "Clicks": rng.integers(0, 60, n_rows).astype(float),
+            "Percentage": rng.integers(0, 100, n_rows).astype(float),
+        }
+    )
+    template = {
+        "Port Values": pd.DataFrame(
+            {"Portfolio Name": portfolios, "Base Bid": [0.5, 0.6, 0.7, 0.8], "Target CPA": [np.nan, 5, 6, 7]}
+        ),
+        "Top ASINs": pd.DataFrame({"ASIN": []}),
+    }
+    return template, ZeroSalesCleaner().pre_validation_filter(bulk)
+
+
+def test_run_optimization_reports_every_stage():
+    template, bulk = build_inputs()
+    optimization = ZeroSalesOptimization()
+
+    success, message, results = optimization.run_optimization(template, bulk)
+    assert success, message
+
+    report = json.loads(optimization.export_performance_report())
+    stages = {stage["stage"]: stage for stage in report["stages"]}
+    assert list(stages) == ["validate", "clean", "process"]
+    assert stages["validate"]["rows_in"] == len(bulk)
+    assert stages["clean"]["rows_out"] == stages["process"]["rows_in"]
+    assert stages["process"]["rows_out"] == sum(len(df) for df in results.values())
+    assert all(stage["wall_seconds"] >= 0 and stage["error"] is None for stage in stages.values())
+    assert report["total_wall_seconds"] == pytest.approx(
+        sum(stage["wall_seconds"] for stage in stages.values())
+    )
+
+
+def test_failed_stage_is_recorded_with_memory():
+    profiler = StageProfiler("test", trace_memory=True)
+
+    with pytest.raises(ValueError):
+        with profiler.stage("explode", pd.DataFrame({"a": range(3)})):
+            data = np.ones(1_000_000)
+            raise ValueError("boom")
+
+    (stage,) = profiler.report()["stages"]
+    assert stage["error"] == "boom"
+    assert (stage["rows_in"], stage["cols_in"]) == (3, 1)
+    assert stage["traced_peak_mb"] >= 7
+    assert not tracemalloc.is_tracing()
+
+
+def test_overlapping_stages_do_not_report_memory():
+    profiler = StageProfiler("test", trace_memory=True)
+    started = threading.Barrier(2)
+
+    def run_stage(name):
+        with profiler.stage(name):
+            started.wait()
+            with profiler.stage(f"{name} nested"):
+                pass
+
+    threads = [threading.Thread(target=run_stage, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stages = {stage["stage"]: stage for stage in profiler.report()["stages"]}
+    assert stages["a"]["memory_overlapped"] and stages["b"]["memory_overlapped"]
+    assert stages["a"]["traced_peak_mb"] is None and stages["b"]["rss_growth_mb"] is None
+
+    # Sequential stages, and stages nested in one thread, keep their memory
+    with profiler.stage("alone"):
+        with profiler.stage("alone nested"):
+            pass
+    stages = {stage["stage"]: stage for stage in profiler.report()["stages"]}
+    assert not stages["alone"]["memory_overlapped"]
+    assert stages["alone"]["traced_peak_mb"] is not None